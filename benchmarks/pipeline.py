@@ -0,0 +1,441 @@
+"""Benchmark every pipeline stage on synthetic designs.
+
+Usage:
+    python -m benchmarks.pipeline run --preset scaling --out results.json
+    python -m benchmarks.pipeline run --case modules=64,bus_width=32
+    python -m benchmarks.pipeline compare base.json results.json
+
+`run` generates one design per case (see `benchmarks.synthetic`) and measures
+each stage in isolation on the previous stage's output: wall time as the
+minimum and median over `--repeats` runs with the garbage collector disabled,
+then peak traced allocation (`tracemalloc`) over one further run. `compare`
+prints per-stage time ratios between two result files and exits with status 1
+when a stage slowed down by more than `--threshold`.
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass, fields, replace
+from pathlib import Path
+from typing import Any, Callable, Iterable, Optional
+
+from benchmarks.synthetic import (
+    BACKEND_NAME,
+    VIEW_PROFILE,
+    DesignParams,
+    write_design,
+)
+
+SCHEMA_VERSION = 1
+
+STAGES = (
+    "parse_string",
+    "resolve_import_graph",
+    "build_patterned_graph",
+    "build_atomized_graph",
+    "verify_atomized_graph",
+    "build_netlist_ir_design",
+    "view_binding",
+    "emit_netlist",
+)
+
+_SCALING_BASE = DesignParams(
+    modules=32, depth=3, fanout=4, bus_width=8, view_rules=4, library_size=16
+)
+
+PRESETS: dict[str, tuple[DesignParams, ...]] = {
+    "smoke": (
+        DesignParams(
+            modules=4, depth=2, fanout=2, bus_width=2, view_rules=1, library_size=2
+        ),
+    ),
+    # One curve per parameter, each varying from the same base design.
+    "scaling": (
+        _SCALING_BASE,
+        *(replace(_SCALING_BASE, modules=value) for value in (12, 128, 512)),
+        *(replace(_SCALING_BASE, depth=value) for value in (1, 5, 8)),
+        *(replace(_SCALING_BASE, fanout=value) for value in (1, 16, 64)),
+        *(replace(_SCALING_BASE, bus_width=value) for value in (1, 32, 128)),
+        *(replace(_SCALING_BASE, view_rules=value) for value in (0, 8)),
+        *(replace(_SCALING_BASE, library_size=value) for value in (1, 128, 1024)),
+    ),
+}
+
+
+class BenchmarkError(RuntimeError):
+    """Raised when a synthetic design fails to compile."""
+
+
+@dataclass(frozen=True)
+class StageResult:
+    """Measurements of one stage."""
+
+    wall_s_min: float
+    wall_s_median: float
+    peak_bytes: int
+
+
+def run_case(
+    params: DesignParams, workdir: Path, *, repeats: int = 5
+) -> dict[str, Any]:
+    """Generate one design and measure every stage.
+
+    Args:
+        params: Design size parameters.
+        workdir: Directory the design is written into.
+        repeats: Timed runs per stage.
+
+    Returns:
+        JSON-ready case record with params, sizes and per-stage results.
+
+    Raises:
+        BenchmarkError: If a stage reports error diagnostics.
+    """
+    from asdl.ast import parse_string
+    from asdl.core.verify_atomized_graph import verify_atomized_graph_if_clean
+    from asdl.emit.backend_config import load_backend_config
+    from asdl.emit.netlist import emit_netlist
+    from asdl.imports import resolve_import_graph
+    from asdl.lowering import (
+        build_atomized_graph,
+        build_netlist_ir_design,
+        build_patterned_graph_from_import_graph,
+        resolve_top_module_id,
+    )
+    from asdl.views.api import (
+        apply_resolved_view_bindings,
+        resolve_design_view_bindings,
+    )
+
+    design_files = write_design(params, workdir / params.label())
+    entry_file = design_files.entry_file
+    sources = [
+        (path, path.read_text(encoding="utf-8"))
+        for path in (design_files.entry_file, design_files.library_file)
+    ]
+    backend_config = load_backend_config(BACKEND_NAME, design_files.backend_config)
+
+    def parse_sources() -> list[Any]:
+        return [_checked(parse_string(text, path), "parse") for path, text in sources]
+
+    def resolve() -> Any:
+        return _checked(resolve_import_graph(entry_file), "import resolution")
+
+    stages: dict[str, StageResult] = {}
+    stages["parse_string"] = _measure(parse_sources, repeats)
+    import_graph = resolve()
+    stages["resolve_import_graph"] = _measure(resolve, repeats)
+
+    def patterned() -> Any:
+        return _checked(
+            build_patterned_graph_from_import_graph(import_graph), "lowering"
+        )
+
+    graph = patterned()
+    stages["build_patterned_graph"] = _measure(patterned, repeats)
+
+    def atomized() -> Any:
+        return _checked(build_atomized_graph(graph), "atomization")
+
+    atomized_graph = atomized()
+    stages["build_atomized_graph"] = _measure(atomized, repeats)
+
+    def verify() -> None:
+        _raise_on_errors(verify_atomized_graph_if_clean(atomized_graph, []), "verify")
+
+    stages["verify_atomized_graph"] = _measure(verify, repeats)
+
+    entry_doc = import_graph.documents[import_graph.entry_file]
+    entry_file_id = str(import_graph.entry_file)
+    top_module_id = resolve_top_module_id(graph, entry_doc.top, entry_file_id)
+
+    def netlist_ir() -> Any:
+        return build_netlist_ir_design(
+            atomized_graph, top_module_id=top_module_id, entry_file_id=entry_file_id
+        )
+
+    design = netlist_ir()
+    stages["build_netlist_ir_design"] = _measure(netlist_ir, repeats)
+
+    def view_binding() -> Any:
+        bindings = _checked(
+            resolve_design_view_bindings(
+                design,
+                config_path=design_files.view_config,
+                profile_name=VIEW_PROFILE,
+            ),
+            "view binding",
+        )
+        return apply_resolved_view_bindings(design, bindings)
+
+    bound_design = view_binding()
+    stages["view_binding"] = _measure(view_binding, repeats)
+
+    def emit() -> str:
+        return _checked(
+            emit_netlist(
+                bound_design, backend_name=BACKEND_NAME, backend_config=backend_config
+            ),
+            "emission",
+        )
+
+    netlist_text = emit()
+    stages["emit_netlist"] = _measure(emit, repeats)
+
+    return {
+        "label": params.label(),
+        "params": asdict(params),
+        "sizes": {
+            "source_bytes": sum(len(text.encode("utf-8")) for _, text in sources),
+            "patterned_modules": len(graph.modules),
+            "atomized_instances": sum(
+                len(module.instances) for module in atomized_graph.modules.values()
+            ),
+            "atomized_nets": sum(
+                len(module.nets) for module in atomized_graph.modules.values()
+            ),
+            "netlist_modules": len(bound_design.modules),
+            "netlist_lines": netlist_text.count("\n") + 1,
+        },
+        "stages": {name: asdict(stages[name]) for name in STAGES},
+    }
+
+
+def run_suite(
+    cases: Iterable[DesignParams],
+    *,
+    repeats: int = 5,
+    workdir: Optional[Path] = None,
+    progress: Optional[Callable[[str], None]] = None,
+) -> dict[str, Any]:
+    """Run every case and return the JSON-ready results document."""
+    results: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory(prefix="asdl-bench-") as scratch:
+        root = workdir if workdir is not None else Path(scratch)
+        for params in cases:
+            if progress is not None:
+                progress(params.label())
+            results.append(run_case(params, root, repeats=repeats))
+    return {
+        "schema_version": SCHEMA_VERSION,
+        "environment": _environment(),
+        "repeats": repeats,
+        "cases": results,
+    }
+
+
+def compare_results(
+    base: dict[str, Any], new: dict[str, Any], *, threshold: float = 1.10
+) -> tuple[list[str], bool]:
+    """Compare two results documents case by case.
+
+    Args:
+        base: Baseline results document.
+        new: Results document to compare against the baseline.
+        threshold: `new / base` minimum-time ratio above which a stage counts
+            as a regression.
+
+    Returns:
+        Report lines and whether any stage regressed.
+    """
+    base_cases = {case["label"]: case for case in base["cases"]}
+    lines = [f"{'case':<28}{'stage':<26}{'base ms':>10}{'new ms':>10}{'ratio':>8}"]
+    regressed = False
+    for case in new["cases"]:
+        base_case = base_cases.get(case["label"])
+        if base_case is None:
+            continue
+        for stage in STAGES:
+            base_time = base_case["stages"].get(stage, {}).get("wall_s_min")
+            new_time = case["stages"].get(stage, {}).get("wall_s_min")
+            if base_time is None or new_time is None:
+                continue
+            ratio = new_time / base_time if base_time > 0 else float("inf")
+            flag = ""
+            if ratio > threshold:
+                regressed = True
+                flag = "  slower"
+            lines.append(
+                f"{case['label']:<28}{stage:<26}{base_time * 1000:>10.2f}"
+                f"{new_time * 1000:>10.2f}{ratio:>8.2f}{flag}"
+            )
+    return lines, regressed
+
+
+def parse_case(text: str) -> DesignParams:
+    """Parse `modules=64,bus_width=32` into params over the scaling base.
+
+    Raises:
+        ValueError: If a key is unknown or a value is not an integer.
+    """
+    names = {field.name for field in fields(DesignParams)}
+    overrides: dict[str, int] = {}
+    for item in filter(None, text.split(",")):
+        key, _, value = item.partition("=")
+        key = key.strip()
+        if key not in names:
+            raise ValueError(f"Unknown design parameter '{key}'.")
+        overrides[key] = int(value)
+    return replace(_SCALING_BASE, **overrides)
+
+
+def _measure(stage: Callable[[], Any], repeats: int) -> StageResult:
+    times: list[float] = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeats):
+            start = time.perf_counter()
+            stage()
+            times.append(time.perf_counter() - start)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        stage()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return StageResult(
+        wall_s_min=min(times),
+        wall_s_median=statistics.median(times),
+        peak_bytes=peak - baseline,
+    )
+
+
+def _checked(result: tuple[Any, list[Any]], stage: str) -> Any:
+    value, diagnostics = result
+    _raise_on_errors(diagnostics, stage)
+    if value is None:
+        raise BenchmarkError(f"{stage} produced no result.")
+    return value
+
+
+def _raise_on_errors(diagnostics: Iterable[Any], stage: str) -> None:
+    from asdl.diagnostics import Severity
+
+    errors = [
+        diagnostic
+        for diagnostic in diagnostics
+        if diagnostic.severity in (Severity.ERROR, Severity.FATAL)
+    ]
+    if errors:
+        raise BenchmarkError(f"{stage} failed: {errors[0].code} {errors[0].message}")
+
+
+def _environment() -> dict[str, Any]:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=Path(__file__).resolve().parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def _parse_args(argv: Optional[list[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark ASDL pipeline stages on synthetic designs."
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Run benchmark cases.")
+    run.add_argument(
+        "--preset",
+        choices=sorted(PRESETS),
+        help="Named case list (default: smoke when no --case is given).",
+    )
+    run.add_argument(
+        "--case",
+        action="append",
+        default=[],
+        help=(
+            "Extra case as comma-separated overrides of the scaling base, "
+            "e.g. modules=64,bus_width=32 (repeatable)."
+        ),
+    )
+    run.add_argument("--repeats", type=int, default=5, help="Timed runs per stage.")
+    run.add_argument("--out", type=Path, help="Write results JSON to this path.")
+    run.add_argument(
+        "--workdir",
+        type=Path,
+        help="Keep generated designs here instead of a temporary directory.",
+    )
+
+    compare = commands.add_parser("compare", help="Compare two results files.")
+    compare.add_argument("base", type=Path)
+    compare.add_argument("new", type=Path)
+    compare.add_argument(
+        "--threshold",
+        type=float,
+        default=1.10,
+        help="Slowdown ratio reported as a regression (default: 1.10).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    args = _parse_args(argv)
+    if args.command == "compare":
+        base = json.loads(args.base.read_text(encoding="utf-8"))
+        new = json.loads(args.new.read_text(encoding="utf-8"))
+        lines, regressed = compare_results(base, new, threshold=args.threshold)
+        print("\n".join(lines))
+        return 1 if regressed else 0
+
+    try:
+        cases = [parse_case(text) for text in args.case]
+    except ValueError as exc:
+        print(f"Invalid --case: {exc}", file=sys.stderr)
+        return 2
+    if args.preset is not None or not cases:
+        cases = [*PRESETS[args.preset or "smoke"], *cases]
+    try:
+        results = run_suite(
+            cases,
+            repeats=args.repeats,
+            workdir=args.workdir,
+            progress=lambda label: print(f"running {label}", file=sys.stderr),
+        )
+    except (BenchmarkError, ValueError) as exc:
+        print(str(exc), file=sys.stderr)
+        return 1
+
+    text = json.dumps(results, indent=2) + "\n"
+    if args.out is not None:
+        args.out.write_text(text, encoding="utf-8")
+    else:
+        sys.stdout.write(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,247 @@
+"""Parametric synthetic ASDL designs for pipeline benchmarks.
+
+A design is fully determined by its `DesignParams`, so the same parameters
+produce byte-identical files on every machine.
+
+Shape:
+- `lib.asdl` holds `library_size` resistor-like devices.
+- `top.asdl` imports the library and holds `modules` modules arranged in
+  `depth` levels below the `tb` top module. Every module exposes two
+  `bus_width`-bit ports, `IN<@bus>` and `OUT<@bus>`.
+- Each non-leaf module instantiates every child module assigned to it as a
+  `fanout`-wide instance pattern, with bus broadcast over the fan-out axis.
+- Each leaf module instantiates one library device per bus bit. The first
+  `view_rules` leaves (at most the number of leaves) also get a `@behave`
+  variant, and the `bench` profile of `views.yaml` binds each of them with
+  one rule.
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+BACKEND_NAME = "sim.ngspice"
+VIEW_PROFILE = "bench"
+
+_BACKEND_CONFIG = """\
+sim.ngspice:
+  extension: ".spice"
+  comment_prefix: "*"
+  templates:
+    __subckt_header__: ".subckt {name} {ports}"
+    __subckt_header_params__: ".subckt {name} {ports} {params}"
+    __subckt_footer__: ".ends {name}"
+    __subckt_call__: "X{name} {ports} {ref}"
+    __subckt_call_params__: "X{name} {ports} {ref} {params}"
+    __netlist_header__: "* {top}"
+    __netlist_footer__: ".end"
+"""
+
+
+@dataclass(frozen=True)
+class DesignParams:
+    """Synthetic design size parameters.
+
+    Attributes:
+        modules: Modules below the top module (N).
+        depth: Hierarchy levels below the top module (D).
+        fanout: Instances per child instance pattern (F).
+        bus_width: Port bus width in bits (W).
+        view_rules: View-binding rules and `@behave` leaf variants (R).
+        library_size: Devices in the imported library (L).
+    """
+
+    modules: int = 8
+    depth: int = 3
+    fanout: int = 4
+    bus_width: int = 8
+    view_rules: int = 2
+    library_size: int = 8
+
+    def __post_init__(self) -> None:
+        for name, value in asdict(self).items():
+            if value < (0 if name == "view_rules" else 1):
+                raise ValueError(f"{name} must be positive, got {value}.")
+        if self.depth > self.modules:
+            raise ValueError("depth must not exceed modules.")
+
+    def label(self) -> str:
+        """Return a compact identifier such as `N8-D3-F4-W8-R2-L8`."""
+        return (
+            f"N{self.modules}-D{self.depth}-F{self.fanout}-W{self.bus_width}"
+            f"-R{self.view_rules}-L{self.library_size}"
+        )
+
+
+@dataclass(frozen=True)
+class SyntheticDesign:
+    """Paths of a generated design."""
+
+    params: DesignParams
+    entry_file: Path
+    library_file: Path
+    view_config: Path
+    backend_config: Path
+
+
+def module_levels(params: DesignParams) -> list[list[str]]:
+    """Return module names per hierarchy level, top level first."""
+    levels: list[list[str]] = [[] for _ in range(params.depth)]
+    for index in range(params.modules):
+        level = min(index * params.depth // params.modules, params.depth - 1)
+        levels[level].append(f"m{index}")
+    return levels
+
+
+def render_library(params: DesignParams) -> str:
+    """Return the library ASDL source."""
+    lines = ["devices:"]
+    for index in range(params.library_size):
+        lines.extend(
+            [
+                f"  dev{index}:",
+                "    ports: [P, N]",
+                "    parameters:",
+                f"      r: {index + 1}k",
+                "    backends:",
+                f"      {BACKEND_NAME}:",
+                '        template: "R{name} {ports} {params}"',
+            ]
+        )
+    return "\n".join(lines) + "\n"
+
+
+def render_design(params: DesignParams) -> str:
+    """Return the entry-file ASDL source."""
+    levels = module_levels(params)
+    children = _assign_children(levels)
+    leaves = _view_leaves(levels, children, params)
+    lines = ["imports:", "  lib: ./lib.asdl", "top: tb", "modules:"]
+    lines.extend(_render_parent("tb", levels[0], params))
+    for level in levels:
+        for name in level:
+            if children[name]:
+                lines.extend(_render_parent(name, children[name], params))
+            else:
+                lines.extend(_render_leaf(name, params, int(name[1:])))
+    for position, name in enumerate(leaves):
+        lines.extend(_render_leaf(f"{name}@behave", params, position + 1))
+    return "\n".join(lines) + "\n"
+
+
+def render_view_config(params: DesignParams) -> str:
+    """Return the view config with one rule per `@behave` leaf."""
+    levels = module_levels(params)
+    leaves = _view_leaves(levels, _assign_children(levels), params)
+    lines = [f"{VIEW_PROFILE}:", "  view_order: [default, behave]", "  rules:"]
+    for index, name in enumerate(leaves):
+        lines.extend(
+            [
+                f"    - id: rule{index}",
+                "      match:",
+                "        path: tb",
+                f"        module: {name}",
+                f"      bind: {name}@behave",
+            ]
+        )
+    if params.view_rules == 0:
+        lines[-1] = "  rules: []"
+    return "\n".join(lines) + "\n"
+
+
+def write_design(params: DesignParams, directory: Path) -> SyntheticDesign:
+    """Write the design, library, view config and backend config.
+
+    Args:
+        params: Design size parameters.
+        directory: Destination directory (created if missing).
+
+    Returns:
+        Paths of the written files.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    design = SyntheticDesign(
+        params=params,
+        entry_file=directory / "top.asdl",
+        library_file=directory / "lib.asdl",
+        view_config=directory / "views.yaml",
+        backend_config=directory / "backends.yaml",
+    )
+    design.entry_file.write_text(render_design(params), encoding="utf-8")
+    design.library_file.write_text(render_library(params), encoding="utf-8")
+    design.view_config.write_text(render_view_config(params), encoding="utf-8")
+    design.backend_config.write_text(_BACKEND_CONFIG, encoding="utf-8")
+    (directory / "params.json").write_text(
+        json.dumps(asdict(params), indent=2) + "\n", encoding="utf-8"
+    )
+    return design
+
+
+def _assign_children(levels: list[list[str]]) -> dict[str, list[str]]:
+    """Give every module of level k+1 to one parent of level k, round-robin."""
+    children: dict[str, list[str]] = {name: [] for level in levels for name in level}
+    for parents, level in zip(levels, levels[1:]):
+        for index, name in enumerate(level):
+            children[parents[index % len(parents)]].append(name)
+    return children
+
+
+def _view_leaves(
+    levels: list[list[str]], children: dict[str, list[str]], params: DesignParams
+) -> list[str]:
+    """Return the leaf modules that get a `@behave` variant and a view rule."""
+    leaves = [name for level in levels for name in level if not children[name]]
+    if params.view_rules > len(leaves):
+        raise ValueError(
+            f"view_rules ({params.view_rules}) exceeds the {len(leaves)} leaf "
+            f"modules of {params.label()}."
+        )
+    return leaves[: params.view_rules]
+
+
+def _render_parent(name: str, children: list[str], params: DesignParams) -> list[str]:
+    lines = [
+        f"  {name}:",
+        "    patterns:",
+        f"      bus: <1:{params.bus_width}>",
+        f"      fan: <1:{params.fanout}>",
+        "    instances:",
+    ]
+    for child in children:
+        lines.append(f"      {child.upper()}_<@fan>: {child}")
+    lines.append("    nets:")
+    for port in ("IN", "OUT"):
+        endpoints = ", ".join(
+            f"{child.upper()}_<@fan>.{port}<@bus>" for child in children
+        )
+        lines.append(f"      ${port}<@bus>: [{endpoints}]")
+    return lines
+
+
+def _render_leaf(name: str, params: DesignParams, seed: int) -> list[str]:
+    device = f"dev{seed % params.library_size}"
+    return [
+        f"  {name}:",
+        "    patterns:",
+        f"      bus: <1:{params.bus_width}>",
+        "    instances:",
+        f"      R<@bus>: lib.{device}",
+        "    nets:",
+        "      $IN<@bus>: [R<@bus>.P]",
+        "      $OUT<@bus>: [R<@bus>.N]",
+    ]
+
+
+__all__ = [
+    "BACKEND_NAME",
+    "VIEW_PROFILE",
+    "DesignParams",
+    "SyntheticDesign",
+    "module_levels",
+    "render_design",
+    "render_library",
+    "render_view_config",
+    "write_design",
+]
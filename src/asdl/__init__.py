@@ -2,28 +2,41 @@
 ASDL - Analog Structured Description Language
 
 Active refactor surface is `asdl.ast`, `asdl.core`, `asdl.diagnostics`,
-`asdl.emit`, and `asdl.lowering`.
+`asdl.emit`, and `asdl.lowering`. `asdl.Compiler` wraps them in a reusable
+compilation session.
+
+Top-level names are loaded on first access so that importing a subpackage
+(for example `asdl.cli` to print `asdlc --help`) does not pay for the
+Pydantic AST models or the lowering stack.
 """
 
-from .ast import (
-    AsdlDocument,
-    DeviceBackendDecl,
-    DeviceDecl,
-    EndpointListExpr,
-    InstanceExpr,
-    InstancesBlock,
-    LocationIndex,
-    Locatable,
-    ModuleDecl,
-    NetsBlock,
-    ParamValue,
-    model_json_schema,
-    parse_file,
-    parse_string,
-)
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .ast import (
+        AsdlDocument,
+        DeviceBackendDecl,
+        DeviceDecl,
+        EndpointListExpr,
+        InstanceExpr,
+        InstancesBlock,
+        LocationIndex,
+        Locatable,
+        ModuleDecl,
+        NetsBlock,
+        ParamValue,
+        model_json_schema,
+        parse_file,
+        parse_string,
+    )
+    from .compiler import Compiler
 
 __version__ = "0.1.0"
 __all__ = [
+    "Compiler",
     "Locatable",
     "LocationIndex",
     "ParamValue",
@@ -39,3 +52,19 @@ __all__ = [
     "parse_file",
     "parse_string",
 ]
+
+_LAZY_EXPORTS = {name: ".ast" for name in __all__}
+_LAZY_EXPORTS["Compiler"] = ".compiler"
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
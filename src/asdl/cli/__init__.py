@@ -1,28 +1,34 @@
 from __future__ import annotations
 
+import glob
+import hashlib
 import json
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Iterable, List, Optional
 
 import click
-import yaml
 
-from asdl.cli.query_runtime import (
+from asdl.cli.query_options import (
     QueryStage,
-    build_query_bindings_payload,
-    build_query_tree_compact_payload,
-    build_query_tree_payload,
-    build_query_runtime,
-    finalize_query_output,
     query_common_options,
-    render_query_json,
     validate_query_common_options,
 )
 from asdl.cli.runtime_common import (
+    PreparedViewBindings,
+    prepare_view_bindings,
     resolve_and_apply_view_bindings,
     validate_view_binding_options,
 )
+from asdl.cli.server import ServerAwareGroup, default_socket_path
+from asdl.compile_environment import (
+    CompileEnvironment,
+    active_compile_environment,
+    compile_environment_scope,
+)
+from asdl.compile_stats import CompileStats, compile_stats_scope
+from asdl.instrumentation import event
 from asdl.diagnostics import (
     Diagnostic,
     Severity,
@@ -38,7 +44,7 @@ CLI_WRITE_ERROR = format_code("TOOL", 2)
 CLI_SCHEMA_ERROR = format_code("TOOL", 3)
 
 
-@click.group()
+@click.group(cls=ServerAwareGroup)
 def cli() -> None:
     """ASDL compiler (asdlc)."""
 
@@ -93,6 +99,50 @@ def schema(output_dir: Optional[Path]) -> None:
     click.echo(f"Wrote: {txt_path}")
 
 
+@cli.command("serve")
+@click.option(
+    "--socket",
+    "socket_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=(
+        "Unix socket path (default: $ASDL_SERVER_SOCKET, else "
+        "$XDG_RUNTIME_DIR/asdlc-<uid>/server.sock)."
+    ),
+)
+def serve(socket_path: Optional[Path]) -> None:
+    """Run a long-lived compile server on a local Unix socket.
+
+    While the server runs, `asdlc netlist`, `query`, `depgraph-dump` and
+    `visualizer-dump` invocations that use the same socket path are answered by
+    the server, which keeps imports and parsed documents warm between calls.
+    Stop it with Ctrl-C or a `shutdown` request.
+    """
+    from asdl.cli.server import CompileServer, resolve_socket_path
+
+    diagnostics: List[Diagnostic] = []
+    if socket_path is None:
+        socket_path = resolve_socket_path() or default_socket_path()
+    try:
+        server = CompileServer(socket_path, cli)
+    except OSError as exc:
+        diagnostics.append(
+            _diagnostic(
+                CLI_WRITE_ERROR,
+                f"Failed to start compile server on '{socket_path}': {exc}",
+            )
+        )
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+
+    click.echo(f"Listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
 @cli.command("patterned-graph-dump")
 @click.argument("input_file", type=click.Path(dir_okay=False, path_type=Path))
 @click.option(
@@ -502,6 +552,17 @@ def _render_compact_tree_text(payload: dict[str, Any]) -> str:
     return "\n".join(lines)
 
 
+def _echo_query_ndjson(rows: Iterable[Any], diagnostics: List[Diagnostic]) -> None:
+    """Stream NDJSON query rows, then report diagnostics and exit status."""
+    from asdl.cli.query_runtime import iter_query_ndjson
+
+    for line in iter_query_ndjson(rows):
+        click.echo(line, nl=False)
+    _emit_diagnostics(diagnostics)
+    if _has_error_diagnostics(diagnostics):
+        raise click.exceptions.Exit(1)
+
+
 @query.command("tree")
 @query_common_options
 @click.option(
@@ -513,6 +574,13 @@ def _render_compact_tree_text(payload: dict[str, Any]) -> str:
         "(default) or verbose metadata payload."
     ),
 )
+@click.option(
+    "--ndjson",
+    "ndjson_output",
+    is_flag=True,
+    default=False,
+    help="Stream one JSON object per hierarchy row as it is traversed.",
+)
 def query_tree(
     input_file: Path,
     config_path: Optional[Path],
@@ -521,10 +589,21 @@ def query_tree(
     view_profile: Optional[str],
     top_name: Optional[str],
     stage: str,
+    verify: bool,
     json_output: bool,
     compact_view: bool,
+    ndjson_output: bool,
 ) -> None:
     """Emit hierarchical query rows."""
+    from asdl.cli.query_runtime import (
+        build_query_runtime,
+        build_query_tree_compact_payload,
+        build_query_tree_payload,
+        finalize_query_output,
+        iter_query_tree_rows,
+        render_query_json,
+    )
+
     del top_name  # Consumed by follow-up query tasks.
     diagnostics: List[Diagnostic] = []
 
@@ -533,6 +612,10 @@ def query_tree(
         view_profile=view_profile,
     ):
         diagnostics.append(_diagnostic(CLI_SCHEMA_ERROR, message))
+    if ndjson_output and json_output:
+        diagnostics.append(
+            _diagnostic(CLI_SCHEMA_ERROR, "--ndjson cannot be combined with --json.")
+        )
     if _has_error_diagnostics(diagnostics):
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
@@ -547,12 +630,17 @@ def query_tree(
         stage=QueryStage(stage),
         view_config_path=view_config_path,
         view_profile=view_profile,
+        verify=verify,
     )
     diagnostics.extend(runtime_diags)
     if runtime is None:
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
 
+    if ndjson_output:
+        _echo_query_ndjson(iter_query_tree_rows(runtime), diagnostics)
+        return
+
     payload: Any
     kind: str
     if compact_view:
@@ -583,6 +671,13 @@ def query_tree(
 
 @query.command("bindings")
 @query_common_options
+@click.option(
+    "--ndjson",
+    "ndjson_output",
+    is_flag=True,
+    default=False,
+    help="Stream one JSON object per binding row.",
+)
 def query_bindings(
     input_file: Path,
     config_path: Optional[Path],
@@ -591,9 +686,18 @@ def query_bindings(
     view_profile: Optional[str],
     top_name: Optional[str],
     stage: str,
+    verify: bool,
     json_output: bool,
+    ndjson_output: bool,
 ) -> None:
     """Emit resolved view-binding rows for indexed hierarchy instances."""
+    from asdl.cli.query_runtime import (
+        build_query_bindings_payload,
+        build_query_runtime,
+        finalize_query_output,
+        iter_query_bindings_rows,
+    )
+
     del top_name  # Consumed by follow-up query tasks.
     diagnostics: List[Diagnostic] = []
 
@@ -609,6 +713,10 @@ def query_bindings(
         view_profile=view_profile,
     ):
         diagnostics.append(_diagnostic(CLI_SCHEMA_ERROR, message))
+    if ndjson_output and json_output:
+        diagnostics.append(
+            _diagnostic(CLI_SCHEMA_ERROR, "--ndjson cannot be combined with --json.")
+        )
     if _has_error_diagnostics(diagnostics):
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
@@ -620,15 +728,26 @@ def query_bindings(
         entry_file=input_file,
         config_path=config_path,
         lib_roots=resolved_lib_roots,
-        stage=QueryStage(stage),
+        stage=(
+            # Binding rows come from view resolution, so authored-stage
+            # requests still resolve.
+            QueryStage.RESOLVED
+            if QueryStage(stage) == QueryStage.AUTHORED
+            else QueryStage(stage)
+        ),
         view_config_path=view_config_path,
         view_profile=view_profile,
+        verify=verify,
     )
     diagnostics.extend(runtime_diags)
     if runtime is None:
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
 
+    if ndjson_output:
+        _echo_query_ndjson(iter_query_bindings_rows(runtime), diagnostics)
+        return
+
     exit_code, output_text = finalize_query_output(
         kind="query.bindings",
         payload=build_query_bindings_payload(runtime),
@@ -641,6 +760,175 @@ def query_bindings(
         raise click.exceptions.Exit(exit_code)
 
 
+@query.command("stats")
+@query_common_options
+def query_stats(
+    input_file: Path,
+    config_path: Optional[Path],
+    lib_roots: tuple[Path, ...],
+    view_config_path: Optional[Path],
+    view_profile: Optional[str],
+    top_name: Optional[str],
+    stage: str,
+    verify: bool,
+    json_output: bool,
+) -> None:
+    """Emit flattened device/module counts without flattening the design."""
+    from asdl.cli.query_runtime import (
+        build_query_runtime,
+        build_query_stats_payload,
+        finalize_query_output,
+    )
+
+    del top_name  # Consumed by follow-up query tasks.
+    diagnostics: List[Diagnostic] = []
+
+    for message in validate_query_common_options(
+        view_config_path=view_config_path,
+        view_profile=view_profile,
+    ):
+        diagnostics.append(_diagnostic(CLI_SCHEMA_ERROR, message))
+    if _has_error_diagnostics(diagnostics):
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+
+    resolved_lib_roots, _backend_config_path = _resolve_rc_settings(
+        input_file, config_path, lib_roots, diagnostics
+    )
+    runtime, runtime_diags = build_query_runtime(
+        entry_file=input_file,
+        config_path=config_path,
+        lib_roots=resolved_lib_roots,
+        stage=QueryStage(stage),
+        view_config_path=view_config_path,
+        view_profile=view_profile,
+        verify=verify,
+    )
+    diagnostics.extend(runtime_diags)
+    if runtime is None:
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+
+    exit_code, output_text = finalize_query_output(
+        kind="query.stats",
+        payload=build_query_stats_payload(runtime),
+        json_output=json_output,
+        diagnostics=diagnostics,
+    )
+    click.echo(output_text, nl=False)
+    _emit_diagnostics(diagnostics)
+    if exit_code != 0:
+        raise click.exceptions.Exit(exit_code)
+
+
+@query.command("net-trace")
+@query_common_options
+@click.option(
+    "--module",
+    "module_name",
+    type=str,
+    help="Anchor module symbol (required unless --path selects the anchor).",
+)
+@click.option("--net", "net_name", type=str, required=True, help="Net to trace.")
+@click.option(
+    "--path",
+    "anchor_path",
+    type=str,
+    help="Module occurrence path of the anchor (for example `tb.dut`).",
+)
+@click.option(
+    "--direction",
+    type=click.Choice(["up", "down", "both"], case_sensitive=True),
+    default="both",
+    show_default=True,
+    help="Restrict equivalents to ancestors (up) or descendants (down).",
+)
+@click.option(
+    "--order",
+    type=click.Choice(["dfs-pre", "dfs-post"], case_sensitive=True),
+    default="dfs-pre",
+    show_default=True,
+    help="Ordering of equivalent nets.",
+)
+def query_net_trace(
+    input_file: Path,
+    config_path: Optional[Path],
+    lib_roots: tuple[Path, ...],
+    view_config_path: Optional[Path],
+    view_profile: Optional[str],
+    top_name: Optional[str],
+    stage: str,
+    verify: bool,
+    json_output: bool,
+    module_name: Optional[str],
+    net_name: str,
+    anchor_path: Optional[str],
+    direction: str,
+    order: str,
+) -> None:
+    """Trace a net across hierarchy to every connected device pin."""
+    from asdl.cli.query_runtime import (
+        build_query_net_trace_payload,
+        build_query_runtime,
+        finalize_query_output,
+    )
+
+    del top_name  # Consumed by follow-up query tasks.
+    diagnostics: List[Diagnostic] = []
+
+    if module_name is None and anchor_path is None:
+        diagnostics.append(
+            _diagnostic(CLI_SCHEMA_ERROR, "query net-trace requires --module or --path.")
+        )
+    for message in validate_query_common_options(
+        view_config_path=view_config_path,
+        view_profile=view_profile,
+    ):
+        diagnostics.append(_diagnostic(CLI_SCHEMA_ERROR, message))
+    if _has_error_diagnostics(diagnostics):
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+
+    resolved_lib_roots, _backend_config_path = _resolve_rc_settings(
+        input_file, config_path, lib_roots, diagnostics
+    )
+    runtime, runtime_diags = build_query_runtime(
+        entry_file=input_file,
+        config_path=config_path,
+        lib_roots=resolved_lib_roots,
+        stage=QueryStage(stage),
+        view_config_path=view_config_path,
+        view_profile=view_profile,
+        verify=verify,
+    )
+    diagnostics.extend(runtime_diags)
+    if runtime is None:
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+
+    payload, trace_diags = build_query_net_trace_payload(
+        runtime,
+        net=net_name,
+        module=module_name,
+        path=anchor_path,
+        direction=direction,  # type: ignore[arg-type]
+        order=order,
+    )
+    diagnostics.extend(trace_diags)
+    exit_code, output_text = finalize_query_output(
+        kind="query.net_trace",
+        payload=payload,
+        json_output=json_output,
+        diagnostics=diagnostics,
+        missing_anchor=payload is None,
+    )
+    if payload is not None:
+        click.echo(output_text, nl=False)
+    _emit_diagnostics(diagnostics)
+    if exit_code != 0:
+        raise click.exceptions.Exit(exit_code)
+
+
 @cli.command("netlist")
 @click.argument("input_file", type=click.Path(dir_okay=False, path_type=Path))
 @click.option(
@@ -689,9 +977,27 @@ def query_bindings(
 )
 @click.option(
     "--view-profile",
-    "view_profile",
+    "view_profiles",
     type=str,
-    help="View-binding profile name from --view-config.",
+    multiple=True,
+    help=(
+        "View-binding profile name from --view-config (repeatable; several "
+        "profiles write <stem>.<profile><suffix> outputs and logs)."
+    ),
+)
+@click.option(
+    "--all-view-profiles",
+    is_flag=True,
+    default=False,
+    help="Emit one netlist and compile log per profile in --view-config.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes for multi-profile emission.",
 )
 @click.option(
     "--log",
@@ -702,6 +1008,59 @@ def query_bindings(
         "<entry_file_basename>.log.json next to the input file)."
     ),
 )
+@click.option(
+    "--fold-parallel",
+    is_flag=True,
+    default=False,
+    help=(
+        "Fold identical pattern-expanded device instances into one instance "
+        "with a multiplicity factor (requires backend multiplicity_param)."
+    ),
+)
+@click.option(
+    "--split",
+    is_flag=True,
+    default=False,
+    help=(
+        "Write one file per emitted subckt into <output_stem>.subckts/ and "
+        "include them from the top file; unchanged files are not rewritten "
+        "and stale ones are removed."
+    ),
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Print per-stage wall/CPU timings and counters to stderr.",
+)
+@click.option(
+    "--trace-out",
+    "trace_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=(
+        "Write a Chrome trace-event JSON of pipeline stages and per-file, "
+        "per-module spans (runs -j work in-process)."
+    ),
+)
+@click.option(
+    "--memory-report",
+    is_flag=True,
+    default=False,
+    help=(
+        "Trace allocations with tracemalloc; print per-stage peaks, IR sizes "
+        "and the IRs alive at emission to stderr and add them to the compile "
+        "log (runs -j work in-process)."
+    ),
+)
+@click.option(
+    "--low-memory",
+    is_flag=True,
+    default=False,
+    help=(
+        "Release each intermediate IR as soon as the next stage no longer "
+        "needs it, lowering peak memory."
+    ),
+)
 def netlist(
     input_file: Path,
     config_path: Optional[Path],
@@ -711,8 +1070,16 @@ def netlist(
     lib_roots: tuple[Path, ...],
     top_as_subckt: bool,
     view_config_path: Optional[Path],
-    view_profile: Optional[str],
+    view_profiles: tuple[str, ...],
+    all_view_profiles: bool,
+    jobs: int,
     compile_log_path: Optional[Path],
+    fold_parallel: bool,
+    split: bool,
+    timings: bool,
+    trace_path: Optional[Path],
+    memory_report: bool,
+    low_memory: bool,
 ) -> None:
     """Generate a netlist from ASDL.
 
@@ -722,7 +1089,7 @@ def netlist(
     diagnostics: List[Diagnostic] = []
 
     try:
-        from asdl.emit.netlist import emit_netlist, load_backend
+        from asdl.emit.netlist import load_backend
         from asdl.lowering import run_netlist_ir_pipeline
     except Exception as exc:  # pragma: no cover - defensive: missing optional deps
         diagnostics.append(
@@ -734,94 +1101,863 @@ def netlist(
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
 
+    profile_names = list(dict.fromkeys(view_profiles))
     for message in validate_view_binding_options(
         view_config_path=view_config_path,
-        view_profile=view_profile,
+        view_profile=profile_names[0] if profile_names else None,
+        all_view_profiles=all_view_profiles,
     ):
         diagnostics.append(_diagnostic(CLI_SCHEMA_ERROR, message))
     if _has_error_diagnostics(diagnostics):
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
 
+    _record_trace(trace_path)
+    memory = _record_memory_report() if memory_report else None
     resolved_lib_roots, backend_config_path = _resolve_rc_settings(
         input_file, config_path, lib_roots, diagnostics
     )
-    design, pipeline_diags = run_netlist_ir_pipeline(
-        entry_file=input_file,
-        lib_roots=resolved_lib_roots,
-        verify=verify,
-    )
+    stats = CompileStats()
+    with compile_stats_scope(stats):
+        design, pipeline_diags = run_netlist_ir_pipeline(
+            entry_file=input_file,
+            lib_roots=resolved_lib_roots,
+            verify=verify,
+            low_memory=low_memory,
+        )
     diagnostics.extend(pipeline_diags)
     if design is None or _has_error_diagnostics(diagnostics):
+        if timings:
+            _echo_timings(stats, str(input_file))
+        if memory is not None:
+            _echo_memory_report(memory)
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
 
-    design, resolved_bindings, view_diags = resolve_and_apply_view_bindings(
-        design=design,
+    run = _NetlistRun(
+        input_file=input_file,
+        output_path=output_path,
+        compile_log_path=compile_log_path,
+        backend=backend,
+        backend_config_path=backend_config_path,
+        top_as_subckt=top_as_subckt,
+        fold_parallel=fold_parallel,
+        split=split,
         view_config_path=view_config_path,
-        view_profile=view_profile,
-        diagnostic_builder=_diagnostic,
-        import_error_code=CLI_IMPORT_ERROR,
     )
-    diagnostics.extend(view_diags)
-    if design is None or _has_error_diagnostics(diagnostics):
+    if not all_view_profiles and len(profile_names) <= 1:
+        succeeded, variant_diags, variant_stats = _build_netlist_variant(
+            design,
+            run,
+            view_profile=profile_names[0] if profile_names else None,
+            base_diagnostics=diagnostics,
+            stats=stats,
+            memory=memory,
+        )
+        diagnostics.extend(variant_diags)
+        if timings:
+            _echo_timings(variant_stats, str(input_file))
+        if memory is not None:
+            _echo_memory_report(memory)
+        _emit_diagnostics(diagnostics)
+        if not succeeded:
+            raise click.exceptions.Exit(1)
+        return
+
+    assert view_config_path is not None
+    with stats.stage("view_binding"):
+        prepared, prepare_diags = prepare_view_bindings(
+            design=design,
+            view_config_path=view_config_path,
+            diagnostic_builder=_diagnostic,
+            import_error_code=CLI_IMPORT_ERROR,
+        )
+    diagnostics.extend(prepare_diags)
+    if prepared is None or _has_error_diagnostics(diagnostics):
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
+    if all_view_profiles:
+        profile_names = list(prepared.config.profiles)
 
-    backend_config, backend_diags = load_backend(
-        backend, backend_config_path=backend_config_path
-    )
+    with compile_stats_scope(stats):
+        backend_config, backend_diags = load_backend(
+            backend, backend_config_path=backend_config_path
+        )
     diagnostics.extend(backend_diags)
     if backend_config is None or _has_error_diagnostics(diagnostics):
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
 
-    netlist_text, emit_diags = emit_netlist(
-        design,
-        top_as_subckt=top_as_subckt,
-        backend_name=backend,
+    batch = _NetlistBatch(
+        design=design,
+        run=run,
+        prepared=prepared,
         backend_config=backend_config,
+        base_diagnostics=tuple(diagnostics),
+        stats=stats,
+        environment=active_compile_environment(),
+        memory=memory,
     )
-    diagnostics.extend(emit_diags)
-    if netlist_text is None or _has_error_diagnostics(diagnostics):
-        _emit_diagnostics(diagnostics)
+    if (
+        jobs > 1
+        and len(profile_names) > 1
+        and trace_path is None
+        and memory is None
+    ):
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(profile_names)),
+            initializer=_init_netlist_batch_worker,
+            initargs=(batch,),
+        ) as executor:
+            results = []
+            for result, missing in executor.map(
+                _run_netlist_batch_worker, profile_names
+            ):
+                results.append(result)
+                batch.environment.record_missing_variables(missing)
+    else:
+        results = [batch.run_profile(profile_name) for profile_name in profile_names]
+
+    failed = False
+    for profile_name, (succeeded, variant_diags, variant_stats) in zip(
+        profile_names, results
+    ):
+        diagnostics.extend(variant_diags)
+        failed = failed or not succeeded
+        if timings:
+            _echo_timings(variant_stats, f"{input_file} [{profile_name}]")
+    if memory is not None:
+        _echo_memory_report(memory)
+    _emit_diagnostics(diagnostics)
+    if failed:
         raise click.exceptions.Exit(1)
 
-    if output_path is None:
-        output_path = input_file.with_suffix(backend_config.extension)
-    if compile_log_path is None:
-        compile_log_path = input_file.with_name(f"{input_file.stem}.log.json")
 
-    try:
-        output_path.write_text(netlist_text, encoding="utf-8")
-    except OSError as exc:
-        diagnostics.append(
-            _diagnostic(
-                CLI_WRITE_ERROR,
-                f"Failed to write netlist to '{output_path}': {exc}",
+@dataclass(frozen=True)
+class _NetlistRun:
+    """Command-level options shared by every netlist variant of one compile."""
+
+    input_file: Path
+    output_path: Optional[Path]
+    compile_log_path: Optional[Path]
+    backend: str
+    backend_config_path: Optional[Path]
+    top_as_subckt: bool
+    fold_parallel: bool
+    split: bool
+    view_config_path: Optional[Path]
+
+
+@dataclass(frozen=True)
+class _NetlistBatch:
+    """Shared compile state for emitting one netlist per view profile."""
+
+    design: Any
+    run: _NetlistRun
+    prepared: PreparedViewBindings
+    backend_config: Any
+    base_diagnostics: tuple[Diagnostic, ...]
+    stats: CompileStats
+    environment: CompileEnvironment
+    memory: Any = None
+
+    def run_profile(
+        self, profile_name: str
+    ) -> tuple[bool, list[Diagnostic], CompileStats]:
+        """Resolve, apply and emit one profile with profile-suffixed outputs."""
+        with compile_environment_scope(self.environment):
+            return _build_netlist_variant(
+                self.design,
+                self.run,
+                view_profile=profile_name,
+                base_diagnostics=list(self.base_diagnostics),
+                prepared=self.prepared,
+                backend_config=self.backend_config,
+                output_tag=profile_name,
+                stats=self.stats,
+                memory=self.memory,
             )
-        )
-        _emit_diagnostics(diagnostics)
-        raise click.exceptions.Exit(1)
+
+
+_NETLIST_BATCH_WORKER_STATE: Optional[_NetlistBatch] = None
+
+
+def _init_netlist_batch_worker(batch: _NetlistBatch) -> None:
+    """Install shared batch state in a profile worker process."""
+    global _NETLIST_BATCH_WORKER_STATE
+    _NETLIST_BATCH_WORKER_STATE = batch
+
+
+def _run_netlist_batch_worker(
+    profile_name: str,
+) -> tuple[tuple[bool, list[Diagnostic], CompileStats], frozenset[str]]:
+    """Run one profile using the worker's shared batch state.
+
+    Returns:
+        The profile result and the unset variables it looked up, which the
+        parent records in its own environment.
+    """
+    assert _NETLIST_BATCH_WORKER_STATE is not None
+    result = _NETLIST_BATCH_WORKER_STATE.run_profile(profile_name)
+    return result, _NETLIST_BATCH_WORKER_STATE.environment.missing_variables()
+
+
+@cli.command("build")
+@click.argument("entries", nargs=-1, required=True, type=str)
+@click.option(
+    "--config",
+    "config_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Explicit .asdlrc path for every entry (overrides discovery).",
+)
+@click.option(
+    "--output-dir",
+    "output_dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    help=(
+        "Directory for netlists and compile logs (default: next to each "
+        "entry file)."
+    ),
+)
+@click.option(
+    "--verify/--no-verify",
+    default=True,
+    show_default=True,
+    help="Enable IR verification passes.",
+)
+@click.option(
+    "--backend",
+    default="sim.ngspice",
+    show_default=True,
+    help="Backend name from the backend config.",
+)
+@click.option(
+    "--lib",
+    "lib_roots",
+    multiple=True,
+    type=click.Path(file_okay=False, path_type=Path),
+    help="Library search root (repeatable).",
+)
+@click.option(
+    "--top-as-subckt",
+    is_flag=True,
+    default=False,
+    help="Emit top modules as .subckt blocks.",
+)
+@click.option(
+    "--view-config",
+    "view_config_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="View-binding config YAML path.",
+)
+@click.option(
+    "--view-profile",
+    "view_profile",
+    type=str,
+    help="View-binding profile applied to every entry.",
+)
+@click.option(
+    "-j",
+    "--jobs",
+    type=click.IntRange(min=1),
+    default=1,
+    show_default=True,
+    help="Worker processes compiling entries.",
+)
+@click.option(
+    "--summary",
+    "summary_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Write an aggregated JSON build summary to this path.",
+)
+@click.option(
+    "--fold-parallel",
+    is_flag=True,
+    default=False,
+    help=(
+        "Fold identical pattern-expanded device instances into one instance "
+        "with a multiplicity factor (requires backend multiplicity_param)."
+    ),
+)
+@click.option(
+    "--split",
+    is_flag=True,
+    default=False,
+    help=(
+        "Write one file per emitted subckt into <output_stem>.subckts/ and "
+        "include them from the top file; unchanged files are not rewritten "
+        "and stale ones are removed."
+    ),
+)
+@click.option(
+    "--timings",
+    is_flag=True,
+    default=False,
+    help="Print per-entry stage timings and counters to stderr.",
+)
+@click.option(
+    "--trace-out",
+    "trace_path",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help=(
+        "Write a Chrome trace-event JSON of pipeline stages and per-file, "
+        "per-module spans (runs -j work in-process)."
+    ),
+)
+@click.option(
+    "--low-memory",
+    is_flag=True,
+    default=False,
+    help=(
+        "Release each intermediate IR as soon as the next stage no longer "
+        "needs it and do not keep parsed files across entries."
+    ),
+)
+def build(
+    entries: tuple[str, ...],
+    config_path: Optional[Path],
+    output_dir: Optional[Path],
+    verify: bool,
+    backend: str,
+    lib_roots: tuple[Path, ...],
+    top_as_subckt: bool,
+    view_config_path: Optional[Path],
+    view_profile: Optional[str],
+    jobs: int,
+    summary_path: Optional[Path],
+    fold_parallel: bool,
+    split: bool,
+    timings: bool,
+    trace_path: Optional[Path],
+    low_memory: bool,
+) -> None:
+    """Generate netlists for many ASDL entry files in one run.
+
+    ENTRIES are entry files or glob patterns (for example 'libs/tb/*.asdl').
+    Each entry writes its own netlist and compile log; parsed files, .asdlrc
+    settings and backend configs are loaded once and shared across entries.
+    """
+    diagnostics: List[Diagnostic] = []
 
     try:
-        from asdl.emit.netlist.render import build_emission_name_map
-        from asdl.views.api import view_sidecar_to_jsonable
+        from asdl.emit.netlist import load_backend
+        from asdl.imports import DocumentCache
     except Exception as exc:  # pragma: no cover - defensive: missing optional deps
         diagnostics.append(
             _diagnostic(
                 CLI_IMPORT_ERROR,
-                f"Failed to load compile log dependencies: {exc}",
+                f"Failed to load pipeline dependencies: {exc}",
             )
         )
         _emit_diagnostics(diagnostics)
         raise click.exceptions.Exit(1)
 
+    for message in validate_view_binding_options(
+        view_config_path=view_config_path,
+        view_profile=view_profile,
+    ):
+        diagnostics.append(_diagnostic(CLI_SCHEMA_ERROR, message))
+    entry_files = _expand_build_entries(entries, diagnostics)
+    if _has_error_diagnostics(diagnostics):
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+
+    rc_settings: dict[Optional[Path], Any] = {}
+    backend_configs: dict[Optional[Path], Any] = {}
+    backend_diagnostics: dict[Optional[Path], list[Diagnostic]] = {}
+    build_entries: list[_BuildEntry] = []
+    outputs: dict[Path, Path] = {}
+    for entry_file in entry_files:
+        # Discovery depends only on the entry directory.
+        rc_key = None if config_path is not None else entry_file.parent
+        if rc_key not in rc_settings:
+            rc_settings[rc_key] = _load_rc_settings(entry_file, config_path, lib_roots)
+        settings, rc_diags = rc_settings[rc_key]
+        if settings is None:
+            build_entries.append(
+                _BuildEntry(run=None, lib_roots=(), diagnostics=tuple(rc_diags))
+            )
+            continue
+        entry_lib_roots, backend_config_path, environment = settings
+        if backend_config_path is None and environment.get("ASDL_BACKEND_CONFIG"):
+            # Entries may see different environments; key configs by file.
+            backend_config_path = Path(environment.variables["ASDL_BACKEND_CONFIG"])
+        if backend_config_path not in backend_configs:
+            backend_config, backend_diags = load_backend(
+                backend, backend_config_path=backend_config_path
+            )
+            backend_configs[backend_config_path] = backend_config
+            backend_diagnostics[backend_config_path] = backend_diags
+        backend_config = backend_configs[backend_config_path]
+        if backend_config is None:
+            build_entries.append(
+                _BuildEntry(
+                    run=None,
+                    lib_roots=(),
+                    diagnostics=tuple(backend_diagnostics[backend_config_path]),
+                )
+            )
+            continue
+
+        target_dir = output_dir if output_dir is not None else entry_file.parent
+        output_path = target_dir / f"{entry_file.stem}{backend_config.extension}"
+        compile_log_path = target_dir / f"{entry_file.stem}.log.json"
+        for path in (output_path, compile_log_path):
+            previous = outputs.setdefault(path, entry_file)
+            if previous != entry_file:
+                diagnostics.append(
+                    _diagnostic(
+                        CLI_SCHEMA_ERROR,
+                        (
+                            f"Entries '{previous}' and '{entry_file}' both write "
+                            f"'{path}'; use distinct file names or build them "
+                            "separately."
+                        ),
+                    )
+                )
+        build_entries.append(
+            _BuildEntry(
+                run=_NetlistRun(
+                    input_file=entry_file,
+                    output_path=output_path,
+                    compile_log_path=compile_log_path,
+                    backend=backend,
+                    backend_config_path=backend_config_path,
+                    top_as_subckt=top_as_subckt,
+                    fold_parallel=fold_parallel,
+                    split=split,
+                    view_config_path=view_config_path,
+                ),
+                lib_roots=tuple(entry_lib_roots),
+                diagnostics=(),
+                environment=environment,
+            )
+        )
+    if _has_error_diagnostics(diagnostics):
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+
+    if output_dir is not None:
+        try:
+            output_dir.mkdir(parents=True, exist_ok=True)
+        except OSError as exc:
+            diagnostics.append(
+                _diagnostic(
+                    CLI_WRITE_ERROR,
+                    f"Failed to create output directory '{output_dir}': {exc}",
+                )
+            )
+            _emit_diagnostics(diagnostics)
+            raise click.exceptions.Exit(1)
+
+    batch = _BuildBatch(
+        verify=verify,
+        view_profile=view_profile,
+        backend_configs={
+            path: config
+            for path, config in backend_configs.items()
+            if config is not None
+        },
+        document_cache=None if low_memory else DocumentCache(),
+        low_memory=low_memory,
+    )
+    _record_trace(trace_path)
+    if jobs > 1 and len(build_entries) > 1 and trace_path is None:
+        from concurrent.futures import ProcessPoolExecutor
+
+        # Each worker keeps its own document cache for every entry it builds.
+        with ProcessPoolExecutor(
+            max_workers=min(jobs, len(build_entries)),
+            initializer=_init_build_worker,
+            initargs=(batch,),
+        ) as executor:
+            results = list(executor.map(_run_build_worker, build_entries))
+    else:
+        results = [batch.run_entry(build_entry) for build_entry in build_entries]
+
+    summary_entries: list[dict[str, Any]] = []
+    for entry_file, build_entry, (succeeded, entry_diags, entry_stats) in zip(
+        entry_files, build_entries, results
+    ):
+        diagnostics.extend(entry_diags)
+        if timings:
+            _echo_timings(entry_stats, str(entry_file))
+        run = build_entry.run
+        summary_entries.append(
+            {
+                "entry": str(entry_file),
+                "status": "ok" if succeeded else "failed",
+                "netlist": str(run.output_path) if succeeded and run else None,
+                "compile_log": (
+                    str(run.compile_log_path) if succeeded and run else None
+                ),
+                "errors": sum(
+                    1
+                    for diagnostic in entry_diags
+                    if diagnostic.severity in (Severity.ERROR, Severity.FATAL)
+                ),
+                "warnings": sum(
+                    1
+                    for diagnostic in entry_diags
+                    if diagnostic.severity is Severity.WARNING
+                ),
+            }
+        )
+        click.echo(
+            f"{'ok' if succeeded else 'failed'}: {entry_file}"
+            + (f" -> {run.output_path}" if succeeded and run else "")
+        )
+    failed = sum(1 for item in summary_entries if item["status"] != "ok")
+    click.echo(f"{len(summary_entries) - failed} of {len(summary_entries)} entries built.")
+
+    if summary_path is not None:
+        summary = {
+            "schema_version": 1,
+            "backend": backend,
+            "entries": summary_entries,
+            "succeeded": len(summary_entries) - failed,
+            "failed": failed,
+        }
+        try:
+            summary_path.write_text(
+                json.dumps(summary, sort_keys=True, indent=2) + "\n",
+                encoding="utf-8",
+            )
+        except OSError as exc:
+            diagnostics.append(
+                _diagnostic(
+                    CLI_WRITE_ERROR,
+                    f"Failed to write build summary to '{summary_path}': {exc}",
+                )
+            )
+    _emit_diagnostics(diagnostics)
+    if failed or _has_error_diagnostics(diagnostics):
+        raise click.exceptions.Exit(1)
+
+
+def _expand_build_entries(
+    patterns: Iterable[str], diagnostics: List[Diagnostic]
+) -> list[Path]:
+    """Expand build entry arguments into distinct entry files.
+
+    Arguments containing glob characters are expanded in sorted order; other
+    arguments are kept as given so missing files surface as parse diagnostics.
+
+    Args:
+        patterns: Entry file paths or glob patterns, in CLI order.
+        diagnostics: Diagnostics list to append unmatched patterns.
+
+    Returns:
+        Entry files in argument order, without duplicates.
+    """
+    entry_files: list[Path] = []
+    seen: set[Path] = set()
+    for pattern in patterns:
+        if glob.has_magic(pattern):
+            matches = [
+                Path(match)
+                for match in sorted(glob.glob(pattern, recursive=True))
+                if os.path.isfile(match)
+            ]
+            if not matches:
+                diagnostics.append(
+                    _diagnostic(
+                        CLI_SCHEMA_ERROR,
+                        f"No entry files match '{pattern}'.",
+                    )
+                )
+        else:
+            matches = [Path(pattern)]
+        for match in matches:
+            key = match.absolute()
+            if key in seen:
+                continue
+            seen.add(key)
+            entry_files.append(match)
+    return entry_files
+
+
+@dataclass(frozen=True)
+class _BuildEntry:
+    """One build entry; `run` is None when its setup already failed."""
+
+    run: Optional[_NetlistRun]
+    lib_roots: tuple[Path, ...]
+    diagnostics: tuple[Diagnostic, ...]
+    environment: Optional[CompileEnvironment] = None
+
+
+@dataclass(frozen=True)
+class _BuildBatch:
+    """State shared by every entry compiled in one build worker."""
+
+    verify: bool
+    view_profile: Optional[str]
+    backend_configs: dict[Optional[Path], Any]
+    document_cache: Any
+    low_memory: bool = False
+
+    def run_entry(
+        self, entry: _BuildEntry
+    ) -> tuple[bool, list[Diagnostic], CompileStats]:
+        """Compile, emit and write one entry's netlist and compile log."""
+        from asdl.lowering import run_netlist_ir_pipeline
+
+        diagnostics = list(entry.diagnostics)
+        stats = CompileStats()
+        if entry.run is None:
+            return False, diagnostics, stats
+        environment = entry.environment or active_compile_environment()
+        with compile_environment_scope(environment), compile_stats_scope(stats):
+            design, pipeline_diags = run_netlist_ir_pipeline(
+                entry_file=entry.run.input_file,
+                lib_roots=entry.lib_roots,
+                verify=self.verify,
+                document_cache=self.document_cache,
+                low_memory=self.low_memory,
+            )
+        diagnostics.extend(pipeline_diags)
+        if design is None or _has_error_diagnostics(diagnostics):
+            return False, diagnostics, stats
+        with compile_environment_scope(environment):
+            succeeded, variant_diags, stats = _build_netlist_variant(
+                design,
+                entry.run,
+                view_profile=self.view_profile,
+                base_diagnostics=list(diagnostics),
+                backend_config=self.backend_configs[entry.run.backend_config_path],
+                stats=stats,
+            )
+        return succeeded, diagnostics + variant_diags, stats
+
+
+_BUILD_WORKER_STATE: Optional[_BuildBatch] = None
+
+
+def _init_build_worker(batch: _BuildBatch) -> None:
+    """Install shared build state in an entry worker process."""
+    global _BUILD_WORKER_STATE
+    _BUILD_WORKER_STATE = batch
+
+
+def _run_build_worker(
+    entry: _BuildEntry,
+) -> tuple[bool, list[Diagnostic], CompileStats]:
+    """Build one entry using the worker's shared build state."""
+    assert _BUILD_WORKER_STATE is not None
+    return _BUILD_WORKER_STATE.run_entry(entry)
+
+
+def _build_netlist_variant(
+    design: Any,
+    run: _NetlistRun,
+    *,
+    view_profile: Optional[str],
+    base_diagnostics: list[Diagnostic],
+    prepared: Optional[PreparedViewBindings] = None,
+    backend_config: Any = None,
+    output_tag: Optional[str] = None,
+    stats: Optional[CompileStats] = None,
+    memory: Any = None,
+) -> tuple[bool, list[Diagnostic], CompileStats]:
+    """Resolve views, emit and write one netlist plus its compile log.
+
+    Args:
+        design: Authored pipeline output design.
+        run: Command-level netlist options.
+        view_profile: Optional view profile to resolve and apply.
+        base_diagnostics: Diagnostics gathered before this variant; included in
+            the compile log but not returned.
+        prepared: Optional shared view config and indexes for ``design``.
+        backend_config: Optional preloaded backend config.
+        output_tag: Optional tag inserted into default and explicit output and
+            compile-log file names (``<stem>.<tag><suffix>``).
+        stats: Optional pipeline timings and counters; copied, extended with
+            this variant's stages and recorded in the compile log.
+        memory: Optional recording `asdl.memory_report.MemoryReport`; its
+            report so far is recorded in the compile log.
+
+    Returns:
+        Tuple ``(succeeded, diagnostics, stats)`` with diagnostics produced by
+        this variant only and the variant's timings and counters.
+    """
+    from asdl.emit.netlist import (
+        build_emission_name_map,
+        build_emission_plan,
+        emit_netlist,
+        emit_netlist_split,
+        fold_parallel_devices,
+        load_backend,
+    )
+
+    diagnostics: list[Diagnostic] = []
+    stats = stats.copy() if stats is not None else CompileStats()
+    input_file = run.input_file
+    backend = run.backend
+    output_path = run.output_path
+    compile_log_path = run.compile_log_path
+
+    with stats.stage("view_binding"):
+        design, resolved_bindings, view_diags = resolve_and_apply_view_bindings(
+            design=design,
+            view_config_path=run.view_config_path,
+            view_profile=view_profile,
+            diagnostic_builder=_diagnostic,
+            import_error_code=CLI_IMPORT_ERROR,
+            prepared=prepared,
+        )
+    diagnostics.extend(view_diags)
+    if design is None or _has_error_diagnostics(diagnostics):
+        return False, diagnostics, stats
+    event("ir_ready", "memory", ir="bound_netlist_ir", value=design)
+
+    if backend_config is None:
+        with compile_stats_scope(stats):
+            backend_config, backend_diags = load_backend(
+                backend, backend_config_path=run.backend_config_path
+            )
+        diagnostics.extend(backend_diags)
+        if backend_config is None or _has_error_diagnostics(diagnostics):
+            return False, diagnostics, stats
+
+    parallel_folds: tuple[Any, ...] = ()
+    if run.fold_parallel:
+        if backend_config.multiplicity_param is None:
+            diagnostics.append(
+                _diagnostic(
+                    CLI_SCHEMA_ERROR,
+                    (
+                        f"--fold-parallel requires backend '{backend}' to declare "
+                        "multiplicity_param in the backend config."
+                    ),
+                )
+            )
+            return False, diagnostics, stats
+        with stats.stage("parallel_fold"):
+            design, parallel_folds = fold_parallel_devices(
+                design,
+                backend_name=backend,
+                multiplicity_param=backend_config.multiplicity_param,
+            )
+
+    # Computed once for emission and the compile-log name map; planning
+    # diagnostics are reported by emission.
+    with stats.stage("emission"):
+        emission_plan, _ = build_emission_plan(design)
+
+    if output_path is None:
+        output_path = input_file.with_suffix(backend_config.extension)
+    if compile_log_path is None:
+        compile_log_path = input_file.with_name(f"{input_file.stem}.log.json")
+    if output_tag is not None:
+        output_path = _tagged_output_path(output_path, output_tag)
+        compile_log_path = _tagged_output_path(compile_log_path, output_tag)
+
+    split_outputs: list[dict[str, Any]] = []
+    if run.split:
+        include_dir = f"{output_path.stem}.subckts"
+        with compile_stats_scope(stats), stats.stage("emission"):
+            split_netlist, emit_diags = emit_netlist_split(
+                design,
+                include_dir=include_dir,
+                top_as_subckt=run.top_as_subckt,
+                backend_name=backend,
+                backend_config=backend_config,
+                emission_plan=emission_plan,
+            )
+        diagnostics.extend(emit_diags)
+        if split_netlist is None or _has_error_diagnostics(diagnostics):
+            return False, diagnostics, stats
+        event("ir_ready", "memory", ir="netlist_text", value=split_netlist)
+        subckt_dir = output_path.parent / include_dir
+        targets: list[tuple[Path, str, Optional[str], str]] = [
+            (
+                subckt_dir / subckt.file_name,
+                f"{include_dir}/{subckt.file_name}",
+                subckt.symbol,
+                subckt.text,
+            )
+            for subckt in split_netlist.subckts
+        ]
+        targets.append((output_path, output_path.name, None, split_netlist.top))
+        previous_files = _previous_split_files(
+            compile_log_path, include_dir, backend_config.extension
+        )
+        try:
+            with stats.stage("write"):
+                if split_netlist.subckts:
+                    subckt_dir.mkdir(parents=True, exist_ok=True)
+                for target_path, log_path, symbol, text in targets:
+                    digest, written = _write_text_if_changed(target_path, text)
+                    split_outputs.append(
+                        {
+                            "path": log_path,
+                            "module": symbol,
+                            "sha256": digest,
+                            "written": written,
+                        }
+                    )
+                _remove_stale_split_files(
+                    subckt_dir,
+                    previous_files,
+                    {subckt.file_name for subckt in split_netlist.subckts},
+                )
+        except OSError as exc:
+            diagnostics.append(
+                _diagnostic(
+                    CLI_WRITE_ERROR,
+                    f"Failed to write split netlist to '{output_path}': {exc}",
+                )
+            )
+            return False, diagnostics, stats
+    else:
+        with compile_stats_scope(stats), stats.stage("emission"):
+            netlist_text, emit_diags = emit_netlist(
+                design,
+                top_as_subckt=run.top_as_subckt,
+                backend_name=backend,
+                backend_config=backend_config,
+                emission_plan=emission_plan,
+            )
+        diagnostics.extend(emit_diags)
+        if netlist_text is None or _has_error_diagnostics(diagnostics):
+            return False, diagnostics, stats
+        event("ir_ready", "memory", ir="netlist_text", value=netlist_text)
+
+        try:
+            with stats.stage("write"):
+                output_path.write_text(netlist_text, encoding="utf-8")
+        except OSError as exc:
+            diagnostics.append(
+                _diagnostic(
+                    CLI_WRITE_ERROR,
+                    f"Failed to write netlist to '{output_path}': {exc}",
+                )
+            )
+            return False, diagnostics, stats
+
+    try:
+        from asdl.views.api import view_sidecar_to_jsonable
+    except Exception as exc:  # pragma: no cover - defensive: missing optional deps
+        diagnostics.append(
+            _diagnostic(
+                CLI_IMPORT_ERROR,
+                f"Failed to load compile log dependencies: {exc}",
+            )
+        )
+        return False, diagnostics, stats
+
     compile_log_payload = _build_compile_log_payload(
         resolved_bindings=resolved_bindings,
-        emission_name_map=build_emission_name_map(design),
-        diagnostics=diagnostics,
+        emission_name_map=build_emission_name_map(design, emission_plan),
+        parallel_folds=parallel_folds,
+        split_outputs=split_outputs,
+        diagnostics=base_diagnostics + diagnostics,
         view_json_converter=view_sidecar_to_jsonable,
+        stats=stats,
+        memory=memory.to_jsonable() if memory is not None else None,
     )
     compile_log_text = json.dumps(compile_log_payload, sort_keys=True, indent=2) + "\n"
     try:
@@ -833,10 +1969,16 @@ def netlist(
                 f"Failed to write compile log to '{compile_log_path}': {exc}",
             )
         )
-        _emit_diagnostics(diagnostics)
-        raise click.exceptions.Exit(1)
+        return False, diagnostics, stats
 
-    _emit_diagnostics(diagnostics)
+    return True, diagnostics, stats
+
+
+def _tagged_output_path(path: Path, tag: str) -> Path:
+    """Insert a tag before a path's suffix (``.log.json`` counts as one)."""
+    suffix = ".log.json" if path.name.endswith(".log.json") else path.suffix
+    stem = path.name[: len(path.name) - len(suffix)] if suffix else path.name
+    return path.with_name(f"{stem}.{tag}{suffix}")
 
 
 def _build_compile_log_payload(
@@ -845,8 +1987,17 @@ def _build_compile_log_payload(
     emission_name_map: list[Any],
     diagnostics: list[Diagnostic],
     view_json_converter: Any,
+    parallel_folds: tuple[Any, ...] = (),
+    split_outputs: Iterable[dict[str, Any]] = (),
+    stats: Optional[CompileStats] = None,
+    memory: Optional[dict[str, Any]] = None,
 ) -> dict[str, Any]:
-    """Build deterministic compile-log JSON payload for `asdlc netlist`."""
+    """Build the compile-log JSON payload for `asdlc netlist`.
+
+    Every section except `performance` (stage timings and counters) and
+    `memory` (only present with `--memory-report`) is deterministic for
+    identical inputs and options.
+    """
     warnings = [
         diagnostic for diagnostic in diagnostics if diagnostic.severity == Severity.WARNING
     ]
@@ -856,7 +2007,7 @@ def _build_compile_log_payload(
     }
     for diagnostic in diagnostics:
         severity_counts[diagnostic.severity.value] += 1
-    return {
+    payload = {
         "view_bindings": view_json_converter(resolved_bindings or ()),
         "emission_name_map": [
             {
@@ -868,12 +2019,160 @@ def _build_compile_log_payload(
             }
             for entry in emission_name_map
         ],
+        "parallel_folds": [
+            {
+                "module": entry.module,
+                "file_id": entry.file_id,
+                "instance": entry.instance,
+                "ref": entry.ref,
+                "expression_id": entry.expression_id,
+                "members": list(entry.members),
+                "multiplicity": entry.multiplicity,
+            }
+            for entry in parallel_folds
+        ],
+        "split_outputs": [dict(entry) for entry in split_outputs],
         "warning_count": len(warnings),
         "warnings": diagnostics_to_jsonable(warnings),
         "diagnostic_count": len(diagnostics),
         "diagnostic_severity_counts": severity_counts,
         "diagnostics": diagnostics_to_jsonable(diagnostics),
+        "performance": (stats or CompileStats()).to_jsonable(),
     }
+    if memory is not None:
+        payload["memory"] = memory
+    return payload
+
+
+def _write_text_if_changed(path: Path, text: str) -> tuple[str, bool]:
+    """Write text unless the file already has the same content hash.
+
+    Args:
+        path: Destination file path.
+        text: File content to write.
+
+    Returns:
+        Tuple of the content sha256 hex digest and whether the file was written.
+    """
+    data = text.encode("utf-8")
+    digest = hashlib.sha256(data).hexdigest()
+    try:
+        existing = path.read_bytes()
+    except OSError:
+        existing = None
+    if existing is not None and hashlib.sha256(existing).hexdigest() == digest:
+        return digest, False
+    path.write_bytes(data)
+    return digest, True
+
+
+def _previous_split_files(
+    compile_log_path: Path, include_dir: str, extension: str
+) -> set[str]:
+    """Return the subckt file names the previous compile log recorded.
+
+    Args:
+        compile_log_path: Compile log path of the current run.
+        include_dir: Split include directory relative to the top file.
+        extension: Backend file extension.
+
+    Returns:
+        Names of files in `include_dir` listed under `split_outputs` that end
+        with `extension`; empty when the log is missing or unreadable.
+    """
+    try:
+        payload = json.loads(compile_log_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return set()
+    entries = payload.get("split_outputs") if isinstance(payload, dict) else None
+    if not isinstance(entries, list):
+        return set()
+    prefix = f"{include_dir}/"
+    names: set[str] = set()
+    for entry in entries:
+        path = entry.get("path") if isinstance(entry, dict) else None
+        if not isinstance(path, str) or not path.startswith(prefix):
+            continue
+        name = path[len(prefix) :]
+        if (
+            name.endswith(extension)
+            and name not in ("", ".", "..")
+            and "/" not in name
+            and "\\" not in name
+        ):
+            names.add(name)
+    return names
+
+
+def _remove_stale_split_files(
+    subckt_dir: Path, previous: set[str], keep: set[str]
+) -> None:
+    """Delete subckt files an earlier run wrote that this run did not.
+
+    Only names in `previous` are deleted; any other file or subdirectory is
+    left alone. The directory itself is removed once it is empty.
+
+    Args:
+        subckt_dir: The `<output_stem>.subckts` directory.
+        previous: File names the previous run's compile log recorded.
+        keep: File names written by the current run.
+    """
+    if not subckt_dir.is_dir():
+        return
+    for name in previous - keep:
+        path = subckt_dir / name
+        if path.is_symlink() or path.is_file():
+            path.unlink()
+    if not keep and not any(subckt_dir.iterdir()):
+        subckt_dir.rmdir()
+
+
+def _record_trace(trace_path: Optional[Path]) -> None:
+    """Record instrumentation spans until the current command finishes.
+
+    The trace is written when the click context closes, so failing commands
+    still produce one.
+    """
+    if trace_path is None:
+        return
+    from asdl.instrumentation import ChromeTraceRecorder, subscribe, unsubscribe
+
+    recorder = ChromeTraceRecorder()
+    subscribe(recorder)
+
+    def _write_trace() -> None:
+        unsubscribe(recorder)
+        try:
+            recorder.write(trace_path)
+        except OSError as exc:
+            _emit_diagnostics(
+                [
+                    _diagnostic(
+                        CLI_WRITE_ERROR,
+                        f"Failed to write trace to '{trace_path}': {exc}",
+                    )
+                ]
+            )
+
+    click.get_current_context().call_on_close(_write_trace)
+
+
+def _record_memory_report() -> Any:
+    """Start a memory report that stops when the current command finishes."""
+    from asdl.memory_report import MemoryReport
+
+    report = MemoryReport()
+    report.start()
+    click.get_current_context().call_on_close(report.stop)
+    return report
+
+
+def _echo_memory_report(report: Any) -> None:
+    click.echo(report.format_text(), err=True)
+
+
+def _echo_timings(stats: CompileStats, title: str) -> None:
+    click.echo(stats.format_summary(title), err=True)
 
 
 def _emit_diagnostics(diagnostics: Iterable[Diagnostic]) -> None:
@@ -897,6 +2196,9 @@ def _resolve_rc_settings(
 ) -> tuple[list[Path], Optional[Path]]:
     """Resolve rc-derived settings for a CLI entry file.
 
+    The rc environment is installed as the compile environment until the
+    current command finishes.
+
     Args:
         entry_file: Entry file path used for rc discovery.
         config_path: Optional explicit rc path (overrides discovery).
@@ -906,48 +2208,73 @@ def _resolve_rc_settings(
     Returns:
         Tuple of (combined lib roots, backend config path override).
     """
+    settings, rc_diags = _load_rc_settings(entry_file, config_path, cli_lib_roots)
+    diagnostics.extend(rc_diags)
+    if settings is None:
+        _emit_diagnostics(diagnostics)
+        raise click.exceptions.Exit(1)
+    combined_roots, backend_config_path, environment = settings
+    click.get_current_context().with_resource(compile_environment_scope(environment))
+    return combined_roots, backend_config_path
+
+
+def _load_rc_settings(
+    entry_file: Path,
+    config_path: Optional[Path],
+    cli_lib_roots: Iterable[Path],
+) -> tuple[
+    Optional[tuple[list[Path], Optional[Path], CompileEnvironment]], list[Diagnostic]
+]:
+    """Load rc-derived settings, reporting failures as diagnostics.
+
+    Args:
+        entry_file: Entry file path used for rc discovery.
+        config_path: Optional explicit rc path (overrides discovery).
+        cli_lib_roots: Library roots supplied on the CLI (first in precedence).
+
+    Returns:
+        Tuple of ((combined lib roots, backend config path override, compile
+        environment) or None, diagnostics). The environment is the active one
+        with rc `env` entries added for unset variables; `os.environ` is not
+        modified.
+    """
     try:
+        import yaml
+
         from asdl.cli.config import load_asdlrc
     except Exception as exc:  # pragma: no cover - defensive: missing optional deps
-        diagnostics.append(
+        return None, [
             _diagnostic(
                 CLI_IMPORT_ERROR,
                 f"Failed to load .asdlrc support: {exc}",
             )
-        )
-        _emit_diagnostics(diagnostics)
-        raise click.exceptions.Exit(1)
+        ]
 
+    environment = active_compile_environment()
     try:
-        rc_config = load_asdlrc(entry_file, config_path=config_path)
+        rc_config = load_asdlrc(
+            entry_file, config_path=config_path, environ=environment.variables
+        )
     except (FileNotFoundError, TypeError, ValueError, yaml.YAMLError) as exc:
-        diagnostics.append(
+        return None, [
             _diagnostic(
                 CLI_SCHEMA_ERROR,
                 f"Failed to load .asdlrc: {exc}",
             )
-        )
-        _emit_diagnostics(diagnostics)
-        raise click.exceptions.Exit(1)
+        ]
 
     combined_roots = list(cli_lib_roots)
     backend_config_path: Optional[Path] = None
     if rc_config is None:
-        return combined_roots, backend_config_path
+        return (combined_roots, backend_config_path, environment), []
 
-    _merge_rc_env(rc_config.env)
+    environment = environment.with_defaults(rc_config.env)
     combined_roots.extend(rc_config.lib_roots)
 
-    if rc_config.backend_config and os.environ.get("ASDL_BACKEND_CONFIG") is None:
+    if rc_config.backend_config and environment.get("ASDL_BACKEND_CONFIG") is None:
         backend_config_path = rc_config.backend_config
 
-    return combined_roots, backend_config_path
-
-
-def _merge_rc_env(env: dict[str, str]) -> None:
-    """Merge rc env entries into os.environ without overriding existing keys."""
-    for key, value in env.items():
-        os.environ.setdefault(key, value)
+    return (combined_roots, backend_config_path, environment), []
 
 
 def _diagnostic(code: str, message: str) -> Diagnostic:
@@ -8,8 +8,6 @@ import re
 from pathlib import Path
 from typing import Mapping, Optional
 
-import yaml
-
 ASDLRC_FILENAME = ".asdlrc"
 ASDLRC_SCHEMA_VERSION = 1
 _TOKEN_PATTERN = re.compile(r"\$\{([^}]+)\}")
@@ -45,13 +43,18 @@ def discover_asdlrc(entry_file: Path) -> Optional[Path]:
 
 
 def load_asdlrc(
-    entry_file: Path, *, config_path: Optional[Path] = None
+    entry_file: Path,
+    *,
+    config_path: Optional[Path] = None,
+    environ: Optional[Mapping[str, str]] = None,
 ) -> Optional[AsdlrcConfig]:
     """Load an .asdlrc discovered from an entry file or explicit path.
 
     Args:
         entry_file: Entry file to anchor discovery when config_path is None.
         config_path: Optional explicit rc path (overrides discovery).
+        environ: Optional environment mapping for interpolation (defaults to
+            os.environ).
 
     Returns:
         Parsed AsdlrcConfig or None when no rc file is found.
@@ -62,7 +65,7 @@ def load_asdlrc(
         rc_path = discover_asdlrc(entry_file)
     if rc_path is None:
         return None
-    return parse_asdlrc(rc_path)
+    return parse_asdlrc(rc_path, environ=environ)
 
 
 def parse_asdlrc(
@@ -84,6 +87,8 @@ def parse_asdlrc(
         ValueError: If the schema_version is missing or unsupported.
         yaml.YAMLError: If YAML parsing fails.
     """
+    import yaml
+
     rc_path = Path(rc_path)
     if not rc_path.exists():
         raise FileNotFoundError(f".asdlrc not found: {rc_path}")
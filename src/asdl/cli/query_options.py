@@ -0,0 +1,120 @@
+"""Lightweight `asdlc query` option definitions.
+
+Kept separate from `asdl.cli.query_runtime` so that registering the query
+subcommands does not import the lowering, view and emission stack.
+"""
+
+from __future__ import annotations
+
+from enum import Enum
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import click
+
+from asdl.cli.runtime_common import validate_view_binding_options
+
+
+class QueryStage(str, Enum):
+    """Supported `asdlc query` pipeline stages."""
+
+    AUTHORED = "authored"
+    RESOLVED = "resolved"
+    EMITTED = "emitted"
+
+
+def query_common_options(func: Callable[..., Any]) -> Callable[..., Any]:
+    """Attach shared query options to a Click subcommand callback.
+
+    Args:
+        func: Query subcommand callback.
+
+    Returns:
+        Callback decorated with shared query options.
+    """
+
+    decorators = [
+        click.argument("input_file", type=click.Path(dir_okay=False, path_type=Path)),
+        click.option(
+            "--config",
+            "config_path",
+            type=click.Path(dir_okay=False, path_type=Path),
+            help="Explicit .asdlrc path (overrides discovery).",
+        ),
+        click.option(
+            "--lib",
+            "lib_roots",
+            multiple=True,
+            type=click.Path(file_okay=False, path_type=Path),
+            help="Library search root (repeatable).",
+        ),
+        click.option(
+            "--view-config",
+            "view_config_path",
+            type=click.Path(dir_okay=False, path_type=Path),
+            help="View-binding config YAML path.",
+        ),
+        click.option(
+            "--view-profile",
+            "view_profile",
+            type=str,
+            help="View-binding profile name from --view-config.",
+        ),
+        click.option(
+            "--top",
+            "top_name",
+            type=str,
+            help="Optional top-module override.",
+        ),
+        click.option(
+            "--stage",
+            "stage",
+            type=click.Choice([item.value for item in QueryStage], case_sensitive=True),
+            default=QueryStage.RESOLVED.value,
+            show_default=True,
+            help="Query stage to inspect.",
+        ),
+        click.option(
+            "--verify/--no-verify",
+            "verify",
+            default=True,
+            show_default=True,
+            help=(
+                "Enable IR verification passes; structure-only queries may "
+                "skip them."
+            ),
+        ),
+        click.option(
+            "--json",
+            "json_output",
+            is_flag=True,
+            default=False,
+            help="Emit machine-readable JSON payload.",
+        ),
+    ]
+    wrapped = func
+    for decorator in reversed(decorators):
+        wrapped = decorator(wrapped)
+    return wrapped
+
+
+def validate_query_common_options(
+    *, view_config_path: Optional[Path], view_profile: Optional[str]
+) -> list[str]:
+    """Validate shared query option dependencies.
+
+    Args:
+        view_config_path: Optional path supplied to `--view-config`.
+        view_profile: Optional profile supplied to `--view-profile`.
+
+    Returns:
+        Error messages for invalid option combinations.
+    """
+
+    return validate_view_binding_options(
+        view_config_path=view_config_path,
+        view_profile=view_profile,
+    )
+
+
+__all__ = ["QueryStage", "query_common_options", "validate_query_common_options"]
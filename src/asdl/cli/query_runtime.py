@@ -4,36 +4,47 @@ from __future__ import annotations
 
 import json
 from dataclasses import dataclass
-from enum import Enum
+from itertools import islice
 from pathlib import Path
-from typing import Any, Callable, Iterable, Optional
-
-import click
-
-from asdl.core.hierarchy import resolve_top_module, traverse_hierarchy
-from asdl.cli.runtime_common import (
-    resolve_and_apply_view_bindings,
-    validate_view_binding_options,
+from typing import Any, Iterable, Iterator, Optional
+
+from asdl.core.hierarchy import (
+    HierarchyEntry,
+    HierarchyRollup,
+    iter_hierarchy,
+    resolve_top_module,
+    rollup_hierarchy,
+)
+from asdl.core.net_trace import (
+    NetConnectivityIndex,
+    NetTraceEquivalent,
+    NetTraceOccurrence,
+    TraceDirection,
+    iter_module_occurrences,
 )
+from asdl.core.symbol_resolution import index_symbols, select_symbol
+from asdl.cli.query_options import (
+    QueryStage,
+    query_common_options,
+    validate_query_common_options,
+)
+from asdl.cli.runtime_common import resolve_and_apply_view_bindings
 from asdl.diagnostics import Diagnostic, Severity, format_code
-from asdl.emit.netlist.render import EmissionNameMapEntry, build_emission_name_map
-from asdl.emit.netlist_ir import NetlistDesign
+from asdl.emit.netlist.render import (
+    EmissionNameMapEntry,
+    EmissionPlan,
+    build_emission_name_map,
+    build_emission_plan,
+)
+from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
 from asdl.lowering import run_netlist_ir_pipeline
-from asdl.views.instance_index import build_instance_index
-from asdl.views.pathing import join_hierarchy_path
+from asdl.views.pathing import is_path_within_scope, join_hierarchy_path
+from asdl.views.session import ViewBindingSession
 
 QUERY_RUNTIME_ERROR = format_code("TOOL", 4)
 QUERY_JSON_SCHEMA_VERSION = 1
 
 
-class QueryStage(str, Enum):
-    """Supported `asdlc query` pipeline stages."""
-
-    AUTHORED = "authored"
-    RESOLVED = "resolved"
-    EMITTED = "emitted"
-
-
 @dataclass(frozen=True)
 class QueryRuntime:
     """Shared runtime payload for query subcommands.
@@ -44,6 +55,9 @@ class QueryRuntime:
         resolved_design: View-resolved design (or authored when no view config).
         stage_design: Stage-specific design selected for the query.
         resolved_bindings: Optional view-binding sidecar entries.
+        emission_plan: Emission plan for `stage_design` (emitted stage only).
+        view_session: View-binding session for `authored_design`, shared by
+            view resolution, application and binding queries.
     """
 
     stage: QueryStage
@@ -51,6 +65,8 @@ class QueryRuntime:
     resolved_design: NetlistDesign
     stage_design: NetlistDesign
     resolved_bindings: tuple[Any, ...]
+    emission_plan: Optional[EmissionPlan] = None
+    view_session: Optional[ViewBindingSession] = None
 
 
 @dataclass(frozen=True)
@@ -77,90 +93,6 @@ class QueryBindingsEntry:
     rule_id: Optional[str]
 
 
-def query_common_options(func: Callable[..., Any]) -> Callable[..., Any]:
-    """Attach shared query options to a Click subcommand callback.
-
-    Args:
-        func: Query subcommand callback.
-
-    Returns:
-        Callback decorated with shared query options.
-    """
-
-    decorators = [
-        click.argument("input_file", type=click.Path(dir_okay=False, path_type=Path)),
-        click.option(
-            "--config",
-            "config_path",
-            type=click.Path(dir_okay=False, path_type=Path),
-            help="Explicit .asdlrc path (overrides discovery).",
-        ),
-        click.option(
-            "--lib",
-            "lib_roots",
-            multiple=True,
-            type=click.Path(file_okay=False, path_type=Path),
-            help="Library search root (repeatable).",
-        ),
-        click.option(
-            "--view-config",
-            "view_config_path",
-            type=click.Path(dir_okay=False, path_type=Path),
-            help="View-binding config YAML path.",
-        ),
-        click.option(
-            "--view-profile",
-            "view_profile",
-            type=str,
-            help="View-binding profile name from --view-config.",
-        ),
-        click.option(
-            "--top",
-            "top_name",
-            type=str,
-            help="Optional top-module override.",
-        ),
-        click.option(
-            "--stage",
-            "stage",
-            type=click.Choice([item.value for item in QueryStage], case_sensitive=True),
-            default=QueryStage.RESOLVED.value,
-            show_default=True,
-            help="Query stage to inspect.",
-        ),
-        click.option(
-            "--json",
-            "json_output",
-            is_flag=True,
-            default=False,
-            help="Emit machine-readable JSON payload.",
-        ),
-    ]
-    wrapped = func
-    for decorator in reversed(decorators):
-        wrapped = decorator(wrapped)
-    return wrapped
-
-
-def validate_query_common_options(
-    *, view_config_path: Optional[Path], view_profile: Optional[str]
-) -> list[str]:
-    """Validate shared query option dependencies.
-
-    Args:
-        view_config_path: Optional path supplied to `--view-config`.
-        view_profile: Optional profile supplied to `--view-profile`.
-
-    Returns:
-        Error messages for invalid option combinations.
-    """
-
-    return validate_view_binding_options(
-        view_config_path=view_config_path,
-        view_profile=view_profile,
-    )
-
-
 def build_query_runtime(
     *,
     entry_file: Path,
@@ -184,6 +116,12 @@ def build_query_runtime(
 
     Returns:
         Tuple of `(runtime, diagnostics)` where runtime is None on failure.
+
+    Notes:
+        Work stops at the requested stage: `authored` returns right after
+        NetlistIR construction without loading the view config (the resolved
+        design aliases the authored design and no bindings are recorded), and
+        only `emitted` builds an emission plan.
     """
 
     diagnostics: list[Diagnostic] = []
@@ -197,20 +135,36 @@ def build_query_runtime(
     if authored_design is None or _has_error_diagnostics(diagnostics):
         return None, diagnostics
 
+    view_session = ViewBindingSession(authored_design)
+    if stage == QueryStage.AUTHORED:
+        return (
+            QueryRuntime(
+                stage=stage,
+                authored_design=authored_design,
+                resolved_design=authored_design,
+                stage_design=authored_design,
+                resolved_bindings=(),
+                view_session=view_session,
+            ),
+            diagnostics,
+        )
+
     resolved_design, resolved_bindings, view_diags = resolve_and_apply_view_bindings(
         design=authored_design,
         view_config_path=view_config_path,
         view_profile=view_profile,
         diagnostic_builder=lambda code, message: _diagnostic(message, code=code),
         import_error_code=QUERY_RUNTIME_ERROR,
+        session=view_session,
     )
     diagnostics.extend(view_diags)
     if resolved_design is None:
         return None, diagnostics
 
-    stage_design = authored_design
-    if stage in (QueryStage.RESOLVED, QueryStage.EMITTED):
-        stage_design = resolved_design
+    stage_design = resolved_design
+    emission_plan = None
+    if stage == QueryStage.EMITTED:
+        emission_plan, _ = build_emission_plan(stage_design)
 
     return (
         QueryRuntime(
@@ -219,6 +173,8 @@ def build_query_runtime(
             resolved_design=resolved_design,
             stage_design=stage_design,
             resolved_bindings=resolved_bindings,
+            emission_plan=emission_plan,
+            view_session=view_session,
         ),
         diagnostics,
     )
@@ -243,6 +199,20 @@ def render_query_json(*, kind: str, payload: Any, compact: bool = True) -> str:
     return json.dumps(envelope, sort_keys=True, indent=2)
 
 
+def iter_query_ndjson(rows: Iterable[Any]) -> Iterator[str]:
+    """Render query rows as newline-delimited JSON, one compact object per line.
+
+    Args:
+        rows: JSON-ready row objects, consumed lazily.
+
+    Yields:
+        Serialized rows with deterministic key ordering and a trailing newline.
+    """
+
+    for row in rows:
+        yield json.dumps(row, sort_keys=True, separators=(",", ":")) + "\n"
+
+
 def query_exit_code(
     diagnostics: Iterable[Diagnostic], *, missing_anchor: bool = False
 ) -> int:
@@ -280,49 +250,47 @@ def finalize_query_output(
     return exit_code, str(payload)
 
 
-def build_query_tree_payload(runtime: QueryRuntime) -> dict[str, Any]:
-    """Build deterministic `query.tree` nested payload for one runtime.
+def iter_query_tree_rows(runtime: QueryRuntime) -> Iterator[dict[str, Any]]:
+    """Yield flat `query.tree` rows in deterministic DFS preorder.
+
+    Rows are produced as the authored hierarchy is traversed; resolved refs
+    are looked up by walking the resolved design alongside it, so memory is
+    bounded by hierarchy depth and module count rather than occurrence count.
 
     Args:
         runtime: Query runtime with authored/resolved designs.
 
-    Returns:
-        Root tree node encoded as a JSON-ready dictionary.
+    Yields:
+        Root row followed by one row per authored hierarchy entry, each with
+        the verbose tree-node fields except `children`.
     """
 
     authored_top = resolve_top_module(runtime.authored_design)
     if authored_top is None:
-        return {}
+        return
 
-    authored_entries = traverse_hierarchy(
-        runtime.authored_design,
-        include_devices=True,
-        order="dfs-pre",
+    resolves_refs = runtime.stage in (QueryStage.RESOLVED, QueryStage.EMITTED)
+    resolved_top = (
+        resolve_top_module(runtime.resolved_design) if resolves_refs else None
     )
-
-    resolved_top = resolve_top_module(runtime.resolved_design)
-    resolved_entries = (
-        traverse_hierarchy(runtime.resolved_design, include_devices=True, order="dfs-pre")
+    emission_lookup = (
+        _build_emission_lookup(runtime) if runtime.stage == QueryStage.EMITTED else None
+    )
+    resolved_walk = (
+        _ResolvedHierarchyWalk(runtime.resolved_design, resolved_top)
         if resolved_top is not None
-        else []
+        else None
     )
-    resolved_by_path = {entry.path: entry for entry in resolved_entries}
-
-    emission_lookup = _build_emission_lookup(runtime) if runtime.stage == QueryStage.EMITTED else None
 
-    entries: list[QueryTreeEntry] = []
-    top_resolved_ref = (
-        resolved_top.name if runtime.stage in (QueryStage.RESOLVED, QueryStage.EMITTED) and resolved_top else None
-    )
+    top_resolved_ref = resolved_top.name if resolved_top is not None else None
     top_emitted_name = None
     if emission_lookup is not None and top_resolved_ref is not None:
-        top_file_id = resolved_top.file_id if resolved_top is not None else authored_top.file_id
         top_emitted_name = _lookup_emitted_name(
             top_resolved_ref,
-            top_file_id,
+            resolved_top.file_id,
             emission_lookup,
         )
-    entries.append(
+    yield _query_tree_row(
         QueryTreeEntry(
             path=authored_top.name,
             parent_path=None,
@@ -334,28 +302,35 @@ def build_query_tree_payload(runtime: QueryRuntime) -> dict[str, Any]:
         )
     )
 
-    for authored_entry in authored_entries:
-        full_path = authored_entry.path
-        resolved_entry = resolved_by_path.get(full_path)
+    for authored_entry in iter_hierarchy(
+        runtime.authored_design,
+        include_devices=True,
+        order="dfs-pre",
+    ):
+        resolved_instance = (
+            resolved_walk.visit(authored_entry) if resolved_walk is not None else None
+        )
         resolved_ref: Optional[str] = None
-        if runtime.stage in (QueryStage.RESOLVED, QueryStage.EMITTED):
+        if resolves_refs:
             resolved_ref = (
-                resolved_entry.ref if resolved_entry is not None else authored_entry.ref
+                resolved_instance.ref
+                if resolved_instance is not None
+                else authored_entry.ref
             )
 
         emitted_name: Optional[str] = None
         if emission_lookup is not None and resolved_ref is not None:
             emitted_name = _lookup_emitted_name(
                 resolved_ref,
-                resolved_entry.ref_file_id
-                if resolved_entry is not None
+                resolved_instance.ref_file_id
+                if resolved_instance is not None
                 else authored_entry.ref_file_id,
                 emission_lookup,
             )
 
-        entries.append(
+        yield _query_tree_row(
             QueryTreeEntry(
-                path=full_path,
+                path=authored_entry.path,
                 parent_path=authored_entry.parent_path,
                 instance=authored_entry.instance,
                 authored_ref=authored_entry.ref,
@@ -365,28 +340,29 @@ def build_query_tree_payload(runtime: QueryRuntime) -> dict[str, Any]:
             )
         )
 
-    nodes_by_path: dict[str, dict[str, Any]] = {}
-    for entry in entries:
-        nodes_by_path[entry.path] = {
-            "path": entry.path,
-            "parent_path": entry.parent_path,
-            "instance": entry.instance,
-            "authored_ref": entry.authored_ref,
-            "resolved_ref": entry.resolved_ref,
-            "emitted_name": entry.emitted_name,
-            "depth": entry.depth,
-            "children": {},
-        }
 
-    for entry in entries:
-        if entry.parent_path is None or entry.instance is None:
+def build_query_tree_payload(runtime: QueryRuntime) -> dict[str, Any]:
+    """Build deterministic `query.tree` nested payload for one runtime.
+
+    Args:
+        runtime: Query runtime with authored/resolved designs.
+
+    Returns:
+        Root tree node encoded as a JSON-ready dictionary.
+    """
+
+    root: dict[str, Any] = {}
+    nodes_by_path: dict[str, dict[str, Any]] = {}
+    for row in iter_query_tree_rows(runtime):
+        node = {**row, "children": {}}
+        nodes_by_path[row["path"]] = node
+        if row["parent_path"] is None or row["instance"] is None:
+            root = node
             continue
-        parent_node = nodes_by_path.get(entry.parent_path)
-        child_node = nodes_by_path[entry.path]
+        parent_node = nodes_by_path.get(row["parent_path"])
         if parent_node is not None:
-            parent_node["children"][entry.instance] = child_node
-
-    return nodes_by_path.get(authored_top.name, {})
+            parent_node["children"][row["instance"]] = node
+    return root
 
 
 def build_query_tree_compact_payload(runtime: QueryRuntime) -> dict[str, Any]:
@@ -408,35 +384,282 @@ def build_query_bindings_payload(runtime: QueryRuntime) -> list[dict[str, Any]]:
         Ordered list of binding rows sorted by `(path, instance)`.
     """
 
-    authored_index = build_instance_index(runtime.authored_design)
-    authored_by_path = {entry.full_path: entry.ref for entry in authored_index.entries}
+    return list(iter_query_bindings_rows(runtime))
+
+
+def iter_query_bindings_rows(runtime: QueryRuntime) -> Iterator[dict[str, Any]]:
+    """Yield `query.bindings` rows sorted by `(path, instance)`.
+
+    Args:
+        runtime: Query runtime with authored design and resolved bindings.
+
+    Yields:
+        One JSON-ready binding row per resolved instance occurrence.
+    """
+
+    session = ViewBindingSession.for_design(runtime.authored_design, runtime.view_session)
+    authored_by_path = session.entries_by_path
 
-    rows: list[QueryBindingsEntry] = []
     for binding in sorted(
         runtime.resolved_bindings,
         key=lambda entry: (entry.path, entry.instance),
     ):
         full_path = join_hierarchy_path(binding.path, binding.instance)
-        rows.append(
-            QueryBindingsEntry(
-                path=binding.path,
-                instance=binding.instance,
-                authored_ref=authored_by_path.get(full_path, binding.resolved),
-                resolved=binding.resolved,
-                rule_id=binding.rule_id,
-            )
+        entry = QueryBindingsEntry(
+            path=binding.path,
+            instance=binding.instance,
+            authored_ref=(
+                authored_by_path[full_path].ref
+                if full_path in authored_by_path
+                else binding.resolved
+            ),
+            resolved=binding.resolved,
+            rule_id=binding.rule_id,
         )
-
-    return [
-        {
+        yield {
             "path": entry.path,
             "instance": entry.instance,
             "authored_ref": entry.authored_ref,
             "resolved": entry.resolved,
             "rule_id": entry.rule_id,
         }
-        for entry in rows
+
+
+def build_query_stats_payload(runtime: QueryRuntime) -> dict[str, Any]:
+    """Build deterministic `query.stats` hierarchy roll-up payload.
+
+    Totals are computed by memoized roll-up over module definitions, so the
+    cost does not grow with the flattened occurrence count.
+
+    Args:
+        runtime: Query runtime with a stage-selected design.
+
+    Returns:
+        Top-level totals plus per-module subtree totals, or an empty mapping
+        when no top module resolves.
+    """
+
+    stats = rollup_hierarchy(runtime.stage_design)
+    if stats.top is None:
+        return {}
+
+    subtrees = [
+        {
+            "module": name,
+            "file_id": file_id,
+            "occurrences": stats.occurrences.get((file_id, name), 0),
+            **_rollup_payload(rollup),
+        }
+        for (file_id, name), rollup in stats.subtrees.items()
     ]
+    subtrees.sort(key=lambda row: (row["module"], row["file_id"] or ""))
+    return {
+        "top": stats.top.name,
+        **_rollup_payload(stats.total),
+        "subtrees": subtrees,
+    }
+
+
+def build_query_net_trace_payload(
+    runtime: QueryRuntime,
+    *,
+    net: str,
+    module: Optional[str] = None,
+    path: Optional[str] = None,
+    direction: TraceDirection = "both",
+    order: str = "dfs-pre",
+) -> tuple[Optional[dict[str, Any]], list[Diagnostic]]:
+    """Build deterministic `query.net_trace` payload for one net anchor.
+
+    Connectivity is summarized once per module definition and only the
+    occurrences on the traced net are expanded.
+
+    Args:
+        runtime: Query runtime with a stage-selected design.
+        net: Net name inside the anchor module.
+        module: Anchor module symbol; required when `path` is omitted.
+        path: Optional module occurrence path selecting the anchor.
+        direction: `up`, `down` or `both`.
+        order: `dfs-pre` or `dfs-post` ordering of equivalents.
+
+    Returns:
+        Tuple `(payload, diagnostics)`; payload is None when the anchor does
+        not resolve.
+    """
+
+    connectivity = NetConnectivityIndex(runtime.stage_design)
+    anchor: Optional[NetTraceOccurrence] = None
+    chain: Optional[list[NetTraceOccurrence]] = None
+    if path is not None:
+        chain = connectivity.resolve_occurrences(path)
+        if chain is None:
+            return None, [_diagnostic(f"Module occurrence path '{path}' not found.")]
+        anchor = chain[-1]
+        if module is not None and anchor.ref != module:
+            return None, [
+                _diagnostic(
+                    f"Module occurrence '{path}' references '{anchor.ref}', "
+                    f"not '{module}'."
+                )
+            ]
+    elif module is not None:
+        matches = list(islice(iter_module_occurrences(connectivity, module), 2))
+        if not matches:
+            return None, [_diagnostic(f"Module '{module}' has no occurrence.")]
+        if len(matches) > 1:
+            return None, [
+                _diagnostic(
+                    f"Module '{module}' has multiple occurrences; "
+                    "use --path to select one."
+                )
+            ]
+        anchor = matches[0]
+        chain = connectivity.resolve_occurrences(anchor.path)
+    if anchor is None or chain is None:
+        return None, [_diagnostic("net-trace requires --module or --path.")]
+
+    traced = connectivity.trace(chain, net, direction=direction)
+    if traced is None:
+        return None, [_diagnostic(f"Net '{net}' not found in module '{anchor.ref}'.")]
+    equivalents, pins = traced
+
+    reports_refs = runtime.stage != QueryStage.AUTHORED
+
+    def _order_key(equivalent: NetTraceEquivalent) -> tuple[Any, ...]:
+        position = equivalent.occurrence.position
+        if order == "dfs-post":
+            # Descendants sort before their ancestors.
+            position = position + (float("inf"),)
+        return (position, equivalent.occurrence.path)
+
+    return (
+        {
+            "anchor": {"module": anchor.ref, "net": net, "path": anchor.path},
+            "stage": runtime.stage.value,
+            "equivalents": [
+                {
+                    "path": equivalent.occurrence.path,
+                    "module": equivalent.occurrence.ref,
+                    "net": net_name,
+                    "relation": equivalent.relation,
+                    "resolved_ref": (
+                        equivalent.occurrence.ref if reports_refs else None
+                    ),
+                }
+                for equivalent in sorted(equivalents, key=_order_key)
+                for net_name in sorted(equivalent.nets)
+            ],
+            "connections": [
+                {
+                    "instance_path": pin.instance_path,
+                    "instance": pin.instance,
+                    "terminal": pin.terminal,
+                    "resolved_ref": pin.ref if reports_refs else None,
+                }
+                for pin in sorted(
+                    pins, key=lambda pin: (pin.instance_path, pin.terminal)
+                )
+            ],
+        },
+        [],
+    )
+
+
+def _rollup_payload(rollup: HierarchyRollup) -> dict[str, Any]:
+    """Encode one hierarchy roll-up as JSON-ready fields."""
+
+    return {
+        "instances": rollup.instance_count,
+        "max_depth": rollup.max_depth,
+        "devices": dict(sorted(rollup.device_counts.items())),
+        "modules": dict(sorted(rollup.module_counts.items())),
+    }
+
+
+def _query_tree_row(entry: QueryTreeEntry) -> dict[str, Any]:
+    """Encode one query-tree entry as a JSON-ready row."""
+
+    return {
+        "path": entry.path,
+        "parent_path": entry.parent_path,
+        "instance": entry.instance,
+        "authored_ref": entry.authored_ref,
+        "resolved_ref": entry.resolved_ref,
+        "emitted_name": entry.emitted_name,
+        "depth": entry.depth,
+    }
+
+
+class _ResolvedHierarchyWalk:
+    """Follow authored DFS-preorder rows through the resolved design.
+
+    Keeps only the current resolved module chain (one frame per depth) plus
+    per-module instance lookups, so resolved refs can be attached to streamed
+    authored rows without materializing the resolved hierarchy.
+    """
+
+    def __init__(self, design: NetlistDesign, top: NetlistModule) -> None:
+        self._modules_by_key, self._modules_by_name = index_symbols(design.modules)
+        self._devices_by_key, self._devices_by_name = index_symbols(design.devices)
+        self._instances_by_module: dict[
+            tuple[Optional[str], str], dict[str, NetlistInstance]
+        ] = {}
+        top_key = (top.file_id, top.name)
+        self._chain: list[tuple[str, Optional[NetlistModule]]] = [(top.name, top)]
+        self._ancestry: list[tuple[Optional[str], str]] = [top_key]
+
+    def visit(self, entry: HierarchyEntry) -> Optional[NetlistInstance]:
+        """Return the resolved instance at `entry.path`, if it exists.
+
+        Args:
+            entry: Authored hierarchy row, visited in DFS preorder.
+
+        Returns:
+            Resolved instance occupying the same path, or None when the
+            resolved hierarchy has no such occurrence.
+        """
+        while len(self._chain) > 1 and not is_path_within_scope(
+            entry.parent_path, self._chain[-1][0]
+        ):
+            self._chain.pop()
+            self._ancestry.pop()
+        parent_path, parent = self._chain[-1]
+        if parent is None or parent_path != entry.parent_path:
+            return None
+
+        instance = self._instance_lookup(parent).get(entry.instance)
+        if instance is None:
+            return None
+        target = select_symbol(
+            symbols_by_name=self._modules_by_name,
+            symbols_by_key=self._modules_by_key,
+            name=instance.ref,
+            file_id=instance.ref_file_id,
+        )
+        if target is None:
+            # Unresolved refs are skipped by traversal, matching no row.
+            device = select_symbol(
+                symbols_by_name=self._devices_by_name,
+                symbols_by_key=self._devices_by_key,
+                name=instance.ref,
+                file_id=instance.ref_file_id,
+            )
+            return instance if device is not None else None
+        target_key = (target.file_id, target.name)
+        # Cycle edges are leaves in the resolved traversal as well.
+        self._chain.append((entry.path, None if target_key in self._ancestry else target))
+        self._ancestry.append(target_key)
+        return instance
+
+    def _instance_lookup(self, module: NetlistModule) -> dict[str, NetlistInstance]:
+        key = (module.file_id, module.name)
+        lookup = self._instances_by_module.get(key)
+        if lookup is None:
+            lookup = {}
+            for instance in module.instances:
+                lookup.setdefault(instance.name, instance)
+            self._instances_by_module[key] = lookup
+        return lookup
 
 
 def _build_emission_lookup(
@@ -446,7 +669,7 @@ def _build_emission_lookup(
 
     by_key: dict[tuple[Optional[str], str], str] = {}
     by_symbol: dict[str, list[EmissionNameMapEntry]] = {}
-    for entry in build_emission_name_map(runtime.stage_design):
+    for entry in build_emission_name_map(runtime.stage_design, runtime.emission_plan):
         by_key[(entry.file_id, entry.symbol)] = entry.emitted_name
         by_symbol.setdefault(entry.symbol, []).append(entry)
     return by_key, {symbol: tuple(entries) for symbol, entries in by_symbol.items()}
@@ -515,10 +738,15 @@ __all__ = [
     "QueryRuntime",
     "QueryStage",
     "build_query_bindings_payload",
+    "build_query_net_trace_payload",
+    "build_query_stats_payload",
     "build_query_tree_compact_payload",
     "build_query_tree_payload",
     "build_query_runtime",
     "finalize_query_output",
+    "iter_query_bindings_rows",
+    "iter_query_ndjson",
+    "iter_query_tree_rows",
     "query_common_options",
     "query_exit_code",
     "query_json_envelope",
@@ -2,21 +2,43 @@
 
 from __future__ import annotations
 
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
 from asdl.diagnostics import Diagnostic, Severity
-from asdl.emit.netlist_ir import NetlistDesign
+
+if TYPE_CHECKING:
+    from asdl.emit.netlist_ir import NetlistDesign
+
+
+@dataclass(frozen=True)
+class PreparedViewBindings:
+    """View config and view-binding session shared by several profile runs.
+
+    Attributes:
+        config_path: View config path the config was loaded from.
+        config: Loaded view config.
+        session: View-binding session for the authored design.
+    """
+
+    config_path: Path
+    config: Any
+    session: Any
 
 
 def validate_view_binding_options(
-    *, view_config_path: Optional[Path], view_profile: Optional[str]
+    *,
+    view_config_path: Optional[Path],
+    view_profile: Optional[str],
+    all_view_profiles: bool = False,
 ) -> list[str]:
     """Validate view-binding option dependencies for CLI commands.
 
     Args:
         view_config_path: Optional path supplied by ``--view-config``.
         view_profile: Optional value supplied by ``--view-profile``.
+        all_view_profiles: True when ``--all-view-profiles`` is supplied.
 
     Returns:
         Error messages for invalid option combinations.
@@ -25,11 +47,58 @@ def validate_view_binding_options(
     errors: list[str] = []
     if view_config_path is None and view_profile is not None:
         errors.append("--view-profile requires --view-config.")
-    if view_config_path is not None and view_profile is None:
+    if all_view_profiles:
+        if view_config_path is None:
+            errors.append("--all-view-profiles requires --view-config.")
+        if view_profile is not None:
+            errors.append("--all-view-profiles cannot be combined with --view-profile.")
+    elif view_config_path is not None and view_profile is None:
         errors.append("--view-config requires --view-profile.")
     return errors
 
 
+def prepare_view_bindings(
+    *,
+    design: NetlistDesign,
+    view_config_path: Path,
+    diagnostic_builder: Callable[[str, str], Diagnostic],
+    import_error_code: str,
+) -> tuple[Optional[PreparedViewBindings], list[Diagnostic]]:
+    """Load a view config and index a design once for several profile runs.
+
+    Args:
+        design: Authored pipeline output design.
+        view_config_path: View config path.
+        diagnostic_builder: Callback used to construct CLI diagnostics.
+        import_error_code: Diagnostic code for dependency import failures.
+
+    Returns:
+        Tuple ``(prepared, diagnostics)`` where ``prepared`` is ``None`` on
+        failure.
+    """
+
+    try:
+        from asdl.views import ViewBindingSession, load_view_config
+    except Exception as exc:  # pragma: no cover - defensive
+        return None, [
+            diagnostic_builder(
+                import_error_code, f"Failed to load view-binding dependencies: {exc}"
+            )
+        ]
+
+    config, diagnostics = load_view_config(view_config_path)
+    if config is None or _has_error_diagnostics(diagnostics):
+        return None, diagnostics
+    return (
+        PreparedViewBindings(
+            config_path=view_config_path,
+            config=config,
+            session=ViewBindingSession(design),
+        ),
+        diagnostics,
+    )
+
+
 def resolve_and_apply_view_bindings(
     *,
     design: NetlistDesign,
@@ -37,6 +106,8 @@ def resolve_and_apply_view_bindings(
     view_profile: Optional[str],
     diagnostic_builder: Callable[[str, str], Diagnostic],
     import_error_code: str,
+    prepared: Optional[PreparedViewBindings] = None,
+    session: Any = None,
 ) -> tuple[Optional[NetlistDesign], tuple[Any, ...], list[Diagnostic]]:
     """Resolve and apply optional view bindings for a compiled design.
 
@@ -50,6 +121,11 @@ def resolve_and_apply_view_bindings(
         view_profile: Optional profile name from the view config.
         diagnostic_builder: Callback used to construct CLI diagnostics.
         import_error_code: Diagnostic code for dependency import failures.
+        prepared: Optional config and session from ``prepare_view_bindings``
+            for ``design``; reused instead of reloading and reindexing.
+        session: Optional ``ViewBindingSession`` for ``design`` when no
+            ``prepared`` state is given. Resolution and application always
+            share one session.
 
     Returns:
         Tuple ``(resolved_design, resolved_bindings, diagnostics)`` where
@@ -67,6 +143,7 @@ def resolve_and_apply_view_bindings(
             apply_resolved_view_bindings,
             resolve_design_view_bindings,
         )
+        from asdl.views.session import ViewBindingSession
     except Exception as exc:  # pragma: no cover - defensive
         diagnostics.append(
             diagnostic_builder(
@@ -75,21 +152,29 @@ def resolve_and_apply_view_bindings(
         )
         return None, (), diagnostics
 
+    if prepared is not None:
+        session = prepared.session
+    session = ViewBindingSession.for_design(design, session)
     bindings, view_diags = resolve_design_view_bindings(
         design,
         config_path=view_config_path,
         profile_name=view_profile,
+        config=prepared.config if prepared is not None else None,
+        session=session,
     )
     diagnostics.extend(view_diags)
     if bindings is None or _has_error_diagnostics(diagnostics):
         return None, (), diagnostics
 
     try:
-        resolved_design = apply_resolved_view_bindings(design, bindings)
+        resolved_design = apply_resolved_view_bindings(
+            design, bindings, session=session
+        )
     except ValueError as exc:
         diagnostics.append(diagnostic_builder(VIEW_APPLY_ERROR, str(exc)))
         return None, (), diagnostics
-    return resolved_design, tuple(bindings), diagnostics
+    # Application works on the binding graph; only the sidecar is flattened.
+    return resolved_design, bindings.entries(), diagnostics
 
 
 def _has_error_diagnostics(diagnostics: list[Diagnostic]) -> bool:
@@ -0,0 +1,660 @@
+"""Long-lived compile server for `asdlc serve` and its transparent client.
+
+The server listens on a local Unix socket and answers newline-delimited
+JSON-RPC 2.0 requests. Each CLI command is a method whose params carry the
+command arguments, working directory and environment of the calling process;
+the result carries the command's exit code, stdout and stderr. Commands run
+in-process with a shared document cache, so Python startup, imports and the
+parsing of unchanged files are paid once per server rather than once per call.
+
+The socket lives in a directory only its owner can write to, and clients talk
+only to a socket (and a listening process) owned by their own user. They send
+just the environment variables a compile reads, not the whole environment: a
+fixed set up front, then any unset variable the server reports a compile
+looked up, in which case the command is run again with it.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import re
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
+import threading
+import traceback
+from pathlib import Path
+from typing import Any, Optional, Sequence
+
+import click
+
+SERVER_SOCKET_ENV = "ASDL_SERVER_SOCKET"
+
+# Commands forwarded to a running server; everything else runs locally.
+SERVED_COMMANDS = frozenset({"netlist", "query", "depgraph-dump", "visualizer-dump"})
+
+JSONRPC_PARSE_ERROR = -32700
+JSONRPC_INVALID_REQUEST = -32600
+JSONRPC_METHOD_NOT_FOUND = -32601
+JSONRPC_INVALID_PARAMS = -32602
+JSONRPC_INTERNAL_ERROR = -32603
+
+_CONNECT_TIMEOUT_SECONDS = 0.5
+
+# Forwarded to the server besides the variables named in the `.asdlrc` of an
+# argument: every `ASDL_*` variable, and `HOME` for `~` expansion.
+FORWARDED_ENV_PREFIX = "ASDL_"
+FORWARDED_ENV_NAMES = frozenset({"HOME"})
+
+# Names an `.asdlrc` may read: `$NAME`/`${NAME}` references and mapping keys
+# (which include the `env` entries the process environment overrides).
+_RC_NAME_PATTERN = re.compile(
+    r"\$\{?([A-Za-z_]\w*)|^\s*([A-Za-z_]\w*)\s*:", re.MULTILINE
+)
+
+_PEER_CREDENTIALS = struct.Struct("3i")
+
+
+def default_socket_path() -> Path:
+    """Return the per-user default server socket path.
+
+    The socket sits in a per-user subdirectory (created with mode `0700` by
+    the server) of `$XDG_RUNTIME_DIR`, or of the system temp directory.
+    """
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    return Path(runtime_dir) / f"asdlc-{os.getuid()}" / "server.sock"
+
+
+def resolve_socket_path() -> Optional[Path]:
+    """Return the socket path clients should use, or None when disabled.
+
+    `ASDL_SERVER_SOCKET` overrides the default path; setting it to an empty
+    string disables the server client entirely.
+    """
+    configured = os.environ.get(SERVER_SOCKET_ENV)
+    if configured is None:
+        return default_socket_path()
+    if configured == "":
+        return None
+    return Path(configured)
+
+
+def call_server(
+    socket_path: Path, method: str, params: Optional[dict[str, Any]] = None
+) -> dict[str, Any]:
+    """Send one JSON-RPC request to a server and return the decoded response.
+
+    Args:
+        socket_path: Server Unix socket path.
+        method: JSON-RPC method name.
+        params: Optional method params.
+
+    Returns:
+        The JSON-RPC response object.
+
+    Raises:
+        OSError: If the server cannot be reached or runs as another user.
+        ValueError: If the response is not valid JSON.
+    """
+    request = {"jsonrpc": "2.0", "id": 1, "method": method, "params": params or {}}
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(_CONNECT_TIMEOUT_SECONDS)
+        client.connect(str(socket_path))
+        client.settimeout(None)
+        _check_peer_user(client, socket_path)
+        client.sendall(json.dumps(request).encode("utf-8") + b"\n")
+        with client.makefile("rb") as stream:
+            line = stream.readline()
+    if not line:
+        raise ValueError("Compile server closed the connection without a response.")
+    return json.loads(line)
+
+
+def forward_to_server(args: Sequence[str]) -> Optional[int]:
+    """Run a CLI invocation on a running server, if one is available.
+
+    Args:
+        args: Command-line arguments without the program name.
+
+    Returns:
+        The command exit code, or None when the command is not served or no
+        server answered (the caller then runs the command locally).
+    """
+    if not args or args[0] not in SERVED_COMMANDS:
+        return None
+    socket_path = resolve_socket_path()
+    if socket_path is None or not os.path.lexists(socket_path):
+        return None
+    problem = _untrusted_socket_reason(socket_path)
+    if problem is not None:
+        sys.stderr.write(
+            f"asdlc: ignoring compile server socket '{socket_path}': {problem}\n"
+        )
+        return None
+    try:
+        status = call_server(socket_path, "ping").get("result")
+    except (OSError, ValueError):
+        return None
+    requested = []
+    if isinstance(status, dict):
+        requested = status.get("requested_variables", [])
+    cwd = os.getcwd()
+    env = forwarded_environment(args[1:], Path(cwd), requested=requested)
+    while True:
+        params = {"args": list(args[1:]), "cwd": cwd, "env": env}
+        try:
+            response = call_server(socket_path, args[0], params)
+        except (OSError, ValueError):
+            return None
+        result = response.get("result")
+        if not isinstance(result, dict):
+            return None
+        # Rerun with the variables the compile looked up but did not get, so
+        # the output matches a local run. `env` only grows, so this ends.
+        missing = {
+            name: os.environ[name]
+            for name in result.get("missing_variables", [])
+            if name in os.environ and name not in env
+        }
+        if not missing:
+            break
+        env = {**env, **missing}
+    sys.stdout.write(result.get("stdout", ""))
+    sys.stdout.flush()
+    sys.stderr.write(result.get("stderr", ""))
+    sys.stderr.flush()
+    return int(result.get("exit_code", 1))
+
+
+def forwarded_environment(
+    args: Sequence[str],
+    cwd: Path,
+    environ: Optional[dict[str, str]] = None,
+    *,
+    requested: Sequence[str] = (),
+) -> dict[str, str]:
+    """Return the environment variables a served command may read.
+
+    These are the `ASDL_*` variables, `HOME`, the `requested` names, and
+    every name referenced or defined by the `.asdlrc` of an argument that
+    names an existing file (the rc itself, a `--config` file, or the rc
+    discovered from an entry file).
+
+    Args:
+        args: Command arguments without the command name.
+        cwd: Directory relative arguments are resolved against.
+        environ: Environment to select from (defaults to `os.environ`).
+        requested: Names the server reported earlier compiles looking up
+            while unset.
+
+    Returns:
+        The selected variables.
+    """
+    source = os.environ if environ is None else environ
+    names = {name for name in source if name.startswith(FORWARDED_ENV_PREFIX)}
+    names.update(FORWARDED_ENV_NAMES)
+    names.update(requested)
+    for rc_path in _argument_rc_files(args, cwd):
+        try:
+            text = rc_path.read_text(encoding="utf-8")
+        except (OSError, UnicodeDecodeError):
+            continue
+        for match in _RC_NAME_PATTERN.finditer(text):
+            names.add(match.group(1) or match.group(2))
+    return {name: source[name] for name in sorted(names) if name in source}
+
+
+class ServerAwareGroup(click.Group):
+    """Click group that forwards served commands to a running compile server.
+
+    Forwarding only applies to real command-line invocations (`args` taken
+    from `sys.argv`); programmatic calls such as `CliRunner.invoke` and the
+    server's own dispatch always run locally.
+    """
+
+    def main(  # type: ignore[override]
+        self,
+        args: Optional[Sequence[str]] = None,
+        prog_name: Optional[str] = None,
+        complete_var: Optional[str] = None,
+        standalone_mode: bool = True,
+        **extra: Any,
+    ) -> Any:
+        if args is None and standalone_mode:
+            exit_code = forward_to_server(sys.argv[1:])
+            if exit_code is not None:
+                sys.exit(exit_code)
+        return super().main(
+            args,
+            prog_name=prog_name,
+            complete_var=complete_var,
+            standalone_mode=standalone_mode,
+            **extra,
+        )
+
+
+class CompileServer(socketserver.UnixStreamServer):
+    """Serial JSON-RPC server running `asdlc` commands in-process.
+
+    Requests are handled one at a time. Each command runs under a
+    `CompileEnvironment` holding the caller's forwarded variables, with
+    relative path arguments made absolute against the caller's working
+    directory; the process environment and working directory are never
+    modified. The socket is bound with a `0077` umask, inside a directory
+    that must not be writable by other users (the default directory is
+    created with mode `0700`).
+    """
+
+    def __init__(self, socket_path: Path, command: click.Group) -> None:
+        from asdl.imports import DocumentCache
+
+        self.socket_path = Path(socket_path)
+        self.command = command
+        self.document_cache = DocumentCache()
+        self.requests_served = 0
+        # Unset variables compiles looked up; clients forward them up front.
+        self.requested_variables: set[str] = set()
+        _prepare_socket_directory(self.socket_path.parent)
+        _remove_stale_socket(self.socket_path)
+        previous_umask = os.umask(0o077)
+        try:
+            super().__init__(str(self.socket_path), _CompileRequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self) -> None:
+        super().server_close()
+        with contextlib.suppress(FileNotFoundError):
+            self.socket_path.unlink()
+
+    def dispatch(self, request: Any) -> Optional[dict[str, Any]]:
+        """Answer one decoded JSON-RPC request.
+
+        Args:
+            request: Decoded request object.
+
+        Returns:
+            The JSON-RPC response object, or None for notifications.
+        """
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error_response(None, JSONRPC_INVALID_REQUEST, "Invalid request.")
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params") or {}
+        if not isinstance(params, dict):
+            return _error_response(
+                request_id, JSONRPC_INVALID_PARAMS, "params must be an object."
+            )
+
+        if method == "ping":
+            result: Any = {
+                "pid": os.getpid(),
+                "requests_served": self.requests_served,
+                "cached_documents": len(self.document_cache),
+                "requested_variables": sorted(self.requested_variables),
+            }
+        elif method == "shutdown":
+            result = {"stopping": True}
+            # shutdown() blocks until serve_forever exits; run it elsewhere.
+            threading.Thread(target=self.shutdown, daemon=True).start()
+        elif method in SERVED_COMMANDS:
+            args = params.get("args", [])
+            cwd = params.get("cwd")
+            env = params.get("env")
+            if (
+                not isinstance(args, list)
+                or not all(isinstance(arg, str) for arg in args)
+                or (cwd is not None and not isinstance(cwd, str))
+                or (env is not None and not isinstance(env, dict))
+            ):
+                return _error_response(
+                    request_id,
+                    JSONRPC_INVALID_PARAMS,
+                    "params must provide args (list of strings), cwd and env.",
+                )
+            try:
+                result = self.run_command([method, *args], cwd=cwd, env=env)
+            except Exception as exc:
+                # Command failures are results (see `_invoke`); this covers
+                # setup such as a missing cwd, before the command ran.
+                return _error_response(
+                    request_id, JSONRPC_INTERNAL_ERROR, f"{type(exc).__name__}: {exc}"
+                )
+            self.requests_served += 1
+        else:
+            return _error_response(
+                request_id, JSONRPC_METHOD_NOT_FOUND, f"Unknown method '{method}'."
+            )
+
+        if "id" not in request:
+            return None
+        return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+    def run_command(
+        self,
+        argv: list[str],
+        *,
+        cwd: Optional[str],
+        env: Optional[dict[str, str]],
+    ) -> dict[str, Any]:
+        """Run one CLI command with the caller's cwd and environment.
+
+        Args:
+            argv: Command name and arguments.
+            cwd: Caller working directory; relative path arguments and
+                relative `ASDL_LIB_PATH`/`ASDL_BACKEND_CONFIG` entries are
+                resolved against it.
+            env: Caller environment variables; the server's own environment
+                is used when omitted.
+
+        Returns:
+            Mapping with `exit_code`, `stdout`, `stderr` and
+            `missing_variables` (names the command looked up that `env` does
+            not set; empty when `env` is omitted).
+
+        Raises:
+            FileNotFoundError: If `cwd` is not an existing directory.
+        """
+        from asdl.compile_environment import (
+            CompileEnvironment,
+            RecordingVariables,
+            active_compile_environment,
+            compile_environment_scope,
+        )
+        from asdl.imports import document_cache_scope
+
+        if cwd is not None:
+            if not os.path.isdir(cwd):
+                raise FileNotFoundError(f"Working directory '{cwd}' does not exist.")
+            argv = _absolute_path_arguments(self.command, argv, cwd)
+        environment = active_compile_environment()
+        variables: Optional[RecordingVariables] = None
+        if env is not None:
+            variables = RecordingVariables(
+                env if cwd is None else _absolute_path_variables(env, cwd)
+            )
+            environment = CompileEnvironment(variables)
+        stdout = io.StringIO()
+        stderr = io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(
+            stderr
+        ), document_cache_scope(self.document_cache), compile_environment_scope(
+            environment
+        ):
+            exit_code = _invoke(self.command, argv)
+        missing = sorted(variables.missing) if variables is not None else []
+        self.requested_variables.update(missing)
+        return {
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+            "missing_variables": missing,
+        }
+
+
+class _CompileRequestHandler(socketserver.StreamRequestHandler):
+    server: CompileServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response: Optional[dict[str, Any]] = _error_response(
+                    None, JSONRPC_PARSE_ERROR, "Parse error."
+                )
+            else:
+                response = self.server.dispatch(request)
+            if response is not None:
+                self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+                self.wfile.flush()
+
+
+def _invoke(command: click.Group, argv: list[str]) -> int:
+    """Run a click command without exiting the process; return its exit code."""
+    try:
+        result = command.main(args=argv, prog_name="asdlc", standalone_mode=False)
+    except click.exceptions.Exit as exc:
+        return exc.exit_code
+    except click.ClickException as exc:
+        exc.show()
+        return exc.exit_code
+    except click.exceptions.Abort:
+        click.echo("Aborted!", err=True)
+        return 1
+    except Exception:
+        # Answer with a failed result: a client left without a response would
+        # rerun the command (and its file writes) locally.
+        traceback.print_exc()
+        return 1
+    return result if isinstance(result, int) else 0
+
+
+def _absolute_path_arguments(
+    command: click.Group, argv: list[str], cwd: str
+) -> list[str]:
+    """Return `argv` with relative `click.Path` values made absolute.
+
+    Walks the command tree the way click parses it: `--opt value`,
+    `--opt=value` and `-ovalue` option forms, then positional arguments in
+    declaration order, with the first positional of a group naming its
+    subcommand.
+
+    Args:
+        command: Root command group.
+        argv: Command name and arguments.
+        cwd: Directory relative paths are resolved against.
+
+    Returns:
+        The rewritten argument list.
+    """
+    tokens = list(argv)
+    current: click.Command = command
+    start = 0
+    while isinstance(current, click.Group):
+        index = _absolute_path_tokens(current, tokens, start, cwd)
+        if index is None:
+            return tokens
+        subcommand = current.get_command(click.Context(current), tokens[index])
+        if subcommand is None:
+            return tokens
+        current, start = subcommand, index + 1
+    _absolute_path_tokens(current, tokens, start, cwd)
+    return tokens
+
+
+def _absolute_path_tokens(
+    command: click.Command, tokens: list[str], start: int, cwd: str
+) -> Optional[int]:
+    """Rewrite path tokens of one command level in place.
+
+    Returns:
+        Index of the subcommand name for a group, else None.
+    """
+    options: dict[str, tuple[bool, bool]] = {}
+    arguments: list[click.Argument] = []
+    for param in command.params:
+        if isinstance(param, click.Option):
+            takes_value = not param.is_flag and not param.count
+            for opt in (*param.opts, *param.secondary_opts):
+                options[opt] = (takes_value, isinstance(param.type, click.Path))
+        elif isinstance(param, click.Argument):
+            arguments.append(param)
+
+    position = 0
+    only_positional = False
+    index = start
+    while index < len(tokens):
+        token = tokens[index]
+        if not only_positional and token == "--":
+            only_positional = True
+        elif not only_positional and token.startswith("-") and token != "-":
+            name, separator, value = token.partition("=")
+            if name in options:
+                takes_value, is_path = options[name]
+                if separator and is_path:
+                    tokens[index] = f"{name}={_absolute_path(value, cwd)}"
+                elif not separator and takes_value:
+                    index += 1
+                    if is_path and index < len(tokens):
+                        tokens[index] = _absolute_path(tokens[index], cwd)
+            elif not token.startswith("--") and token[:2] in options:
+                takes_value, is_path = options[token[:2]]
+                if takes_value and is_path:
+                    tokens[index] = token[:2] + _absolute_path(token[2:], cwd)
+        elif isinstance(command, click.Group):
+            return index
+        else:
+            argument = _argument_at(arguments, position)
+            if argument is not None and isinstance(argument.type, click.Path):
+                tokens[index] = _absolute_path(token, cwd)
+            position += 1
+        index += 1
+    return None
+
+
+def _argument_at(
+    arguments: Sequence[click.Argument], position: int
+) -> Optional[click.Argument]:
+    for argument in arguments:
+        if argument.nargs < 0 or position < argument.nargs:
+            return argument
+        position -= argument.nargs
+    return None
+
+
+def _absolute_path(value: str, cwd: str) -> str:
+    if value in ("", "-") or value.startswith("~") or os.path.isabs(value):
+        return value
+    return os.path.join(cwd, value)
+
+
+def _absolute_path_variables(env: dict[str, str], cwd: str) -> dict[str, str]:
+    """Resolve relative paths in the path variables a compile reads."""
+    resolved = dict(env)
+    lib_path = env.get("ASDL_LIB_PATH")
+    if lib_path:
+        resolved["ASDL_LIB_PATH"] = os.pathsep.join(
+            _absolute_path(entry, cwd) if entry.strip() and entry[0] != "$" else entry
+            for entry in lib_path.split(os.pathsep)
+        )
+    backend_config = env.get("ASDL_BACKEND_CONFIG")
+    if backend_config and not backend_config.startswith("$"):
+        resolved["ASDL_BACKEND_CONFIG"] = _absolute_path(backend_config, cwd)
+    return resolved
+
+
+def _error_response(request_id: Any, code: int, message: str) -> dict[str, Any]:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "error": {"code": code, "message": message},
+    }
+
+
+def _argument_rc_files(args: Sequence[str], cwd: Path) -> list[Path]:
+    from asdl.cli.config import ASDLRC_FILENAME, discover_asdlrc
+
+    rc_files: list[Path] = []
+    previous = ""
+    for arg in args:
+        value = arg.split("=", 1)[1] if arg.startswith("--") and "=" in arg else arg
+        is_config = previous == "--config" or arg.startswith("--config=")
+        previous = arg
+        path = cwd / value
+        if not value or not path.is_file():
+            continue
+        if is_config or path.name == ASDLRC_FILENAME:
+            rc_path: Optional[Path] = path
+        else:
+            rc_path = discover_asdlrc(path)
+        if rc_path is not None and rc_path not in rc_files:
+            rc_files.append(rc_path)
+    return rc_files
+
+
+def _directory_problem(info: os.stat_result) -> Optional[str]:
+    """Describe why a socket directory is unsafe, or return None."""
+    if not stat.S_ISDIR(info.st_mode):
+        return "its directory is not a directory"
+    if info.st_uid not in (os.getuid(), 0):
+        return "its directory is owned by another user"
+    writable_by_others = info.st_mode & (stat.S_IWGRP | stat.S_IWOTH)
+    if writable_by_others and not info.st_mode & stat.S_ISVTX:
+        return "its directory is writable by other users"
+    return None
+
+
+def _untrusted_socket_reason(socket_path: Path) -> Optional[str]:
+    """Return why clients must not use `socket_path`, or None if it is safe."""
+    try:
+        info = os.lstat(socket_path)
+        directory = os.lstat(socket_path.parent)
+    except OSError as exc:
+        return str(exc)
+    if not stat.S_ISSOCK(info.st_mode):
+        return "not a socket"
+    if info.st_uid != os.getuid():
+        return "owned by another user"
+    return _directory_problem(directory)
+
+
+def _check_peer_user(client: socket.socket, socket_path: Path) -> None:
+    """Refuse servers run by another user, where the platform reports it."""
+    option = getattr(socket, "SO_PEERCRED", None)
+    if option is None:
+        return
+    credentials = client.getsockopt(socket.SOL_SOCKET, option, _PEER_CREDENTIALS.size)
+    _, peer_uid, _ = _PEER_CREDENTIALS.unpack(credentials)
+    if peer_uid != os.getuid():
+        raise OSError(
+            f"Compile server on '{socket_path}' runs as another user ({peer_uid})."
+        )
+
+
+def _prepare_socket_directory(directory: Path) -> None:
+    """Create a missing socket directory as `0700`; refuse unsafe ones."""
+    if not os.path.lexists(directory):
+        directory.mkdir(mode=0o700, parents=True)
+    problem = _directory_problem(os.lstat(directory))
+    if problem is not None:
+        raise OSError(f"Refusing socket directory '{directory}': {problem}.")
+
+
+def _remove_stale_socket(socket_path: Path) -> None:
+    """Remove a leftover socket file; refuse if a server still answers on it."""
+    try:
+        info = os.lstat(socket_path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(info.st_mode):
+        raise OSError(f"'{socket_path}' exists and is not a socket.")
+    try:
+        call_server(socket_path, "ping")
+    except (OSError, ValueError):
+        socket_path.unlink()
+        return
+    raise OSError(f"A compile server is already listening on '{socket_path}'.")
+
+
+__all__ = [
+    "CompileServer",
+    "FORWARDED_ENV_NAMES",
+    "FORWARDED_ENV_PREFIX",
+    "SERVED_COMMANDS",
+    "SERVER_SOCKET_ENV",
+    "ServerAwareGroup",
+    "call_server",
+    "default_socket_path",
+    "forward_to_server",
+    "forwarded_environment",
+    "resolve_socket_path",
+]
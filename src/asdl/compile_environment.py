@@ -0,0 +1,199 @@
+"""Per-compile environment variables.
+
+Pipeline code never reads or writes `os.environ` directly: environment
+lookups (`ASDL_LIB_PATH`, `ASDL_BACKEND_CONFIG`) and `$VAR` expansion in
+import paths, library roots and rendered templates go through the
+`CompileEnvironment` installed by `compile_environment_scope`. Without one,
+the live process environment is used. `.asdlrc` `env` entries are applied by
+installing `environment.with_defaults(rc.env)` for the compile instead of
+merging them into `os.environ`, so concurrent compiles in one process, each
+in its own thread or context, cannot see each other's settings.
+
+`RecordingVariables` notes which unset variables a compile looked up; the
+compile server uses it to ask its client for variables it did not forward.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from collections import ChainMap
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, Iterator, Mapping, Optional
+
+# `os.path.expandvars` syntax on POSIX: `$NAME` or `${NAME}`.
+_VAR_PATTERN = re.compile(r"\$(\w+|\{[^}]*\})", re.ASCII)
+
+
+class RecordingVariables(Mapping[str, str]):
+    """Variable mapping that records the names looked up while unset.
+
+    Attributes:
+        missing: Names looked up (by `[]`, `get` or `in`) that were unset.
+    """
+
+    def __init__(
+        self, variables: Mapping[str, str], missing: Iterable[str] = ()
+    ) -> None:
+        self._variables = variables
+        self.missing: set[str] = set(missing)
+
+    def __getitem__(self, name: str) -> str:
+        try:
+            return self._variables[name]
+        except KeyError:
+            self.missing.add(name)
+            raise
+
+    def __contains__(self, name: object) -> bool:
+        found = name in self._variables
+        if not found and isinstance(name, str):
+            self.missing.add(name)
+        return found
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._variables)
+
+    def __len__(self) -> int:
+        return len(self._variables)
+
+    def __reduce__(
+        self,
+    ) -> tuple[type[RecordingVariables], tuple[dict[str, str], set[str]]]:
+        return (RecordingVariables, (dict(self._variables), set(self.missing)))
+
+
+@dataclass(frozen=True)
+class CompileEnvironment:
+    """Environment variables seen by one compile.
+
+    Attributes:
+        variables: Variable mapping; treated as read-only.
+    """
+
+    variables: Mapping[str, str]
+
+    def __reduce__(
+        self,
+    ) -> tuple[type[CompileEnvironment], tuple[Mapping[str, str]]]:
+        # Views of `os.environ` are not picklable; send a snapshot instead.
+        return (CompileEnvironment, (_snapshot(self.variables),))
+
+    @classmethod
+    def from_process(cls) -> CompileEnvironment:
+        """Return a snapshot of the current process environment."""
+        return cls(dict(os.environ))
+
+    def get(self, name: str, default: Optional[str] = None) -> Optional[str]:
+        """Return variable `name`, or `default` when unset."""
+        return self.variables.get(name, default)
+
+    def with_defaults(self, defaults: Mapping[str, str]) -> CompileEnvironment:
+        """Return a copy with `defaults` added for variables that are unset."""
+        if all(name in self.variables for name in defaults):
+            return self
+        # A chain rather than a merged copy keeps lookups going through
+        # `self.variables` (and any `RecordingVariables` in it).
+        return CompileEnvironment(ChainMap(self.variables, dict(defaults)))
+
+    def missing_variables(self) -> frozenset[str]:
+        """Return unset names looked up through `RecordingVariables`."""
+        return frozenset(
+            name for recorder in _recorders(self.variables) for name in recorder.missing
+        )
+
+    def record_missing_variables(self, names: Iterable[str]) -> None:
+        """Add unset names looked up elsewhere, such as in a worker process."""
+        names = tuple(names)
+        for recorder in _recorders(self.variables):
+            recorder.missing.update(names)
+
+    def expandvars(self, text: str) -> str:
+        """Expand `$NAME` and `${NAME}` like `os.path.expandvars` on POSIX.
+
+        Unset variables are left unchanged.
+        """
+        if "$" not in text:
+            return text
+
+        def _replace(match: re.Match[str]) -> str:
+            name = match.group(1)
+            if name.startswith("{") and name.endswith("}"):
+                name = name[1:-1]
+            value = self.variables.get(name)
+            return match.group(0) if value is None else value
+
+        return _VAR_PATTERN.sub(_replace, text)
+
+    def expanduser(self, path: str) -> str:
+        """Expand a leading `~` using this environment's `HOME`.
+
+        `~user` forms fall back to `os.path.expanduser`.
+        """
+        if not path.startswith("~"):
+            return path
+        if path == "~" or path.startswith("~/"):
+            home = self.variables.get("HOME")
+            if home is not None:
+                return (home.rstrip("/") or "/") + path[1:]
+        return os.path.expanduser(path)
+
+
+def _recorders(variables: Mapping[str, str]) -> Iterator[RecordingVariables]:
+    if isinstance(variables, RecordingVariables):
+        yield variables
+    elif isinstance(variables, ChainMap):
+        for mapping in variables.maps:
+            yield from _recorders(mapping)
+
+
+def _snapshot(variables: Mapping[str, str]) -> Mapping[str, str]:
+    if isinstance(variables, RecordingVariables):
+        return variables
+    if isinstance(variables, ChainMap):
+        return ChainMap(*(_snapshot(mapping) for mapping in variables.maps))
+    return dict(variables)
+
+
+# Reads the live process environment, matching the behavior before
+# per-compile environments existed.
+_PROCESS_ENVIRONMENT = CompileEnvironment(os.environ)
+
+_ACTIVE_COMPILE_ENVIRONMENT: ContextVar[Optional[CompileEnvironment]] = ContextVar(
+    "asdl_active_compile_environment", default=None
+)
+
+
+def active_compile_environment() -> CompileEnvironment:
+    """Return the installed environment, or the live process environment."""
+    environment = _ACTIVE_COMPILE_ENVIRONMENT.get()
+    return _PROCESS_ENVIRONMENT if environment is None else environment
+
+
+@contextmanager
+def compile_environment_scope(
+    environment: CompileEnvironment,
+) -> Iterator[CompileEnvironment]:
+    """Use `environment` for the compile running in the current context.
+
+    Args:
+        environment: Environment to install for the current context.
+
+    Yields:
+        The installed environment.
+    """
+    token = _ACTIVE_COMPILE_ENVIRONMENT.set(environment)
+    try:
+        yield environment
+    finally:
+        _ACTIVE_COMPILE_ENVIRONMENT.reset(token)
+
+
+__all__ = [
+    "CompileEnvironment",
+    "RecordingVariables",
+    "active_compile_environment",
+    "compile_environment_scope",
+]
@@ -0,0 +1,200 @@
+"""Per-stage timings and counters for one compile.
+
+Pipeline stages and hot paths report into the collector installed by
+`compile_stats_scope`; with no collector installed, `stage` and `count` are
+no-ops, so library callers pay one context-variable lookup per call site.
+Every stage is also an `asdl.instrumentation` span of category `stage`.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, ContextManager, Iterator, Optional
+
+from asdl.instrumentation import span
+
+# Canonical report order; stages outside this list follow in first-seen order.
+STAGE_ORDER = (
+    "parse",
+    "import_resolution",
+    "patterned_graph",
+    "atomization",
+    "verification",
+    "netlist_ir",
+    "view_binding",
+    "parallel_fold",
+    "emission",
+    "write",
+)
+
+
+@dataclass
+class StageTiming:
+    """Accumulated exclusive time of one stage."""
+
+    wall_seconds: float = 0.0
+    cpu_seconds: float = 0.0
+    calls: int = 0
+
+
+@dataclass
+class CompileStats:
+    """Stage timings and named counters collected during one compile.
+
+    Stage times are exclusive: time spent in a nested stage (for example
+    `parse` inside `import_resolution`) is attributed to the nested stage
+    only, so the per-stage times add up to the instrumented total. CPU time is
+    measured for the compiling thread.
+    """
+
+    stages: dict[str, StageTiming] = field(default_factory=dict)
+    counters: dict[str, int] = field(default_factory=dict)
+    _open: list[list[float]] = field(default_factory=list, repr=False, compare=False)
+
+    @contextmanager
+    def stage(self, name: str, **args: Any) -> Iterator[None]:
+        """Time the enclosed block as one call of stage `name`.
+
+        Args:
+            name: Stage name.
+            **args: Instrumentation span arguments (not recorded in stats).
+        """
+        wall_start = time.perf_counter()
+        cpu_start = time.thread_time()
+        self._open.append([0.0, 0.0])
+        try:
+            with span(name, "stage", **args):
+                yield
+        finally:
+            child_wall, child_cpu = self._open.pop()
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+            timing = self.stages.setdefault(name, StageTiming())
+            timing.wall_seconds += wall - child_wall
+            timing.cpu_seconds += cpu - child_cpu
+            timing.calls += 1
+            if self._open:
+                self._open[-1][0] += wall
+                self._open[-1][1] += cpu
+
+    def count(self, name: str, amount: int = 1) -> None:
+        """Add `amount` to counter `name`."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def copy(self) -> CompileStats:
+        """Return an independent copy of the collected stages and counters."""
+        return CompileStats(
+            stages={
+                name: StageTiming(timing.wall_seconds, timing.cpu_seconds, timing.calls)
+                for name, timing in self.stages.items()
+            },
+            counters=dict(self.counters),
+        )
+
+    def ordered_stages(self) -> list[tuple[str, StageTiming]]:
+        """Return recorded stages in canonical order."""
+        rank = {name: index for index, name in enumerate(STAGE_ORDER)}
+        names = sorted(self.stages, key=lambda name: rank.get(name, len(rank)))
+        return [(name, self.stages[name]) for name in names]
+
+    def to_jsonable(self) -> dict[str, Any]:
+        """Return the compile-log `performance` payload (milliseconds)."""
+        stages = [
+            {
+                "stage": name,
+                "wall_ms": _milliseconds(timing.wall_seconds),
+                "cpu_ms": _milliseconds(timing.cpu_seconds),
+                "calls": timing.calls,
+            }
+            for name, timing in self.ordered_stages()
+        ]
+        return {
+            "stages": stages,
+            "total_wall_ms": _milliseconds(
+                sum(timing.wall_seconds for timing in self.stages.values())
+            ),
+            "total_cpu_ms": _milliseconds(
+                sum(timing.cpu_seconds for timing in self.stages.values())
+            ),
+            "counters": dict(sorted(self.counters.items())),
+        }
+
+    def format_summary(self, title: str) -> str:
+        """Render a fixed-width text table for `--timings`."""
+        lines = [
+            f"timings: {title}",
+            f"  {'stage':<18}{'wall ms':>10}{'cpu ms':>10}{'calls':>7}",
+        ]
+        for name, timing in self.ordered_stages():
+            lines.append(
+                f"  {name:<18}{timing.wall_seconds * 1000:>10.2f}"
+                f"{timing.cpu_seconds * 1000:>10.2f}{timing.calls:>7}"
+            )
+        total_wall = sum(timing.wall_seconds for timing in self.stages.values())
+        total_cpu = sum(timing.cpu_seconds for timing in self.stages.values())
+        lines.append(f"  {'total':<18}{total_wall * 1000:>10.2f}{total_cpu * 1000:>10.2f}")
+        if self.counters:
+            lines.append("  counters:")
+            for name, value in sorted(self.counters.items()):
+                lines.append(f"    {name:<24}{value:>10}")
+        return "\n".join(lines)
+
+
+_ACTIVE_COMPILE_STATS: ContextVar[Optional[CompileStats]] = ContextVar(
+    "asdl_active_compile_stats", default=None
+)
+
+
+def active_compile_stats() -> Optional[CompileStats]:
+    """Return the collector installed by `compile_stats_scope`, if any."""
+    return _ACTIVE_COMPILE_STATS.get()
+
+
+@contextmanager
+def compile_stats_scope(stats: CompileStats) -> Iterator[CompileStats]:
+    """Report stage timings and counters of the enclosed compile into `stats`.
+
+    Args:
+        stats: Collector to install for the current context.
+
+    Yields:
+        The installed collector.
+    """
+    token = _ACTIVE_COMPILE_STATS.set(stats)
+    try:
+        yield stats
+    finally:
+        _ACTIVE_COMPILE_STATS.reset(token)
+
+
+def stage(name: str, **args: Any) -> ContextManager[None]:
+    """Time the enclosed block as stage `name` of the active compile."""
+    stats = _ACTIVE_COMPILE_STATS.get()
+    if stats is None:
+        return span(name, "stage", **args)
+    return stats.stage(name, **args)
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add `amount` to counter `name` of the active compile."""
+    stats = _ACTIVE_COMPILE_STATS.get()
+    if stats is not None:
+        stats.count(name, amount)
+
+
+def _milliseconds(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+__all__ = [
+    "STAGE_ORDER",
+    "CompileStats",
+    "StageTiming",
+    "active_compile_stats",
+    "compile_stats_scope",
+    "count",
+    "stage",
+]
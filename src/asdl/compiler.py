@@ -0,0 +1,566 @@
+"""Reusable in-process compilation sessions."""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TypeVar
+
+import yaml
+
+from asdl.compile_environment import (
+    CompileEnvironment,
+    active_compile_environment,
+    compile_environment_scope,
+)
+from asdl.core.graph import ProgramGraph
+from asdl.diagnostics import Diagnostic, Severity, format_code
+from asdl.emit.backend_config import BackendConfig
+from asdl.emit.netlist_ir import NetlistDesign
+from asdl.imports import DocumentCache, ImportGraph, resolve_import_graph
+from asdl.lowering import resolve_top_module_id
+from asdl.lowering.ast_to_patterned_graph import (
+    build_patterned_graph_from_import_graph,
+)
+from asdl.lowering.atomized_graph_to_netlist_ir import build_netlist_ir_design
+from asdl.lowering.patterned_graph_to_atomized import (
+    build_atomized_graph,
+    build_atomized_graph_and_verify,
+)
+
+NO_SPAN_NOTE = "No source span available."
+
+COMPILER_CONFIG_ERROR = format_code("TOOL", 5)
+
+DEFAULT_MAX_ENTRIES = 64
+
+_T = TypeVar("_T")
+_FileStamp = tuple[int, int]
+# Variables of the environment a compile was started under. Import paths,
+# library roots and `.asdlrc` values may expand any `$VAR`, so cached results
+# are keyed on the whole mapping rather than on a fixed list of names.
+_EnvironmentKey = frozenset[tuple[str, str]]
+
+
+@dataclass(frozen=True)
+class _RcSettings:
+    """`.asdlrc` settings resolved for one entry directory and environment."""
+
+    lib_roots: tuple[Path, ...]
+    backend_config_path: Optional[Path]
+    rc_path: Optional[Path]
+    rc_stamp: Optional[_FileStamp]
+    diagnostics: tuple[Diagnostic, ...]
+    environment: CompileEnvironment
+
+
+@dataclass
+class _EntryState:
+    """Cached stage results for one entry file and environment."""
+
+    settings: _RcSettings
+    stamps: dict[Path, Optional[_FileStamp]] = field(default_factory=dict)
+    stages: dict[str, tuple[Any, tuple[Diagnostic, ...]]] = field(
+        default_factory=dict
+    )
+
+
+class Compiler:
+    """Compilation session that keeps pipeline work warm between calls.
+
+    A session caches parsed documents, `.asdlrc` settings, backend configs
+    and, per entry file, the import graph and every lowered stage. Cached
+    stages are revalidated against the modification time and size of each
+    file in the entry's import graph and of the entry's `.asdlrc`, taken
+    before the file was read, so an edited file is picked up on the next
+    call; `invalidate` drops state explicitly, for example after a file was
+    replaced with identical metadata or a new library file was added.
+    Settings and stages are cached per compile environment: callers under a
+    different `compile_environment_scope`, or after the process environment
+    changed, never see results resolved for another environment.
+
+    Each stage method returns ``(value or None, diagnostics)`` like the
+    pipeline functions, with diagnostics accumulated from earlier stages.
+    Returned objects are shared with the cache and must be treated as
+    read-only. Failed results are not cached. At most ``max_entries`` entry
+    files keep stage results; the least recently used entry is evicted first.
+
+    A session may be shared by threads: cache bookkeeping is locked, stages
+    build outside the lock (concurrent misses on one stage may both build it,
+    and the last result is cached), and each entry compiles under its own
+    `CompileEnvironment` instead of a shared `os.environ`.
+
+    Args:
+        lib_roots: Library search roots placed before `.asdlrc` roots and
+            `ASDL_LIB_PATH`, like `asdlc --lib`.
+        verify: When True, run atomized graph verification.
+        use_asdlrc: When True, discover and apply `.asdlrc` per entry file
+            (env entries extend that entry's compile environment without
+            overriding variables; `os.environ` is not modified).
+        max_entries: Maximum number of entry files with cached stages.
+    """
+
+    def __init__(
+        self,
+        *,
+        lib_roots: Iterable[Path] = (),
+        verify: bool = True,
+        use_asdlrc: bool = True,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+    ) -> None:
+        self.lib_roots = tuple(Path(root) for root in lib_roots)
+        self.verify = verify
+        self.use_asdlrc = use_asdlrc
+        self.max_entries = max_entries
+        self.documents = DocumentCache()
+        self._entries: OrderedDict[tuple[Path, _EnvironmentKey], _EntryState] = (
+            OrderedDict()
+        )
+        self._rc_settings: dict[tuple[Path, _EnvironmentKey], _RcSettings] = {}
+        self._backends: dict[tuple[str, Optional[Path]], BackendConfig] = {}
+        self._lock = threading.Lock()
+
+    def parse(
+        self, entry_file: Path
+    ) -> tuple[Optional[ImportGraph], list[Diagnostic]]:
+        """Parse an entry file and resolve its import graph.
+
+        Args:
+            entry_file: Entry ASDL file.
+
+        Returns:
+            Tuple of (import graph or None, diagnostics).
+        """
+        entry = _normalize_path(entry_file)
+
+        def build() -> tuple[Optional[ImportGraph], list[Diagnostic]]:
+            settings = self._settings_for(entry)
+            diagnostics = list(settings.diagnostics)
+            if _has_error_diagnostics(diagnostics):
+                return None, diagnostics
+            with compile_environment_scope(settings.environment):
+                graph, import_diags = resolve_import_graph(
+                    entry, lib_roots=settings.lib_roots, document_cache=self.documents
+                )
+            diagnostics.extend(import_diags)
+            if graph is None or _has_error_diagnostics(diagnostics):
+                return None, diagnostics
+            return graph, diagnostics
+
+        return self._stage(entry, "parse", build)
+
+    def patterned(
+        self, entry_file: Path
+    ) -> tuple[Optional[ProgramGraph], list[Diagnostic]]:
+        """Lower an entry file into a PatternedGraph program.
+
+        Args:
+            entry_file: Entry ASDL file.
+
+        Returns:
+            Tuple of (ProgramGraph or None, diagnostics).
+        """
+        entry = _normalize_path(entry_file)
+        inputs: dict[str, Any] = {}
+
+        def build() -> tuple[Optional[ProgramGraph], list[Diagnostic]]:
+            import_graph, diagnostics = self.parse(entry)
+            inputs["parse"] = import_graph
+            if import_graph is None:
+                return None, diagnostics
+            graph, lower_diags = build_patterned_graph_from_import_graph(import_graph)
+            diagnostics.extend(lower_diags)
+            if _has_error_diagnostics(diagnostics):
+                return None, diagnostics
+            return graph, diagnostics
+
+        return self._stage(entry, "patterned", build, inputs)
+
+    def atomized(self, entry_file: Path) -> tuple[Optional[Any], list[Diagnostic]]:
+        """Lower an entry file into an AtomizedGraph program.
+
+        Args:
+            entry_file: Entry ASDL file.
+
+        Returns:
+            Tuple of (AtomizedProgramGraph or None, diagnostics).
+        """
+        entry = _normalize_path(entry_file)
+        inputs: dict[str, Any] = {}
+
+        def build() -> tuple[Optional[Any], list[Diagnostic]]:
+            graph, diagnostics = self.patterned(entry)
+            inputs["patterned"] = graph
+            if graph is None:
+                return None, diagnostics
+            if self.verify:
+                atomized, atomized_diags = build_atomized_graph_and_verify(graph)
+            else:
+                atomized, atomized_diags = build_atomized_graph(graph)
+            diagnostics.extend(atomized_diags)
+            if _has_error_diagnostics(diagnostics):
+                return None, diagnostics
+            return atomized, diagnostics
+
+        return self._stage(entry, "atomized", build, inputs)
+
+    def netlist_ir(
+        self, entry_file: Path
+    ) -> tuple[Optional[NetlistDesign], list[Diagnostic]]:
+        """Lower an entry file into a NetlistIR design.
+
+        The result matches `run_netlist_ir_pipeline(entry_file=...)` for the
+        same library roots and verify setting.
+
+        Args:
+            entry_file: Entry ASDL file.
+
+        Returns:
+            Tuple of (NetlistIR design or None, diagnostics).
+        """
+        entry = _normalize_path(entry_file)
+        inputs: dict[str, Any] = {}
+
+        def build() -> tuple[Optional[NetlistDesign], list[Diagnostic]]:
+            atomized, diagnostics = self.atomized(entry)
+            if atomized is None:
+                return None, diagnostics
+            import_graph, _ = self.parse(entry)
+            graph, _ = self.patterned(entry)
+            if import_graph is None or graph is None:
+                # A file changed after `atomized` and no longer compiles.
+                return None, diagnostics
+            inputs.update(parse=import_graph, patterned=graph, atomized=atomized)
+            entry_doc = import_graph.documents.get(import_graph.entry_file)
+            entry_file_id = str(import_graph.entry_file)
+            design = build_netlist_ir_design(
+                atomized,
+                top_module_id=resolve_top_module_id(
+                    graph,
+                    entry_doc.top if entry_doc is not None else None,
+                    entry_file_id,
+                ),
+                entry_file_id=entry_file_id,
+            )
+            return design, diagnostics
+
+        return self._stage(entry, "netlist_ir", build, inputs)
+
+    def backend_config(
+        self, backend: str, *, entry_file: Optional[Path] = None
+    ) -> tuple[Optional[BackendConfig], list[Diagnostic]]:
+        """Load a backend config once per backend name and config path.
+
+        Args:
+            backend: Backend name from the backend config file.
+            entry_file: Optional entry file whose `.asdlrc` may select the
+                backend config path (used only when `ASDL_BACKEND_CONFIG` is
+                unset, as in the CLI).
+
+        Returns:
+            Tuple of (BackendConfig or None, diagnostics).
+        """
+        from asdl.emit.netlist import load_backend
+
+        config_path: Optional[Path] = None
+        environment = active_compile_environment()
+        if entry_file is not None:
+            settings = self._settings_for(_normalize_path(entry_file))
+            config_path = settings.backend_config_path
+            environment = settings.environment
+        if config_path is None and environment.get("ASDL_BACKEND_CONFIG"):
+            config_path = Path(environment.variables["ASDL_BACKEND_CONFIG"])
+        key = (backend, config_path)
+        with self._lock:
+            cached = self._backends.get(key)
+        if cached is not None:
+            return cached, []
+        with compile_environment_scope(environment):
+            config, diagnostics = load_backend(
+                backend, backend_config_path=config_path
+            )
+        if config is not None:
+            with self._lock:
+                self._backends[key] = config
+        return config, diagnostics
+
+    def emit(
+        self,
+        entry_file: Path,
+        *,
+        backend: str = "sim.ngspice",
+        top_as_subckt: bool = False,
+    ) -> tuple[Optional[str], list[Diagnostic]]:
+        """Compile an entry file and render its backend netlist text.
+
+        Args:
+            entry_file: Entry ASDL file.
+            backend: Backend name from the backend config file.
+            top_as_subckt: Keep the subckt wrapper for the top module.
+
+        Returns:
+            Tuple of (netlist text or None, diagnostics).
+        """
+        with _pinned_environment():
+            return self._emit(entry_file, backend, top_as_subckt)
+
+    def _emit(
+        self, entry_file: Path, backend: str, top_as_subckt: bool
+    ) -> tuple[Optional[str], list[Diagnostic]]:
+        from asdl.emit.netlist import emit_netlist
+
+        design, diagnostics = self.netlist_ir(entry_file)
+        if design is None:
+            return None, diagnostics
+        config, backend_diags = self.backend_config(backend, entry_file=entry_file)
+        diagnostics.extend(backend_diags)
+        if config is None:
+            return None, diagnostics
+        with compile_environment_scope(
+            self._settings_for(_normalize_path(entry_file)).environment
+        ):
+            text, emit_diags = emit_netlist(
+                design,
+                backend_name=backend,
+                top_as_subckt=top_as_subckt,
+                backend_config=config,
+            )
+        diagnostics.extend(emit_diags)
+        if text is None or _has_error_diagnostics(diagnostics):
+            return None, diagnostics
+        return text, diagnostics
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        """Drop cached state derived from `path`, or all state when omitted.
+
+        Args:
+            path: ASDL source, `.asdlrc` or backend config file that changed.
+        """
+        with self._lock:
+            self._invalidate(path)
+
+    def _invalidate(self, path: Optional[Path]) -> None:
+        if path is None:
+            self.documents.invalidate()
+            self._entries.clear()
+            self._rc_settings.clear()
+            self._backends.clear()
+            return
+
+        target = _normalize_path(path)
+        self.documents.invalidate(target)
+        for key in [
+            key for key, state in self._entries.items() if target in state.stamps
+        ]:
+            del self._entries[key]
+        rc_keys = [
+            key
+            for key, settings in self._rc_settings.items()
+            if settings.rc_path == target
+        ]
+        for key in rc_keys:
+            del self._rc_settings[key]
+        if rc_keys:
+            # Entries under a changed rc may resolve imports differently.
+            self._entries.clear()
+        for key in [
+            key
+            for key in self._backends
+            if key[1] is not None and _normalize_path(key[1]) == target
+        ]:
+            del self._backends[key]
+
+    def _stage(
+        self,
+        entry: Path,
+        stage: str,
+        build: Callable[[], tuple[Optional[_T], list[Diagnostic]]],
+        inputs: Optional[dict[str, Any]] = None,
+    ) -> tuple[Optional[_T], list[Diagnostic]]:
+        """Return a cached stage result for `entry` or build and cache it.
+
+        `inputs` maps the earlier stages the build used to the values it got
+        from them once the build returns.
+        """
+        with _pinned_environment():
+            return self._cached_stage(
+                entry, stage, build, {} if inputs is None else inputs
+            )
+
+    def _cached_stage(
+        self,
+        entry: Path,
+        stage: str,
+        build: Callable[[], tuple[Optional[_T], list[Diagnostic]]],
+        inputs: dict[str, Any],
+    ) -> tuple[Optional[_T], list[Diagnostic]]:
+        settings = self._settings_for(entry)
+        key = (entry, _environment_key(active_compile_environment()))
+        with self._lock:
+            state = self._entries.get(key)
+        if state is not None and (
+            state.settings is not settings or not _stamps_match(state.stamps)
+        ):
+            with self._lock:
+                if self._entries.get(key) is state:
+                    del self._entries[key]
+            state = None
+        if state is not None:
+            with self._lock:
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                cached = state.stages.get(stage)
+            if cached is not None:
+                return cached[0], list(cached[1])
+
+        value, diagnostics = build()
+        if value is None:
+            return None, diagnostics
+        with self._lock:
+            state = self._entries.get(key)
+            if state is None:
+                if stage != "parse":
+                    # Parse always succeeds first and seeds the entry state.
+                    return value, diagnostics
+                # Stamps recorded before each file was read: a file edited
+                # during the build no longer matches and is rebuilt next call.
+                documents = value.documents  # type: ignore[attr-defined]
+                state = _EntryState(
+                    settings=settings,
+                    stamps={
+                        file_id: self.documents.stamp(file_id, document)
+                        for file_id, document in documents.items()
+                    },
+                )
+                self._entries[key] = state
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            elif any(
+                state.stages.get(name, (None,))[0] is not used
+                for name, used in inputs.items()
+            ):
+                # An earlier stage was rebuilt during this build, for example
+                # after a file was edited; its result belongs to the old state.
+                return value, diagnostics
+            state.stages[stage] = (value, tuple(diagnostics))
+        return value, diagnostics
+
+    def _settings_for(self, entry: Path) -> _RcSettings:
+        """Resolve library roots and backend config path for an entry file.
+
+        Settings are cached per entry directory and active environment, and
+        reloaded when the `.asdlrc` they were read from changed.
+        """
+        environment = active_compile_environment()
+        key = (entry.parent, _environment_key(environment))
+        with self._lock:
+            cached = self._rc_settings.get(key)
+        if cached is not None and (
+            cached.rc_path is None or _file_stamp(cached.rc_path) == cached.rc_stamp
+        ):
+            return cached
+        settings = self._load_settings(entry, environment)
+        with self._lock:
+            current = self._rc_settings.get(key)
+            if current is not cached and current is not None:
+                # Another thread reloaded the same settings first.
+                return current
+            self._rc_settings[key] = settings
+        return settings
+
+    def _load_settings(
+        self, entry: Path, environment: CompileEnvironment
+    ) -> _RcSettings:
+        if not self.use_asdlrc:
+            return _RcSettings(self.lib_roots, None, None, None, (), environment)
+        from asdl.cli.config import discover_asdlrc, parse_asdlrc
+
+        rc_path = discover_asdlrc(entry)
+        if rc_path is None:
+            return _RcSettings(self.lib_roots, None, None, None, (), environment)
+        rc_path = _normalize_path(rc_path)
+        # Stamp before reading, like source files.
+        rc_stamp = _file_stamp(rc_path)
+        try:
+            rc_config = parse_asdlrc(rc_path, environ=environment.variables)
+        except (FileNotFoundError, TypeError, ValueError, yaml.YAMLError) as exc:
+            return _RcSettings(
+                self.lib_roots,
+                None,
+                rc_path,
+                rc_stamp,
+                (_diagnostic(COMPILER_CONFIG_ERROR, f"Failed to load .asdlrc: {exc}"),),
+                environment,
+            )
+        environment = environment.with_defaults(rc_config.env)
+        backend_config_path = None
+        if rc_config.backend_config and environment.get("ASDL_BACKEND_CONFIG") is None:
+            backend_config_path = rc_config.backend_config
+        return _RcSettings(
+            lib_roots=(*self.lib_roots, *rc_config.lib_roots),
+            backend_config_path=backend_config_path,
+            rc_path=rc_path,
+            rc_stamp=rc_stamp,
+            diagnostics=(),
+            environment=environment,
+        )
+
+
+@contextmanager
+def _pinned_environment() -> Iterator[CompileEnvironment]:
+    """Snapshot the live process environment for the duration of one call.
+
+    Keying caches on a snapshot is cheap for nested stages, and the call no
+    longer sees a process environment that changes halfway through it.
+    """
+    environment = active_compile_environment()
+    if environment.variables is not os.environ:
+        yield environment
+        return
+    with compile_environment_scope(CompileEnvironment.from_process()) as pinned:
+        yield pinned
+
+
+def _environment_key(environment: CompileEnvironment) -> _EnvironmentKey:
+    return frozenset(environment.variables.items())
+
+
+def _stamps_match(stamps: dict[Path, Optional[_FileStamp]]) -> bool:
+    return all(_file_stamp(file_id) == stamp for file_id, stamp in stamps.items())
+
+
+def _file_stamp(path: Path) -> Optional[_FileStamp]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _normalize_path(path: Path | str) -> Path:
+    return Path(os.path.abspath(os.path.expanduser(str(path))))
+
+
+def _has_error_diagnostics(diagnostics: Iterable[Diagnostic]) -> bool:
+    return any(
+        diagnostic.severity in (Severity.ERROR, Severity.FATAL)
+        for diagnostic in diagnostics
+    )
+
+
+def _diagnostic(code: str, message: str) -> Diagnostic:
+    return Diagnostic(
+        code=code,
+        severity=Severity.ERROR,
+        message=message,
+        primary_span=None,
+        notes=[NO_SPAN_NOTE],
+        source="compiler",
+    )
+
+
+__all__ = ["COMPILER_CONFIG_ERROR", "Compiler"]
@@ -40,8 +40,21 @@ from .graph import (
     NetId,
     ProgramGraph,
 )
-from .hierarchy import HierarchyEntry, traverse_hierarchy
+from .hierarchy import (
+    HierarchyEntry,
+    HierarchyRollup,
+    HierarchyStats,
+    iter_hierarchy,
+    rollup_hierarchy,
+    traverse_hierarchy,
+)
 from .index import GraphIndex
+from .net_trace import (
+    NetConnectivityIndex,
+    NetTraceEquivalent,
+    NetTraceOccurrence,
+    NetTracePin,
+)
 from .query import DesignQuery, query
 from .pipeline import run_patterned_graph_pipeline
 from .registries import (
@@ -108,12 +121,18 @@ __all__ = [
     "GroupSlice",
     "GraphIndex",
     "HierarchyEntry",
+    "HierarchyRollup",
+    "HierarchyStats",
     "InstanceBundle",
     "InstId",
     "ModuleGraph",
     "ModuleId",
     "NetBundle",
     "NetId",
+    "NetConnectivityIndex",
+    "NetTraceEquivalent",
+    "NetTraceOccurrence",
+    "NetTracePin",
     "ParamPatternOriginIndex",
     "PatternExpr",
     "PatternExprKind",
@@ -133,6 +152,8 @@ __all__ = [
     "query",
     "RegistrySet",
     "run_patterned_graph_pipeline",
+    "iter_hierarchy",
+    "rollup_hierarchy",
     "traverse_hierarchy",
     "SchematicHints",
     "SourceSpanIndex",
@@ -3,12 +3,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Union
 
-from asdl.emit.netlist_ir import NetlistDesign, NetlistModule
+from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
 from asdl.core.symbol_resolution import index_symbols, select_symbol
 from asdl.core.top_resolution import PERMISSIVE_TOP_POLICY, resolve_top_symbol
 
+_ModuleKey = tuple[Optional[str], str]
+
 
 @dataclass(frozen=True)
 class HierarchyEntry:
@@ -33,6 +35,42 @@ class HierarchyEntry:
     is_device: bool
 
 
+@dataclass(frozen=True)
+class HierarchyRollup:
+    """Flattened totals for the hierarchy below one module definition.
+
+    Attributes:
+        instance_count: Flattened instance occurrences below the module.
+        device_counts: Flattened device-instance counts keyed by device ref.
+        module_counts: Flattened module-instance counts keyed by module ref.
+        max_depth: Deepest instance depth relative to the module (0 if empty).
+    """
+
+    instance_count: int
+    device_counts: dict[str, int]
+    module_counts: dict[str, int]
+    max_depth: int
+
+
+@dataclass(frozen=True)
+class HierarchyStats:
+    """Roll-up statistics for the hierarchy rooted at the resolved top.
+
+    Attributes:
+        top: Resolved top module, or None when no top resolves.
+        total: Roll-up for the top module.
+        subtrees: Roll-up per reachable module keyed by `(file_id, name)`.
+            With cyclic hierarchies, the roll-up of the first occurrence.
+        occurrences: Flattened occurrence count per reachable module key; the
+            top counts once.
+    """
+
+    top: Optional[NetlistModule]
+    total: HierarchyRollup
+    subtrees: dict[tuple[Optional[str], str], HierarchyRollup]
+    occurrences: dict[tuple[Optional[str], str], int]
+
+
 def traverse_hierarchy(
     design: NetlistDesign,
     *,
@@ -55,33 +93,167 @@ def traverse_hierarchy(
         Deterministically ordered hierarchy entries.
     """
 
+    return list(iter_hierarchy(design, include_devices=include_devices, order=order))
+
+
+def iter_hierarchy(
+    design: NetlistDesign,
+    *,
+    include_devices: bool,
+    order: str = "dfs-pre",
+    max_depth: Optional[int] = None,
+    path_prefixes: Optional[Iterable[str]] = None,
+    predicate: Optional[Callable[[HierarchyEntry], bool]] = None,
+    skip_subtree: Optional[Callable[[HierarchyEntry], bool]] = None,
+) -> Iterator[HierarchyEntry]:
+    """Lazily traverse a NetlistIR hierarchy with optional pruning.
+
+    Yields the same rows, in the same order, as ``traverse_hierarchy`` using an
+    explicit stack, so hierarchy depth is not bounded by the interpreter
+    recursion limit and callers can stop early.
+
+    Args:
+        design: Design to traverse.
+        include_devices: Include device-referencing instances when True.
+        order: Traversal order. Only `"dfs-pre"` is supported in v0.
+        max_depth: Optional maximum entry depth; deeper rows are neither
+            yielded nor visited.
+        path_prefixes: Optional hierarchy paths; only rows at or below one of
+            them are yielded, and branches that cannot reach one are pruned.
+        predicate: Optional row filter. Rows failing it are not yielded, but
+            their subtrees are still visited.
+        skip_subtree: Optional callback; when it returns True for a visited
+            row, that row's children are not visited.
+
+    Yields:
+        Deterministically ordered hierarchy entries.
+    """
+
     if order != "dfs-pre":
         raise ValueError(f"Unsupported hierarchy traversal order: {order!r}")
 
     top = resolve_top_module(design)
     if top is None:
-        return []
+        return
 
     modules_by_key, modules_by_name = index_symbols(design.modules)
     devices_by_key, devices_by_name = index_symbols(design.devices)
+    prefixes = None if path_prefixes is None else tuple(path_prefixes)
+    if prefixes is not None and top.name in prefixes:
+        prefixes = None
+
+    top_key: tuple[Optional[str], str] = (top.file_id, top.name)
+    ancestry: list[tuple[Optional[str], str]] = [top_key]
+    ancestry_keys = {top_key}
+    stack: list[tuple[Iterator[NetlistInstance], str, int]] = [
+        (iter(top.instances), top.name, 0)
+    ]
+    while stack:
+        instances, parent_path, parent_depth = stack[-1]
+        instance = next(instances, None)
+        if instance is None:
+            stack.pop()
+            ancestry_keys.discard(ancestry.pop())
+            continue
+
+        depth = parent_depth + 1
+        if max_depth is not None and depth > max_depth:
+            continue
+        full_path = f"{parent_path}.{instance.name}"
+        in_scope = True
+        if prefixes is not None:
+            in_scope = any(_is_within(full_path, prefix) for prefix in prefixes)
+            if not in_scope and not any(
+                prefix.startswith(f"{full_path}.") for prefix in prefixes
+            ):
+                continue
 
-    entries: list[HierarchyEntry] = []
+        target_module = select_symbol(
+            symbols_by_name=modules_by_name,
+            symbols_by_key=modules_by_key,
+            name=instance.ref,
+            file_id=instance.ref_file_id,
+        )
+        is_device = False
+        if target_module is None:
+            target_device = select_symbol(
+                symbols_by_name=devices_by_name,
+                symbols_by_key=devices_by_key,
+                name=instance.ref,
+                file_id=instance.ref_file_id,
+            )
+            if target_device is None or not include_devices:
+                continue
+            is_device = True
+
+        entry = HierarchyEntry(
+            path=full_path,
+            parent_path=parent_path,
+            instance=instance.name,
+            ref=instance.ref,
+            ref_file_id=instance.ref_file_id,
+            depth=depth,
+            is_device=is_device,
+        )
+        if in_scope and (predicate is None or predicate(entry)):
+            yield entry
+
+        if target_module is None:
+            continue
+        target_key: tuple[Optional[str], str] = (target_module.file_id, target_module.name)
+        if target_key in ancestry_keys:
+            continue
+        if max_depth is not None and depth >= max_depth:
+            continue
+        if skip_subtree is not None and skip_subtree(entry):
+            continue
+        stack.append((iter(target_module.instances), full_path, depth))
+        ancestry.append(target_key)
+        ancestry_keys.add(target_key)
+
+
+def rollup_hierarchy(design: NetlistDesign) -> HierarchyStats:
+    """Compute flattened hierarchy statistics without enumerating occurrences.
+
+    Each module's totals are computed once from its own instances and the
+    memoized totals of the modules it references, so cost scales with the
+    number of module definitions and instance declarations rather than the
+    flattened occurrence count. Counting matches ``traverse_hierarchy`` with
+    ``include_devices=True``: unresolved refs are skipped and cycle edges are
+    counted as leaves.
 
-    def _visit(
-        module: NetlistModule,
-        parent_path: str,
-        ancestry: tuple[tuple[Optional[str], str], ...],
-    ) -> None:
-        for instance in module.instances:
-            full_path = f"{parent_path}.{instance.name}"
+    Args:
+        design: Design to summarize.
 
+    Returns:
+        Roll-up statistics for the resolved top module.
+    """
+
+    top = resolve_top_module(design)
+    if top is None:
+        return HierarchyStats(
+            top=None,
+            total=HierarchyRollup(0, {}, {}, 0),
+            subtrees={},
+            occurrences={},
+        )
+
+    modules_by_key, modules_by_name = index_symbols(design.modules)
+    devices_by_key, devices_by_name = index_symbols(design.devices)
+    root: _ModuleKey = (top.file_id, top.name)
+    modules: dict[_ModuleKey, NetlistModule] = {root: top}
+    edges: dict[_ModuleKey, tuple[tuple[str, Optional[_ModuleKey]], ...]] = {}
+    pending = [root]
+    while pending:
+        key = pending.pop()
+        module_edges: list[tuple[str, Optional[_ModuleKey]]] = []
+        for instance in modules[key].instances:
             target_module = select_symbol(
                 symbols_by_name=modules_by_name,
                 symbols_by_key=modules_by_key,
                 name=instance.ref,
                 file_id=instance.ref_file_id,
             )
-            is_device = False
             if target_module is None:
                 target_device = select_symbol(
                     symbols_by_name=devices_by_name,
@@ -89,32 +261,122 @@ def traverse_hierarchy(
                     name=instance.ref,
                     file_id=instance.ref_file_id,
                 )
-                if target_device is None or not include_devices:
-                    continue
-                is_device = True
-
-            entries.append(
-                HierarchyEntry(
-                    path=full_path,
-                    parent_path=parent_path,
-                    instance=instance.name,
-                    ref=instance.ref,
-                    ref_file_id=instance.ref_file_id,
-                    depth=full_path.count("."),
-                    is_device=is_device,
-                )
-            )
+                if target_device is not None:
+                    module_edges.append((instance.ref, None))
+                continue
+            child: _ModuleKey = (target_module.file_id, target_module.name)
+            module_edges.append((instance.ref, child))
+            if child not in modules:
+                modules[child] = target_module
+                pending.append(child)
+        edges[key] = tuple(module_edges)
 
-            if target_module is None:
+    acyclic = _is_acyclic(root, edges)
+    memo: dict[object, tuple[HierarchyRollup, dict[_ModuleKey, int]]] = {}
+    first_memo_key: dict[_ModuleKey, object] = {}
+
+    def _memo_key(
+        key: _ModuleKey, ancestry: frozenset[_ModuleKey]
+    ) -> Union[_ModuleKey, tuple[_ModuleKey, frozenset[_ModuleKey]]]:
+        # Without cycles a module's totals do not depend on its ancestry.
+        return key if acyclic else (key, ancestry)
+
+    stack: list[tuple[_ModuleKey, frozenset[_ModuleKey]]] = [(root, frozenset((root,)))]
+    while stack:
+        key, ancestry = stack[-1]
+        memo_key = _memo_key(key, ancestry)
+        if memo_key in memo:
+            stack.pop()
+            continue
+        first_memo_key.setdefault(key, memo_key)
+
+        missing = [
+            (child, ancestry | {child})
+            for _ref, child in edges[key]
+            if child is not None
+            and child not in ancestry
+            and _memo_key(child, ancestry | {child}) not in memo
+        ]
+        if missing:
+            stack.extend(reversed(missing))
+            continue
+
+        stack.pop()
+        instance_count = 0
+        device_counts: dict[str, int] = {}
+        module_counts: dict[str, int] = {}
+        key_counts: dict[_ModuleKey, int] = {}
+        max_depth = 0
+        for ref, child in edges[key]:
+            instance_count += 1
+            max_depth = max(max_depth, 1)
+            if child is None:
+                device_counts[ref] = device_counts.get(ref, 0) + 1
                 continue
-            target_key: tuple[Optional[str], str] = (target_module.file_id, target_module.name)
-            if target_key in ancestry:
+            module_counts[ref] = module_counts.get(ref, 0) + 1
+            key_counts[child] = key_counts.get(child, 0) + 1
+            if child in ancestry:
                 continue
-            _visit(target_module, full_path, ancestry + (target_key,))
+            child_rollup, child_key_counts = memo[_memo_key(child, ancestry | {child})]
+            instance_count += child_rollup.instance_count
+            max_depth = max(max_depth, child_rollup.max_depth + 1)
+            _merge_counts(device_counts, child_rollup.device_counts)
+            _merge_counts(module_counts, child_rollup.module_counts)
+            _merge_counts(key_counts, child_key_counts)
+        memo[memo_key] = (
+            HierarchyRollup(
+                instance_count=instance_count,
+                device_counts=device_counts,
+                module_counts=module_counts,
+                max_depth=max_depth,
+            ),
+            key_counts,
+        )
 
-    top_key: tuple[Optional[str], str] = (top.file_id, top.name)
-    _visit(top, top.name, (top_key,))
-    return entries
+    total, root_key_counts = memo[_memo_key(root, frozenset((root,)))]
+    occurrences = {key: root_key_counts.get(key, 0) for key in modules}
+    occurrences[root] += 1
+    return HierarchyStats(
+        top=top,
+        total=total,
+        subtrees={key: memo[first_memo_key[key]][0] for key in first_memo_key},
+        occurrences=occurrences,
+    )
+
+
+def _merge_counts(target: dict, source: dict) -> None:
+    """Add `source` counts into `target` in place."""
+    for key, count in source.items():
+        target[key] = target.get(key, 0) + count
+
+
+def _is_acyclic(
+    root: _ModuleKey,
+    edges: dict[_ModuleKey, tuple[tuple[str, Optional[_ModuleKey]], ...]],
+) -> bool:
+    """Return whether no module reachable from `root` references an ancestor."""
+    indegree: dict[_ModuleKey, int] = {key: 0 for key in edges}
+    for module_edges in edges.values():
+        for _ref, child in module_edges:
+            if child is not None:
+                indegree[child] += 1
+    ready = [root] if indegree[root] == 0 else []
+    visited = 0
+    while ready:
+        key = ready.pop()
+        visited += 1
+        for _ref, child in edges[key]:
+            if child is None:
+                continue
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                ready.append(child)
+    return visited == len(edges)
+
+
+def _is_within(full_path: str, scope_path: str) -> bool:
+    """Return whether `full_path` equals or descends from `scope_path`."""
+    return full_path == scope_path or full_path.startswith(f"{scope_path}.")
 
 
 def resolve_top_module(design: NetlistDesign) -> Optional[NetlistModule]:
@@ -128,4 +390,12 @@ def resolve_top_module(design: NetlistDesign) -> Optional[NetlistModule]:
     return result.symbol
 
 
-__all__ = ["HierarchyEntry", "resolve_top_module", "traverse_hierarchy"]
+__all__ = [
+    "HierarchyEntry",
+    "HierarchyRollup",
+    "HierarchyStats",
+    "iter_hierarchy",
+    "resolve_top_module",
+    "rollup_hierarchy",
+    "traverse_hierarchy",
+]
@@ -0,0 +1,531 @@
+"""Cross-hierarchy net tracing over NetlistIR port connectivity."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator, Literal, Optional
+
+from asdl.core.hierarchy import iter_hierarchy, resolve_top_module
+from asdl.core.symbol_resolution import index_symbols, select_symbol
+from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
+
+ModuleKey = tuple[Optional[str], str]
+TraceDirection = Literal["up", "down", "both"]
+
+
+@dataclass(frozen=True)
+class ModuleNetClass:
+    """One internally connected net class of a module definition.
+
+    Nets are joined when they attach to ports of a child module that are
+    connected inside that child, transitively through the hierarchy.
+
+    Attributes:
+        index: Class identifier, unique within the module.
+        nets: Member net names in module declaration order.
+        device_pins: `(instance, terminal, ref)` for device-instance pins
+            attached to the class, in instance/connection order.
+        child_links: `(instance_index, instance, ref, child, child_class)` for
+            module instances attached to the class, one per child class.
+    """
+
+    index: int
+    nets: tuple[str, ...]
+    device_pins: tuple[tuple[str, str, str], ...]
+    child_links: tuple[tuple[int, str, str, ModuleKey, int], ...]
+
+
+@dataclass(frozen=True)
+class ModuleNetClasses:
+    """Net classes of one module definition.
+
+    Attributes:
+        module: Module definition.
+        class_by_net: Class identifier for each net name.
+        classes: Classes ordered by first member net.
+    """
+
+    module: NetlistModule
+    class_by_net: dict[str, int]
+    classes: tuple[ModuleNetClass, ...]
+
+    def net_class(self, net: str) -> Optional[ModuleNetClass]:
+        """Return the class containing `net`, or None for unknown nets."""
+        index = self.class_by_net.get(net)
+        return None if index is None else self.classes[index]
+
+
+@dataclass(frozen=True)
+class NetTraceOccurrence:
+    """One module occurrence along a hierarchy path.
+
+    Attributes:
+        path: Hierarchy path of the occurrence (top name for the root).
+        module: Key of the occurrence's module definition.
+        ref: Symbol used to reference the module (top name for the root).
+        position: Instance declaration indices from the root.
+    """
+
+    path: str
+    module: ModuleKey
+    ref: str
+    position: tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class NetTraceEquivalent:
+    """Nets equivalent to the traced net within one module occurrence.
+
+    Attributes:
+        occurrence: Module occurrence holding the nets.
+        nets: Equivalent net names in module declaration order.
+        relation: `self` for the anchor, `up` for ancestors of the anchor,
+            `down` for all other occurrences.
+    """
+
+    occurrence: NetTraceOccurrence
+    nets: tuple[str, ...]
+    relation: str
+
+
+@dataclass(frozen=True)
+class NetTracePin:
+    """One leaf device pin on the traced net.
+
+    Attributes:
+        instance_path: Full hierarchy path of the device instance.
+        instance: Device instance leaf name.
+        terminal: Device port name.
+        ref: Referenced device symbol.
+    """
+
+    instance_path: str
+    instance: str
+    terminal: str
+    ref: str
+
+
+class NetConnectivityIndex:
+    """Per-module net connectivity, computed once per module definition.
+
+    Each module's union-find over its nets is computed on first use from its
+    own instance connections and the already-computed classes of the modules
+    it instantiates. Traces then expand only the occurrences they reach, so no
+    flattened netlist is built.
+
+    Hierarchy cycles are cut at the back edge: a module instance that would
+    re-enter a module still being summarized contributes no connectivity.
+    """
+
+    def __init__(self, design: NetlistDesign) -> None:
+        self.design = design
+        self._modules_by_key, self._modules_by_name = index_symbols(design.modules)
+        self._devices_by_key, self._devices_by_name = index_symbols(design.devices)
+        self._classes: dict[ModuleKey, ModuleNetClasses] = {}
+
+    def resolve_module(self, instance: NetlistInstance) -> Optional[NetlistModule]:
+        """Return the module referenced by `instance`, if any."""
+        return select_symbol(
+            symbols_by_name=self._modules_by_name,
+            symbols_by_key=self._modules_by_key,
+            name=instance.ref,
+            file_id=instance.ref_file_id,
+        )
+
+    def is_device(self, instance: NetlistInstance) -> bool:
+        """Return whether `instance` references a known device."""
+        return (
+            select_symbol(
+                symbols_by_name=self._devices_by_name,
+                symbols_by_key=self._devices_by_key,
+                name=instance.ref,
+                file_id=instance.ref_file_id,
+            )
+            is not None
+        )
+
+    def module_classes(self, module: NetlistModule) -> ModuleNetClasses:
+        """Return net classes for `module`, summarizing children first.
+
+        Args:
+            module: Module definition to summarize.
+
+        Returns:
+            Memoized net classes for the module.
+        """
+        root: ModuleKey = (module.file_id, module.name)
+        if root in self._classes:
+            return self._classes[root]
+
+        in_progress: set[ModuleKey] = set()
+        stack: list[NetlistModule] = [module]
+        while stack:
+            current = stack[-1]
+            key = (current.file_id, current.name)
+            if key in self._classes:
+                stack.pop()
+                continue
+            in_progress.add(key)
+            pending = []
+            for instance in current.instances:
+                child = self.resolve_module(instance)
+                if child is None:
+                    continue
+                child_key = (child.file_id, child.name)
+                if child_key not in self._classes and child_key not in in_progress:
+                    pending.append(child)
+            if pending:
+                stack.extend(reversed(pending))
+                continue
+            stack.pop()
+            in_progress.discard(key)
+            self._classes[key] = self._summarize(current)
+        return self._classes[root]
+
+    def _summarize(self, module: NetlistModule) -> ModuleNetClasses:
+        """Union nets of `module` through its children's port classes."""
+        order: dict[str, int] = {}
+        for name in [net.name for net in module.nets] + list(module.ports):
+            order.setdefault(name, len(order))
+        for instance in module.instances:
+            for conn in instance.conns:
+                order.setdefault(conn.net, len(order))
+        parent = list(range(len(order)))
+
+        def _find(node: int) -> int:
+            while parent[node] != node:
+                parent[node] = parent[parent[node]]
+                node = parent[node]
+            return node
+
+        # Resolved child summaries per instance; cut cycle edges have none.
+        targets: list[Optional[tuple[NetlistModule, ModuleNetClasses]]] = []
+        for instance in module.instances:
+            child = self.resolve_module(instance)
+            child_classes = (
+                self._classes.get((child.file_id, child.name))
+                if child is not None
+                else None
+            )
+            targets.append(
+                (child, child_classes)
+                if child is not None and child_classes is not None
+                else None
+            )
+            if child_classes is None:
+                continue
+            first_by_class: dict[int, int] = {}
+            for conn in instance.conns:
+                class_index = child_classes.class_by_net.get(conn.port)
+                if class_index is None:
+                    continue
+                node = order[conn.net]
+                first = first_by_class.setdefault(class_index, node)
+                root_a, root_b = _find(first), _find(node)
+                if root_a != root_b:
+                    parent[max(root_a, root_b)] = min(root_a, root_b)
+
+        members: dict[int, list[str]] = {}
+        for name, node in order.items():
+            members.setdefault(_find(node), []).append(name)
+        class_by_root = {root: index for index, root in enumerate(sorted(members))}
+        pins: list[list[tuple[str, str, str]]] = [[] for _ in class_by_root]
+        links: list[dict[tuple[int, int], tuple[int, str, str, ModuleKey, int]]] = [
+            {} for _ in class_by_root
+        ]
+        for instance_index, instance in enumerate(module.instances):
+            target = targets[instance_index]
+            if target is None and not self.is_device(instance):
+                continue
+            for conn in instance.conns:
+                class_index = class_by_root[_find(order[conn.net])]
+                if target is None:
+                    pins[class_index].append((instance.name, conn.port, instance.ref))
+                    continue
+                child, child_classes = target
+                child_class = child_classes.class_by_net.get(conn.port)
+                if child_class is None:
+                    continue
+                links[class_index].setdefault(
+                    (instance_index, child_class),
+                    (
+                        instance_index,
+                        instance.name,
+                        instance.ref,
+                        (child.file_id, child.name),
+                        child_class,
+                    ),
+                )
+
+        classes = tuple(
+            ModuleNetClass(
+                index=class_by_root[root],
+                nets=tuple(members[root]),
+                device_pins=tuple(pins[class_by_root[root]]),
+                child_links=tuple(links[class_by_root[root]].values()),
+            )
+            for root in sorted(members)
+        )
+        return ModuleNetClasses(
+            module=module,
+            class_by_net={
+                name: class_by_root[_find(node)] for name, node in order.items()
+            },
+            classes=classes,
+        )
+
+    def resolve_occurrences(self, path: str) -> Optional[list[NetTraceOccurrence]]:
+        """Return the module occurrence chain from the root to `path`.
+
+        Args:
+            path: Dot-separated module occurrence path rooted at the top name.
+
+        Returns:
+            Root-to-anchor occurrences, or None when `path` does not name a
+            module occurrence.
+        """
+        top = resolve_top_module(self.design)
+        if top is None:
+            return None
+        segments = path.split(".")
+        if segments[0] != top.name:
+            return None
+        chain = [
+            NetTraceOccurrence(
+                path=top.name, module=(top.file_id, top.name), ref=top.name, position=()
+            )
+        ]
+        module = top
+        ancestry = {chain[0].module}
+        for segment in segments[1:]:
+            if module is None:
+                return None
+            found = next(
+                (
+                    (index, instance)
+                    for index, instance in enumerate(module.instances)
+                    if instance.name == segment
+                ),
+                None,
+            )
+            if found is None:
+                return None
+            index, instance = found
+            child = self.resolve_module(instance)
+            if child is None:
+                return None
+            key = (child.file_id, child.name)
+            previous = chain[-1]
+            chain.append(
+                NetTraceOccurrence(
+                    path=f"{previous.path}.{segment}",
+                    module=key,
+                    ref=instance.ref,
+                    position=previous.position + (index,),
+                )
+            )
+            # Cycle edges are leaves: their occurrence has no children.
+            module = None if key in ancestry else child
+            ancestry.add(key)
+        return chain
+
+    def trace(
+        self,
+        chain: list[NetTraceOccurrence],
+        net: str,
+        *,
+        direction: TraceDirection = "both",
+    ) -> Optional[tuple[list[NetTraceEquivalent], list[NetTracePin]]]:
+        """Trace `net` from the last occurrence of `chain` across the hierarchy.
+
+        The full equivalence class is found by climbing port boundaries toward
+        the root and expanding each reached class into the subtrees it
+        connects to. `direction` then filters it: `down` keeps the anchor and
+        its descendants, `up` keeps the anchor and its ancestors.
+
+        Args:
+            chain: Root-to-anchor occurrences from ``resolve_occurrences``.
+            net: Net name in the anchor module.
+            direction: `up`, `down` or `both`.
+
+        Returns:
+            `(equivalents, pins)` with one equivalent per occurrence, in
+            discovery order, or None when `net` is not a net of the anchor
+            module.
+        """
+        anchor = chain[-1]
+        anchor_module = self._modules_by_key.get(anchor.module)
+        if anchor_module is None:
+            return None
+        anchor_class = self.module_classes(anchor_module).net_class(net)
+        if anchor_class is None:
+            return None
+
+        found: dict[str, tuple[NetTraceOccurrence, set[str]]] = {}
+        pins: list[NetTracePin] = []
+        ancestry = tuple(occurrence.module for occurrence in chain)
+        # A cycle-edge occurrence is a leaf; only its local pins are traced.
+        anchor_is_leaf = anchor.module in ancestry[:-1]
+        self._expand_down(
+            anchor, anchor_class, ancestry, None, anchor_is_leaf, found, pins
+        )
+
+        current_class = anchor_class
+        for depth in range(len(chain) - 1, 0, -1):
+            child_occurrence = chain[depth]
+            parent_occurrence = chain[depth - 1]
+            parent_module = self._modules_by_key[parent_occurrence.module]
+            instance_index = child_occurrence.position[-1]
+            instance = parent_module.instances[instance_index]
+            child_ports = set(self._modules_by_key[child_occurrence.module].ports)
+            parent_net = next(
+                (
+                    conn.net
+                    for conn in instance.conns
+                    if conn.port in current_class.nets and conn.port in child_ports
+                ),
+                None,
+            )
+            if parent_net is None:
+                break
+            parent_class = self.module_classes(parent_module).net_class(parent_net)
+            if parent_class is None:
+                break
+            self._expand_down(
+                parent_occurrence,
+                parent_class,
+                ancestry[:depth],
+                (instance_index, current_class.index),
+                False,
+                found,
+                pins,
+            )
+            current_class = parent_class
+
+        anchor_path = anchor.path
+        equivalents: list[NetTraceEquivalent] = []
+        for path, (occurrence, nets) in found.items():
+            if path == anchor_path:
+                relation = "self"
+            elif anchor_path.startswith(f"{path}."):
+                relation = "up"
+            else:
+                relation = "down"
+            if direction == "up" and relation == "down":
+                continue
+            if direction == "down" and not (
+                relation == "self" or path.startswith(f"{anchor_path}.")
+            ):
+                continue
+            declared = self._classes[occurrence.module].class_by_net
+            equivalents.append(
+                NetTraceEquivalent(
+                    occurrence=occurrence,
+                    nets=tuple(name for name in declared if name in nets),
+                    relation=relation,
+                )
+            )
+        kept = {equivalent.occurrence.path for equivalent in equivalents}
+        pins = [
+            pin for pin in pins if pin.instance_path.rsplit(".", 1)[0] in kept
+        ]
+        return equivalents, pins
+
+    def _expand_down(
+        self,
+        occurrence: NetTraceOccurrence,
+        net_class: ModuleNetClass,
+        ancestry: tuple[ModuleKey, ...],
+        skip_link: Optional[tuple[int, int]],
+        is_leaf: bool,
+        found: dict[str, tuple[NetTraceOccurrence, set[str]]],
+        pins: list[NetTracePin],
+    ) -> None:
+        """Record `net_class` at `occurrence` and every class it reaches below.
+
+        `skip_link` names the `(instance_index, child_class)` link already
+        traced from below, so climbing does not revisit it.
+        """
+        stack: list[
+            tuple[NetTraceOccurrence, ModuleNetClass, tuple[ModuleKey, ...]]
+        ] = [(occurrence, net_class, ancestry)]
+        while stack:
+            current, current_class, current_ancestry = stack.pop()
+            found.setdefault(current.path, (current, set()))[1].update(
+                current_class.nets
+            )
+            pins.extend(_local_pins(current, current_class))
+            if current is occurrence and is_leaf:
+                continue
+            children = []
+            for index, instance, ref, child, child_class in current_class.child_links:
+                if current is occurrence and (index, child_class) == skip_link:
+                    continue
+                if child in current_ancestry:
+                    continue
+                children.append(
+                    (
+                        NetTraceOccurrence(
+                            path=f"{current.path}.{instance}",
+                            module=child,
+                            ref=ref,
+                            position=current.position + (index,),
+                        ),
+                        self._classes[child].classes[child_class],
+                        current_ancestry + (child,),
+                    )
+                )
+            stack.extend(reversed(children))
+
+
+def iter_module_occurrences(
+    index: NetConnectivityIndex, ref: str
+) -> Iterator[NetTraceOccurrence]:
+    """Yield module occurrences referenced by `ref` in DFS preorder.
+
+    The root occurrence matches when `ref` equals the top module name.
+
+    Args:
+        index: Connectivity index for the design.
+        ref: Exact module symbol to match.
+
+    Yields:
+        Matching occurrences; callers may stop early.
+    """
+    top = resolve_top_module(index.design)
+    if top is None:
+        return
+    if top.name == ref:
+        yield NetTraceOccurrence(
+            path=top.name, module=(top.file_id, top.name), ref=top.name, position=()
+        )
+    for entry in iter_hierarchy(index.design, include_devices=False):
+        if entry.ref != ref:
+            continue
+        chain = index.resolve_occurrences(entry.path)
+        if chain is not None:
+            yield chain[-1]
+
+
+def _local_pins(
+    occurrence: NetTraceOccurrence, net_class: ModuleNetClass
+) -> Iterator[NetTracePin]:
+    for instance, terminal, ref in net_class.device_pins:
+        yield NetTracePin(
+            instance_path=f"{occurrence.path}.{instance}",
+            instance=instance,
+            terminal=terminal,
+            ref=ref,
+        )
+
+
+__all__ = [
+    "ModuleNetClass",
+    "ModuleNetClasses",
+    "NetConnectivityIndex",
+    "NetTraceEquivalent",
+    "NetTraceOccurrence",
+    "NetTracePin",
+    "TraceDirection",
+    "iter_module_occurrences",
+]
@@ -3,12 +3,13 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-import os
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import yaml
 
+from asdl.compile_environment import active_compile_environment
+from asdl.compile_stats import count
 from asdl.diagnostics import Diagnostic, Severity, format_code
 
 MISSING_BACKEND = format_code("EMIT", 4)
@@ -25,10 +26,16 @@ REQUIRED_SYSTEM_DEVICES = {
 }
 
 # Optional system devices (backends MAY define these)
-OPTIONAL_SYSTEM_DEVICES: set[str] = set()
+OPTIONAL_SYSTEM_DEVICES: set[str] = {
+    "__include__",
+}
 
 DEFAULT_PATTERN_RENDERING = "{N}"
 
+# Parsed backend config files keyed by absolute path; entries are reused while
+# the file's modification time and size are unchanged.
+_CONFIG_DATA_CACHE: Dict[Path, tuple[tuple[int, int], Any]] = {}
+
 
 @dataclass(frozen=True)
 class SystemDeviceTemplate:
@@ -46,6 +53,8 @@ class BackendConfig:
     comment_prefix: str
     templates: Dict[str, SystemDeviceTemplate]
     pattern_rendering: str = DEFAULT_PATTERN_RENDERING
+    multiplicity_param: Optional[str] = None
+    array_rendering: Optional[str] = None
 
 
 def load_backend_config(
@@ -67,7 +76,7 @@ def load_backend_config(
         yaml.YAMLError: If YAML is malformed
     """
     if config_path is None:
-        env_path = os.environ.get("ASDL_BACKEND_CONFIG")
+        env_path = active_compile_environment().get("ASDL_BACKEND_CONFIG")
         if env_path:
             config_path = Path(env_path)
         else:
@@ -76,8 +85,7 @@ def load_backend_config(
     if not config_path.exists():
         raise FileNotFoundError(f"Backend config file not found: {config_path}")
 
-    with open(config_path, "r") as f:
-        data = yaml.safe_load(f)
+    data = _load_config_data(config_path)
 
     if backend_name not in data:
         raise KeyError(
@@ -102,6 +110,8 @@ def load_backend_config(
     )
     if pattern_rendering is None:
         pattern_rendering = DEFAULT_PATTERN_RENDERING
+    multiplicity_param = backend_data.get("multiplicity_param")
+    array_rendering = backend_data.get("array_rendering")
 
     if not isinstance(templates_raw, dict):
         raise TypeError(
@@ -111,6 +121,19 @@ def load_backend_config(
         raise TypeError(
             f"Backend '{backend_name}' pattern_rendering must be a string"
         )
+    if multiplicity_param is not None and not isinstance(multiplicity_param, str):
+        raise TypeError(
+            f"Backend '{backend_name}' multiplicity_param must be a string"
+        )
+    if array_rendering is not None and (
+        not isinstance(array_rendering, str)
+        or "{start}" not in array_rendering
+        or "{end}" not in array_rendering
+    ):
+        raise TypeError(
+            f"Backend '{backend_name}' array_rendering must be a string "
+            "containing {start} and {end}"
+        )
 
     templates = {
         name: SystemDeviceTemplate(template=template)
@@ -123,9 +146,30 @@ def load_backend_config(
         comment_prefix=comment_prefix,
         templates=templates,
         pattern_rendering=pattern_rendering,
+        multiplicity_param=multiplicity_param,
+        array_rendering=array_rendering,
     )
 
 
+def _load_config_data(config_path: Path) -> Any:
+    """Return the parsed YAML content of a backend config file.
+
+    Repeated loads of an unchanged file (same mtime and size) reuse the first
+    parse, so long-lived processes read each backend config once.
+    """
+    stat = config_path.stat()
+    stamp = (stat.st_mtime_ns, stat.st_size)
+    key = config_path.absolute()
+    cached = _CONFIG_DATA_CACHE.get(key)
+    if cached is not None and cached[0] == stamp:
+        count("backend_config_cache_hits")
+        return cached[1]
+    with open(config_path, "r") as f:
+        data = yaml.safe_load(f)
+    _CONFIG_DATA_CACHE[key] = (stamp, data)
+    return data
+
+
 def validate_system_devices(config: BackendConfig) -> List[Diagnostic]:
     """Validate that all required system devices are present.
 
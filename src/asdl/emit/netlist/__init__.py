@@ -1,3 +1,23 @@
-from .api import EmitOptions, emit_netlist, load_backend
+from .api import EmitOptions, emit_netlist, emit_netlist_split, load_backend
+from .parallel_fold import ParallelFoldEntry, fold_parallel_devices
+from .render import (
+    EmissionPlan,
+    SplitNetlist,
+    SplitSubcktFile,
+    build_emission_name_map,
+    build_emission_plan,
+)
 
-__all__ = ["EmitOptions", "emit_netlist", "load_backend"]
+__all__ = [
+    "EmissionPlan",
+    "EmitOptions",
+    "ParallelFoldEntry",
+    "SplitNetlist",
+    "SplitSubcktFile",
+    "build_emission_name_map",
+    "build_emission_plan",
+    "emit_netlist",
+    "emit_netlist_split",
+    "fold_parallel_devices",
+    "load_backend",
+]
@@ -12,7 +12,12 @@ from asdl.emit.backend_config import BackendConfig, load_backend_config
 from asdl.emit.netlist_ir import NetlistDesign
 
 from .diagnostics import MISSING_BACKEND, _diagnostic, _has_error_diagnostics
-from .render import _emit_design
+from .render import (
+    EmissionPlan,
+    SplitNetlist,
+    _emit_design,
+    _emit_split_netlist_ir_design,
+)
 from .verify import _run_netlist_verification
 
 
@@ -50,7 +55,86 @@ def emit_netlist(
     backend_config_path: Optional[Path] = None,
     backend_config: Optional[BackendConfig] = None,
     emit_timestamp: Optional[datetime] = None,
+    emission_plan: Optional[EmissionPlan] = None,
 ) -> Tuple[Optional[str], List[Diagnostic]]:
+    options, diagnostics = _prepare_emit_options(
+        design,
+        backend_name=backend_name,
+        top_as_subckt=top_as_subckt,
+        backend_config_path=backend_config_path,
+        backend_config=backend_config,
+        emit_timestamp=emit_timestamp,
+    )
+    if options is None:
+        return None, diagnostics
+    netlist, emit_diags = _emit_design(design, options, emission_plan)
+    diagnostics.extend(emit_diags)
+    if netlist is None or _has_error_diagnostics(diagnostics):
+        return None, diagnostics
+
+    return netlist, diagnostics
+
+
+def emit_netlist_split(
+    design: NetlistDesign,
+    *,
+    include_dir: str,
+    backend_name: str = "sim.ngspice",
+    top_as_subckt: bool = False,
+    backend_config_path: Optional[Path] = None,
+    backend_config: Optional[BackendConfig] = None,
+    emit_timestamp: Optional[datetime] = None,
+    emission_plan: Optional[EmissionPlan] = None,
+) -> Tuple[Optional[SplitNetlist], List[Diagnostic]]:
+    """Emit a top file plus one file per emitted subckt.
+
+    The top file renders `__include__` for each subckt file using the path
+    `<include_dir>/<emitted_name><extension>` (escaped and de-duplicated as
+    described in `SplitSubcktFile`), so the backend must define the optional
+    `__include__` system device.
+
+    Args:
+        design: NetlistIR design to emit.
+        include_dir: Subckt file directory relative to the top file.
+        backend_name: Backend identifier.
+        top_as_subckt: Whether the top module is emitted as a subckt.
+        backend_config_path: Optional backend config path.
+        backend_config: Optional preloaded backend config.
+        emit_timestamp: Optional timestamp for header/footer placeholders.
+        emission_plan: Optional precomputed emission plan for `design`.
+
+    Returns:
+        Tuple of the split netlist (None on error) and diagnostics.
+    """
+    options, diagnostics = _prepare_emit_options(
+        design,
+        backend_name=backend_name,
+        top_as_subckt=top_as_subckt,
+        backend_config_path=backend_config_path,
+        backend_config=backend_config,
+        emit_timestamp=emit_timestamp,
+    )
+    if options is None:
+        return None, diagnostics
+    split, emit_diags = _emit_split_netlist_ir_design(
+        design, options, include_dir=include_dir, plan=emission_plan
+    )
+    diagnostics.extend(emit_diags)
+    if split is None or _has_error_diagnostics(diagnostics):
+        return None, diagnostics
+    return split, diagnostics
+
+
+def _prepare_emit_options(
+    design: NetlistDesign,
+    *,
+    backend_name: str,
+    top_as_subckt: bool,
+    backend_config_path: Optional[Path],
+    backend_config: Optional[BackendConfig],
+    emit_timestamp: Optional[datetime],
+) -> Tuple[Optional[EmitOptions], List[Diagnostic]]:
+    """Load the backend, verify the design, and build emission options."""
     diagnostics: List[Diagnostic] = []
 
     if backend_config is None:
@@ -74,9 +158,4 @@ def emit_netlist(
         backend_config=backend_config,
         emit_timestamp=emit_timestamp or datetime.now(),
     )
-    netlist, emit_diags = _emit_design(design, options)
-    diagnostics.extend(emit_diags)
-    if netlist is None or _has_error_diagnostics(diagnostics):
-        return None, diagnostics
-
-    return netlist, diagnostics
+    return options, diagnostics
@@ -32,6 +32,7 @@ INSTANCE_VARIABLE_OVERRIDE = format_code("EMIT", 12)
 VARIABLE_KEY_COLLISION = format_code("EMIT", 13)
 EMISSION_NAME_COLLISION = format_code("EMIT", 14)
 PROVENANCE_METADATA_WARNING = format_code("EMIT", 15)
+SPLIT_FILE_NAME_CONFLICT = format_code("EMIT", 16)
 
 
 def _emit_diagnostic(
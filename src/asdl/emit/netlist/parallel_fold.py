@@ -0,0 +1,222 @@
+"""Opt-in NetlistIR pass folding parallel device instances into multiplicity."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional, Tuple
+
+from asdl.core.symbol_resolution import index_symbols, select_symbol
+from asdl.emit.netlist_ir import (
+    NetlistBackend,
+    NetlistDesign,
+    NetlistDevice,
+    NetlistInstance,
+    NetlistModule,
+)
+
+from .templates import _template_field_roots
+
+_FoldKey = Tuple[
+    str,
+    str,
+    str,
+    int,
+    Tuple[Tuple[str, str], ...],
+    Tuple[Tuple[str, str], ...],
+]
+
+
+@dataclass(frozen=True)
+class ParallelFoldEntry:
+    """One group of parallel device instances folded into a single instance.
+
+    Attributes:
+        module: Module symbol containing the folded instances.
+        file_id: Module source file identifier.
+        instance: Literal name of the kept (first) instance.
+        ref: Referenced device symbol.
+        expression_id: Pattern expression the folded instances came from.
+        members: Literal names of every folded instance, in declaration order.
+        multiplicity: Multiplicity factor written to the kept instance.
+    """
+
+    module: str
+    file_id: str
+    instance: str
+    ref: str
+    expression_id: str
+    members: Tuple[str, ...]
+    multiplicity: int
+
+
+def fold_parallel_devices(
+    design: NetlistDesign,
+    *,
+    backend_name: str,
+    multiplicity_param: str,
+) -> Tuple[NetlistDesign, Tuple[ParallelFoldEntry, ...]]:
+    """Fold pattern-expanded parallel device instances into one instance.
+
+    Instances fold together when they share a module, the same pattern
+    expression (`pattern_origin.expression_id` and segment), the same device
+    reference, identical port-to-net connections and identical params. The
+    first instance of each group is kept in place, retaining its name and
+    `PatternOrigin`; its multiplicity param is set to the group size times the
+    effective per-instance multiplicity. Remaining members are dropped.
+
+    Devices are eligible only when the selected backend template consumes the
+    multiplicity param (directly or via `{params}`), the param is declared on
+    the device or backend, and its effective value is an integer literal.
+    Non-patterned instances are never folded.
+
+    Args:
+        design: NetlistIR design to rewrite.
+        backend_name: Backend used to select device templates.
+        multiplicity_param: Device param carrying the multiplicity factor.
+
+    Returns:
+        Tuple of the rewritten design (the input design when nothing folds)
+        and fold entries in module/declaration order.
+    """
+    devices_by_key, devices_by_name = index_symbols(design.devices)
+    modules_by_key, modules_by_name = index_symbols(design.modules)
+    base_by_device: Dict[int, Optional[int]] = {}
+
+    folds: List[ParallelFoldEntry] = []
+    rewritten_modules: List[NetlistModule] = []
+    changed = False
+    for module in design.modules:
+        groups: Dict[_FoldKey, List[int]] = {}
+        for position, instance in enumerate(module.instances):
+            origin = instance.pattern_origin
+            if origin is None:
+                continue
+            if select_symbol(
+                symbols_by_key=modules_by_key,
+                symbols_by_name=modules_by_name,
+                name=instance.ref,
+                file_id=instance.ref_file_id,
+            ) is not None:
+                continue
+            device = select_symbol(
+                symbols_by_key=devices_by_key,
+                symbols_by_name=devices_by_name,
+                name=instance.ref,
+                file_id=instance.ref_file_id,
+            )
+            if device is None:
+                continue
+            if id(device) not in base_by_device:
+                base_by_device[id(device)] = _device_base_multiplicity(
+                    device, backend_name, multiplicity_param
+                )
+            if base_by_device[id(device)] is None:
+                continue
+            key: _FoldKey = (
+                instance.ref,
+                instance.ref_file_id,
+                origin.expression_id,
+                origin.segment_index,
+                tuple(sorted((conn.port, conn.net) for conn in instance.conns)),
+                tuple(sorted((instance.params or {}).items())),
+            )
+            groups.setdefault(key, []).append(position)
+
+        replacements: Dict[int, NetlistInstance] = {}
+        dropped: set[int] = set()
+        for positions in groups.values():
+            if len(positions) < 2:
+                continue
+            kept = module.instances[positions[0]]
+            device = select_symbol(
+                symbols_by_key=devices_by_key,
+                symbols_by_name=devices_by_name,
+                name=kept.ref,
+                file_id=kept.ref_file_id,
+            )
+            kept_params = kept.params or {}
+            if multiplicity_param in kept_params:
+                per_instance = _parse_multiplicity(kept_params[multiplicity_param])
+            else:
+                per_instance = base_by_device[id(device)]
+            if per_instance is None:
+                continue
+            multiplicity = per_instance * len(positions)
+            params = dict(kept_params)
+            params[multiplicity_param] = str(multiplicity)
+            replacements[positions[0]] = replace(kept, params=params)
+            dropped.update(positions[1:])
+            folds.append(
+                ParallelFoldEntry(
+                    module=module.name,
+                    file_id=module.file_id,
+                    instance=kept.name,
+                    ref=kept.ref,
+                    expression_id=kept.pattern_origin.expression_id,
+                    members=tuple(module.instances[pos].name for pos in positions),
+                    multiplicity=multiplicity,
+                )
+            )
+
+        if not replacements:
+            rewritten_modules.append(module)
+            continue
+        changed = True
+        instances = [
+            replacements.get(position, instance)
+            for position, instance in enumerate(module.instances)
+            if position not in dropped
+        ]
+        rewritten_modules.append(replace(module, instances=instances))
+
+    if not changed:
+        return design, ()
+    return replace(design, modules=rewritten_modules), tuple(folds)
+
+
+def _device_base_multiplicity(
+    device: NetlistDevice, backend_name: str, multiplicity_param: str
+) -> Optional[int]:
+    """Return the default multiplicity for a foldable device, else None."""
+    backend = _select_backend(device, backend_name)
+    if backend is None:
+        return None
+    try:
+        placeholders = _template_field_roots(backend.template)
+    except ValueError:
+        return None
+    if multiplicity_param not in placeholders and "params" not in placeholders:
+        return None
+    if backend.props and multiplicity_param in backend.props:
+        return None
+    if backend.params and multiplicity_param in backend.params:
+        return _parse_multiplicity(backend.params[multiplicity_param])
+    if device.params and multiplicity_param in device.params:
+        return _parse_multiplicity(device.params[multiplicity_param])
+    return None
+
+
+def _select_backend(
+    device: NetlistDevice, backend_name: str
+) -> Optional[NetlistBackend]:
+    """Select a device backend definition by name."""
+    for backend in device.backends:
+        if backend.name == backend_name:
+            return backend
+    return None
+
+
+def _parse_multiplicity(value: Optional[str]) -> Optional[int]:
+    """Parse a positive integer multiplicity literal."""
+    if value is None:
+        return None
+    try:
+        parsed = int(str(value).strip())
+    except ValueError:
+        return None
+    if parsed < 1:
+        return None
+    return parsed
+
+
+__all__ = ["ParallelFoldEntry", "fold_parallel_devices"]
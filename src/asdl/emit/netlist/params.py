@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from dataclasses import dataclass
 from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
 try:
@@ -75,17 +76,63 @@ def _merge_params(
     Returns:
         Merged parameters, formatted params string, and diagnostics.
     """
-    diagnostics: List[Diagnostic] = []
+    order = _param_layer_order(device_params, backend_params)
+    base: Dict[str, str] = {}
+    base.update(device_params)
+    base.update(backend_params)
+    return _apply_instance_param_layer(
+        order,
+        frozenset(order),
+        base,
+        inst_params,
+        instance_name=instance_name,
+        device_name=device_name,
+        loc=loc,
+        emit_warnings=emit_warnings,
+    )
+
+
+def _param_layer_order(
+    device_params: Mapping[str, str], backend_params: Mapping[str, str]
+) -> Tuple[str, ...]:
+    """Return emitted param order: device keys, then new backend keys."""
     order: List[str] = list(device_params.keys())
+    seen = set(order)
     for key in backend_params.keys():
-        if key not in order:
+        if key not in seen:
             order.append(key)
-    allowed = set(order)
+            seen.add(key)
+    return tuple(order)
+
+
+def _apply_instance_param_layer(
+    order: Tuple[str, ...],
+    allowed: frozenset[str],
+    base_params: Mapping[str, str],
+    inst_params: Mapping[str, str],
+    *,
+    instance_name: str,
+    device_name: str,
+    loc: LocationAttr | None = None,
+    emit_warnings: bool = True,
+) -> Tuple[Dict[str, str], str, List[Diagnostic]]:
+    """Apply instance overrides on top of a precomputed device/backend layer.
 
-    merged: Dict[str, str] = {}
-    merged.update(device_params)
-    merged.update(backend_params)
+    Args:
+        order: Emitted param key order.
+        allowed: Param keys instances may override.
+        base_params: Device params already overridden by backend params.
+        inst_params: Instance parameter overrides.
+        instance_name: Instance name for diagnostics.
+        device_name: Device name for diagnostics.
+        loc: Optional location for diagnostics.
+        emit_warnings: Whether to emit warnings for unknown instance params.
 
+    Returns:
+        Merged parameters, formatted params string, and diagnostics.
+    """
+    diagnostics: List[Diagnostic] = []
+    merged: Dict[str, str] = dict(base_params)
     for key, value in inst_params.items():
         if key not in allowed:
             if emit_warnings:
@@ -139,6 +186,47 @@ def _merge_variables(
     Returns:
         Merged variables and diagnostics.
     """
+    diagnostics = _variable_collision_diagnostics(
+        device_vars,
+        backend_vars,
+        device_param_keys=device_param_keys,
+        backend_param_keys=backend_param_keys,
+        backend_prop_keys=backend_prop_keys,
+        device_name=device_name,
+        device_loc=device_loc,
+        backend_loc=backend_loc,
+    )
+    variable_keys = set(device_vars) | set(backend_vars)
+    diagnostics.extend(
+        _variable_override_diagnostics(
+            variable_keys,
+            instance_params,
+            instance_name=instance_name,
+            device_name=device_name,
+            instance_loc=instance_loc,
+        )
+    )
+
+    merged = dict(device_vars)
+    merged.update(backend_vars)
+    return merged, diagnostics
+
+
+def _variable_collision_diagnostics(
+    device_vars: Mapping[str, str],
+    backend_vars: Mapping[str, str],
+    *,
+    device_param_keys: Iterable[str],
+    backend_param_keys: Iterable[str],
+    backend_prop_keys: Iterable[str],
+    device_name: str,
+    device_loc: LocationAttr | None = None,
+    backend_loc: LocationAttr | None = None,
+) -> List[Diagnostic]:
+    """Report variables that collide with param or backend prop keys.
+
+    The result depends only on the device/backend pair, never on the instance.
+    """
     diagnostics: List[Diagnostic] = []
     param_keys = set(device_param_keys) | set(backend_param_keys)
     prop_keys = set(backend_prop_keys)
@@ -177,21 +265,137 @@ def _merge_variables(
                     backend_loc or loc,
                 )
             )
+    return diagnostics
 
-    overrides = set(instance_params) & set(variable_sources)
-    for key in sorted(overrides):
-        diagnostics.append(
-            _diagnostic(
-                INSTANCE_VARIABLE_OVERRIDE,
-                (
-                    f"Instance '{instance_name}' overrides variable '{key}' on "
-                    f"device '{device_name}'"
-                ),
-                Severity.ERROR,
-                instance_loc,
-            )
+
+def _variable_override_diagnostics(
+    variable_keys: Iterable[str],
+    instance_params: Mapping[str, str],
+    *,
+    instance_name: str,
+    device_name: str,
+    instance_loc: LocationAttr | None = None,
+) -> List[Diagnostic]:
+    """Report instance params that attempt to override device variables."""
+    overrides = set(instance_params) & set(variable_keys)
+    return [
+        _diagnostic(
+            INSTANCE_VARIABLE_OVERRIDE,
+            (
+                f"Instance '{instance_name}' overrides variable '{key}' on "
+                f"device '{device_name}'"
+            ),
+            Severity.ERROR,
+            instance_loc,
         )
+        for key in sorted(overrides)
+    ]
 
-    merged = dict(device_vars)
-    merged.update(backend_vars)
-    return merged, diagnostics
+
+@dataclass(frozen=True)
+class _DeviceBackendTable:
+    """Instance-independent merge layers for one (device, backend) pair.
+
+    Everything except the instance override layer is constant per pair, so
+    emission builds this once and reuses it for every instance line.
+
+    Attributes:
+        device_name: Device symbol name used in diagnostics.
+        param_order: Emitted param key order (device keys, then backend keys).
+        allowed_params: Param keys that instances may override.
+        base_params: Device params overridden by backend params.
+        variables: Device variables overridden by backend variables.
+        variable_keys: Variable keys instances must not override.
+        props: Backend props.
+        collision_diagnostics: Variable collision diagnostics for the pair.
+    """
+
+    device_name: str
+    param_order: Tuple[str, ...]
+    allowed_params: frozenset[str]
+    base_params: Dict[str, str]
+    variables: Dict[str, str]
+    variable_keys: frozenset[str]
+    props: Dict[str, str]
+    collision_diagnostics: Tuple[Diagnostic, ...]
+
+    def merge_instance_params(
+        self,
+        inst_params: Mapping[str, str],
+        *,
+        instance_name: str,
+        emit_warnings: bool = True,
+    ) -> Tuple[Dict[str, str], str, List[Diagnostic]]:
+        """Apply the instance layer; mirrors `_merge_params` output."""
+        return _apply_instance_param_layer(
+            self.param_order,
+            self.allowed_params,
+            self.base_params,
+            inst_params,
+            instance_name=instance_name,
+            device_name=self.device_name,
+            emit_warnings=emit_warnings,
+        )
+
+    def variable_diagnostics(
+        self, inst_params: Mapping[str, str], *, instance_name: str
+    ) -> List[Diagnostic]:
+        """Return per-instance variable diagnostics; mirrors `_merge_variables`."""
+        diagnostics = list(self.collision_diagnostics)
+        if inst_params:
+            diagnostics.extend(
+                _variable_override_diagnostics(
+                    self.variable_keys,
+                    inst_params,
+                    instance_name=instance_name,
+                    device_name=self.device_name,
+                )
+            )
+        return diagnostics
+
+
+def _build_device_backend_table(
+    device_params: Mapping[str, str],
+    backend_params: Mapping[str, str],
+    device_vars: Mapping[str, str],
+    backend_vars: Mapping[str, str],
+    props: Mapping[str, str],
+    *,
+    device_name: str,
+) -> _DeviceBackendTable:
+    """Precompute the constant merge layers for one (device, backend) pair.
+
+    Args:
+        device_params: Device-level parameter defaults.
+        backend_params: Backend-level parameter overrides.
+        device_vars: Device-level variables.
+        backend_vars: Backend-level variables.
+        props: Backend props.
+        device_name: Device name for diagnostics.
+
+    Returns:
+        Reusable merge table for instance emission.
+    """
+    order = _param_layer_order(device_params, backend_params)
+    base_params: Dict[str, str] = dict(device_params)
+    base_params.update(backend_params)
+    variables: Dict[str, str] = dict(device_vars)
+    variables.update(backend_vars)
+    collisions = _variable_collision_diagnostics(
+        device_vars,
+        backend_vars,
+        device_param_keys=device_params.keys(),
+        backend_param_keys=backend_params.keys(),
+        backend_prop_keys=props.keys(),
+        device_name=device_name,
+    )
+    return _DeviceBackendTable(
+        device_name=device_name,
+        param_order=order,
+        allowed_params=frozenset(order),
+        base_params=base_params,
+        variables=variables,
+        variable_keys=frozenset(variables),
+        props=dict(props),
+        collision_diagnostics=tuple(collisions),
+    )
@@ -1,19 +1,23 @@
 from __future__ import annotations
 
-import os
 import re
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Dict, Iterable, List, Mapping, Optional, Tuple
 
+from asdl.compile_environment import active_compile_environment
+from asdl.compile_stats import count
+from asdl.instrumentation import span
 from asdl.diagnostics import Diagnostic, Severity
 from asdl.diagnostics.collector import DiagnosticCollector
 from asdl.emit.backend_config import BackendConfig
 from asdl.emit.netlist_ir import (
     NetlistBackend,
+    NetlistConn,
     NetlistDesign,
     NetlistDevice,
     NetlistInstance,
     NetlistModule,
+    NetlistNet,
     PatternExpressionTable as NetlistPatternExpressionTable,
     PatternOrigin as NetlistPatternOrigin,
 )
@@ -25,6 +29,7 @@ from .diagnostics import (
     MISSING_TOP,
     MISSING_CONN,
     PROVENANCE_METADATA_WARNING,
+    SPLIT_FILE_NAME_CONFLICT,
     UNKNOWN_CONN_PORT,
     UNKNOWN_REFERENCE,
     UNRESOLVED_ENV_VAR,
@@ -35,7 +40,11 @@ from .ir_utils import (
     _build_netlist_ir_index,
     _select_netlist_ir_symbol,
 )
-from .params import _dict_attr_to_strings, _merge_params, _merge_variables
+from .params import (
+    _DeviceBackendTable,
+    _build_device_backend_table,
+    _dict_attr_to_strings,
+)
 from .templates import (
     _escape_braced_env_vars,
     _restore_braced_env_vars,
@@ -44,10 +53,132 @@ from .templates import (
 )
 
 
+@dataclass(frozen=True)
+class _DeviceEmissionPlan:
+    """Cached per (device, backend) emission inputs.
+
+    Attributes:
+        table: Precomputed device/backend param and variable layers.
+        escaped_template: Backend template with braced env vars escaped.
+        env_vars: Escaped env-var placeholders to restore after formatting.
+        placeholders: Template placeholder roots, or None when malformed.
+    """
+
+    table: _DeviceBackendTable
+    escaped_template: str
+    env_vars: Dict[str, str]
+    placeholders: Optional[set[str]]
+
+
+@dataclass(frozen=True)
+class _InstanceArrayPlan:
+    """Array instance statements planned for one module.
+
+    Attributes:
+        arrays: Synthetic array instance keyed by its first member position.
+        skipped: Positions of the remaining members, which emit no line.
+    """
+
+    arrays: Dict[int, NetlistInstance]
+    skipped: frozenset[int]
+
+
+@dataclass(frozen=True)
+class EmissionPlan:
+    """Emission scope computed once per design and shared by consumers.
+
+    The plan holds the symbol index, the modules reachable from the resolved
+    top in emission order, and the collision-free emitted module names. The
+    renderer, the compile-log name map and `asdlc query` all read it instead of
+    re-walking the design.
+
+    Attributes:
+        design: Design the plan was computed for.
+        index: NetlistIR symbol lookup tables.
+        top_module: Resolved top module.
+        reachable_modules: Modules reachable from the top, in emission order.
+        module_emitted_names: Emitted names keyed by module identity.
+        diagnostics: Provenance and name-collision diagnostics from planning.
+    """
+
+    design: NetlistDesign
+    index: "NetlistIRIndex"
+    top_module: NetlistModule
+    reachable_modules: List[NetlistModule]
+    module_emitted_names: Dict[int, str]
+    diagnostics: Tuple[Diagnostic, ...] = ()
+
+    def emitted_name(self, module: NetlistModule) -> str:
+        """Return the emitted name for a module (its symbol if unplanned)."""
+        return _module_emitted_name_ir(module, self.module_emitted_names)
+
+    def name_map(self) -> List[EmissionNameMapEntry]:
+        """Return logical/base/emitted name entries in emission order."""
+        return _emission_name_entries(
+            self.reachable_modules, self.module_emitted_names
+        )
+
+
+@dataclass(frozen=True)
+class _RenderedModule:
+    """Rendered line block for one emitted module."""
+
+    module: NetlistModule
+    emitted_name: str
+    lines: List[str]
+    is_subckt: bool
+
+
+@dataclass(frozen=True)
+class _RenderedNetlist:
+    """Rendered netlist header, module blocks in emission order, and footer."""
+
+    header: Optional[str]
+    modules: List[_RenderedModule]
+    footer: Optional[str]
+
+
+@dataclass(frozen=True)
+class SplitSubcktFile:
+    """One subckt definition file produced by split emission.
+
+    Attributes:
+        symbol: Logical module symbol.
+        file_id: Module source file identifier.
+        emitted_name: Emitted subckt name.
+        file_name: File name: the emitted name with path separators escaped,
+            a `__<n>` suffix when it equals an earlier name ignoring case,
+            and the backend extension.
+        text: Rendered subckt definition.
+    """
+
+    symbol: str
+    file_id: Optional[str]
+    emitted_name: str
+    file_name: str
+    text: str
+
+
+@dataclass(frozen=True)
+class SplitNetlist:
+    """Split emission result: a top file plus one file per emitted subckt.
+
+    Attributes:
+        top: Top file text (header, `__include__` lines, top body, footer).
+        subckts: Subckt files in emission order.
+    """
+
+    top: str
+    subckts: Tuple[SplitSubcktFile, ...]
+
+
 @dataclass(frozen=True)
 class _NetlistIRSymbolMaps:
     index: "NetlistIRIndex"
     module_emitted_names: Dict[int, str]
+    device_plans: Dict[Tuple[int, str], _DeviceEmissionPlan] = field(
+        default_factory=dict
+    )
 
 
 @dataclass(frozen=True)
@@ -66,6 +197,7 @@ _MODULE_SYMBOL_PATTERN = re.compile(
     r"^(?P<cell>[A-Za-z_][A-Za-z0-9_]*)(?:@(?P<view>[A-Za-z_][A-Za-z0-9_]*))?$"
 )
 _SANITIZE_TOKEN_PATTERN = re.compile(r"[^A-Za-z0-9_]+")
+_UNSAFE_FILE_NAME_PATTERN = re.compile(r"[/\\\x00]")
 _MAX_PORT_PREVIEW = 8
 _MAX_PORT_MATCH_SCAN = 200
 
@@ -106,49 +238,181 @@ def _case_insensitive_match(
     return match
 
 def _emit_design(
-    design: NetlistDesign, options: "EmitOptions"
+    design: NetlistDesign,
+    options: "EmitOptions",
+    plan: Optional[EmissionPlan] = None,
 ) -> Tuple[Optional[str], List[Diagnostic]]:
     """Render a NetlistIR design into a netlist string."""
-    return _emit_netlist_ir_design(design, options)
+    return _emit_netlist_ir_design(design, options, plan)
 
 
 def _emit_netlist_ir_design(
-    design: NetlistDesign, options: "EmitOptions"
+    design: NetlistDesign,
+    options: "EmitOptions",
+    plan: Optional[EmissionPlan] = None,
 ) -> Tuple[Optional[str], List[Diagnostic]]:
     """Render a NetlistIR design into a netlist string."""
-    diagnostics: List[Diagnostic] = []
-    collector = DiagnosticCollector()
+    rendered, diagnostics = _render_netlist_ir_sections(design, options, plan)
+    if rendered is None:
+        return None, diagnostics
+    lines: List[str] = []
+    if rendered.header:
+        lines.append(rendered.header)
+    for section in rendered.modules:
+        lines.extend(section.lines)
+    if rendered.footer:
+        lines.append(rendered.footer)
+    return "\n".join(lines), diagnostics
 
-    entry_file_id = design.entry_file_id
 
-    index = _build_netlist_ir_index(design, collector)
-    diagnostics.extend(collector.to_list())
-    if index is None:
+def _emit_split_netlist_ir_design(
+    design: NetlistDesign,
+    options: "EmitOptions",
+    *,
+    include_dir: str,
+    plan: Optional[EmissionPlan] = None,
+) -> Tuple[Optional[SplitNetlist], List[Diagnostic]]:
+    """Render a NetlistIR design into a top file plus one file per subckt.
+
+    Args:
+        design: NetlistIR design to render.
+        options: Emission options.
+        include_dir: Directory of subckt files relative to the top file.
+        plan: Optional precomputed emission plan for `design`.
+
+    Returns:
+        Tuple of the split netlist (None on error) and diagnostics.
+    """
+    rendered, diagnostics = _render_netlist_ir_sections(design, options, plan)
+    if rendered is None:
         return None, diagnostics
 
-    top_module = _select_netlist_ir_symbol(
-        index.modules_by_name,
-        index.modules_by_key,
-        index.top_name,
-        index.top_file_id,
-    )
-    if top_module is None:
+    extension = options.backend_config.extension
+    top_lines: List[str] = []
+    if rendered.header:
+        top_lines.append(rendered.header)
+    subckts: List[SplitSubcktFile] = []
+    include_lines: List[str] = []
+    body_lines: List[str] = []
+    used_file_names: set[str] = set()
+    had_error = False
+    for section in rendered.modules:
+        if not section.is_subckt:
+            body_lines.extend(section.lines)
+            continue
+        file_name = _split_file_name(
+            section.emitted_name, extension, used_file_names, diagnostics
+        )
+        path = f"{include_dir}/{file_name}" if include_dir else file_name
+        include, include_error = _render_system_device(
+            "__include__",
+            options.backend_config,
+            {
+                "path": path,
+                "name": section.emitted_name,
+                "sym_name": section.module.name,
+                "file_id": section.module.file_id or "",
+            },
+            diagnostics,
+        )
+        had_error = had_error or include_error
+        if include:
+            include_lines.append(include)
+        subckts.append(
+            SplitSubcktFile(
+                symbol=section.module.name,
+                file_id=section.module.file_id,
+                emitted_name=section.emitted_name,
+                file_name=file_name,
+                text="\n".join(section.lines),
+            )
+        )
+    if had_error:
+        return None, diagnostics
+    top_lines.extend(include_lines)
+    top_lines.extend(body_lines)
+    if rendered.footer:
+        top_lines.append(rendered.footer)
+    split = SplitNetlist(top="\n".join(top_lines), subckts=tuple(subckts))
+    return split, diagnostics
+
+
+def _split_file_name(
+    emitted_name: str,
+    extension: str,
+    used_file_names: set[str],
+    diagnostics: List[Diagnostic],
+) -> str:
+    """Return the split file name for one subckt and record it as used.
+
+    Path separators are escaped, and a name equal to an earlier one ignoring
+    case gets a `__<n>` suffix so no two files collide on case-insensitive
+    file systems. Both changes are reported as warnings.
+
+    Args:
+        emitted_name: Emitted subckt name.
+        extension: Backend file extension.
+        used_file_names: Case-folded file names already assigned; updated.
+        diagnostics: Diagnostics list to append warnings to.
+
+    Returns:
+        File name inside the split include directory.
+    """
+    stem = _UNSAFE_FILE_NAME_PATTERN.sub("_", emitted_name)
+    if stem in ("", ".", ".."):
+        stem = f"_{stem}"
+    if stem != emitted_name:
         diagnostics.append(
             _diagnostic(
-                MISSING_TOP,
-                f"Top module '{index.top_name}' is not defined in entry file",
-                Severity.ERROR,
+                SPLIT_FILE_NAME_CONFLICT,
+                (
+                    f"Subckt '{emitted_name}' is written to '{stem}{extension}' "
+                    "because its name is not a valid file name."
+                ),
+                Severity.WARNING,
             )
         )
-        return None, diagnostics
+    file_name = f"{stem}{extension}"
+    next_suffix = 2
+    while file_name.casefold() in used_file_names:
+        file_name = f"{stem}__{next_suffix}{extension}"
+        next_suffix += 1
+    if next_suffix > 2:
+        diagnostics.append(
+            _diagnostic(
+                SPLIT_FILE_NAME_CONFLICT,
+                (
+                    f"Subckt '{emitted_name}' is written to '{file_name}' because "
+                    f"'{stem}{extension}' collides with another subckt file on "
+                    "case-insensitive file systems."
+                ),
+                Severity.WARNING,
+            )
+        )
+    used_file_names.add(file_name.casefold())
+    return file_name
 
-    reachable_modules = _collect_reachable_modules_ir(design, index, top_module)
 
-    _emit_provenance_diagnostics_ir(reachable_modules, design, index, top_module, diagnostics)
-    module_emitted_names = _build_module_emitted_names_ir(reachable_modules, diagnostics)
+def _render_netlist_ir_sections(
+    design: NetlistDesign,
+    options: "EmitOptions",
+    plan: Optional[EmissionPlan] = None,
+) -> Tuple[Optional[_RenderedNetlist], List[Diagnostic]]:
+    """Render the netlist header, per-module line blocks and footer."""
+    if plan is None or plan.design is not design:
+        plan, diagnostics = build_emission_plan(design)
+    else:
+        diagnostics = list(plan.diagnostics)
+    if plan is None:
+        return None, diagnostics
+
+    entry_file_id = design.entry_file_id
+    index = plan.index
+    top_module = plan.top_module
+    reachable_modules = plan.reachable_modules
+    module_emitted_names = plan.module_emitted_names
     top_emitted_name = _module_emitted_name_ir(top_module, module_emitted_names)
 
-    lines: List[str] = []
     had_error = False
 
     emit_context = _emit_timestamp_context(options.emit_timestamp)
@@ -165,23 +429,33 @@ def _emit_netlist_ir_design(
         header_context,
         diagnostics,
     )
-    if header:
-        lines.append(header)
     had_error = had_error or header_error
 
     symbol_maps = _NetlistIRSymbolMaps(
         index=index, module_emitted_names=module_emitted_names
     )
+    sections: List[_RenderedModule] = []
     for module in reachable_modules:
-        module_lines, module_error = _emit_netlist_ir_module(
-            module,
-            symbol_maps,
-            is_top=module is top_module,
-            options=options,
-            diagnostics=diagnostics,
+        is_top = module is top_module
+        with span("emit_module", "emission", module=module.name, file=module.file_id):
+            module_lines, module_error = _emit_netlist_ir_module(
+                module,
+                symbol_maps,
+                is_top=is_top,
+                options=options,
+                diagnostics=diagnostics,
+            )
+        sections.append(
+            _RenderedModule(
+                module=module,
+                emitted_name=_module_emitted_name_ir(module, module_emitted_names),
+                lines=module_lines,
+                is_subckt=not (is_top and not options.top_as_subckt),
+            )
         )
-        lines.extend(module_lines)
         had_error = had_error or module_error
+        count("instances_emitted", len(module.instances))
+        count("nets_emitted", len(module.nets))
 
     footer_context = {
         "backend": options.backend_name,
@@ -196,13 +470,14 @@ def _emit_netlist_ir_design(
         footer_context,
         diagnostics,
     )
-    if footer:
-        lines.append(footer)
     had_error = had_error or footer_error
 
     if had_error:
         return None, diagnostics
-    return "\n".join(lines), diagnostics
+    return (
+        _RenderedNetlist(header=header, modules=sections, footer=footer),
+        diagnostics,
+    )
 
 
 def _collect_reachable_modules_ir(
@@ -283,7 +558,14 @@ def _emit_netlist_ir_module(
             lines.append(header)
         had_error = had_error or header_error
 
-    for instance in module.instances:
+    array_plan = _plan_instance_arrays_ir(
+        module, pattern_table, options.backend_config
+    )
+    for position, instance in enumerate(module.instances):
+        if array_plan is not None:
+            if position in array_plan.skipped:
+                continue
+            instance = array_plan.arrays.get(position, instance)
         line, inst_error = _emit_netlist_ir_instance(
             instance,
             symbols,
@@ -412,34 +694,17 @@ def _emit_netlist_ir_instance(
         return None, True
     ports_str = " ".join(conns)
 
-    device_params = _dict_attr_to_strings(device.params)
-    backend_params = _dict_attr_to_strings(backend.params)
+    plan = _device_emission_plan(device, backend, ref_name, symbols.device_plans)
+    table = plan.table
     inst_params = _dict_attr_to_strings(instance.params)
-    props = _dict_attr_to_strings(backend.props)
-    merged_params, params_str, param_diags = _merge_params(
-        device_params,
-        backend_params,
+    merged_params, params_str, param_diags = table.merge_instance_params(
         inst_params,
         instance_name=instance.name,
-        device_name=ref_name,
-        loc=None,
     )
     diagnostics.extend(param_diags)
 
-    device_vars = _dict_attr_to_strings(device.variables)
-    backend_vars = _dict_attr_to_strings(backend.variables)
-    merged_vars, variable_diags = _merge_variables(
-        device_vars,
-        backend_vars,
-        device_param_keys=device_params.keys(),
-        backend_param_keys=backend_params.keys(),
-        backend_prop_keys=props.keys(),
-        instance_params=inst_params,
-        instance_name=instance.name,
-        device_name=ref_name,
-        device_loc=None,
-        backend_loc=None,
-        instance_loc=None,
+    variable_diags = table.variable_diagnostics(
+        inst_params, instance_name=instance.name
     )
     diagnostics.extend(variable_diags)
     if any(
@@ -447,20 +712,23 @@ def _emit_netlist_ir_instance(
     ):
         return None, True
 
-    template = backend.template
-    escaped_template, env_vars = _escape_braced_env_vars(template)
-    placeholders = _validate_template(template, ref_name, diagnostics, loc=None)
+    escaped_template = plan.escaped_template
+    env_vars = plan.env_vars
+    placeholders = plan.placeholders
     if placeholders is None:
+        # Replay validation so each offending instance reports the diagnostic.
+        _validate_template(backend.template, ref_name, diagnostics, loc=None)
         return None, True
 
-    props.setdefault("params", params_str)
     template_values = {
         "name": instance_name,
         "ports": ports_str,
     }
     template_values.update(merged_params)
-    template_values.update(merged_vars)
-    template_values.update(props)
+    template_values.update(table.variables)
+    template_values.update(table.props)
+    if "params" not in table.props:
+        template_values["params"] = params_str
     try:
         rendered = escaped_template.format_map(template_values)
     except KeyError as exc:
@@ -514,6 +782,45 @@ def _emit_netlist_ir_instance(
     return rendered, False
 
 
+def _device_emission_plan(
+    device: NetlistDevice,
+    backend: NetlistBackend,
+    device_name: str,
+    cache: Dict[Tuple[int, str], _DeviceEmissionPlan],
+) -> _DeviceEmissionPlan:
+    """Return the cached emission plan for one (device, backend) pair.
+
+    Device/backend params, variables, props and template parsing are constant
+    for a pair, so they are computed on first use and shared by every
+    instance line that references the device.
+    """
+    key = (id(device), backend.name)
+    plan = cache.get(key)
+    if plan is not None:
+        return plan
+    table = _build_device_backend_table(
+        _dict_attr_to_strings(device.params),
+        _dict_attr_to_strings(backend.params),
+        _dict_attr_to_strings(device.variables),
+        _dict_attr_to_strings(backend.variables),
+        _dict_attr_to_strings(backend.props),
+        device_name=device_name,
+    )
+    escaped_template, env_vars = _escape_braced_env_vars(backend.template)
+    try:
+        placeholders: Optional[set[str]] = _template_field_roots(backend.template)
+    except ValueError:
+        placeholders = None
+    plan = _DeviceEmissionPlan(
+        table=table,
+        escaped_template=escaped_template,
+        env_vars=env_vars,
+        placeholders=placeholders,
+    )
+    cache[key] = plan
+    return plan
+
+
 def _select_netlist_backend(
     device: NetlistDevice, backend_name: str
 ) -> Optional[NetlistBackend]:
@@ -585,6 +892,236 @@ def _build_net_name_map_ir(
             pattern_rendering,
         )
     return name_map
+
+
+def _plan_instance_arrays_ir(
+    module: NetlistModule,
+    pattern_table: Optional[NetlistPatternExpressionTable],
+    config: BackendConfig,
+) -> Optional[_InstanceArrayPlan]:
+    """Plan simulator-native array statements for patterned instances.
+
+    Instances group when they come from the same pattern expression segment,
+    reference the same symbol with identical params, and differ only along one
+    numeric pattern axis forming a contiguous ascending or descending range.
+    Each connection must be either the same net for every member or a net
+    pattern varying along one contiguous axis of the same length. Groups that
+    do not qualify emit one line per atom as usual.
+
+    Args:
+        module: NetlistIR module being emitted.
+        pattern_table: Module pattern expression table.
+        config: Backend configuration; arrays require `array_rendering`.
+
+    Returns:
+        Array plan, or None when the backend has no array syntax.
+    """
+    array_rendering = config.array_rendering
+    if array_rendering is None or pattern_table is None:
+        return None
+    pattern_rendering = config.pattern_rendering
+    nets_by_name = {net.name: net for net in module.nets}
+
+    buckets: Dict[Tuple[object, ...], List[int]] = {}
+    for position, instance in enumerate(module.instances):
+        origin = instance.pattern_origin
+        if origin is None:
+            continue
+        entry = pattern_table.get(origin.expression_id)
+        if entry is None or entry.kind != "inst":
+            continue
+        key = (
+            origin.expression_id,
+            origin.segment_index,
+            instance.ref,
+            instance.ref_file_id,
+            tuple(sorted((instance.params or {}).items())),
+            tuple(sorted(conn.port for conn in instance.conns)),
+        )
+        buckets.setdefault(key, []).append(position)
+
+    arrays: Dict[int, NetlistInstance] = {}
+    skipped: set[int] = set()
+    for positions in buckets.values():
+        if len(positions) < 2:
+            continue
+        origins = [module.instances[pos].pattern_origin for pos in positions]
+        axis = _array_axis_ir(origins)
+        if axis is None:
+            continue
+        groups: Dict[Tuple[object, ...], List[int]] = {}
+        for position, origin in zip(positions, origins):
+            groups.setdefault(_mask_axis(origin.pattern_parts, axis), []).append(
+                position
+            )
+        for group in groups.values():
+            if len(group) < 2:
+                continue
+            array_instance = _build_array_instance_ir(
+                [module.instances[pos] for pos in group],
+                axis,
+                nets_by_name,
+                pattern_table,
+                array_rendering,
+                pattern_rendering,
+            )
+            if array_instance is None:
+                continue
+            arrays[group[0]] = array_instance
+            skipped.update(group[1:])
+
+    if not arrays:
+        return None
+    return _InstanceArrayPlan(arrays=arrays, skipped=frozenset(skipped))
+
+
+def _build_array_instance_ir(
+    members: List[NetlistInstance],
+    axis: int,
+    nets_by_name: Mapping[str, NetlistNet],
+    pattern_table: NetlistPatternExpressionTable,
+    array_rendering: str,
+    pattern_rendering: str,
+) -> Optional[NetlistInstance]:
+    """Build the synthetic array instance for one group, or None if ineligible."""
+    first = members[0]
+    span = _contiguous_span(
+        [member.pattern_origin.pattern_parts[axis] for member in members]
+    )
+    if span is None:
+        return None
+    name = _render_array_origin_ir(
+        first.pattern_origin, axis, span, array_rendering, pattern_rendering
+    )
+    if name is None:
+        return None
+
+    member_conns = [
+        {conn.port: conn.net for conn in member.conns} for member in members
+    ]
+    conns: List[NetlistConn] = []
+    for conn in first.conns:
+        member_nets = [conn_map[conn.port] for conn_map in member_conns]
+        if all(net == conn.net for net in member_nets):
+            conns.append(conn)
+            continue
+        bus = _render_net_bus_ir(
+            [nets_by_name.get(net) for net in member_nets],
+            pattern_table,
+            array_rendering,
+            pattern_rendering,
+        )
+        if bus is None:
+            return None
+        conns.append(NetlistConn(port=conn.port, net=bus))
+
+    return NetlistInstance(
+        name=name,
+        ref=first.ref,
+        ref_file_id=first.ref_file_id,
+        params=first.params,
+        conns=conns,
+    )
+
+
+def _render_net_bus_ir(
+    nets: List[Optional[NetlistNet]],
+    pattern_table: NetlistPatternExpressionTable,
+    array_rendering: str,
+    pattern_rendering: str,
+) -> Optional[str]:
+    """Render per-member nets as one bus reference, or None if not a bus."""
+    origins: List[NetlistPatternOrigin] = []
+    for net in nets:
+        if net is None or net.pattern_origin is None:
+            return None
+        entry = pattern_table.get(net.pattern_origin.expression_id)
+        if entry is None or entry.kind != "net":
+            return None
+        origins.append(net.pattern_origin)
+    first = origins[0]
+    if any(
+        origin.expression_id != first.expression_id
+        or origin.segment_index != first.segment_index
+        for origin in origins
+    ):
+        return None
+    axis = _array_axis_ir(origins)
+    if axis is None:
+        return None
+    masked = _mask_axis(first.pattern_parts, axis)
+    if any(_mask_axis(origin.pattern_parts, axis) != masked for origin in origins):
+        return None
+    span = _contiguous_span([origin.pattern_parts[axis] for origin in origins])
+    if span is None:
+        return None
+    return _render_array_origin_ir(
+        first, axis, span, array_rendering, pattern_rendering
+    )
+
+
+def _array_axis_ir(origins: List[NetlistPatternOrigin]) -> Optional[int]:
+    """Return the innermost varying numeric pattern axis shared by origins."""
+    first = origins[0]
+    width = len(first.pattern_parts)
+    if any(
+        origin.base_name != first.base_name or len(origin.pattern_parts) != width
+        for origin in origins
+    ):
+        return None
+    for axis in reversed(range(width)):
+        values = [origin.pattern_parts[axis] for origin in origins]
+        if all(value == values[0] for value in values):
+            continue
+        if all(
+            isinstance(value, int) and not isinstance(value, bool)
+            for value in values
+        ):
+            return axis
+    return None
+
+
+def _mask_axis(parts: Iterable[object], axis: int) -> Tuple[object, ...]:
+    """Return pattern parts with one axis removed."""
+    return tuple(part for idx, part in enumerate(parts) if idx != axis)
+
+
+def _contiguous_span(values: List[object]) -> Optional[Tuple[int, int]]:
+    """Return (start, end) when values step by +1 or -1, else None."""
+    if len(values) < 2 or not all(isinstance(value, int) for value in values):
+        return None
+    step = values[1] - values[0]
+    if step not in (1, -1):
+        return None
+    for previous, current in zip(values, values[1:]):
+        if current - previous != step:
+            return None
+    return values[0], values[-1]
+
+
+def _render_array_origin_ir(
+    origin: NetlistPatternOrigin,
+    axis: int,
+    span: Tuple[int, int],
+    array_rendering: str,
+    pattern_rendering: str,
+) -> Optional[str]:
+    """Render a pattern origin with one axis replaced by an index range."""
+    try:
+        range_part = array_rendering.format_map({"start": span[0], "end": span[1]})
+    except (KeyError, ValueError):
+        return None
+    rendered_parts: list[str] = []
+    for idx, part in enumerate(origin.pattern_parts):
+        if idx == axis:
+            rendered_parts.append(range_part)
+        elif isinstance(part, int):
+            rendered_parts.append(_render_numeric_part(part, pattern_rendering))
+        else:
+            rendered_parts.append(str(part))
+    return f"{origin.base_name}{''.join(rendered_parts)}"
+
+
 def _emit_timestamp_context(emit_timestamp) -> Dict[str, str]:
     return {
         "emit_date": emit_timestamp.strftime("%Y-%m-%d"),
@@ -773,36 +1310,25 @@ def _emit_provenance_diagnostics_ir(
                 )
 
 
-def build_emission_name_map(design: NetlistDesign) -> List[EmissionNameMapEntry]:
-    """Build deterministic logical/base/emitted module-name mapping entries."""
-    modules_for_mapping = _collect_reachable_modules_for_mapping_ir(design)
-    emitted_names = _build_module_emitted_names_ir(modules_for_mapping, diagnostics=None)
-    entries: List[EmissionNameMapEntry] = []
-    for module in modules_for_mapping:
-        base_name = _realization_name_from_symbol(module.name)
-        emitted_name = emitted_names[_module_key_ir(module)]
-        entries.append(
-            EmissionNameMapEntry(
-                symbol=module.name,
-                file_id=module.file_id,
-                base_name=base_name,
-                emitted_name=emitted_name,
-                renamed=emitted_name != base_name,
-            )
-        )
-    return entries
-
+def build_emission_plan(
+    design: NetlistDesign,
+) -> Tuple[Optional[EmissionPlan], List[Diagnostic]]:
+    """Compute the emission scope and emitted module names for a design.
 
-def _collect_reachable_modules_for_mapping_ir(design: NetlistDesign) -> List[NetlistModule]:
-    """Collect modules to include in compile-log emission-name mapping.
+    Args:
+        design: NetlistIR design to plan.
 
-    This mirrors emission scoping: map entries and collision allocation are
-    based on modules reachable from the final resolved top realization.
+    Returns:
+        Tuple of the emission plan (None when the top cannot be resolved) and
+        diagnostics, including the planning diagnostics stored on the plan.
     """
+    diagnostics: List[Diagnostic] = []
     collector = DiagnosticCollector()
+
     index = _build_netlist_ir_index(design, collector)
+    diagnostics.extend(collector.to_list())
     if index is None:
-        return list(design.modules)
+        return None, diagnostics
 
     top_module = _select_netlist_ir_symbol(
         index.modules_by_name,
@@ -811,9 +1337,71 @@ def _collect_reachable_modules_for_mapping_ir(design: NetlistDesign) -> List[Net
         index.top_file_id,
     )
     if top_module is None:
-        return list(design.modules)
+        diagnostics.append(
+            _diagnostic(
+                MISSING_TOP,
+                f"Top module '{index.top_name}' is not defined in entry file",
+                Severity.ERROR,
+            )
+        )
+        return None, diagnostics
+
+    reachable_modules = _collect_reachable_modules_ir(design, index, top_module)
+
+    _emit_provenance_diagnostics_ir(reachable_modules, design, index, top_module, diagnostics)
+    module_emitted_names = _build_module_emitted_names_ir(reachable_modules, diagnostics)
+    plan = EmissionPlan(
+        design=design,
+        index=index,
+        top_module=top_module,
+        reachable_modules=reachable_modules,
+        module_emitted_names=module_emitted_names,
+        diagnostics=tuple(diagnostics),
+    )
+    return plan, diagnostics
+
+
+def build_emission_name_map(
+    design: NetlistDesign, plan: Optional[EmissionPlan] = None
+) -> List[EmissionNameMapEntry]:
+    """Build deterministic logical/base/emitted module-name mapping entries.
+
+    Entries mirror emission scoping (modules reachable from the resolved top).
+    When the top cannot be resolved, every design module is mapped.
+
+    Args:
+        design: NetlistIR design to map.
+        plan: Optional precomputed emission plan for `design`.
 
-    return _collect_reachable_modules_ir(design, index, top_module)
+    Returns:
+        Name-map entries in emission order.
+    """
+    if plan is None or plan.design is not design:
+        plan, _ = build_emission_plan(design)
+    if plan is not None:
+        return plan.name_map()
+    modules = list(design.modules)
+    return _emission_name_entries(modules, _build_module_emitted_names_ir(modules))
+
+
+def _emission_name_entries(
+    modules: List[NetlistModule], emitted_names: Dict[int, str]
+) -> List[EmissionNameMapEntry]:
+    """Build name-map entries for modules with allocated emitted names."""
+    entries: List[EmissionNameMapEntry] = []
+    for module in modules:
+        base_name = _realization_name_from_symbol(module.name)
+        emitted_name = emitted_names[_module_key_ir(module)]
+        entries.append(
+            EmissionNameMapEntry(
+                symbol=module.name,
+                file_id=module.file_id,
+                base_name=base_name,
+                emitted_name=emitted_name,
+                renamed=emitted_name != base_name,
+            )
+        )
+    return entries
 
 
 def _ordered_conns_netlist_ir(
@@ -975,7 +1563,7 @@ def _collapse_whitespace(rendered: str) -> str:
 
 
 def _expand_env_vars(rendered: str) -> Tuple[Optional[str], Optional[List[str]]]:
-    expanded = os.path.expandvars(rendered)
+    expanded = active_compile_environment().expandvars(rendered)
     if _ENV_VAR_PATTERN.search(rendered) and _ENV_VAR_PATTERN.search(expanded):
         unresolved = sorted(
             {match.group(0) for match in _ENV_VAR_PATTERN.finditer(expanded)}
@@ -15,7 +15,11 @@ except ModuleNotFoundError:
 
 from asdl.diagnostics import Diagnostic, Severity
 from asdl.diagnostics.collector import DiagnosticCollector
-from asdl.emit.backend_config import BackendConfig, REQUIRED_SYSTEM_DEVICES
+from asdl.emit.backend_config import (
+    BackendConfig,
+    OPTIONAL_SYSTEM_DEVICES,
+    REQUIRED_SYSTEM_DEVICES,
+)
 
 from .diagnostics import (
     MALFORMED_TEMPLATE,
@@ -33,6 +37,7 @@ SYSTEM_DEVICE_REQUIRED_PLACEHOLDERS: Dict[str, set[str]] = {
     "__subckt_call_params__": {"name", "ports", "ref", "params"},
     "__netlist_header__": set(),
     "__netlist_footer__": set(),
+    "__include__": {"path"},
 }
 
 SYSTEM_DEVICE_ALLOWED_PLACEHOLDERS: Dict[str, set[str]] = {
@@ -57,6 +62,7 @@ SYSTEM_DEVICE_ALLOWED_PLACEHOLDERS: Dict[str, set[str]] = {
         "emit_date",
         "emit_time",
     },
+    "__include__": {"path", "name", "sym_name", "file_id"},
 }
 
 _BRACED_ENV_VAR_PATTERN = re.compile(r"\$\{[^}]+\}")
@@ -123,7 +129,7 @@ def _template_field_roots(template: str) -> set[str]:
 def _validate_system_device_templates(
     config: BackendConfig, diagnostics: DiagnosticCollector
 ) -> None:
-    for device_name in REQUIRED_SYSTEM_DEVICES:
+    for device_name in sorted(REQUIRED_SYSTEM_DEVICES | OPTIONAL_SYSTEM_DEVICES):
         template = config.templates.get(device_name)
         if template is None:
             continue
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Iterable, List, Optional, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from asdl.diagnostics import Diagnostic, Severity
 from asdl.diagnostics.collector import DiagnosticCollector
@@ -25,7 +25,7 @@ from .ir_utils import (
     _build_netlist_ir_index,
     _select_netlist_ir_symbol,
 )
-from .params import _dict_attr_to_strings, _merge_variables
+from .params import _DeviceBackendTable, _build_device_backend_table
 from .templates import _validate_system_device_templates, _validate_template
 
 
@@ -245,6 +245,7 @@ def _run_netlist_verification(
     diagnostics.extend(validate_system_devices(backend_config))
     _validate_system_device_templates(backend_config, diagnostics)
 
+    device_tables: Dict[Tuple[int, str], _DeviceBackendTable] = {}
     for module in design.modules:
         for instance in module.instances:
             ref_name = instance.ref
@@ -291,26 +292,22 @@ def _run_netlist_verification(
 
             _ordered_conns_netlist_ir(instance, target_device.ports, diagnostics)
 
-            device_params = _string_dict(target_device.params)
-            backend_params = _string_dict(backend.params)
-            instance_params = _string_dict(instance.params)
-            device_vars = _string_dict(target_device.variables)
-            backend_vars = _string_dict(backend.variables)
-            props = _string_dict(backend.props)
-            _, variable_diags = _merge_variables(
-                device_vars,
-                backend_vars,
-                device_param_keys=device_params.keys(),
-                backend_param_keys=backend_params.keys(),
-                backend_prop_keys=props.keys(),
-                instance_params=instance_params,
-                instance_name=instance.name,
-                device_name=ref_name,
-                device_loc=None,
-                backend_loc=None,
-                instance_loc=None,
+            table = device_tables.get((id(target_device), backend.name))
+            if table is None:
+                table = _build_device_backend_table(
+                    _string_dict(target_device.params),
+                    _string_dict(backend.params),
+                    _string_dict(target_device.variables),
+                    _string_dict(backend.variables),
+                    _string_dict(backend.props),
+                    device_name=ref_name,
+                )
+                device_tables[(id(target_device), backend.name)] = table
+            diagnostics.extend(
+                table.variable_diagnostics(
+                    _string_dict(instance.params), instance_name=instance.name
+                )
             )
-            diagnostics.extend(variable_diags)
 
             placeholders = _validate_template(
                 backend.template,
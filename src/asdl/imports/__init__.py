@@ -1,12 +1,15 @@
+from .document_cache import DocumentCache, document_cache_scope
 from .name_env import NameEnv
 from .program_db import ProgramDB, SymbolDef
 from .resolver import ImportGraph, resolve_import_graph, resolve_import_path
 
 __all__ = [
+    "DocumentCache",
     "ImportGraph",
     "NameEnv",
     "ProgramDB",
     "SymbolDef",
+    "document_cache_scope",
     "resolve_import_graph",
     "resolve_import_path",
 ]
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+from asdl.ast import AsdlDocument, parse_file
+from asdl.compile_stats import count
+from asdl.diagnostics import Diagnostic
+
+
+@dataclass(frozen=True)
+class _CachedDocument:
+    stamp: tuple[int, int]
+    document: Optional[AsdlDocument]
+    diagnostics: tuple[Diagnostic, ...]
+
+
+@dataclass
+class DocumentCache:
+    """Parsed ASDL documents shared across import-graph resolutions.
+
+    Entries are keyed by normalized file path and revalidated against the
+    file's modification time and size on every lookup, so an edited file is
+    re-parsed while unchanged shared libraries are parsed once. Cached
+    documents are treated as immutable by every pipeline stage.
+    """
+
+    _entries: dict[Path, _CachedDocument] = field(default_factory=dict)
+
+    def parse(self, file_id: Path) -> Tuple[Optional[AsdlDocument], List[Diagnostic]]:
+        """Return the parsed document for `file_id`, parsing on a cache miss.
+
+        Args:
+            file_id: Normalized absolute path of the ASDL file.
+
+        Returns:
+            The parsed document (or None) and the parse diagnostics.
+        """
+        try:
+            stat = os.stat(file_id)
+        except OSError:
+            return parse_file(str(file_id))
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        cached = self._entries.get(file_id)
+        if cached is None or cached.stamp != stamp:
+            document, diagnostics = parse_file(str(file_id))
+            cached = _CachedDocument(
+                stamp=stamp, document=document, diagnostics=tuple(diagnostics)
+            )
+            self._entries[file_id] = cached
+            count("files_parsed")
+        else:
+            count("document_cache_hits")
+        return cached.document, list(cached.diagnostics)
+
+    def stamp(
+        self, file_id: Path, document: Optional[AsdlDocument]
+    ) -> Optional[tuple[int, int]]:
+        """Return the stamp taken before `document` was parsed from `file_id`.
+
+        The stamp is recorded before the file is read, so a file edited while
+        it was parsed no longer matches it.
+
+        Args:
+            file_id: Normalized absolute path of the ASDL file.
+            document: Document previously returned by `parse(file_id)`.
+
+        Returns:
+            The `(mtime_ns, size)` stamp, or None when the cache no longer
+            holds `document` for `file_id`.
+        """
+        cached = self._entries.get(file_id)
+        if cached is None or cached.document is not document:
+            return None
+        return cached.stamp
+
+    def invalidate(self, file_id: Optional[Path] = None) -> None:
+        """Drop the cached parse of `file_id`, or every entry when omitted."""
+        if file_id is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(file_id, None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_ACTIVE_DOCUMENT_CACHE: ContextVar[Optional[DocumentCache]] = ContextVar(
+    "asdl_active_document_cache", default=None
+)
+
+
+def active_document_cache() -> Optional[DocumentCache]:
+    """Return the document cache installed by `document_cache_scope`, if any."""
+    return _ACTIVE_DOCUMENT_CACHE.get()
+
+
+@contextmanager
+def document_cache_scope(cache: DocumentCache) -> Iterator[DocumentCache]:
+    """Use `cache` for import resolution that is not given an explicit cache.
+
+    Long-lived hosts (such as the compile server) install one cache around
+    each request so every command shares parsed documents without threading
+    the cache through each pipeline entry point.
+
+    Args:
+        cache: Cache to install for the current context.
+
+    Yields:
+        The installed cache.
+    """
+    token = _ACTIVE_DOCUMENT_CACHE.set(cache)
+    try:
+        yield cache
+    finally:
+        _ACTIVE_DOCUMENT_CACHE.reset(token)
+
+
+__all__ = ["DocumentCache", "active_document_cache", "document_cache_scope"]
@@ -8,6 +8,8 @@ from typing import Iterable, List, Optional, Tuple
 
 from asdl.ast import AsdlDocument, parse_file
 from asdl.ast.location import Locatable
+from asdl.compile_environment import active_compile_environment
+from asdl.compile_stats import count, stage
 from asdl.diagnostics import Diagnostic, Severity
 
 from .diagnostics import (
@@ -16,6 +18,7 @@ from .diagnostics import (
     import_path_malformed,
     import_path_missing,
 )
+from .document_cache import DocumentCache, active_document_cache
 from .name_env import NameEnv
 from .program_db import ProgramDB
 
@@ -93,6 +96,7 @@ def resolve_import_graph(
     project_root: Optional[Path] = None,
     include_roots: Optional[Iterable[Path]] = None,
     lib_roots: Optional[Iterable[Path]] = None,
+    document_cache: Optional[DocumentCache] = None,
 ) -> Tuple[Optional[ImportGraph], List[Diagnostic]]:
     diagnostics: List[Diagnostic] = []
     documents: dict[Path, AsdlDocument] = {}
@@ -100,6 +104,8 @@ def resolve_import_graph(
     visit_stack: list[Path] = []
     visit_index: dict[Path, int] = {}
     visited: set[Path] = set()
+    if document_cache is None:
+        document_cache = active_document_cache()
 
     def visit(path: Path) -> bool:
         file_id = _normalize_path(path)
@@ -114,7 +120,12 @@ def resolve_import_graph(
         visit_index[file_id] = len(visit_stack)
         visit_stack.append(file_id)
 
-        document, parse_diags = parse_file(str(file_id))
+        with stage("parse", file=str(file_id)):
+            if document_cache is not None:
+                document, parse_diags = document_cache.parse(file_id)
+            else:
+                document, parse_diags = parse_file(str(file_id))
+                count("files_parsed")
         diagnostics.extend(parse_diags)
         if document is None:
             visit_stack.pop()
@@ -148,6 +159,9 @@ def resolve_import_graph(
         return ok
 
     ok = visit(Path(entry_file))
+    # `visit` refers to itself through its closure; clearing the cell breaks
+    # that cycle so the documents are freed by refcounting, not a gc pass.
+    del visit
     if not ok:
         return None, diagnostics
 
@@ -177,8 +191,9 @@ def _expand_import_path(import_path: str) -> str:
 
 
 def _expand_path(path: str) -> str:
-    expanded = os.path.expandvars(path)
-    expanded = os.path.expanduser(expanded)
+    environment = active_compile_environment()
+    expanded = environment.expandvars(path)
+    expanded = environment.expanduser(expanded)
     if expanded.strip() == "":
         raise ValueError("Expanded path is empty.")
     if path.startswith("~") and expanded.startswith("~"):
@@ -217,7 +232,7 @@ def _iter_logical_candidates(
 
 
 def _env_lib_roots() -> Tuple[List[Path], List[Diagnostic]]:
-    raw = os.environ.get("ASDL_LIB_PATH", "")
+    raw = active_compile_environment().get("ASDL_LIB_PATH", "")
     if not raw:
         return [], []
     roots: List[Path] = []
@@ -246,7 +261,8 @@ def _normalize_roots(roots: Optional[Iterable[Path]]) -> List[Path]:
 
 
 def _normalize_root(root: Path | str) -> Path:
-    expanded = os.path.expanduser(os.path.expandvars(str(root)))
+    environment = active_compile_environment()
+    expanded = environment.expanduser(environment.expandvars(str(root)))
     path = Path(expanded)
     if not path.is_absolute():
         path = Path.cwd() / path
@@ -0,0 +1,235 @@
+"""Span and event hooks around pipeline passes and hot loops.
+
+Pipeline code marks work with `span(...)` (a timed region) and `event(...)`
+(a point in time). Subscribers registered with `subscribe` receive one
+`InstrumentationEvent` when a span begins, one when it ends and one per
+event. With no subscriber, `span` returns a shared no-op context manager and
+`event` returns immediately, so instrumented loops cost one global lookup per
+call site.
+
+`ChromeTraceRecorder` is a subscriber that writes the Chrome trace-event JSON
+format (`chrome://tracing`, Perfetto).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import TracebackType
+from typing import Any, Callable, ContextManager, Iterator, Literal, Mapping, Optional
+
+SpanPhase = Literal["begin", "end", "instant"]
+
+
+@dataclass(frozen=True)
+class InstrumentationEvent:
+    """One span boundary or point event delivered to subscribers.
+
+    Attributes:
+        phase: `begin` or `end` for span boundaries, `instant` for events.
+        name: Span or event name (for example `atomize_module`).
+        category: Coarse grouping (for example `stage`, `parse`, `emission`).
+        timestamp_ns: `time.perf_counter_ns()` at the boundary.
+        process_id: Emitting process id.
+        thread_id: Emitting thread identifier.
+        args: Span arguments such as the module or file name.
+    """
+
+    phase: SpanPhase
+    name: str
+    category: str
+    timestamp_ns: int
+    process_id: int
+    thread_id: int
+    args: Mapping[str, Any] = field(default_factory=dict)
+
+
+InstrumentationHook = Callable[[InstrumentationEvent], None]
+
+# Replaced, never mutated, so emitters can read it without the lock.
+_HOOKS: tuple[InstrumentationHook, ...] = ()
+_HOOKS_LOCK = threading.Lock()
+_NULL_SPAN: ContextManager[None] = nullcontext()
+
+
+def subscribe(hook: InstrumentationHook) -> None:
+    """Deliver every span and event, from every thread, to `hook`.
+
+    Hooks run synchronously on the emitting thread and must not raise.
+    """
+    global _HOOKS
+    with _HOOKS_LOCK:
+        _HOOKS = (*_HOOKS, hook)
+
+
+def unsubscribe(hook: InstrumentationHook) -> None:
+    """Stop delivering events to `hook`; unknown hooks are ignored."""
+    global _HOOKS
+    with _HOOKS_LOCK:
+        hooks = list(_HOOKS)
+        if hook in hooks:
+            hooks.remove(hook)
+        _HOOKS = tuple(hooks)
+
+
+@contextmanager
+def subscribed(hook: InstrumentationHook) -> Iterator[InstrumentationHook]:
+    """Subscribe `hook` for the duration of the `with` block."""
+    subscribe(hook)
+    try:
+        yield hook
+    finally:
+        unsubscribe(hook)
+
+
+def is_enabled() -> bool:
+    """Return True when at least one hook is subscribed."""
+    return bool(_HOOKS)
+
+
+def span(name: str, category: str = "pipeline", **args: Any) -> ContextManager[None]:
+    """Mark the enclosed block as a span delivered to subscribed hooks.
+
+    Args:
+        name: Span name.
+        category: Span category.
+        **args: Span arguments recorded with both boundaries.
+
+    Returns:
+        A context manager; a shared no-op one when no hook is subscribed.
+    """
+    if not _HOOKS:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def event(name: str, category: str = "pipeline", **args: Any) -> None:
+    """Deliver an instant event to subscribed hooks."""
+    hooks = _HOOKS
+    if hooks:
+        _dispatch(hooks, "instant", name, category, args)
+
+
+class _Span:
+    __slots__ = ("_name", "_category", "_args", "_hooks")
+
+    def __init__(self, name: str, category: str, args: Mapping[str, Any]) -> None:
+        self._name = name
+        self._category = category
+        self._args = args
+        self._hooks: tuple[InstrumentationHook, ...] = ()
+
+    def __enter__(self) -> None:
+        # Deliver both boundaries to the same hooks, even if subscriptions
+        # change while the span is open.
+        self._hooks = _HOOKS
+        _dispatch(self._hooks, "begin", self._name, self._category, self._args)
+
+    def __exit__(
+        self,
+        exc_type: Optional[type[BaseException]],
+        exc: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        _dispatch(self._hooks, "end", self._name, self._category, self._args)
+
+
+def _dispatch(
+    hooks: tuple[InstrumentationHook, ...],
+    phase: SpanPhase,
+    name: str,
+    category: str,
+    args: Mapping[str, Any],
+) -> None:
+    record = InstrumentationEvent(
+        phase=phase,
+        name=name,
+        category=category,
+        timestamp_ns=time.perf_counter_ns(),
+        process_id=os.getpid(),
+        thread_id=threading.get_ident(),
+        args=args,
+    )
+    for hook in hooks:
+        hook(record)
+
+
+_CHROME_PHASES = {"begin": "B", "end": "E", "instant": "i"}
+
+
+class ChromeTraceRecorder:
+    """Hook that collects events in Chrome trace-event format.
+
+    Example:
+        recorder = ChromeTraceRecorder()
+        with subscribed(recorder):
+            run_netlist_ir_pipeline(entry_file=path)
+        recorder.write(Path("trace.json"))
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._origin_ns = time.perf_counter_ns()
+        self._events: list[dict[str, Any]] = []
+
+    def __call__(self, record: InstrumentationEvent) -> None:
+        trace_event: dict[str, Any] = {
+            "name": record.name,
+            "cat": record.category,
+            "ph": _CHROME_PHASES[record.phase],
+            "ts": (record.timestamp_ns - self._origin_ns) / 1000,
+            "pid": record.process_id,
+            "tid": record.thread_id,
+        }
+        if record.args:
+            trace_event["args"] = {
+                key: _jsonable_arg(value) for key, value in record.args.items()
+            }
+        if record.phase == "instant":
+            trace_event["s"] = "t"
+        with self._lock:
+            self._events.append(trace_event)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def to_jsonable(self) -> dict[str, Any]:
+        """Return the trace as a Chrome trace-event JSON object."""
+        with self._lock:
+            events = list(self._events)
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def write(self, path: Path) -> None:
+        """Write the trace JSON to `path`.
+
+        Raises:
+            OSError: If the file cannot be written.
+        """
+        Path(path).write_text(json.dumps(self.to_jsonable()) + "\n", encoding="utf-8")
+
+
+def _jsonable_arg(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, Path):
+        return str(value)
+    # Arguments may carry whole IRs (see `asdl.memory_report`); never render them.
+    return f"<{type(value).__name__}>"
+
+
+__all__ = [
+    "ChromeTraceRecorder",
+    "InstrumentationEvent",
+    "InstrumentationHook",
+    "event",
+    "is_enabled",
+    "span",
+    "subscribe",
+    "subscribed",
+    "unsubscribe",
+]
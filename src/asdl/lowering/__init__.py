@@ -6,10 +6,14 @@ from pathlib import Path
 from typing import Iterable, Optional
 
 from asdl.ast import AsdlDocument
+from asdl.compile_stats import stage
 from asdl.core.graph import ProgramGraph
+from asdl.core.verify_atomized_graph import verify_atomized_graph_if_clean
 from asdl.diagnostics import Diagnostic, Severity, format_code
 from asdl.emit.netlist_ir import NetlistDesign
+from asdl.imports.document_cache import DocumentCache
 from asdl.imports.resolver import resolve_import_graph
+from asdl.instrumentation import event
 
 from .ast_to_patterned_graph import (
     build_patterned_graph,
@@ -33,6 +37,8 @@ def run_netlist_ir_pipeline(
     file_id: Optional[str] = None,
     lib_roots: Optional[Iterable[Path]] = None,
     verify: bool = True,
+    document_cache: Optional[DocumentCache] = None,
+    low_memory: bool = False,
 ) -> tuple[Optional[NetlistDesign], list[Diagnostic]]:
     """Parse and lower ASDL into a NetlistIR design.
 
@@ -42,6 +48,15 @@ def run_netlist_ir_pipeline(
         file_id: Optional file identifier to attach to module graphs.
         lib_roots: Optional library search roots for import resolution.
         verify: When True, run atomized graph verification.
+        document_cache: Optional parse cache shared across pipeline runs;
+            only used with `entry_file`.
+        low_memory: When True, release each intermediate IR as soon as the
+            next stage no longer needs it: the import graph (ASTs) once the
+            ProgramGraph is built, and each ProgramGraph and AtomizedGraph
+            module once it is lowered. Only the shared registries (source
+            spans and pattern tables) outlive their stage, so peak memory
+            is close to the largest single IR. ASTs held by `document_cache`
+            or a caller-provided `document` stay alive.
 
     Returns:
         Tuple of (NetlistIR design or None, diagnostics).
@@ -59,59 +74,87 @@ def run_netlist_ir_pipeline(
                 )
             )
             return None, diagnostics
-        import_graph, import_diags = resolve_import_graph(
-            entry_file, lib_roots=lib_roots
-        )
+        with stage("import_resolution"):
+            import_graph, import_diags = resolve_import_graph(
+                entry_file, lib_roots=lib_roots, document_cache=document_cache
+            )
         diagnostics.extend(import_diags)
         if import_graph is None or _has_error_diagnostics(diagnostics):
             return None, diagnostics
-        graph, lower_diags = build_patterned_graph_from_import_graph(import_graph)
+        event("ir_ready", "memory", ir="ast", value=import_graph)
+        with stage("patterned_graph"):
+            graph, lower_diags = build_patterned_graph_from_import_graph(import_graph)
         diagnostics.extend(lower_diags)
         if _has_error_diagnostics(diagnostics):
             return None, diagnostics
         entry_doc = import_graph.documents.get(import_graph.entry_file)
         entry_file_id = str(import_graph.entry_file)
-        top_module_id = _resolve_top_module_id(
+        top_module_id = resolve_top_module_id(
             graph,
             entry_doc.top if entry_doc is not None else None,
             entry_file_id,
         )
+        if low_memory:
+            del import_graph, entry_doc
     else:
         if document is None:
             diagnostics.append(
                 _diagnostic(PIPELINE_INPUT_ERROR, "Pipeline requires a document or entry file.")
             )
             return None, diagnostics
-        graph, lower_diags = build_patterned_graph(document, file_id=file_id)
+        event("ir_ready", "memory", ir="ast", value=document)
+        with stage("patterned_graph"):
+            graph, lower_diags = build_patterned_graph(document, file_id=file_id)
         diagnostics.extend(lower_diags)
         if _has_error_diagnostics(diagnostics):
             return None, diagnostics
-        top_module_id = _resolve_top_module_id(
+        top_module_id = resolve_top_module_id(
             graph, document.top, file_id
         )
         entry_file_id = file_id
 
+    event("ir_ready", "memory", ir="patterned_graph", value=graph)
+    with stage("atomization"):
+        atomized, atomized_diags = build_atomized_graph(
+            graph, release_modules=low_memory
+        )
+    if low_memory:
+        del graph
+    event("ir_ready", "memory", ir="atomized_graph", value=atomized)
     if verify:
-        atomized, atomized_diags = build_atomized_graph_and_verify(graph)
-    else:
-        atomized, atomized_diags = build_atomized_graph(graph)
+        with stage("verification"):
+            atomized_diags = verify_atomized_graph_if_clean(atomized, atomized_diags)
     diagnostics.extend(atomized_diags)
     if _has_error_diagnostics(diagnostics):
         return None, diagnostics
 
-    design = build_netlist_ir_design(
-        atomized,
-        top_module_id=top_module_id,
-        entry_file_id=entry_file_id,
-    )
+    with stage("netlist_ir"):
+        design = build_netlist_ir_design(
+            atomized,
+            top_module_id=top_module_id,
+            entry_file_id=entry_file_id,
+            release_modules=low_memory,
+        )
+    event("ir_ready", "memory", ir="netlist_ir", value=design)
     return design, diagnostics
 
 
-def _resolve_top_module_id(
+def resolve_top_module_id(
     graph: ProgramGraph,
     top_name: Optional[str],
     file_id: Optional[str],
 ) -> Optional[str]:
+    """Return the module id of the entry file's `top` module.
+
+    Args:
+        graph: Program graph containing the entry file's modules.
+        top_name: Declared `top` module name, if any.
+        file_id: Entry file id; when None, the first module named
+            `top_name` is used.
+
+    Returns:
+        The module id, or None when no top is declared or it is not found.
+    """
     if top_name is None:
         return None
     for module_id, module in graph.modules.items():
@@ -145,5 +188,6 @@ __all__ = [
     "build_patterned_graph",
     "build_patterned_graph_from_import_graph",
     "build_netlist_ir_design",
+    "resolve_top_module_id",
     "run_netlist_ir_pipeline",
 ]
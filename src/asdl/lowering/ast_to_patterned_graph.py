@@ -303,6 +303,9 @@ def _import_graph_file_order(graph: ImportGraph) -> List[Path]:
             visit(resolved)
 
     visit(graph.entry_file)
+    # Break the self-referencing closure cycle, which would keep `graph` alive
+    # until the next gc pass.
+    del visit
     for file_id in graph.documents.keys():
         if file_id not in seen:
             order.append(file_id)
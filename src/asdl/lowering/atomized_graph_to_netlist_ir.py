@@ -92,6 +92,7 @@ def build_netlist_ir_design(
     *,
     top_module_id: Optional[str] = None,
     entry_file_id: Optional[str] = None,
+    release_modules: bool = False,
 ) -> NetlistDesign:
     """Lower an AtomizedGraph program into a NetlistIR design.
 
@@ -99,10 +100,50 @@ def build_netlist_ir_design(
         program: Atomized program graph to lower.
         top_module_id: Optional module ID to use as the design top.
         entry_file_id: Optional entry file ID used for implicit top inference.
+        release_modules: When True, remove each module from `program.modules`
+            as soon as it is lowered. `program` is consumed; its devices and
+            registries are kept.
 
     Returns:
         NetlistIR design for the atomized program.
     """
+    top_name, resolved_entry_file_id = _resolve_top(
+        program, top_module_id=top_module_id, entry_file_id=entry_file_id
+    )
+
+    # Instance refs are resolved through this table, not `program.modules`,
+    # so modules can be released before the modules that instantiate them.
+    module_symbols = {
+        module_id: (module.name, module.file_id)
+        for module_id, module in program.modules.items()
+    }
+    modules: List[NetlistModule] = []
+    for module_id in list(program.modules):
+        if release_modules:
+            module = program.modules.pop(module_id)
+        else:
+            module = program.modules[module_id]
+        modules.append(_convert_module(module, program, module_symbols))
+    devices = [
+        _convert_device(device, program.registries)
+        for device in program.devices.values()
+    ]
+
+    return NetlistDesign(
+        modules=modules,
+        devices=devices,
+        top=top_name,
+        entry_file_id=resolved_entry_file_id,
+    )
+
+
+def _resolve_top(
+    program: AtomizedProgramGraph,
+    *,
+    top_module_id: Optional[str],
+    entry_file_id: Optional[str],
+) -> Tuple[Optional[str], Optional[str]]:
+    """Return the design top name and entry file ID."""
     top_module = None
     if top_module_id is not None:
         top_module = program.modules.get(top_module_id)
@@ -117,30 +158,17 @@ def build_netlist_ir_design(
     elif len(program.modules) == 1:
         top_module = next(iter(program.modules.values()))
 
-    modules = [
-        _convert_module(module, program)
-        for module in program.modules.values()
-    ]
-    devices = [
-        _convert_device(device, program.registries)
-        for device in program.devices.values()
-    ]
-
-    resolved_entry_file_id = entry_file_id
-    if resolved_entry_file_id is None and top_module is not None:
-        resolved_entry_file_id = top_module.file_id
-
-    return NetlistDesign(
-        modules=modules,
-        devices=devices,
-        top=top_module.name if top_module is not None else None,
-        entry_file_id=resolved_entry_file_id,
-    )
+    if top_module is None:
+        return None, entry_file_id
+    if entry_file_id is None:
+        return top_module.name, top_module.file_id
+    return top_module.name, entry_file_id
 
 
 def _convert_module(
     module: AtomizedModuleGraph,
     program: AtomizedProgramGraph,
+    module_symbols: Dict[str, Tuple[str, str]],
 ) -> NetlistModule:
     """Convert an atomized module into a NetlistIR module."""
     conn_map: Dict[str, List[NetlistConn]] = {
@@ -162,7 +190,7 @@ def _convert_module(
 
     netlist_instances: List[NetlistInstance] = []
     for inst_id, instance in module.instances.items():
-        ref_name, ref_file_id = _resolve_ref(instance, program)
+        ref_name, ref_file_id = _resolve_ref(instance, program, module_symbols)
         netlist_instances.append(
             NetlistInstance(
                 name=instance.name,
@@ -252,11 +280,11 @@ def _convert_device(
 def _resolve_ref(
     instance: AtomizedInstance,
     program: AtomizedProgramGraph,
+    module_symbols: Dict[str, Tuple[str, str]],
 ) -> Tuple[str, str]:
     """Resolve instance references into NetlistIR symbol data."""
     if instance.ref_kind == "module":
-        module = program.modules[instance.ref_id]
-        return module.name, module.file_id
+        return module_symbols[instance.ref_id]
     device = program.devices[instance.ref_id]
     return device.name, device.file_id
 
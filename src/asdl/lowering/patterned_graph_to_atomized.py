@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from asdl.compile_stats import count
 from asdl.core.atomized_graph import (
     AtomizedDeviceDef,
     AtomizedModuleGraph,
@@ -10,6 +11,7 @@ from asdl.core.atomized_graph import (
 from asdl.core.verify_atomized_graph import verify_atomized_graph_if_clean
 from asdl.core.graph import ProgramGraph
 from asdl.diagnostics import Diagnostic
+from asdl.instrumentation import span
 
 from .patterned_graph_to_atomized_context import (
     INVALID_ENDPOINT_EXPR,
@@ -28,11 +30,18 @@ from .patterned_graph_to_atomized_nets import atomize_nets
 
 def build_atomized_graph(
     graph: ProgramGraph,
+    *,
+    release_modules: bool = False,
 ) -> tuple[AtomizedProgramGraph, list[Diagnostic]]:
     """Lower a PatternedGraph program into an AtomizedGraph program.
 
     Args:
         graph: PatternedGraph program to atomize.
+        release_modules: When True, remove each module from `graph.modules`
+            as soon as it is atomized, so the patterned and atomized forms of
+            the program are never fully alive together. `graph` is consumed;
+            its devices and registries are kept (the atomized program shares
+            the registries).
 
     Returns:
         Tuple of (atomized program graph, diagnostics).
@@ -63,51 +72,62 @@ def build_atomized_graph(
 
     source_spans = graph.registries.source_spans
 
-    for module_id, module in graph.modules.items():
-        allocator = _IdAllocator()
-        atomized_module = AtomizedModuleGraph(
-            module_id=module_id,
-            name=module.name,
-            file_id=module.file_id,
-            ports=[],
-            parameters=module.parameters,
-            variables=module.variables,
-            patterned_module_id=module.module_id,
-        )
-        atomized.modules[module_id] = atomized_module
+    for module_id in list(graph.modules):
+        if release_modules:
+            module = graph.modules.pop(module_id)
+        else:
+            module = graph.modules[module_id]
+        with span(
+            "atomize_module", "atomization", module=module.name, file=module.file_id
+        ):
+            allocator = _IdAllocator()
+            atomized_module = AtomizedModuleGraph(
+                module_id=module_id,
+                name=module.name,
+                file_id=module.file_id,
+                ports=[],
+                parameters=module.parameters,
+                variables=module.variables,
+                patterned_module_id=module.module_id,
+            )
+            atomized.modules[module_id] = atomized_module
 
-        module_exprs = _collect_module_expressions(module, expr_registry)
-        ports, port_diags = _expand_port_order(
-            module.ports,
-            module_exprs,
-            module_name=module.name,
-        )
-        diagnostics.extend(port_diags)
-        atomized_module.ports = ports
-
-        context = ModuleAtomizationContext(
-            module=module,
-            atomized_module=atomized_module,
-            expr_registry=expr_registry,
-            source_spans=source_spans,
-            allocator=allocator,
-            diagnostics=diagnostics,
-        )
-        atomize_instances(context)
-        atomize_nets(context)
-
-        for net_id, net in atomized_module.nets.items():
-            if not net.endpoint_ids:
-                diagnostics.append(
-                    _diagnostic(
-                        INVALID_ENDPOINT_EXPR,
-                        (
-                            f"Net '{net.name}' in module '{module.name}' has no "
-                            "legal endpoints after atomization."
-                        ),
-                        context.net_spans.get(net_id),
+            module_exprs = _collect_module_expressions(module, expr_registry)
+            ports, port_diags = _expand_port_order(
+                module.ports,
+                module_exprs,
+                module_name=module.name,
+            )
+            diagnostics.extend(port_diags)
+            atomized_module.ports = ports
+
+            context = ModuleAtomizationContext(
+                module=module,
+                atomized_module=atomized_module,
+                expr_registry=expr_registry,
+                source_spans=source_spans,
+                allocator=allocator,
+                diagnostics=diagnostics,
+            )
+            atomize_instances(context)
+            atomize_nets(context)
+            count(
+                "atoms_expanded",
+                len(atomized_module.instances) + len(atomized_module.nets),
+            )
+
+            for net_id, net in atomized_module.nets.items():
+                if not net.endpoint_ids:
+                    diagnostics.append(
+                        _diagnostic(
+                            INVALID_ENDPOINT_EXPR,
+                            (
+                                f"Net '{net.name}' in module '{module.name}' has no "
+                                "legal endpoints after atomization."
+                            ),
+                            context.net_spans.get(net_id),
+                        )
                     )
-                )
 
     return atomized, diagnostics
 
@@ -0,0 +1,316 @@
+"""Per-stage memory profile of one compile (`asdlc netlist --memory-report`).
+
+`MemoryReport` is an `asdl.instrumentation` subscriber. Around every `stage`
+span it reads `tracemalloc` counters to record the stage's peak allocation and
+the memory it leaves behind, and it diffs `tracemalloc` snapshots around each
+top-level stage to name the allocation sites that retained the most. On
+`ir_ready` events it measures the object graph reachable from the new IR,
+broken down by object type, and keeps a weak reference to it so the report can
+tell which IRs are still alive when emission starts.
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import threading
+import tracemalloc
+import weakref
+from dataclasses import dataclass, field
+from types import BuiltinFunctionType, FunctionType, MethodType, ModuleType
+from typing import Any, Callable, Optional
+
+from asdl.instrumentation import InstrumentationEvent, subscribe, unsubscribe
+
+IR_READY_EVENT = "ir_ready"
+
+# Stage whose first begin marks "emission starts" for the alive-IR check.
+EMISSION_STAGE = "emission"
+
+_SKIPPED_TYPES = (type, ModuleType, FunctionType, BuiltinFunctionType, MethodType)
+
+
+@dataclass
+class StageMemory:
+    """Accumulated memory of one stage.
+
+    Attributes:
+        peak_bytes: Highest traced allocation above the stage's starting
+            level, over all calls.
+        retained_bytes: Net traced allocation left behind by all calls.
+        calls: Number of calls.
+        top_sites: Allocation sites (`file:line`) with the largest net growth
+            across the stage, recorded for top-level stages only.
+    """
+
+    peak_bytes: int = 0
+    retained_bytes: int = 0
+    calls: int = 0
+    top_sites: list[tuple[str, int]] = field(default_factory=list)
+
+
+@dataclass
+class IrMemory:
+    """Size of the object graph reachable from one IR when it was built."""
+
+    name: str
+    root_type: str
+    reachable_bytes: int
+    object_count: int
+    by_type: list[tuple[str, int, int]]
+    ref: Optional[Callable[[], Any]] = field(default=None, repr=False)
+
+    def is_alive(self) -> Optional[bool]:
+        """Return whether the IR is still referenced (None if untrackable)."""
+        if self.ref is None:
+            return None
+        return self.ref() is not None
+
+
+@dataclass
+class _OpenStage:
+    name: str
+    start_current: int
+    peak_seen: int
+    snapshot: Optional[tracemalloc.Snapshot]
+
+
+class MemoryReport:
+    """Collect stage peaks, IR sizes and alive IRs for one compile.
+
+    Args:
+        top_types: Object types listed per IR.
+        top_sites: Allocation sites listed per top-level stage.
+
+    Example:
+        report = MemoryReport()
+        with report.recording():
+            run_netlist_ir_pipeline(entry_file=path)
+        print(report.format_text())
+    """
+
+    def __init__(self, *, top_types: int = 8, top_sites: int = 5) -> None:
+        self.top_types = top_types
+        self.top_sites = top_sites
+        self.stages: dict[str, StageMemory] = {}
+        self.irs: list[IrMemory] = []
+        self.alive_at_emission: Optional[list[str]] = None
+        self._open: list[_OpenStage] = []
+        self._thread_id = threading.get_ident()
+        self._started_tracing = False
+
+    def start(self) -> None:
+        """Start `tracemalloc` (if needed) and subscribe to instrumentation."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._thread_id = threading.get_ident()
+        subscribe(self)
+
+    def stop(self) -> None:
+        """Unsubscribe and stop `tracemalloc` if `start` started it."""
+        unsubscribe(self)
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def recording(self) -> "_Recording":
+        """Return a context manager calling `start` and `stop`."""
+        return _Recording(self)
+
+    def __call__(self, record: InstrumentationEvent) -> None:
+        # Stage nesting is tracked for the compiling thread only.
+        if record.thread_id != self._thread_id or not tracemalloc.is_tracing():
+            return
+        if record.category == "stage" and record.phase == "begin":
+            self._begin_stage(record.name)
+        elif record.category == "stage" and record.phase == "end":
+            self._end_stage(record.name)
+        elif record.phase == "instant" and record.name == IR_READY_EVENT:
+            self.record_ir(str(record.args.get("ir")), record.args.get("value"))
+
+    def record_ir(self, name: str, value: Any) -> None:
+        """Measure the object graph reachable from `value` and track it."""
+        try:
+            ref: Optional[Callable[[], Any]] = weakref.ref(value)
+        except TypeError:
+            ref = None
+        total, count, by_type = _reachable_size(value)
+        ranked = sorted(by_type.items(), key=lambda item: (-item[1][0], item[0]))
+        self.irs.append(
+            IrMemory(
+                name=name,
+                root_type=type(value).__name__,
+                reachable_bytes=total,
+                object_count=count,
+                by_type=[
+                    (type_name, size, objects)
+                    for type_name, (size, objects) in ranked[: self.top_types]
+                ],
+                ref=ref,
+            )
+        )
+
+    def alive_irs(self) -> list[str]:
+        """Return the names of tracked IRs that are still referenced."""
+        return [ir.name for ir in self.irs if ir.is_alive()]
+
+    def to_jsonable(self) -> dict[str, Any]:
+        """Return the compile-log `memory` payload."""
+        return {
+            "stages": [
+                {
+                    "stage": name,
+                    "peak_bytes": stage.peak_bytes,
+                    "retained_bytes": stage.retained_bytes,
+                    "calls": stage.calls,
+                    "top_sites": [
+                        {"site": site, "bytes": size} for site, size in stage.top_sites
+                    ],
+                }
+                for name, stage in self.stages.items()
+            ],
+            "irs": [
+                {
+                    "ir": ir.name,
+                    "type": ir.root_type,
+                    "reachable_bytes": ir.reachable_bytes,
+                    "objects": ir.object_count,
+                    "by_type": [
+                        {"type": type_name, "bytes": size, "objects": objects}
+                        for type_name, size, objects in ir.by_type
+                    ],
+                }
+                for ir in self.irs
+            ],
+            "alive_at_emission": self.alive_at_emission,
+        }
+
+    def format_text(self) -> str:
+        """Render the report as text for stderr."""
+        lines = [
+            "memory: stages",
+            f"  {'stage':<18}{'peak KiB':>12}{'retained KiB':>14}{'calls':>7}",
+        ]
+        for name, stage in self.stages.items():
+            lines.append(
+                f"  {name:<18}{stage.peak_bytes / 1024:>12.1f}"
+                f"{stage.retained_bytes / 1024:>14.1f}{stage.calls:>7}"
+            )
+            for site, size in stage.top_sites:
+                lines.append(f"      {size / 1024:>10.1f} KiB  {site}")
+        lines.append("memory: IRs (reachable when built)")
+        for ir in self.irs:
+            alive = ir.is_alive()
+            state = "untracked" if alive is None else ("alive" if alive else "freed")
+            lines.append(
+                f"  {ir.name} ({ir.root_type}): {ir.reachable_bytes / 1024:.1f} KiB "
+                f"in {ir.object_count} objects, now {state}"
+            )
+            for type_name, size, objects in ir.by_type:
+                lines.append(f"      {size / 1024:>10.1f} KiB {objects:>8}  {type_name}")
+        if self.alive_at_emission is not None:
+            alive = ", ".join(self.alive_at_emission) or "none"
+            lines.append(f"memory: IRs alive when emission starts: {alive}")
+        return "\n".join(lines)
+
+    def _begin_stage(self, name: str) -> None:
+        if name == EMISSION_STAGE and self.alive_at_emission is None:
+            self.alive_at_emission = self.alive_irs()
+        current, peak = tracemalloc.get_traced_memory()
+        if self._open:
+            self._open[-1].peak_seen = max(self._open[-1].peak_seen, peak)
+        snapshot = tracemalloc.take_snapshot() if not self._open else None
+        tracemalloc.reset_peak()
+        self._open.append(
+            _OpenStage(
+                name=name,
+                start_current=current,
+                peak_seen=current,
+                snapshot=snapshot,
+            )
+        )
+
+    def _end_stage(self, name: str) -> None:
+        if not self._open or self._open[-1].name != name:
+            return
+        frame = self._open.pop()
+        current, peak = tracemalloc.get_traced_memory()
+        absolute_peak = max(frame.peak_seen, peak)
+        stage = self.stages.setdefault(name, StageMemory())
+        stage.peak_bytes = max(stage.peak_bytes, absolute_peak - frame.start_current)
+        stage.retained_bytes += current - frame.start_current
+        stage.calls += 1
+        if frame.snapshot is not None:
+            stage.top_sites = _top_sites(
+                frame.snapshot, tracemalloc.take_snapshot(), self.top_sites
+            )
+        if self._open:
+            self._open[-1].peak_seen = max(self._open[-1].peak_seen, absolute_peak)
+
+
+class _Recording:
+    def __init__(self, report: MemoryReport) -> None:
+        self._report = report
+
+    def __enter__(self) -> MemoryReport:
+        self._report.start()
+        return self._report
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._report.stop()
+
+
+def _reachable_size(root: Any) -> tuple[int, int, dict[str, tuple[int, int]]]:
+    """Sum `sys.getsizeof` over objects reachable from `root`.
+
+    Classes, modules and functions are not followed, so the walk stays inside
+    the IR's data. Objects shared with other IRs count toward each of them.
+    """
+    seen: set[int] = set()
+    stack = [root]
+    total = 0
+    by_type: dict[str, list[int]] = {}
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or isinstance(obj, _SKIPPED_TYPES):
+            continue
+        seen.add(id(obj))
+        size = sys.getsizeof(obj, 0)
+        total += size
+        entry = by_type.setdefault(type(obj).__qualname__, [0, 0])
+        entry[0] += size
+        entry[1] += 1
+        stack.extend(gc.get_referents(obj))
+    return (
+        total,
+        len(seen),
+        {name: (size, count) for name, (size, count) in by_type.items()},
+    )
+
+
+def _top_sites(
+    before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, limit: int
+) -> list[tuple[str, int]]:
+    filters = [
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, __file__),
+    ]
+    stats = after.filter_traces(filters).compare_to(
+        before.filter_traces(filters), "lineno"
+    )
+    grown = [stat for stat in stats if stat.size_diff > 0]
+    grown.sort(key=lambda stat: -stat.size_diff)
+    return [
+        (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size_diff)
+        for stat in grown[:limit]
+    ]
+
+
+__all__ = [
+    "EMISSION_STAGE",
+    "IR_READY_EVENT",
+    "IrMemory",
+    "MemoryReport",
+    "StageMemory",
+]
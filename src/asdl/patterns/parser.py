@@ -5,6 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Iterable, Literal, Mapping, Optional, Sequence
 
+from asdl.compile_stats import count
 from asdl.diagnostics import SourceSpan
 
 
@@ -134,6 +135,7 @@ def parse_pattern_expr(
     Returns:
         Tuple of (PatternExpr or None, errors).
     """
+    count("expressions_parsed")
     if expression == "":
         return None, [PatternError("Pattern expression is empty.", span)]
 
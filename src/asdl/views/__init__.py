@@ -9,6 +9,7 @@ from .api import (
     view_sidecar_to_jsonable,
 )
 from .config import load_view_config, parse_view_config_string
+from .hierarchy_dag import ViewHierarchyDag, ViewHierarchyEdge, build_hierarchy_dag
 from .instance_index import (
     ViewInstanceIndex,
     ViewInstanceIndexEntry,
@@ -16,25 +17,41 @@ from .instance_index import (
     match_index_entries,
 )
 from .models import ViewConfig, ViewMatch, ViewProfile, ViewRule
-from .resolver import ResolvedViewBindingEntry, resolve_view_bindings
+from .resolver import (
+    ResolvedViewBindingEdge,
+    ResolvedViewBindingEntry,
+    ResolvedViewBindingNode,
+    ResolvedViewBindings,
+    resolve_view_binding_graph,
+    resolve_view_bindings,
+)
+from .session import ViewBindingSession
 
 __all__ = [
+    "ViewBindingSession",
     "ViewConfig",
+    "ViewHierarchyDag",
+    "ViewHierarchyEdge",
     "ViewInstanceIndex",
     "ViewInstanceIndexEntry",
     "ViewMatch",
     "ViewProfile",
     "ViewRule",
+    "ResolvedViewBindingEdge",
     "ResolvedViewBindingEntry",
+    "ResolvedViewBindingNode",
+    "ResolvedViewBindings",
     "VIEW_APPLY_ERROR",
     "VIEW_PROFILE_NOT_FOUND_ERROR",
     "VIEW_RESOLUTION_ERROR",
     "apply_resolved_view_bindings",
+    "build_hierarchy_dag",
     "build_instance_index",
     "load_view_config",
     "match_index_entries",
     "parse_view_config_string",
     "resolve_design_view_bindings",
+    "resolve_view_binding_graph",
     "resolve_view_bindings",
     "view_sidecar_to_jsonable",
 ]
@@ -3,17 +3,26 @@
 from __future__ import annotations
 
 import hashlib
-from dataclasses import replace
+from dataclasses import dataclass, field, replace
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional, Union
 
-from asdl.core.symbol_resolution import index_symbols, select_symbol
+from asdl.core.symbol_resolution import select_symbol
 from asdl.diagnostics import Diagnostic, Severity, format_code
-from asdl.emit.netlist_ir import NetlistDesign, NetlistModule
+from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
 
 from .config import load_view_config
-from .instance_index import ViewInstanceIndexEntry, build_instance_index
-from .resolver import ResolvedViewBindingEntry, resolve_view_bindings
+from .hierarchy_dag import ModuleKey, ViewHierarchyEdge
+from .models import ViewConfig
+from .pathing import join_hierarchy_path
+from .resolver import (
+    ResolvedViewBindingEdge,
+    ResolvedViewBindingEntry,
+    ResolvedViewBindingNode,
+    ResolvedViewBindings,
+    resolve_view_binding_graph,
+)
+from .session import ViewBindingSession
 
 VIEW_PROFILE_NOT_FOUND_ERROR = format_code("PARSE", 104)
 VIEW_RESOLUTION_ERROR = format_code("IR", 101)
@@ -25,20 +34,28 @@ def resolve_design_view_bindings(
     *,
     config_path: Path,
     profile_name: str,
-) -> tuple[Optional[tuple[ResolvedViewBindingEntry, ...]], list[Diagnostic]]:
+    config: Optional[ViewConfig] = None,
+    session: Optional[ViewBindingSession] = None,
+) -> tuple[Optional[ResolvedViewBindings], list[Diagnostic]]:
     """Resolve a design's view bindings using one config profile.
 
     Args:
         design: NetlistIR design to resolve.
         config_path: View config YAML path.
         profile_name: Selected profile key from the config file.
+        config: Optional already-loaded config for ``config_path``.
+        session: Optional shared view-binding session for ``design``.
 
     Returns:
-        Tuple of resolved sidecar entries (or None on failure) and diagnostics.
+        Tuple of the resolved binding graph (or None on failure) and
+        diagnostics. Pass the graph to `apply_resolved_view_bindings`; expand
+        it with ``entries()`` only where the per-occurrence sidecar is needed.
     """
-    config, diagnostics = load_view_config(config_path)
+    diagnostics: list[Diagnostic] = []
     if config is None:
-        return None, diagnostics
+        config, diagnostics = load_view_config(config_path)
+        if config is None:
+            return None, diagnostics
 
     profile = config.profiles.get(profile_name)
     if profile is None:
@@ -51,7 +68,7 @@ def resolve_design_view_bindings(
         return None, diagnostics
 
     try:
-        resolved = resolve_view_bindings(design, profile)
+        resolved = resolve_view_binding_graph(design, profile, session=session)
     except ValueError as exc:
         diagnostics.append(_diagnostic(VIEW_RESOLUTION_ERROR, str(exc)))
         return None, diagnostics
@@ -82,129 +99,78 @@ def view_sidecar_to_jsonable(
 
 
 def apply_resolved_view_bindings(
-    design: NetlistDesign, entries: tuple[ResolvedViewBindingEntry, ...]
+    design: NetlistDesign,
+    bindings: Union[ResolvedViewBindings, tuple[ResolvedViewBindingEntry, ...]],
+    *,
+    session: Optional[ViewBindingSession] = None,
 ) -> NetlistDesign:
     """Return a design copy with resolved module symbols applied to instances.
 
+    Shared modules whose occurrences resolve differently are specialized into
+    per-variant copies. The rewrite walks the resolved binding graph, so each
+    module is specialized once per distinct resolved node rather than once per
+    flattened occurrence. Specializations are hash-consed by rewritten content,
+    so occurrences that rewrite to identical instance refs share one module
+    named after the first such occurrence.
+
     Args:
         design: NetlistIR design to rewrite.
-        entries: Ordered resolved sidecar entries from `resolve_view_bindings`.
+        bindings: Binding graph from `resolve_view_binding_graph`, or ordered
+            sidecar entries from `resolve_view_bindings` (rebuilt into a
+            graph, one node per occurrence).
+        session: Optional shared view-binding session for ``design``; its
+            hierarchy DAG and symbol tables are reused.
 
     Returns:
         New NetlistIR design with updated instance `ref` symbols.
 
     Raises:
-        ValueError: If sidecar entries do not match design hierarchy paths or
-            if top resolution fails while applying bindings.
+        ValueError: If sidecar entries do not match design hierarchy paths.
     """
-    index = build_instance_index(design)
-    if not index.entries:
-        if entries:
-            raise ValueError(
-                "Resolved sidecar entries are present but the design has no "
-                "hierarchical module instances"
-            )
+    session = ViewBindingSession.for_design(design, session)
+    dag = session.dag
+    if not isinstance(bindings, ResolvedViewBindings):
+        bindings = ResolvedViewBindings.from_entries(dag, bindings)
+    root = bindings.root
+    if root is None or bindings.root_path is None or not root.edges:
         return design
 
-    resolved_by_path: dict[str, str] = {}
-    for entry in entries:
-        full_path = entry.full_path
-        if full_path in resolved_by_path:
-            raise ValueError(f"Resolved sidecar contains duplicate entry for '{full_path}'")
-        resolved_by_path[full_path] = entry.resolved
-
-    index_paths = tuple(index_entry.full_path for index_entry in index.entries)
-    index_path_set = set(index_paths)
-    missing_paths = [path for path in index_paths if path not in resolved_by_path]
-    extra_paths = sorted(path for path in resolved_by_path if path not in index_path_set)
-    if missing_paths or extra_paths:
-        parts: list[str] = []
-        if missing_paths:
-            parts.append(f"missing paths: {', '.join(missing_paths)}")
-        if extra_paths:
-            parts.append(f"unknown paths: {', '.join(extra_paths)}")
-        raise ValueError("Resolved sidecar does not match design index (" + "; ".join(parts) + ")")
-
-    modules_by_key, modules_by_name = index_symbols(design.modules)
-    base_modules_by_name = {
-        module_name: candidates.copy() for module_name, candidates in modules_by_name.items()
+    # Specialization extends these tables, so copy the shared session tables.
+    modules_by_key = dict(session.modules_by_key)
+    modules_by_name = {
+        module_name: candidates.copy()
+        for module_name, candidates in session.modules_by_name.items()
     }
+    base_modules_by_name = session.modules_by_name
 
-    top_module = _resolve_top_module(design)
-    if top_module is None:
-        raise ValueError("Unable to resolve top module for applying view bindings")
-
-    child_entries_by_parent: dict[str, list[ViewInstanceIndexEntry]] = {}
-    for index_entry in index.entries:
-        child_entries_by_parent.setdefault(index_entry.path, []).append(index_entry)
-
+    top_module = dag.modules[root.module]
     used_module_keys = {(module.file_id, module.name) for module in design.modules}
     specialized_modules: list[NetlistModule] = []
     top_override: Optional[NetlistModule] = None
-    specialized_ref_by_path: dict[str, tuple[str, str]] = {}
+    specialized_ref_by_node: dict[
+        tuple[ResolvedViewBindingNode, ModuleKey], tuple[str, str]
+    ] = {}
+    specialized_ref_by_content: dict[tuple[object, ...], tuple[str, str]] = {}
 
-    def _specialize_occurrence(
-        path: str, module: NetlistModule, *, is_top: bool
-    ) -> tuple[str, str]:
+    def _finish(frame: _SpecializationFrame) -> tuple[str, str]:
+        """Return the `(ref, ref_file_id)` that replaces a finished occurrence."""
         nonlocal top_override
-        cached = specialized_ref_by_path.get(path)
-        if cached is not None:
-            return cached
-
-        child_entries = child_entries_by_parent.get(path, [])
-        if not child_entries:
-            specialized_ref_by_path[path] = (module.name, module.file_id)
-            return module.name, module.file_id
-
-        child_entries_by_instance = {
-            child_entry.instance: child_entry for child_entry in child_entries
-        }
-        rewritten_instances = []
-        changed = False
-        for instance in module.instances:
-            child_entry = child_entries_by_instance.get(instance.name)
-            if child_entry is None:
-                rewritten_instances.append(instance)
-                continue
-
-            resolved_symbol = resolved_by_path[child_entry.full_path]
-            child_module = _select_module(
-                modules_by_name,
-                modules_by_key,
-                base_modules_by_name,
-                name=resolved_symbol,
-                file_id=child_entry.ref_file_id,
-            )
-            rewritten_ref = resolved_symbol
-            rewritten_ref_file_id = instance.ref_file_id
-            if child_module is not None:
-                rewritten_ref, rewritten_ref_file_id = _specialize_occurrence(
-                    child_entry.full_path,
-                    child_module,
-                    is_top=False,
-                )
-
-            if rewritten_ref == instance.ref and rewritten_ref_file_id == instance.ref_file_id:
-                rewritten_instances.append(instance)
-                continue
-
-            rewritten_instances.append(
-                replace(instance, ref=rewritten_ref, ref_file_id=rewritten_ref_file_id)
-            )
-            changed = True
-
-        if not changed:
-            specialized_ref_by_path[path] = (module.name, module.file_id)
+        module = frame.module
+        if not frame.changed:
             return module.name, module.file_id
 
-        rewritten_module = replace(module, instances=rewritten_instances)
-        if is_top:
+        rewritten_module = replace(module, instances=frame.rewritten)
+        if frame.is_top:
             top_override = rewritten_module
-            specialized_ref_by_path[path] = (rewritten_module.name, rewritten_module.file_id)
             return rewritten_module.name, rewritten_module.file_id
 
+        content_key = _specialization_content_key(rewritten_module)
+        shared = specialized_ref_by_content.get(content_key)
+        if shared is not None:
+            return shared
+
         specialized_file_id = _build_occurrence_module_file_id(
-            path,
+            frame.path,
             module_name=module.name,
             file_id=module.file_id,
             used_module_keys=used_module_keys,
@@ -214,13 +180,73 @@ def apply_resolved_view_bindings(
         used_module_keys.add((specialized_module.file_id, specialized_module.name))
         modules_by_key[(specialized_module.file_id, specialized_module.name)] = specialized_module
         modules_by_name.setdefault(specialized_module.name, []).append(specialized_module)
-        specialized_ref_by_path[path] = (
-            specialized_module.name,
-            specialized_module.file_id,
+        specialized_ref = (specialized_module.name, specialized_module.file_id)
+        specialized_ref_by_content[content_key] = specialized_ref
+        return specialized_ref
+
+    def _open(
+        node: ResolvedViewBindingNode, module: NetlistModule, path: str, *, is_top: bool
+    ) -> _SpecializationFrame:
+        dag_edges = dag.edges.get(node.module, ())
+        return _SpecializationFrame(
+            node=node,
+            module=module,
+            path=path,
+            is_top=is_top,
+            instances=iter(module.instances),
+            edges_by_instance={
+                edge.instance: (edge, dag_edge)
+                for edge, dag_edge in zip(node.edges, dag_edges)
+            },
         )
-        return specialized_module.name, specialized_module.file_id
 
-    _specialize_occurrence(top_module.name, top_module, is_top=True)
+    # Occurrences are specialized bottom-up on an explicit stack; a child is
+    # finished before the instance that references it is rewritten.
+    stack = [_open(root, top_module, bindings.root_path, is_top=True)]
+    while stack:
+        frame = stack[-1]
+        instance = next(frame.instances, None)
+        if instance is None:
+            stack.pop()
+            specialized_ref = _finish(frame)
+            specialized_ref_by_node[(frame.node, _module_key(frame.module))] = (
+                specialized_ref
+            )
+            if stack:
+                stack[-1].rewrite(specialized_ref)
+            continue
+
+        match = frame.edges_by_instance.get(instance.name)
+        if match is None:
+            frame.rewritten.append(instance)
+            continue
+        edge, dag_edge = match
+        frame.pending = instance
+        child_module = _select_module(
+            modules_by_name,
+            modules_by_key,
+            base_modules_by_name,
+            name=edge.resolved,
+            file_id=dag_edge.ref_file_id,
+        )
+        if child_module is None:
+            frame.rewrite((edge.resolved, instance.ref_file_id))
+            continue
+        if edge.child is None or not edge.child.edges:
+            frame.rewrite((child_module.name, child_module.file_id))
+            continue
+        cached = specialized_ref_by_node.get((edge.child, _module_key(child_module)))
+        if cached is not None:
+            frame.rewrite(cached)
+            continue
+        stack.append(
+            _open(
+                edge.child,
+                child_module,
+                join_hierarchy_path(frame.path, instance.name),
+                is_top=False,
+            )
+        )
 
     rewritten_modules: list[NetlistModule] = []
     top_key = (top_module.file_id, top_module.name)
@@ -233,29 +259,49 @@ def apply_resolved_view_bindings(
     return replace(design, modules=rewritten_modules)
 
 
-def _resolve_top_module(design: NetlistDesign) -> Optional[NetlistModule]:
-    """Resolve top module by honoring explicit top and optional entry file id."""
-    if design.top is not None:
-        if design.entry_file_id is not None:
-            for module in design.modules:
-                if module.name == design.top and module.file_id == design.entry_file_id:
-                    return module
-        for module in design.modules:
-            if module.name == design.top:
-                return module
-        return None
+@dataclass
+class _SpecializationFrame:
+    """Occurrence whose instances are being rewritten during application.
+
+    Attributes:
+        node: Resolved node of the occurrence.
+        module: Module definition selected for the occurrence.
+        path: Hierarchy path of the first occurrence reaching this frame.
+        is_top: True for the top module, which is rewritten in place.
+        instances: Remaining instances of ``module``.
+        edges_by_instance: Resolved and DAG edges keyed by instance name.
+        rewritten: Instances processed so far.
+        changed: True once any instance ref was rewritten.
+        pending: Instance waiting for its child occurrence to finish.
+    """
+
+    node: ResolvedViewBindingNode
+    module: NetlistModule
+    path: str
+    is_top: bool
+    instances: Iterator[NetlistInstance]
+    edges_by_instance: dict[str, tuple[ResolvedViewBindingEdge, ViewHierarchyEdge]]
+    rewritten: list[NetlistInstance] = field(default_factory=list)
+    changed: bool = False
+    pending: Optional[NetlistInstance] = None
+
+    def rewrite(self, ref: tuple[str, str]) -> None:
+        """Point the pending instance at ``ref`` and record it."""
+        instance = self.pending
+        assert instance is not None
+        self.pending = None
+        rewritten_ref, rewritten_ref_file_id = ref
+        if rewritten_ref == instance.ref and rewritten_ref_file_id == instance.ref_file_id:
+            self.rewritten.append(instance)
+            return
+        self.rewritten.append(
+            replace(instance, ref=rewritten_ref, ref_file_id=rewritten_ref_file_id)
+        )
+        self.changed = True
 
-    if design.entry_file_id is not None:
-        entry_modules = [
-            module for module in design.modules if module.file_id == design.entry_file_id
-        ]
-        if len(entry_modules) == 1:
-            return entry_modules[0]
-        return None
 
-    if len(design.modules) == 1:
-        return design.modules[0]
-    return None
+def _module_key(module: NetlistModule) -> ModuleKey:
+    return (module.file_id, module.name)
 
 
 def _select_module(
@@ -276,6 +322,22 @@ def _select_module(
     )
 
 
+def _specialization_content_key(module: NetlistModule) -> tuple[object, ...]:
+    """Return a hashable key for a rewritten module's specialized content.
+
+    Specializations only rewrite instance refs, so two rewrites of the same base
+    module are structurally identical when their instance refs agree.
+    """
+    return (
+        module.file_id,
+        module.name,
+        tuple(
+            (instance.name, instance.ref, instance.ref_file_id)
+            for instance in module.instances
+        ),
+    )
+
+
 def _build_occurrence_module_file_id(
     path: str,
     *,
@@ -0,0 +1,260 @@
+"""Occurrence-compressed module hierarchy DAG for view-binding resolution."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from functools import cached_property
+from typing import Iterator, Optional
+
+from asdl.core.hierarchy import resolve_top_module
+from asdl.core.symbol_resolution import index_symbols, select_symbol
+from asdl.emit.netlist_ir import NetlistDesign, NetlistModule
+
+from .instance_index import ViewInstanceIndex, ViewInstanceIndexEntry, _logical_module_name
+from .pathing import join_hierarchy_path
+
+ModuleKey = tuple[Optional[str], str]
+
+
+@dataclass(frozen=True)
+class ViewHierarchyEdge:
+    """One authored module-instance edge, stored once per parent module.
+
+    Attributes:
+        parent: Key of the module that declares the instance.
+        instance: Instance leaf name.
+        module: Logical (undecorated) referenced module symbol.
+        ref: Authored referenced module symbol (`cell` or `cell@view`).
+        ref_file_id: Source file identifier for the referenced symbol.
+        child: Key of the referenced module definition.
+    """
+
+    parent: ModuleKey
+    instance: str
+    module: str
+    ref: str
+    ref_file_id: str
+    child: ModuleKey
+
+
+@dataclass(frozen=True)
+class ViewHierarchyDag:
+    """Module-instance hierarchy with each parent/instance edge stored once.
+
+    Every hierarchical occurrence of an instance is a path through this graph
+    from the root module. Per-module occurrence multiplicities are recorded so
+    callers can reason about flattened counts without enumerating them.
+
+    Attributes:
+        root: Key of the resolved top module, or None when no top resolves.
+        root_path: Hierarchy path of the root (the top module name).
+        modules: Reachable module definitions keyed by `(file_id, name)`.
+        edges: Module-referencing instance edges grouped by parent module, in
+            authored declaration order.
+        occurrences: Number of hierarchical occurrences per reachable module.
+            Empty when the hierarchy contains a cycle.
+        has_cycles: True when some edge points back into its own ancestry.
+    """
+
+    root: Optional[ModuleKey]
+    root_path: Optional[str]
+    modules: dict[ModuleKey, NetlistModule] = field(default_factory=dict)
+    edges: dict[ModuleKey, tuple[ViewHierarchyEdge, ...]] = field(
+        default_factory=dict
+    )
+    occurrences: dict[ModuleKey, int] = field(default_factory=dict)
+    has_cycles: bool = False
+
+    def has_path(self, path: str) -> bool:
+        """Return whether `path` resolves to the root or an instance occurrence.
+
+        Args:
+            path: Dot-separated hierarchy path rooted at the top module name.
+
+        Returns:
+            True when the path names the root or an existing occurrence.
+        """
+        if self.root is None or self.root_path is None:
+            return False
+        segments = path.split(".")
+        if segments[0] != self.root_path:
+            return False
+
+        current = self.root
+        ancestry = {current}
+        for position, segment in enumerate(segments[1:], start=1):
+            edge = self._edges_by_instance.get((current, segment))
+            if edge is None:
+                return False
+            if edge.child in ancestry:
+                # Cycle edges are leaves in the elaborated hierarchy.
+                return position == len(segments) - 1
+            current = edge.child
+            ancestry.add(current)
+        return True
+
+    @cached_property
+    def _edges_by_instance(self) -> dict[tuple[ModuleKey, str], ViewHierarchyEdge]:
+        """Map `(parent, instance)` to the first matching edge for path lookup."""
+        lookup: dict[tuple[ModuleKey, str], ViewHierarchyEdge] = {}
+        for parent, module_edges in self.edges.items():
+            for edge in module_edges:
+                lookup.setdefault((parent, edge.instance), edge)
+        return lookup
+
+    def occurrence_count(self) -> int:
+        """Return the number of flattened module-instance occurrences."""
+        if self.has_cycles:
+            return sum(1 for _ in self.iter_index_entries())
+        return sum(
+            self.occurrences.get(parent, 0) * len(edges)
+            for parent, edges in self.edges.items()
+        )
+
+    def iter_index_entries(self) -> Iterator[ViewInstanceIndexEntry]:
+        """Expand the DAG into flattened occurrences in DFS preorder.
+
+        Yields:
+            Index entries in the same order as ``build_instance_index``.
+        """
+        if self.root is None or self.root_path is None:
+            return
+
+        ancestry: list[ModuleKey] = [self.root]
+        ancestry_keys = {self.root}
+        stack: list[tuple[Iterator[ViewHierarchyEdge], str]] = [
+            (iter(self.edges.get(self.root, ())), self.root_path)
+        ]
+        while stack:
+            edges, parent_path = stack[-1]
+            edge = next(edges, None)
+            if edge is None:
+                stack.pop()
+                ancestry_keys.discard(ancestry.pop())
+                continue
+            yield ViewInstanceIndexEntry(
+                path=parent_path,
+                instance=edge.instance,
+                module=edge.module,
+                ref=edge.ref,
+                ref_file_id=edge.ref_file_id,
+            )
+            if edge.child in ancestry_keys:
+                continue
+            stack.append(
+                (
+                    iter(self.edges.get(edge.child, ())),
+                    join_hierarchy_path(parent_path, edge.instance),
+                )
+            )
+            ancestry.append(edge.child)
+            ancestry_keys.add(edge.child)
+
+    def to_instance_index(self) -> ViewInstanceIndex:
+        """Return the equivalent flattened instance index."""
+        return ViewInstanceIndex(
+            entries=tuple(self.iter_index_entries()), root_path=self.root_path
+        )
+
+
+def build_hierarchy_dag(design: NetlistDesign) -> ViewHierarchyDag:
+    """Build the occurrence-compressed hierarchy DAG for a design.
+
+    Each reachable module is visited once; its module-referencing instances
+    become edges in authored declaration order. Device-referencing and
+    unresolved instances are skipped, matching ``build_instance_index``.
+
+    Args:
+        design: NetlistIR design to index.
+
+    Returns:
+        Hierarchy DAG rooted at the resolved top module.
+    """
+    top = resolve_top_module(design)
+    if top is None:
+        return ViewHierarchyDag(root=None, root_path=None)
+
+    modules_by_key, modules_by_name = index_symbols(design.modules)
+    root: ModuleKey = (top.file_id, top.name)
+    modules: dict[ModuleKey, NetlistModule] = {root: top}
+    edges: dict[ModuleKey, tuple[ViewHierarchyEdge, ...]] = {}
+    pending = [root]
+    while pending:
+        key = pending.pop()
+        module_edges: list[ViewHierarchyEdge] = []
+        for instance in modules[key].instances:
+            target = select_symbol(
+                symbols_by_name=modules_by_name,
+                symbols_by_key=modules_by_key,
+                name=instance.ref,
+                file_id=instance.ref_file_id,
+            )
+            if target is None:
+                continue
+            child: ModuleKey = (target.file_id, target.name)
+            module_edges.append(
+                ViewHierarchyEdge(
+                    parent=key,
+                    instance=instance.name,
+                    module=_logical_module_name(instance.ref),
+                    ref=instance.ref,
+                    ref_file_id=instance.ref_file_id,
+                    child=child,
+                )
+            )
+            if child not in modules:
+                modules[child] = target
+                pending.append(child)
+        edges[key] = tuple(module_edges)
+
+    order = _topological_order(root, edges)
+    if order is None:
+        return ViewHierarchyDag(
+            root=root,
+            root_path=top.name,
+            modules=modules,
+            edges=edges,
+            has_cycles=True,
+        )
+
+    occurrences: dict[ModuleKey, int] = {key: 0 for key in modules}
+    occurrences[root] = 1
+    for key in order:
+        for edge in edges[key]:
+            occurrences[edge.child] += occurrences[key]
+    return ViewHierarchyDag(
+        root=root,
+        root_path=top.name,
+        modules=modules,
+        edges=edges,
+        occurrences=occurrences,
+    )
+
+
+def _topological_order(
+    root: ModuleKey, edges: dict[ModuleKey, tuple[ViewHierarchyEdge, ...]]
+) -> Optional[list[ModuleKey]]:
+    """Return parents-before-children module order, or None on a cycle."""
+    indegree: dict[ModuleKey, int] = {key: 0 for key in edges}
+    for module_edges in edges.values():
+        for edge in module_edges:
+            indegree[edge.child] += 1
+    ready = [root] if indegree[root] == 0 else []
+    order: list[ModuleKey] = []
+    while ready:
+        key = ready.pop()
+        order.append(key)
+        for edge in edges[key]:
+            indegree[edge.child] -= 1
+            if indegree[edge.child] == 0:
+                ready.append(edge.child)
+    if len(order) != len(edges):
+        return None
+    return order
+
+
+__all__ = [
+    "ViewHierarchyDag",
+    "ViewHierarchyEdge",
+    "build_hierarchy_dag",
+]
@@ -5,7 +5,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional
 
-from asdl.core.hierarchy import resolve_top_module, traverse_hierarchy
+from asdl.core.hierarchy import iter_hierarchy, resolve_top_module
 from asdl.emit.netlist_ir import NetlistDesign
 
 from .models import ViewMatch
@@ -60,7 +60,7 @@ def build_instance_index(design: NetlistDesign) -> ViewInstanceIndex:
     if top is None:
         return ViewInstanceIndex(entries=(), root_path=None)
 
-    traversal = traverse_hierarchy(design, include_devices=False, order="dfs-pre")
+    traversal = iter_hierarchy(design, include_devices=False, order="dfs-pre")
     entries = tuple(
         ViewInstanceIndexEntry(
             path=row.parent_path,
@@ -2,20 +2,18 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import heapq
+from dataclasses import dataclass, field
+from typing import Iterable, Iterator, Optional, Sequence
 
-from asdl.core.symbol_resolution import index_symbols, symbol_exists
+from asdl.compile_stats import count
+from asdl.core.symbol_resolution import symbol_exists
 from asdl.emit.netlist_ir import NetlistDesign, NetlistModule
 
-from .instance_index import (
-    ViewInstanceIndex,
-    ViewInstanceIndexEntry,
-    build_instance_index,
-    match_index_entries,
-)
-from .models import ViewProfile
+from .hierarchy_dag import ModuleKey, ViewHierarchyDag, ViewHierarchyEdge
+from .models import ViewProfile, ViewRule
 from .pathing import join_hierarchy_path
+from .session import ViewBindingSession
 
 
 @dataclass(frozen=True)
@@ -40,6 +38,178 @@ class ResolvedViewBindingEntry:
         return join_hierarchy_path(self.path, self.instance)
 
 
+@dataclass(frozen=True)
+class ResolvedViewBindingEdge:
+    """Resolved binding for one instance edge of a resolved node.
+
+    Attributes:
+        instance: Instance leaf name.
+        resolved: Resolved module symbol in `cell` or `cell@view` form.
+        rule_id: Matching rule identifier that last overrode baseline, or None.
+        child: Resolved node for the referenced module occurrence, or None for
+            a cycle edge (which is a hierarchy leaf).
+    """
+
+    instance: str
+    resolved: str
+    rule_id: Optional[str]
+    child: Optional["ResolvedViewBindingNode"]
+
+
+@dataclass(frozen=True, eq=False)
+class ResolvedViewBindingNode:
+    """Resolved bindings shared by all occurrences with one rule context.
+
+    Nodes compare by identity; the resolver returns the same node object for
+    every occurrence that no path-scoped rule distinguishes.
+
+    Attributes:
+        module: Authored module key `(file_id, name)` of the occurrence.
+        edges: Resolved instance edges in authored declaration order.
+    """
+
+    module: ModuleKey
+    edges: tuple[ResolvedViewBindingEdge, ...]
+
+
+@dataclass(frozen=True)
+class ResolvedViewBindings:
+    """Occurrence-compressed view-binding resolution result.
+
+    Attributes:
+        root: Resolved node for the top module, or None when no top resolves.
+        root_path: Hierarchy path of the root (the top module name).
+        node_count: Number of distinct resolved nodes.
+    """
+
+    root: Optional[ResolvedViewBindingNode]
+    root_path: Optional[str]
+    node_count: int = 0
+
+    def entries(self) -> tuple[ResolvedViewBindingEntry, ...]:
+        """Expand resolved nodes into per-occurrence sidecar entries.
+
+        Returns:
+            Sidecar entries in hierarchical DFS preorder.
+        """
+        if self.root is None or self.root_path is None:
+            return ()
+        entries: list[ResolvedViewBindingEntry] = []
+        stack: list[tuple[Iterator[ResolvedViewBindingEdge], str]] = [
+            (iter(self.root.edges), self.root_path)
+        ]
+        while stack:
+            edges, parent_path = stack[-1]
+            edge = next(edges, None)
+            if edge is None:
+                stack.pop()
+                continue
+            entries.append(
+                ResolvedViewBindingEntry(
+                    path=parent_path,
+                    instance=edge.instance,
+                    resolved=edge.resolved,
+                    rule_id=edge.rule_id,
+                )
+            )
+            if edge.child is not None:
+                stack.append(
+                    (iter(edge.child.edges), join_hierarchy_path(parent_path, edge.instance))
+                )
+        return tuple(entries)
+
+    @classmethod
+    def from_entries(
+        cls,
+        dag: ViewHierarchyDag,
+        entries: Iterable[ResolvedViewBindingEntry],
+    ) -> "ResolvedViewBindings":
+        """Rebuild a binding graph from flattened sidecar entries.
+
+        Every occurrence gets its own node, so the result is as large as the
+        sidecar it was built from.
+
+        Args:
+            dag: Hierarchy DAG of the design the entries were resolved for.
+            entries: Sidecar entries, one per hierarchy occurrence.
+
+        Returns:
+            Binding graph equivalent to ``entries``.
+
+        Raises:
+            ValueError: If entries repeat a path or do not match the design
+                hierarchy occurrences.
+        """
+        resolved_by_path: dict[str, ResolvedViewBindingEntry] = {}
+        for entry in entries:
+            full_path = entry.full_path
+            if full_path in resolved_by_path:
+                raise ValueError(
+                    f"Resolved sidecar contains duplicate entry for '{full_path}'"
+                )
+            resolved_by_path[full_path] = entry
+
+        if dag.root is None or dag.root_path is None or not any(dag.edges.values()):
+            if resolved_by_path:
+                raise ValueError(
+                    "Resolved sidecar entries are present but the design has no "
+                    "hierarchical module instances"
+                )
+            return cls(root=None, root_path=None)
+
+        missing_paths: list[str] = []
+        index_paths: set[str] = set()
+        ancestry = {dag.root}
+        root: Optional[ResolvedViewBindingNode] = None
+        node_count = 0
+        stack = [
+            _NodeFrame(key=dag.root, path=dag.root_path, edges=iter(dag.edges[dag.root]))
+        ]
+        while stack:
+            frame = stack[-1]
+            edge = next(frame.edges, None)
+            if edge is None:
+                stack.pop()
+                ancestry.discard(frame.key)
+                node = ResolvedViewBindingNode(module=frame.key, edges=tuple(frame.built))
+                node_count += 1
+                if stack:
+                    stack[-1].attach(node)
+                else:
+                    root = node
+                continue
+            full_path = join_hierarchy_path(frame.path, edge.instance)
+            index_paths.add(full_path)
+            entry = resolved_by_path.get(full_path)
+            if entry is None:
+                missing_paths.append(full_path)
+                resolved, rule_id = edge.ref, None
+            else:
+                resolved, rule_id = entry.resolved, entry.rule_id
+            frame.pending = (edge.instance, resolved, rule_id)
+            if edge.child in ancestry:
+                frame.attach(None)
+                continue
+            ancestry.add(edge.child)
+            stack.append(
+                _NodeFrame(
+                    key=edge.child, path=full_path, edges=iter(dag.edges[edge.child])
+                )
+            )
+
+        extra_paths = sorted(path for path in resolved_by_path if path not in index_paths)
+        if missing_paths or extra_paths:
+            parts: list[str] = []
+            if missing_paths:
+                parts.append(f"missing paths: {', '.join(missing_paths)}")
+            if extra_paths:
+                parts.append(f"unknown paths: {', '.join(extra_paths)}")
+            raise ValueError(
+                "Resolved sidecar does not match design index (" + "; ".join(parts) + ")"
+            )
+        return cls(root=root, root_path=dag.root_path, node_count=node_count)
+
+
 def resolve_view_bindings(
     design: NetlistDesign, profile: ViewProfile
 ) -> tuple[ResolvedViewBindingEntry, ...]:
@@ -59,65 +229,325 @@ def resolve_view_bindings(
         ValueError: If baseline resolution fails or final resolved symbols are
             unavailable in the loaded design modules.
     """
-    index = build_instance_index(design)
-    modules_by_key, modules_by_name = index_symbols(design.modules)
+    return resolve_view_binding_graph(design, profile).entries()
+
+
+def resolve_view_binding_graph(
+    design: NetlistDesign,
+    profile: ViewProfile,
+    *,
+    session: Optional[ViewBindingSession] = None,
+) -> ResolvedViewBindings:
+    """Resolve view bindings over the occurrence-compressed hierarchy DAG.
 
-    sidecar: list[ResolvedViewBindingEntry] = []
-    sidecar_positions: dict[str, int] = {}
-    index_entries_by_full_path: dict[str, ViewInstanceIndexEntry] = {}
+    Baseline `view_order` selection is evaluated once per module-instance
+    edge. Rules are then evaluated per resolution context: occurrences of a
+    module share one resolved node unless a path-scoped rule distinguishes
+    them, so work scales with design size rather than flattened occurrence
+    count.
+
+    Args:
+        design: NetlistIR design whose hierarchical instances will be resolved.
+        profile: Validated view-binding profile.
+        session: Optional shared view-binding session for ``design``; ignored
+            when it belongs to a different design.
 
-    for index_entry in index.entries:
-        resolved = _resolve_baseline_symbol(
-            index_entry,
+    Returns:
+        Resolved binding graph; ``entries()`` expands the sidecar.
+
+    Raises:
+        ValueError: If baseline resolution fails, a rule path does not exist,
+            or final resolved symbols are unavailable in the design modules.
+    """
+    session = ViewBindingSession.for_design(design, session)
+    dag = session.dag
+    if dag.root is None or dag.root_path is None:
+        return ResolvedViewBindings(root=None, root_path=None)
+    modules_by_key = session.modules_by_key
+    modules_by_name = session.modules_by_name
+
+    baseline: dict[ViewHierarchyEdge, str] = {}
+    for edge, full_path in _iter_first_occurrences(dag):
+        if edge in baseline:
+            continue
+        baseline[edge] = _resolve_baseline_symbol(
+            edge,
+            full_path=full_path,
             view_order=profile.view_order,
             modules_by_key=modules_by_key,
             modules_by_name=modules_by_name,
         )
-        resolved_entry = ResolvedViewBindingEntry(
-            path=index_entry.path,
-            instance=index_entry.instance,
-            resolved=resolved,
-            rule_id=None,
-        )
-        sidecar_positions[index_entry.full_path] = len(sidecar)
-        index_entries_by_full_path[index_entry.full_path] = index_entry
-        sidecar.append(resolved_entry)
 
     for rule in profile.rules:
-        if rule.match.path is not None and not _index_has_hierarchy_path(index, rule.match.path):
+        if rule.match.path is not None and not dag.has_path(rule.match.path):
             raise ValueError(
                 f"Rule '{rule.id}' match.path '{rule.match.path}' does not resolve "
                 "to an existing hierarchy node"
             )
-        for matched_entry in match_index_entries(index, rule.match):
-            position = sidecar_positions[matched_entry.full_path]
-            sidecar[position] = ResolvedViewBindingEntry(
-                path=matched_entry.path,
-                instance=matched_entry.instance,
-                resolved=rule.bind,
-                rule_id=rule.id,
+
+    rules = profile.rules
+    root_rules = frozenset(
+        position for position, rule in enumerate(rules) if rule.match.path is None
+    )
+    active: set[int] = set()
+    pending: list[tuple[int, tuple[str, ...]]] = []
+    for position, rule in enumerate(rules):
+        if rule.match.path is None:
+            continue
+        segments = tuple(rule.match.path.split("."))
+        if len(segments) == 1:
+            active.add(position)
+        else:
+            pending.append((position, segments[1:]))
+
+    nodes: dict[tuple[object, ...], ResolvedViewBindingNode] = {}
+    checked_symbols: set[tuple[str, str]] = set()
+    # Scopes with the same active rules share one set of buckets.
+    buckets_by_scope: dict[tuple[frozenset[int], bool], _RuleBuckets] = {}
+
+    def _resolve_edge(
+        edge: ViewHierarchyEdge, full_path: str, scope: _ResolutionScope
+    ) -> tuple[_ResolutionScope, str, Optional[str]]:
+        child_scope = scope.descend(edge.instance)
+        bucket_key = (child_scope.active, scope.is_root)
+        buckets = buckets_by_scope.get(bucket_key)
+        if buckets is None:
+            positions = child_scope.active
+            if scope.is_root:
+                positions = positions | root_rules
+            buckets = _RuleBuckets.build(positions, rules)
+            buckets_by_scope[bucket_key] = buckets
+
+        resolved = baseline[edge]
+        rule_id: Optional[str] = None
+        candidates = buckets.candidates(edge)
+        count("view_rule_candidates", len(candidates))
+        for position in candidates:
+            rule = rules[position]
+            if rule.match.module is not None and rule.match.module != edge.module:
+                continue
+            resolved = rule.bind
+            rule_id = rule.id
+
+        symbol_key = (resolved, edge.ref_file_id)
+        if symbol_key not in checked_symbols:
+            if not _module_symbol_exists(
+                symbol=resolved,
+                file_id=edge.ref_file_id,
+                modules_by_key=modules_by_key,
+                modules_by_name=modules_by_name,
+            ):
+                raise ValueError(
+                    "Resolved symbol "
+                    f"'{resolved}' for instance "
+                    f"'{full_path}' is not defined in the design"
+                )
+            checked_symbols.add(symbol_key)
+        return child_scope, resolved, rule_id
+
+    # Nodes are built bottom-up on an explicit stack so hierarchy depth is not
+    # bounded by the interpreter recursion limit.
+    ancestry: list[ModuleKey] = []
+    ancestry_keys: set[ModuleKey] = set()
+    stack: list[_NodeFrame] = []
+
+    def _open(
+        key: ModuleKey, path: str, scope: _ResolutionScope
+    ) -> Optional[ResolvedViewBindingNode]:
+        """Return the memoized node for an occurrence, or push a frame for it."""
+        memo_key = (key, scope, (*ancestry, key) if dag.has_cycles else None)
+        cached = nodes.get(memo_key)
+        if cached is not None:
+            return cached
+        stack.append(
+            _NodeFrame(
+                key=key,
+                path=path,
+                scope=scope,
+                memo_key=memo_key,
+                edges=iter(dag.edges.get(key, ())),
             )
+        )
+        ancestry.append(key)
+        ancestry_keys.add(key)
+        return None
 
-    for resolved_entry in sidecar:
-        source_entry = index_entries_by_full_path[resolved_entry.full_path]
-        if not _module_symbol_exists(
-            symbol=resolved_entry.resolved,
-            file_id=source_entry.ref_file_id,
-            modules_by_key=modules_by_key,
-            modules_by_name=modules_by_name,
-        ):
-            raise ValueError(
-                "Resolved symbol "
-                f"'{resolved_entry.resolved}' for instance "
-                f"'{resolved_entry.full_path}' is not defined in the design"
+    root_scope = _ResolutionScope(
+        active=frozenset(active), pending=tuple(pending), is_root=True
+    )
+    root = _open(dag.root, dag.root_path, root_scope)
+    while stack:
+        frame = stack[-1]
+        edge = next(frame.edges, None)
+        if edge is None:
+            stack.pop()
+            ancestry_keys.discard(ancestry.pop())
+            node = ResolvedViewBindingNode(module=frame.key, edges=tuple(frame.built))
+            assert frame.memo_key is not None
+            nodes[frame.memo_key] = node
+            if stack:
+                stack[-1].attach(node)
+            else:
+                root = node
+            continue
+
+        full_path = join_hierarchy_path(frame.path, edge.instance)
+        assert frame.scope is not None
+        child_scope, resolved, rule_id = _resolve_edge(edge, full_path, frame.scope)
+        frame.pending = (edge.instance, resolved, rule_id)
+        if edge.child in ancestry_keys:
+            frame.attach(None)
+            continue
+        child = _open(edge.child, full_path, child_scope)
+        if child is not None:
+            frame.attach(child)
+
+    return ResolvedViewBindings(
+        root=root, root_path=dag.root_path, node_count=len(nodes)
+    )
+
+
+@dataclass
+class _NodeFrame:
+    """Open occurrence whose resolved node is being built bottom-up.
+
+    Attributes:
+        key: Authored module key of the occurrence.
+        path: Hierarchy path of the occurrence.
+        edges: Remaining DAG edges of the module.
+        scope: Rule context (resolver only).
+        memo_key: Node memo key (resolver only).
+        built: Resolved edges closed so far.
+        pending: `(instance, resolved, rule_id)` of the edge whose child node
+            is being built.
+    """
+
+    key: ModuleKey
+    path: str
+    edges: Iterator[ViewHierarchyEdge]
+    scope: Optional["_ResolutionScope"] = None
+    memo_key: Optional[tuple[object, ...]] = None
+    built: list[ResolvedViewBindingEdge] = field(default_factory=list)
+    pending: Optional[tuple[str, str, Optional[str]]] = None
+
+    def attach(self, child: Optional[ResolvedViewBindingNode]) -> None:
+        """Close the pending edge with its resolved child node."""
+        assert self.pending is not None
+        instance, resolved, rule_id = self.pending
+        self.built.append(
+            ResolvedViewBindingEdge(
+                instance=instance, resolved=resolved, rule_id=rule_id, child=child
             )
+        )
+        self.pending = None
+
+
+@dataclass(frozen=True)
+class _ResolutionScope:
+    """Rule context shared by every occurrence resolved under one node.
 
-    return tuple(sidecar)
+    Attributes:
+        active: Positions of path-scoped rules whose scope contains the node.
+        pending: Path-scoped rules still descending toward their scope root,
+            as `(position, remaining_segments)` pairs.
+        is_root: True for the top module, where path-less rules apply.
+    """
+
+    active: frozenset[int]
+    pending: tuple[tuple[int, tuple[str, ...]], ...]
+    is_root: bool = False
+
+    def descend(self, instance: str) -> "_ResolutionScope":
+        """Return the scope for the occurrence reached through `instance`."""
+        if not self.pending:
+            return _ResolutionScope(active=self.active, pending=())
+        active = set(self.active)
+        pending: list[tuple[int, tuple[str, ...]]] = []
+        for position, remaining in self.pending:
+            if remaining[0] != instance:
+                continue
+            if len(remaining) == 1:
+                active.add(position)
+            else:
+                pending.append((position, remaining[1:]))
+        return _ResolutionScope(active=frozenset(active), pending=tuple(pending))
+
+
+@dataclass(frozen=True)
+class _RuleBuckets:
+    """Rules of one rule context, bucketed by what they match.
+
+    Every bucket lists rule positions in ascending (precedence) order. A rule
+    with `match.instance` is bucketed by instance name, one with only
+    `match.module` by module name, and one with neither is a wildcard.
+
+    Attributes:
+        by_instance: Rule positions keyed by `match.instance`.
+        by_module: Rule positions keyed by `match.module` (instance unset).
+        wildcard: Positions of rules without instance or module constraints.
+    """
+
+    by_instance: dict[str, list[int]]
+    by_module: dict[str, list[int]]
+    wildcard: list[int]
+
+    @classmethod
+    def build(cls, positions: Iterable[int], rules: Sequence[ViewRule]) -> _RuleBuckets:
+        """Bucket the rules at `positions`."""
+        by_instance: dict[str, list[int]] = {}
+        by_module: dict[str, list[int]] = {}
+        wildcard: list[int] = []
+        for position in sorted(positions):
+            match = rules[position].match
+            if match.instance is not None:
+                by_instance.setdefault(match.instance, []).append(position)
+            elif match.module is not None:
+                by_module.setdefault(match.module, []).append(position)
+            else:
+                wildcard.append(position)
+        return cls(by_instance=by_instance, by_module=by_module, wildcard=wildcard)
+
+    def candidates(self, edge: ViewHierarchyEdge) -> list[int]:
+        """Return positions of rules that may match `edge`, in order.
+
+        Instance-bucketed rules that also constrain `match.module` still need
+        their module checked by the caller.
+        """
+        by_instance = self.by_instance.get(edge.instance, ())
+        by_module = self.by_module.get(edge.module, ())
+        if not by_instance and not by_module:
+            return self.wildcard
+        return list(heapq.merge(by_instance, by_module, self.wildcard))
+
+
+def _iter_first_occurrences(
+    dag: ViewHierarchyDag,
+) -> Iterator[tuple[ViewHierarchyEdge, str]]:
+    """Yield each DAG edge with the path of its first DFS-preorder occurrence."""
+    if dag.root is None or dag.root_path is None:
+        return
+    visited = {dag.root}
+    stack: list[tuple[Iterator[ViewHierarchyEdge], str]] = [
+        (iter(dag.edges.get(dag.root, ())), dag.root_path)
+    ]
+    while stack:
+        edges, parent_path = stack[-1]
+        edge = next(edges, None)
+        if edge is None:
+            stack.pop()
+            continue
+        full_path = join_hierarchy_path(parent_path, edge.instance)
+        yield edge, full_path
+        if edge.child in visited:
+            continue
+        visited.add(edge.child)
+        stack.append((iter(dag.edges.get(edge.child, ())), full_path))
 
 
 def _resolve_baseline_symbol(
-    entry: ViewInstanceIndexEntry,
+    entry: ViewHierarchyEdge,
     *,
+    full_path: str,
     view_order: list[str],
     modules_by_key: dict[tuple[Optional[str], str], NetlistModule],
     modules_by_name: dict[str, list[NetlistModule]],
@@ -125,7 +555,8 @@ def _resolve_baseline_symbol(
     """Select baseline resolved symbol for one instance entry.
 
     Args:
-        entry: Indexed instance entry with logical module context.
+        entry: Hierarchy edge with logical module context.
+        full_path: Occurrence path reported when resolution fails.
         view_order: Ordered precedence list from a view profile.
         modules_by_key: Available modules keyed by `(file_id, symbol)`.
         modules_by_name: Modules grouped by symbol name.
@@ -151,7 +582,7 @@ def _resolve_baseline_symbol(
 
     raise ValueError(
         "Unable to resolve baseline view "
-        f"for instance '{entry.full_path}' and logical module '{entry.module}'"
+        f"for instance '{full_path}' and logical module '{entry.module}'"
     )
 
 
@@ -181,11 +612,11 @@ def _module_symbol_exists(
     )
 
 
-def _index_has_hierarchy_path(index: ViewInstanceIndex, path: str) -> bool:
-    """Return whether `path` resolves to the index root or an instance node."""
-    if index.root_path == path:
-        return True
-    return any(entry.full_path == path for entry in index.entries)
-
-
-__all__ = ["ResolvedViewBindingEntry", "resolve_view_bindings"]
+__all__ = [
+    "ResolvedViewBindingEdge",
+    "ResolvedViewBindingEntry",
+    "ResolvedViewBindingNode",
+    "ResolvedViewBindings",
+    "resolve_view_binding_graph",
+    "resolve_view_bindings",
+]
@@ -0,0 +1,84 @@
+"""Design-scoped view-binding indexes shared by resolution and application."""
+
+from __future__ import annotations
+
+from functools import cached_property
+from typing import Optional
+
+from asdl.core.symbol_resolution import index_symbols
+from asdl.emit.netlist_ir import NetlistDesign, NetlistModule
+
+from .hierarchy_dag import ViewHierarchyDag, build_hierarchy_dag
+from .instance_index import ViewInstanceIndex, ViewInstanceIndexEntry
+
+
+class ViewBindingSession:
+    """Hierarchy index, symbol tables and path maps for one authored design.
+
+    Resolving one or more profiles, applying their bindings and answering
+    binding queries all walk the same authored hierarchy. A session builds
+    each structure lazily on first use and then shares it, so one command pays
+    for a single traversal regardless of how many consumers it has.
+
+    The session treats its design as immutable; consumers that extend symbol
+    tables (such as specialization during application) must copy them.
+    """
+
+    def __init__(self, design: NetlistDesign) -> None:
+        self.design = design
+
+    @classmethod
+    def for_design(
+        cls, design: NetlistDesign, session: Optional["ViewBindingSession"]
+    ) -> "ViewBindingSession":
+        """Return `session` when it belongs to `design`, else a new session."""
+        if session is not None and session.design is design:
+            return session
+        return cls(design)
+
+    @cached_property
+    def dag(self) -> ViewHierarchyDag:
+        """Occurrence-compressed hierarchy DAG."""
+        return build_hierarchy_dag(self.design)
+
+    @cached_property
+    def index(self) -> ViewInstanceIndex:
+        """Flattened instance index, expanded from the DAG."""
+        return self.dag.to_instance_index()
+
+    @cached_property
+    def modules_by_key(self) -> dict[tuple[Optional[str], str], NetlistModule]:
+        """Modules keyed by `(file_id, name)`."""
+        return self._module_symbols[0]
+
+    @cached_property
+    def modules_by_name(self) -> dict[str, list[NetlistModule]]:
+        """Modules grouped by symbol name."""
+        return self._module_symbols[1]
+
+    @cached_property
+    def entries_by_path(self) -> dict[str, ViewInstanceIndexEntry]:
+        """Index entries keyed by full occurrence path (first entry wins)."""
+        entries: dict[str, ViewInstanceIndexEntry] = {}
+        for entry in self.index.entries:
+            entries.setdefault(entry.full_path, entry)
+        return entries
+
+    @cached_property
+    def child_entries_by_parent(self) -> dict[str, tuple[ViewInstanceIndexEntry, ...]]:
+        """Index entries grouped by parent path, in index order."""
+        children: dict[str, list[ViewInstanceIndexEntry]] = {}
+        for entry in self.index.entries:
+            children.setdefault(entry.path, []).append(entry)
+        return {path: tuple(entries) for path, entries in children.items()}
+
+    @cached_property
+    def _module_symbols(
+        self,
+    ) -> tuple[
+        dict[tuple[Optional[str], str], NetlistModule], dict[str, list[NetlistModule]]
+    ]:
+        return index_symbols(self.design.modules)
+
+
+__all__ = ["ViewBindingSession"]
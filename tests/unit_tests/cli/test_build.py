@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+from click.testing import CliRunner
+
+from asdl.cli import cli
+
+
+def _write_backend_config(tmp_path: Path) -> Path:
+    config_path = tmp_path / "backends.yaml"
+    lines = [
+        "sim.ngspice:",
+        '  extension: ".spice"',
+        '  comment_prefix: "*"',
+        "  templates:",
+        '    __subckt_header__: ".subckt {name} {ports}"',
+        '    __subckt_header_params__: ".subckt {name} {ports} {params}"',
+        '    __subckt_footer__: ".ends {name}"',
+        '    __subckt_call__: "X{name} {ports} {ref}"',
+        '    __subckt_call_params__: "X{name} {ports} {ref} {params}"',
+        '    __netlist_header__: ""',
+        '    __netlist_footer__: ".end"',
+    ]
+    config_path.write_text("\n".join(lines), encoding="utf-8")
+    return config_path
+
+
+def _write_library(path: Path) -> None:
+    lines = [
+        "modules:",
+        "  leaf:",
+        "    instances:",
+        "      R1: res r=2k",
+        "    nets:",
+        "      $IN:",
+        "        - R1.P",
+        "      $OUT:",
+        "        - R1.N",
+        "devices:",
+        "  res:",
+        "    ports: [P, N]",
+        "    parameters:",
+        "      r: 1k",
+        "    backends:",
+        "      sim.ngspice:",
+        '        template: "R{name} {ports} {params}"',
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _write_testbench(path: Path, import_path: str, count: int) -> None:
+    lines = [
+        "imports:",
+        f"  lib: {import_path}",
+        "top: tb",
+        "modules:",
+        "  tb:",
+        "    instances:",
+        f"      U<1:{count}>: lib.leaf",
+        "    nets:",
+        "      $IN:",
+        f"        - U<1:{count}>.IN",
+        "      $OUT:",
+        f"        - U<1:{count}>.OUT",
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+@pytest.fixture
+def testbenches(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(_write_backend_config(tmp_path)))
+    _write_library(tmp_path / "lib.asdl")
+    tb_dir = tmp_path / "tb"
+    tb_dir.mkdir()
+    _write_testbench(tb_dir / "tb_one.asdl", "../lib.asdl", 1)
+    _write_testbench(tb_dir / "tb_two.asdl", "../lib.asdl", 2)
+    return tb_dir
+
+
+def test_cli_build_matches_netlist_outputs_for_each_job_count(
+    tmp_path: Path, testbenches: Path
+) -> None:
+    runner = CliRunner()
+    expected: dict[str, str] = {}
+    for name in ("tb_one", "tb_two"):
+        output = tmp_path / f"{name}.expected.spice"
+        result = runner.invoke(
+            cli,
+            [
+                "netlist",
+                str(testbenches / f"{name}.asdl"),
+                "-o",
+                str(output),
+                "--log",
+                str(tmp_path / f"{name}.expected.log.json"),
+            ],
+        )
+        assert result.exit_code == 0, result.output
+        expected[name] = output.read_text(encoding="utf-8")
+
+    for jobs in ("1", "2"):
+        out_dir = tmp_path / f"jobs{jobs}"
+        summary_path = tmp_path / f"summary{jobs}.json"
+        result = runner.invoke(
+            cli,
+            [
+                "build",
+                str(testbenches / "*.asdl"),
+                "--output-dir",
+                str(out_dir),
+                "-j",
+                jobs,
+                "--summary",
+                str(summary_path),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert result.output.splitlines()[-1] == "2 of 2 entries built."
+        assert sorted(path.name for path in out_dir.iterdir()) == [
+            "tb_one.log.json",
+            "tb_one.spice",
+            "tb_two.log.json",
+            "tb_two.spice",
+        ]
+        for name, text in expected.items():
+            assert (out_dir / f"{name}.spice").read_text(encoding="utf-8") == text
+
+        summary = json.loads(summary_path.read_text(encoding="utf-8"))
+        assert summary["succeeded"] == 2
+        assert summary["failed"] == 0
+        assert [entry["entry"] for entry in summary["entries"]] == [
+            str(testbenches / "tb_one.asdl"),
+            str(testbenches / "tb_two.asdl"),
+        ]
+        assert summary["entries"][0]["netlist"] == str(out_dir / "tb_one.spice")
+        assert summary["entries"][0]["compile_log"] == str(
+            out_dir / "tb_one.log.json"
+        )
+
+
+def test_cli_build_reports_failed_entries_without_stopping_others(
+    tmp_path: Path, testbenches: Path
+) -> None:
+    _write_testbench(testbenches / "tb_broken.asdl", "../missing.asdl", 1)
+    summary_path = tmp_path / "summary.json"
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "build",
+            str(testbenches / "tb_broken.asdl"),
+            str(testbenches / "tb_*.asdl"),
+            "--summary",
+            str(summary_path),
+        ],
+    )
+
+    assert result.exit_code == 1
+    assert "Import path not found" in result.output
+    assert (testbenches / "tb_one.spice").exists()
+    assert (testbenches / "tb_two.log.json").exists()
+    assert not (testbenches / "tb_broken.spice").exists()
+    summary = json.loads(summary_path.read_text(encoding="utf-8"))
+    assert [(entry["entry"], entry["status"]) for entry in summary["entries"]] == [
+        (str(testbenches / "tb_broken.asdl"), "failed"),
+        (str(testbenches / "tb_one.asdl"), "ok"),
+        (str(testbenches / "tb_two.asdl"), "ok"),
+    ]
+    assert summary["entries"][0]["errors"] >= 1
+    assert summary["entries"][0]["netlist"] is None
+
+
+def test_cli_build_rejects_colliding_outputs_and_unmatched_globs(
+    tmp_path: Path, testbenches: Path
+) -> None:
+    other_dir = tmp_path / "other"
+    other_dir.mkdir()
+    _write_testbench(other_dir / "tb_one.asdl", "../lib.asdl", 3)
+    runner = CliRunner()
+
+    collision = runner.invoke(
+        cli,
+        [
+            "build",
+            str(testbenches / "tb_one.asdl"),
+            str(other_dir / "tb_one.asdl"),
+            "--output-dir",
+            str(tmp_path / "out"),
+        ],
+    )
+    assert collision.exit_code == 1
+    assert "both write" in collision.output
+    assert not (tmp_path / "out").exists()
+
+    unmatched = runner.invoke(cli, ["build", str(tmp_path / "nothing" / "*.asdl")])
+    assert unmatched.exit_code == 1
+    assert "No entry files match" in unmatched.output
+
+
+def test_cli_build_records_stage_timings_and_counters(testbenches: Path) -> None:
+    result = CliRunner().invoke(
+        cli,
+        ["build", str(testbenches / "tb_*.asdl"), "--timings"],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert f"timings: {testbenches / 'tb_one.asdl'}" in result.stderr
+    assert f"timings: {testbenches / 'tb_two.asdl'}" in result.stderr
+
+    first = json.loads((testbenches / "tb_one.log.json").read_text(encoding="utf-8"))
+    second = json.loads((testbenches / "tb_two.log.json").read_text(encoding="utf-8"))
+    assert [entry["stage"] for entry in first["performance"]["stages"]] == [
+        "parse",
+        "import_resolution",
+        "patterned_graph",
+        "atomization",
+        "verification",
+        "netlist_ir",
+        "view_binding",
+        "emission",
+        "write",
+    ]
+    assert all(entry["wall_ms"] >= 0 for entry in first["performance"]["stages"])
+    assert first["performance"]["counters"]["files_parsed"] == 2
+    assert "document_cache_hits" not in first["performance"]["counters"]
+    # The shared library is parsed once and reused by the second entry.
+    assert second["performance"]["counters"]["files_parsed"] == 1
+    assert second["performance"]["counters"]["document_cache_hits"] == 1
+    assert second["performance"]["counters"]["instances_emitted"] == 3
+    assert second["performance"]["counters"]["nets_emitted"] == 4
+    assert second["performance"]["counters"]["atoms_expanded"] > 0
+    assert second["performance"]["counters"]["expressions_parsed"] > 0
+
+
+def test_cli_build_trace_out_records_spans_for_every_entry(
+    tmp_path: Path, testbenches: Path
+) -> None:
+    trace_path = tmp_path / "trace.json"
+    result = CliRunner().invoke(
+        cli,
+        [
+            "build",
+            str(testbenches / "tb_*.asdl"),
+            "-j",
+            "2",
+            "--trace-out",
+            str(trace_path),
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    trace = json.loads(trace_path.read_text(encoding="utf-8"))
+    emitted = [
+        event["args"]["module"]
+        for event in trace["traceEvents"]
+        if event["name"] == "emit_module" and event["ph"] == "B"
+    ]
+    assert emitted == ["tb", "leaf", "tb", "leaf"]
+    parsed = [
+        event["args"]["file"]
+        for event in trace["traceEvents"]
+        if event["name"] == "parse" and event["ph"] == "B"
+    ]
+    assert parsed == [
+        str(testbenches / "tb_one.asdl"),
+        str(testbenches.parent / "lib.asdl"),
+        str(testbenches / "tb_two.asdl"),
+        str(testbenches.parent / "lib.asdl"),
+    ]
+
+
+def test_cli_netlist_memory_report_lists_stage_peaks_and_live_irs(
+    tmp_path: Path, testbenches: Path
+) -> None:
+    log_path = tmp_path / "tb_two.log.json"
+    result = CliRunner().invoke(
+        cli,
+        [
+            "netlist",
+            str(testbenches / "tb_two.asdl"),
+            "-o",
+            str(tmp_path / "tb_two.spice"),
+            "--log",
+            str(log_path),
+            "--memory-report",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert "memory: IRs alive when emission starts:" in result.stderr
+    memory = json.loads(log_path.read_text(encoding="utf-8"))["memory"]
+    stages = {entry["stage"]: entry for entry in memory["stages"]}
+    assert {"parse", "atomization", "netlist_ir", "emission"} <= set(stages)
+    assert stages["atomization"]["peak_bytes"] > 0
+    irs = {entry["ir"]: entry for entry in memory["irs"]}
+    assert list(irs) == [
+        "ast",
+        "patterned_graph",
+        "atomized_graph",
+        "netlist_ir",
+        "bound_netlist_ir",
+        "netlist_text",
+    ]
+    assert irs["atomized_graph"]["type"] == "AtomizedProgramGraph"
+    assert irs["atomized_graph"]["reachable_bytes"] > 0
+    assert irs["atomized_graph"]["by_type"][0]["objects"] > 0
+    # The CLI keeps only the authored and view-bound designs for emission.
+    assert "atomized_graph" not in memory["alive_at_emission"]
+    assert "netlist_ir" in memory["alive_at_emission"]
+
+    plain = CliRunner().invoke(
+        cli,
+        ["netlist", str(testbenches / "tb_one.asdl"), "--log", str(log_path)],
+    )
+    assert plain.exit_code == 0, plain.output
+    assert "memory" not in json.loads(log_path.read_text(encoding="utf-8"))
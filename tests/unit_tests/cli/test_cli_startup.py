@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+SRC_DIR = Path(__file__).resolve().parents[3] / "src"
+
+# Cumulative `import asdl.cli` budget reported by `python -X importtime`.
+# Importing the Pydantic AST models or the lowering stack alone exceeds it.
+STARTUP_BUDGET_US = 200_000
+
+HEAVY_MODULES = (
+    "PySpice",
+    "asdl.ast",
+    "asdl.cli.query_runtime",
+    "asdl.core",
+    "asdl.emit",
+    "asdl.lowering",
+    "asdl.views",
+    "matplotlib",
+    "pydantic",
+    "yaml",
+)
+
+
+def _run_python(*args: str) -> subprocess.CompletedProcess[str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(
+        [str(SRC_DIR), *filter(None, [env.get("PYTHONPATH")])]
+    )
+    env["ASDL_SERVER_SOCKET"] = ""
+    return subprocess.run(
+        [sys.executable, *args],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+
+
+def _cumulative_import_us(stderr: str, module: str) -> int:
+    best: int | None = None
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = [field.strip() for field in line[len("import time:") :].split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative = int(fields[1])
+            best = cumulative if best is None else min(best, cumulative)
+    assert best is not None, f"{module} missing from -X importtime output"
+    return best
+
+
+def test_cli_help_does_not_import_pipeline_dependencies() -> None:
+    script = (
+        "import json, sys\n"
+        "from asdl.cli import cli\n"
+        "cli.main(['--help'], prog_name='asdlc', standalone_mode=False)\n"
+        "cli.main(['query', '--help'], prog_name='asdlc', standalone_mode=False)\n"
+        f"heavy = {HEAVY_MODULES!r}\n"
+        "print(json.dumps(sorted(m for m in heavy if m in sys.modules)))\n"
+    )
+    result = _run_python("-c", script)
+
+    assert json.loads(result.stdout.splitlines()[-1]) == []
+
+
+def test_cli_import_time_within_startup_budget() -> None:
+    result = _run_python("-X", "importtime", "-c", "import asdl.cli")
+
+    assert _cumulative_import_us(result.stderr, "asdl.cli") < STARTUP_BUDGET_US
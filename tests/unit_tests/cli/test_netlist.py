@@ -1312,6 +1312,222 @@ def test_cli_netlist_reports_compile_log_write_failure(
     assert "Failed to write compile log" in combined
 
 
+def _parallel_fold_yaml() -> str:
+    return "\n".join(
+        [
+            "top: top",
+            "modules:",
+            "  top:",
+            "    instances:",
+            "      MN<1:4>: nmos W=2u",
+            "      MR: nmos",
+            "    nets:",
+            "      $D: [MN<1:4>.d, MR.d]",
+            "      $G: [MN<1:4>.g, MR.g]",
+            "devices:",
+            "  nmos:",
+            "    ports: [d, g]",
+            "    parameters:",
+            "      W: 1u",
+            "      m: 1",
+            "    backends:",
+            "      sim.ngspice:",
+            '        template: "M{name} {ports} nch {params}"',
+        ]
+    )
+
+
+def _write_complete_backend_config(
+    tmp_path: Path,
+    *,
+    multiplicity_param: bool = False,
+    include_template: bool = False,
+) -> Path:
+    config_path = tmp_path / "complete_backends.yaml"
+    lines = [
+        "sim.ngspice:",
+        '  extension: ".spice"',
+        '  comment_prefix: "*"',
+    ]
+    if multiplicity_param:
+        lines.append("  multiplicity_param: m")
+    lines.extend(
+        [
+            "  templates:",
+            '    __subckt_header__: ".subckt {name} {ports}"',
+            '    __subckt_header_params__: ".subckt {name} {ports} {params}"',
+            '    __subckt_footer__: ".ends {name}"',
+            '    __subckt_call__: "X{name} {ports} {ref}"',
+            '    __subckt_call_params__: "X{name} {ports} {ref} {params}"',
+            '    __netlist_header__: ""',
+            '    __netlist_footer__: ".end"',
+        ]
+    )
+    if include_template:
+        lines.append("    __include__: '.include \"{path}\"'")
+    config_path.write_text("\n".join(lines), encoding="utf-8")
+    return config_path
+
+
+def test_cli_netlist_fold_parallel_emits_multiplicity_and_logs_folds(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = _write_complete_backend_config(tmp_path, multiplicity_param=True)
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    input_path = tmp_path / "fold.asdl"
+    input_path.write_text(_parallel_fold_yaml(), encoding="utf-8")
+    log_path = tmp_path / "fold.log.json"
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["netlist", str(input_path), "--fold-parallel", "--log", str(log_path)],
+    )
+
+    assert result.exit_code == 0, result.output
+    output_path = tmp_path / "fold.spice"
+    assert output_path.read_text(encoding="utf-8") == "\n".join(
+        [
+            "MMN1 D G nch W=2u m=4",
+            "MMR D G nch W=1u m=1",
+            ".end",
+        ]
+    )
+    payload = json.loads(log_path.read_text(encoding="utf-8"))
+    assert payload["parallel_folds"] == [
+        {
+            "expression_id": payload["parallel_folds"][0]["expression_id"],
+            "file_id": str(input_path.resolve()),
+            "instance": "MN1",
+            "members": ["MN1", "MN2", "MN3", "MN4"],
+            "module": "top",
+            "multiplicity": 4,
+            "ref": "nmos",
+        }
+    ]
+
+
+def test_cli_netlist_fold_parallel_requires_backend_multiplicity_param(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = _write_complete_backend_config(tmp_path)
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    input_path = tmp_path / "fold.asdl"
+    input_path.write_text(_parallel_fold_yaml(), encoding="utf-8")
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["netlist", str(input_path), "--fold-parallel"])
+
+    assert result.exit_code == 1
+    stderr = getattr(result, "stderr", "")
+    combined = f"{result.output}{stderr}"
+    assert "multiplicity_param" in combined
+    assert not (tmp_path / "fold.spice").exists()
+
+
+def test_cli_netlist_split_writes_subckt_files_only_when_changed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = _write_complete_backend_config(tmp_path, include_template=True)
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    input_path = tmp_path / "design.asdl"
+    input_path.write_text(_pipeline_yaml(), encoding="utf-8")
+    log_path = tmp_path / "design.log.json"
+    args = ["netlist", str(input_path), "--split", "--log", str(log_path)]
+
+    runner = CliRunner()
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 0, result.output
+    top_path = tmp_path / "design.spice"
+    leaf_path = tmp_path / "design.subckts" / "leaf.spice"
+    assert top_path.read_text(encoding="utf-8") == "\n".join(
+        ['.include "design.subckts/leaf.spice"', "XU1 IN OUT leaf", ".end"]
+    )
+    assert leaf_path.read_text(encoding="utf-8") == "\n".join(
+        [".subckt leaf IN OUT", "R1 IN OUT r=2k", ".ends leaf"]
+    )
+    first_outputs = json.loads(log_path.read_text(encoding="utf-8"))["split_outputs"]
+    assert [
+        (entry["path"], entry["module"], entry["written"]) for entry in first_outputs
+    ] == [
+        ("design.subckts/leaf.spice", "leaf", True),
+        ("design.spice", None, True),
+    ]
+
+    leaf_mtime = leaf_path.stat().st_mtime_ns
+    top_path.write_text("stale", encoding="utf-8")
+    result = runner.invoke(cli, args)
+
+    assert result.exit_code == 0, result.output
+    assert leaf_path.stat().st_mtime_ns == leaf_mtime
+    second_outputs = json.loads(log_path.read_text(encoding="utf-8"))["split_outputs"]
+    assert [entry["written"] for entry in second_outputs] == [False, True]
+    assert [entry["sha256"] for entry in second_outputs] == [
+        entry["sha256"] for entry in first_outputs
+    ]
+
+
+def test_cli_netlist_split_removes_stale_subckt_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = _write_complete_backend_config(tmp_path, include_template=True)
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    input_path = tmp_path / "design.asdl"
+    input_path.write_text(_pipeline_yaml(), encoding="utf-8")
+    subckt_dir = tmp_path / "design.subckts"
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["netlist", str(input_path), "--split"])
+
+    assert result.exit_code == 0, result.output
+    assert sorted(path.name for path in subckt_dir.iterdir()) == ["leaf.spice"]
+
+    flat_yaml = (
+        _pipeline_yaml()
+        .replace("U1: leaf", "U1: res")
+        .replace("U1.IN", "U1.P")
+        .replace("U1.OUT", "U1.N")
+    )
+    input_path.write_text(flat_yaml, encoding="utf-8")
+    result = runner.invoke(cli, ["netlist", str(input_path), "--split"])
+
+    assert result.exit_code == 0, result.output
+    assert not subckt_dir.exists()
+
+
+def test_cli_netlist_split_keeps_files_it_did_not_write(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = _write_complete_backend_config(tmp_path, include_template=True)
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    input_path = tmp_path / "design.asdl"
+    input_path.write_text(_pipeline_yaml(), encoding="utf-8")
+    subckt_dir = tmp_path / "design.subckts"
+    subckt_dir.mkdir()
+    (subckt_dir / "hand_tuned.spice").write_text(".subckt tuned", encoding="utf-8")
+    (subckt_dir / "notes").mkdir()
+
+    runner = CliRunner()
+    result = runner.invoke(cli, ["netlist", str(input_path), "--split"])
+    assert result.exit_code == 0, result.output
+
+    flat_yaml = (
+        _pipeline_yaml()
+        .replace("U1: leaf", "U1: res")
+        .replace("U1.IN", "U1.P")
+        .replace("U1.OUT", "U1.N")
+    )
+    input_path.write_text(flat_yaml, encoding="utf-8")
+    result = runner.invoke(cli, ["netlist", str(input_path), "--split"])
+
+    assert result.exit_code == 0, result.output
+    assert sorted(path.name for path in subckt_dir.iterdir()) == [
+        "hand_tuned.spice",
+        "notes",
+    ]
+
+
 def test_cli_help() -> None:
     runner = CliRunner()
     result = runner.invoke(cli, ["--help"])
@@ -1324,3 +1540,94 @@ def test_cli_help() -> None:
     assert "schema" in output
     assert "Generate a netlist from ASDL." in output
     assert "Generate ASDL schema artifacts." in output
+
+
+def test_cli_netlist_view_profile_sweep_writes_one_output_per_profile(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    config_path = _write_complete_backend_config(tmp_path)
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    runner = CliRunner()
+
+    single_output = tmp_path / "single.spice"
+    single = runner.invoke(
+        cli,
+        [
+            "netlist",
+            str(VIEW_FIXTURE_ASDL),
+            "--view-config",
+            str(VIEW_FIXTURE_CONFIG),
+            "--view-profile",
+            "config_2",
+            "-o",
+            str(single_output),
+            "--log",
+            str(tmp_path / "single.log.json"),
+        ],
+    )
+    assert single.exit_code == 0, single.output
+
+    for jobs in ("1", "2"):
+        sweep_dir = tmp_path / f"jobs{jobs}"
+        sweep_dir.mkdir()
+        result = runner.invoke(
+            cli,
+            [
+                "netlist",
+                str(VIEW_FIXTURE_ASDL),
+                "--view-config",
+                str(VIEW_FIXTURE_CONFIG),
+                "--all-view-profiles",
+                "-j",
+                jobs,
+                "-o",
+                str(sweep_dir / "fixture.spice"),
+                "--log",
+                str(sweep_dir / "fixture.log.json"),
+            ],
+        )
+
+        assert result.exit_code == 0, result.output
+        assert sorted(path.name for path in sweep_dir.iterdir()) == [
+            "fixture.config_1.log.json",
+            "fixture.config_1.spice",
+            "fixture.config_2.log.json",
+            "fixture.config_2.spice",
+            "fixture.config_3.log.json",
+            "fixture.config_3.spice",
+        ]
+        assert (sweep_dir / "fixture.config_2.spice").read_text(
+            encoding="utf-8"
+        ) == single_output.read_text(encoding="utf-8")
+        sweep_log = json.loads(
+            (sweep_dir / "fixture.config_3.log.json").read_text(encoding="utf-8")
+        )
+        assert {entry["rule_id"] for entry in sweep_log["view_bindings"]} >= {
+            "tgate1_default"
+        }
+
+
+def test_cli_netlist_rejects_all_view_profiles_with_view_profile(
+    tmp_path: Path, backend_config: Path
+) -> None:
+    input_path = tmp_path / "design.asdl"
+    input_path.write_text(_pipeline_yaml(), encoding="utf-8")
+
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "netlist",
+            str(input_path),
+            "--view-config",
+            str(VIEW_FIXTURE_CONFIG),
+            "--view-profile",
+            "config_1",
+            "--all-view-profiles",
+        ],
+    )
+
+    assert result.exit_code == 1
+    stderr = getattr(result, "stderr", "")
+    combined = f"{result.output}{stderr}"
+    assert "--all-view-profiles cannot be combined with --view-profile." in combined
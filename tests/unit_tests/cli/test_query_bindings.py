@@ -95,3 +95,25 @@ def test_path_helpers_cover_join_and_scope_contract() -> None:
     assert is_path_within_scope("tb.dut.Tgate2", "tb.dut")
     assert is_path_within_scope("tb.dut", "tb.dut")
     assert not is_path_within_scope("tb.dut2", "tb.dut")
+
+
+def test_query_bindings_ndjson_matches_json_rows() -> None:
+    args = [
+        "--view-config",
+        str(VIEW_FIXTURE_CONFIG),
+        "--view-profile",
+        "config_3",
+    ]
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["query", "bindings", str(VIEW_FIXTURE_ASDL), "--ndjson", *args],
+    )
+
+    assert result.exit_code == 0, result.output
+    lines = result.output.splitlines()
+    assert [json.loads(line) for line in lines] == _query_bindings_payload(*args)
+    assert all(
+        line == json.dumps(json.loads(line), sort_keys=True, separators=(",", ":"))
+        for line in lines
+    )
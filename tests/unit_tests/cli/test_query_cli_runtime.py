@@ -76,6 +76,12 @@ def test_runtime_builds_authored_resolved_and_emitted_stages() -> None:
     )
     assert authored_diags == []
     assert authored_runtime is not None
+    assert authored_runtime.emission_plan is None
+    assert authored_runtime.resolved_design is authored_runtime.authored_design
+    assert authored_runtime.resolved_bindings == ()
+    assert authored_runtime.view_session is not None
+    assert authored_runtime.view_session.design is authored_runtime.authored_design
+    assert "tb.dut.Tgate1" in authored_runtime.view_session.entries_by_path
     assert _ref_by_path("tb.dut.Tgate1", stage_design=authored_runtime.stage_design) == "sw_tgate"
 
     resolved_runtime, resolved_diags = build_query_runtime(
@@ -102,6 +108,8 @@ def test_runtime_builds_authored_resolved_and_emitted_stages() -> None:
     assert emitted_diags == []
     assert emitted_runtime is not None
     assert emitted_runtime.stage_design == resolved_runtime.stage_design
+    assert emitted_runtime.emission_plan is not None
+    assert emitted_runtime.emission_plan.design is emitted_runtime.stage_design
 
 
 def test_query_runtime_envelope_and_exit_helpers() -> None:
@@ -124,3 +132,50 @@ def test_validate_view_binding_options_requires_paired_flags() -> None:
     assert validate_view_binding_options(
         view_config_path=VIEW_FIXTURE_CONFIG, view_profile="config_3"
     ) == []
+
+
+def test_authored_stage_query_skips_view_resolution_and_verification() -> None:
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        [
+            "query",
+            "tree",
+            str(VIEW_FIXTURE_ASDL),
+            "--json",
+            "--verbose-view",
+            "--stage",
+            "authored",
+            "--no-verify",
+            "--view-config",
+            str(VIEW_FIXTURE_CONFIG),
+            "--view-profile",
+            "config_3",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    root = json.loads(result.output)["payload"]
+    tgate2 = root["children"]["dut"]["children"]["Tgate2"]
+    assert tgate2["authored_ref"] == "sw_tgate"
+    assert tgate2["resolved_ref"] is None
+    assert tgate2["emitted_name"] is None
+
+    bindings = runner.invoke(
+        cli,
+        [
+            "query",
+            "bindings",
+            str(VIEW_FIXTURE_ASDL),
+            "--json",
+            "--stage",
+            "authored",
+            "--view-config",
+            str(VIEW_FIXTURE_CONFIG),
+            "--view-profile",
+            "config_3",
+        ],
+    )
+    assert bindings.exit_code == 0, bindings.output
+    rows = json.loads(bindings.output)["payload"]
+    assert {row["instance"]: row["resolved"] for row in rows}["Tgate2"] == "sw_tgate@behave"
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from asdl.cli import cli
+
+VIEW_FIXTURE_DIR = Path(__file__).parent.parent / "views" / "fixtures"
+VIEW_FIXTURE_ASDL = VIEW_FIXTURE_DIR / "view_binding_fixture.asdl"
+VIEW_FIXTURE_CONFIG = VIEW_FIXTURE_DIR / "view_binding_fixture.config.yaml"
+
+
+def _invoke_net_trace(*args: str):
+    runner = CliRunner()
+    return runner.invoke(
+        cli,
+        ["query", "net-trace", str(VIEW_FIXTURE_ASDL), "--json", *args],
+    )
+
+
+def test_query_net_trace_reports_leaf_pins_for_resolved_views() -> None:
+    result = _invoke_net_trace(
+        "--path",
+        "tb.dut",
+        "--net",
+        "IN",
+        "--view-config",
+        str(VIEW_FIXTURE_CONFIG),
+        "--view-profile",
+        "config_3",
+    )
+
+    assert result.exit_code == 0, result.output
+    envelope = json.loads(result.output)
+    assert envelope["kind"] == "query.net_trace"
+    payload = envelope["payload"]
+    assert payload["anchor"] == {"module": "row", "net": "IN", "path": "tb.dut"}
+    assert payload["stage"] == "resolved"
+    assert [
+        (row["path"], row["net"], row["relation"]) for row in payload["equivalents"]
+    ] == [
+        ("tb", "IN", "up"),
+        ("tb.dut", "IN", "self"),
+        ("tb.dut.SR_row", "IN", "down"),
+        ("tb.dut.Tgate1", "IN", "down"),
+        ("tb.dut.Tgate2", "IN", "down"),
+        ("tb.dut.Tgate_dbg", "IN", "down"),
+    ]
+    assert [
+        (row["instance_path"], row["terminal"], row["resolved_ref"])
+        for row in payload["connections"]
+    ] == [
+        ("tb.dut.SR_row.R1", "P", "res"),
+        ("tb.dut.Tgate1.R3", "P", "res"),
+        ("tb.dut.Tgate2.R4", "P", "res"),
+        ("tb.dut.Tgate_dbg.R4", "P", "res"),
+    ]
+
+
+def test_query_net_trace_direction_order_and_authored_stage() -> None:
+    result = _invoke_net_trace(
+        "--module",
+        "row",
+        "--net",
+        "OUT",
+        "--stage",
+        "authored",
+        "--direction",
+        "down",
+        "--order",
+        "dfs-post",
+    )
+
+    assert result.exit_code == 0, result.output
+    payload = json.loads(result.output)["payload"]
+    assert [row["path"] for row in payload["equivalents"]] == [
+        "tb.dut.SR_row",
+        "tb.dut.Tgate1",
+        "tb.dut.Tgate2",
+        "tb.dut.Tgate_dbg",
+        "tb.dut",
+    ]
+    assert all(row["resolved_ref"] is None for row in payload["equivalents"])
+    assert payload["connections"][2]["instance_path"] == "tb.dut.Tgate2.R3"
+
+
+def test_query_net_trace_rejects_missing_and_ambiguous_anchors() -> None:
+    missing_net = _invoke_net_trace("--path", "tb.dut", "--net", "VDD")
+    assert missing_net.exit_code == 1
+    assert "Net 'VDD' not found in module 'row'." in missing_net.output
+
+    ambiguous = _invoke_net_trace("--module", "sw_tgate", "--net", "IN", "--stage", "authored")
+    assert ambiguous.exit_code == 1
+    assert "use --path to select one" in ambiguous.output
+
+    no_anchor = _invoke_net_trace("--net", "IN")
+    assert no_anchor.exit_code == 1
+    assert "query net-trace requires --module or --path." in no_anchor.output
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from click.testing import CliRunner
+
+from asdl.cli import cli
+
+VIEW_FIXTURE_DIR = Path(__file__).parent.parent / "views" / "fixtures"
+VIEW_FIXTURE_ASDL = VIEW_FIXTURE_DIR / "view_binding_fixture.asdl"
+VIEW_FIXTURE_CONFIG = VIEW_FIXTURE_DIR / "view_binding_fixture.config.yaml"
+
+
+def _query_stats_payload(*args: str) -> dict[str, object]:
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["query", "stats", str(VIEW_FIXTURE_ASDL), "--json", *args],
+    )
+    assert result.exit_code == 0, result.output
+    envelope = json.loads(result.output)
+    assert envelope["schema_version"] == 1
+    assert envelope["kind"] == "query.stats"
+    payload = envelope["payload"]
+    assert isinstance(payload, dict)
+    return payload
+
+
+def test_query_stats_rolls_up_authored_hierarchy() -> None:
+    payload = _query_stats_payload("--stage", "authored")
+
+    assert payload["top"] == "tb"
+    assert payload["instances"] == 9
+    assert payload["max_depth"] == 3
+    assert payload["devices"] == {"res": 4}
+    assert payload["modules"] == {
+        "row": 1,
+        "shift_row": 1,
+        "sw_tgate": 2,
+        "sw_tgate@behave": 1,
+    }
+    subtrees = {row["module"]: row for row in payload["subtrees"]}
+    assert list(subtrees) == sorted(subtrees)
+    assert subtrees["sw_tgate"]["occurrences"] == 2
+    assert subtrees["sw_tgate"]["instances"] == 1
+    assert subtrees["row"]["max_depth"] == 2
+    assert subtrees["tb"]["occurrences"] == 1
+    assert subtrees["tb"]["devices"] == payload["devices"]
+
+
+def test_query_stats_reflects_resolved_view_bindings() -> None:
+    payload = _query_stats_payload(
+        "--view-config",
+        str(VIEW_FIXTURE_CONFIG),
+        "--view-profile",
+        "config_3",
+    )
+
+    assert payload["instances"] == 9
+    assert payload["modules"] == {
+        "row": 1,
+        "shift_row": 1,
+        "sw_tgate": 1,
+        "sw_tgate@behave": 2,
+    }
+    subtrees = {row["module"]: row for row in payload["subtrees"]}
+    assert subtrees["sw_tgate@behave"]["occurrences"] == 2
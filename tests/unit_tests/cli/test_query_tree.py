@@ -238,3 +238,37 @@ def test_query_tree_includes_devices_while_views_index_remains_module_only() ->
 def test_query_runtime_has_no_local_top_resolution_helper() -> None:
     """Query runtime must rely on shared hierarchy top-resolution logic."""
     assert not hasattr(query_runtime_module, "_resolve_top_module")
+
+
+def test_query_tree_ndjson_streams_verbose_rows_in_preorder() -> None:
+    args = [
+        "--stage",
+        "emitted",
+        "--view-config",
+        str(VIEW_FIXTURE_CONFIG),
+        "--view-profile",
+        "config_3",
+    ]
+    runner = CliRunner()
+    result = runner.invoke(
+        cli,
+        ["query", "tree", str(VIEW_FIXTURE_ASDL), "--ndjson", *args],
+    )
+
+    assert result.exit_code == 0, result.output
+    rows = [json.loads(line) for line in result.output.splitlines()]
+    verbose = _flatten_by_path(
+        _query_tree_payload("--verbose-view", *args, expected_kind="query.tree")
+    )
+    assert [row["path"] for row in rows] == list(verbose)
+    for row in rows:
+        expected = dict(verbose[row["path"]])
+        del expected["children"]
+        assert row == expected
+
+    rejected = runner.invoke(
+        cli,
+        ["query", "tree", str(VIEW_FIXTURE_ASDL), "--ndjson", "--json"],
+    )
+    assert rejected.exit_code == 1
+    assert "--ndjson cannot be combined with --json." in rejected.output
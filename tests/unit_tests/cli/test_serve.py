@@ -0,0 +1,359 @@
+from __future__ import annotations
+
+import os
+import stat
+import tempfile
+import threading
+from pathlib import Path
+from typing import Iterator
+
+import click
+import pytest
+from click.testing import CliRunner
+
+from asdl.cli import cli
+from asdl.compile_environment import active_compile_environment
+from asdl.cli.server import (
+    CompileServer,
+    call_server,
+    forward_to_server,
+    forwarded_environment,
+)
+
+
+def _write_backend_config(tmp_path: Path) -> Path:
+    config_path = tmp_path / "backends.yaml"
+    lines = [
+        "sim.ngspice:",
+        '  extension: ".spice"',
+        '  comment_prefix: "*"',
+        "  templates:",
+        '    __subckt_header__: ".subckt {name} {ports}"',
+        '    __subckt_header_params__: ".subckt {name} {ports} {params}"',
+        '    __subckt_footer__: ".ends {name}"',
+        '    __subckt_call__: "X{name} {ports} {ref}"',
+        '    __subckt_call_params__: "X{name} {ports} {ref} {params}"',
+        '    __netlist_header__: ""',
+        '    __netlist_footer__: ".end"',
+    ]
+    config_path.write_text("\n".join(lines), encoding="utf-8")
+    return config_path
+
+
+def _write_design(tmp_path: Path) -> None:
+    (tmp_path / "lib.asdl").write_text(
+        "\n".join(
+            [
+                "modules:",
+                "  leaf:",
+                "    instances:",
+                "      R1: res",
+                "    nets:",
+                "      $A: [R1.P]",
+                "      $B: [R1.N]",
+                "devices:",
+                "  res:",
+                "    ports: [P, N]",
+                "    backends:",
+                "      sim.ngspice:",
+                '        template: "R{name} {ports} 1k"',
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    (tmp_path / "tb.asdl").write_text(
+        "\n".join(
+            [
+                "imports:",
+                "  lib: ./lib.asdl",
+                "top: tb",
+                "modules:",
+                "  tb:",
+                "    instances:",
+                "      U<1:2>: lib.leaf",
+                "    nets:",
+                "      $A: [U<1:2>.A]",
+                "      $B: [U<1:2>.B]",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+
+
+@pytest.fixture
+def server() -> Iterator[CompileServer]:
+    # AF_UNIX paths are length-limited; pytest tmp paths can exceed it.
+    socket_dir = Path(tempfile.mkdtemp(prefix="asdlc-"))
+    compile_server = CompileServer(socket_dir / "s.sock", cli)
+    thread = threading.Thread(target=compile_server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield compile_server
+    finally:
+        compile_server.shutdown()
+        compile_server.server_close()
+        thread.join()
+        socket_dir.rmdir()
+
+
+def test_serve_runs_commands_with_client_cwd_and_env(
+    tmp_path: Path, server: CompileServer
+) -> None:
+    config_path = _write_backend_config(tmp_path)
+    _write_design(tmp_path)
+    env = {**os.environ, "ASDL_BACKEND_CONFIG": str(config_path)}
+    cwd = os.getcwd()
+    with pytest.MonkeyPatch.context() as monkeypatch:
+        monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+        local = CliRunner().invoke(
+            cli,
+            [
+                "netlist",
+                str(tmp_path / "tb.asdl"),
+                "-o",
+                str(tmp_path / "tb.local.spice"),
+                "--log",
+                str(tmp_path / "tb.local.log.json"),
+            ],
+        )
+    assert local.exit_code == 0, local.output
+
+    for _ in range(2):
+        response = call_server(
+            server.socket_path,
+            "netlist",
+            {
+                "args": ["tb.asdl", "-o", "tb.out.spice"],
+                "cwd": str(tmp_path),
+                "env": env,
+            },
+        )
+        assert response["result"]["exit_code"] == 0, response
+    assert (tmp_path / "tb.out.spice").read_text(encoding="utf-8") == (
+        tmp_path / "tb.local.spice"
+    ).read_text(encoding="utf-8")
+    assert os.getcwd() == cwd
+    assert os.environ.get("ASDL_BACKEND_CONFIG") != str(config_path)
+
+    missing = call_server(
+        server.socket_path,
+        "netlist",
+        {"args": ["missing.asdl"], "cwd": str(tmp_path), "env": env},
+    )
+    assert missing["result"]["exit_code"] == 1
+    assert "ASDL file not found" in missing["result"]["stderr"]
+
+    status = call_server(server.socket_path, "ping")["result"]
+    assert status["requests_served"] == 3
+    assert status["cached_documents"] == 2
+
+    unknown = call_server(server.socket_path, "schema")
+    assert unknown["error"]["code"] == -32601
+
+
+def test_forward_to_server_uses_running_server_only_for_served_commands(
+    tmp_path: Path,
+    server: CompileServer,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    monkeypatch.setenv("ASDL_SERVER_SOCKET", str(server.socket_path))
+    assert forward_to_server(["schema"]) is None
+
+    exit_code = forward_to_server(["netlist", str(tmp_path / "missing.asdl")])
+    assert exit_code == 1
+    assert "ASDL file not found" in capsys.readouterr().err
+
+    monkeypatch.setenv("ASDL_SERVER_SOCKET", "")
+    assert forward_to_server(["netlist", str(tmp_path / "missing.asdl")]) is None
+    monkeypatch.setenv("ASDL_SERVER_SOCKET", str(tmp_path / "absent.sock"))
+    assert forward_to_server(["netlist", str(tmp_path / "missing.asdl")]) is None
+
+
+def test_forward_to_server_ignores_untrusted_sockets(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    planted = tmp_path / "planted.sock"
+    planted.write_text("", encoding="utf-8")
+    monkeypatch.setenv("ASDL_SERVER_SOCKET", str(planted))
+    assert forward_to_server(["netlist", str(tmp_path / "missing.asdl")]) is None
+    assert "not a socket" in capsys.readouterr().err
+
+    shared = Path(tempfile.mkdtemp(prefix="asdlc-"))
+    try:
+        os.chmod(shared, 0o777)
+        with pytest.raises(OSError, match="writable by other users"):
+            CompileServer(shared / "s.sock", cli)
+    finally:
+        shared.rmdir()
+
+
+def test_compile_server_creates_private_socket_directory() -> None:
+    base = Path(tempfile.mkdtemp(prefix="asdlc-"))
+    socket_path = base / "run" / "s.sock"
+    compile_server = CompileServer(socket_path, cli)
+    try:
+        assert stat.S_IMODE(os.stat(socket_path.parent).st_mode) == 0o700
+        assert stat.S_IMODE(os.lstat(socket_path).st_mode) & 0o077 == 0
+    finally:
+        compile_server.server_close()
+        socket_path.parent.rmdir()
+        base.rmdir()
+
+
+def test_forwarded_environment_selects_compile_variables(tmp_path: Path) -> None:
+    _write_design(tmp_path)
+    (tmp_path / ".asdlrc").write_text(
+        "schema_version: 1\n"
+        "lib_roots: [${PDK_ROOT}/lib]\n"
+        "env:\n"
+        "  CORNER: tt\n",
+        encoding="utf-8",
+    )
+    environ = {
+        "ASDL_LIB_PATH": "/libs",
+        "HOME": "/home/user",
+        "PDK_ROOT": "/pdk",
+        "CORNER": "ff",
+        "API_TOKEN": "secret",
+    }
+
+    selected = forwarded_environment(["tb.asdl", "-o", "out.spice"], tmp_path, environ)
+
+    assert selected == {
+        "ASDL_LIB_PATH": "/libs",
+        "CORNER": "ff",
+        "HOME": "/home/user",
+        "PDK_ROOT": "/pdk",
+    }
+    assert forwarded_environment(["missing.asdl"], tmp_path, environ) == {
+        "ASDL_LIB_PATH": "/libs",
+        "HOME": "/home/user",
+    }
+
+
+def test_forward_to_server_forwards_variables_templates_look_up(
+    tmp_path: Path,
+    server: CompileServer,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    config_path = _write_backend_config(tmp_path)
+    _write_design(tmp_path)
+    lib_path = tmp_path / "lib.asdl"
+    lib_path.write_text(
+        lib_path.read_text(encoding="utf-8").replace("1k", "$SERVE_TEST_RES"),
+        encoding="utf-8",
+    )
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    monkeypatch.setenv("ASDL_SERVER_SOCKET", str(server.socket_path))
+    monkeypatch.setenv("SERVE_TEST_RES", "2k")
+    assert "SERVE_TEST_RES" not in forwarded_environment(["tb.asdl"], tmp_path)
+
+    served = []
+    for name in ["tb.first.spice", "tb.second.spice"]:
+        before = server.requests_served
+        assert forward_to_server(["netlist", "tb.asdl", "-o", name]) == 0
+        served.append(server.requests_served - before)
+    capsys.readouterr()
+
+    # The first call reruns with the variable; later calls send it up front.
+    assert served == [2, 1]
+    first = (tmp_path / "tb.first.spice").read_text(encoding="utf-8")
+    assert "RR1 A B 2k" in first
+    assert (tmp_path / "tb.second.spice").read_text(encoding="utf-8") == first
+    status = call_server(server.socket_path, "ping")["result"]
+    assert "SERVE_TEST_RES" in status["requested_variables"]
+
+
+def test_serve_reports_unexpected_command_errors_as_results() -> None:
+    @click.group()
+    def broken_cli() -> None:
+        pass
+
+    @broken_cli.command("netlist")
+    def broken_netlist() -> None:
+        raise RuntimeError("boom")
+
+    socket_dir = Path(tempfile.mkdtemp(prefix="asdlc-"))
+    compile_server = CompileServer(socket_dir / "s.sock", broken_cli)
+    try:
+        response = compile_server.dispatch(
+            {"jsonrpc": "2.0", "id": 1, "method": "netlist", "params": {}}
+        )
+        assert response is not None
+        assert response["result"]["exit_code"] == 1
+        assert "RuntimeError: boom" in response["result"]["stderr"]
+
+        missing_cwd = compile_server.dispatch(
+            {
+                "jsonrpc": "2.0",
+                "id": 2,
+                "method": "netlist",
+                "params": {"cwd": str(socket_dir / "absent")},
+            }
+        )
+        assert missing_cwd is not None
+        assert missing_cwd["error"]["code"] == -32603
+    finally:
+        compile_server.server_close()
+        socket_dir.rmdir()
+
+
+def test_serve_keeps_process_environment_and_cwd(tmp_path: Path) -> None:
+    seen: dict[str, object] = {}
+
+    @click.group()
+    def probe_cli() -> None:
+        pass
+
+    @probe_cli.command("netlist")
+    @click.argument("input_file", type=click.Path(path_type=Path))
+    @click.option("-o", "output_path", type=click.Path(path_type=Path))
+    @click.option("--tag")
+    def probe(input_file: Path, output_path: Path, tag: str) -> None:
+        seen.update(
+            input_file=input_file,
+            output_path=output_path,
+            tag=tag,
+            variable=active_compile_environment().get("PROBE_VAR"),
+            lib_path=active_compile_environment().get("ASDL_LIB_PATH"),
+            process_variable=os.environ.get("PROBE_VAR"),
+            cwd=os.getcwd(),
+        )
+
+    socket_dir = Path(tempfile.mkdtemp(prefix="asdlc-"))
+    compile_server = CompileServer(socket_dir / "s.sock", probe_cli)
+    cwd = os.getcwd()
+    try:
+        response = compile_server.dispatch(
+            {
+                "jsonrpc": "2.0",
+                "id": 1,
+                "method": "netlist",
+                "params": {
+                    "args": ["--tag", "rel", "tb.asdl", "-oout/tb.spice"],
+                    "cwd": str(tmp_path),
+                    "env": {"PROBE_VAR": "client", "ASDL_LIB_PATH": "libs:/abs"},
+                },
+            }
+        )
+    finally:
+        compile_server.server_close()
+        socket_dir.rmdir()
+
+    assert response is not None and response["result"]["exit_code"] == 0, response
+    assert seen == {
+        "input_file": tmp_path / "tb.asdl",
+        "output_path": tmp_path / "out" / "tb.spice",
+        "tag": "rel",
+        "variable": "client",
+        "lib_path": f"{tmp_path / 'libs'}:/abs",
+        "process_variable": os.environ.get("PROBE_VAR"),
+        "cwd": cwd,
+    }
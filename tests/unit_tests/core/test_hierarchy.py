@@ -1,8 +1,16 @@
 """Unit tests for shared deterministic hierarchy traversal."""
 
+import sys
+
 from asdl.emit.netlist_ir import NetlistDesign, NetlistDevice, NetlistInstance, NetlistModule
 
-from asdl.core.hierarchy import HierarchyEntry, resolve_top_module, traverse_hierarchy
+from asdl.core.hierarchy import (
+    HierarchyEntry,
+    iter_hierarchy,
+    resolve_top_module,
+    rollup_hierarchy,
+    traverse_hierarchy,
+)
 
 
 def test_traverse_hierarchy_excludes_devices_when_requested() -> None:
@@ -184,3 +192,164 @@ def test_resolve_top_module_returns_none_when_entry_scope_is_ambiguous() -> None
     )
 
     assert resolve_top_module(design) is None
+
+
+def test_iter_hierarchy_handles_hierarchies_deeper_than_recursion_limit() -> None:
+    """Iterative traversal walks chains deeper than the interpreter stack."""
+    depth = sys.getrecursionlimit() + 100
+    modules = [
+        NetlistModule(
+            name=f"M{level}",
+            file_id="file://tb",
+            instances=[
+                NetlistInstance(name="u", ref=f"M{level + 1}", ref_file_id="file://tb")
+            ],
+        )
+        for level in range(depth)
+    ]
+    modules.append(NetlistModule(name=f"M{depth}", file_id="file://tb"))
+    design = NetlistDesign(modules=modules, top="M0")
+
+    entries = iter_hierarchy(design, include_devices=False)
+
+    assert sum(1 for _ in entries) == depth
+    deepest = traverse_hierarchy(design, include_devices=False)[-1]
+    assert deepest.depth == depth
+    assert deepest.depth == deepest.path.count(".")
+
+
+def test_iter_hierarchy_prunes_by_depth_prefix_predicate_and_skip() -> None:
+    """Pruning options limit yielded rows and visited subtrees."""
+    design = NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name="a", ref="branch", ref_file_id="file://tb"),
+                    NetlistInstance(name="b", ref="branch", ref_file_id="file://tb"),
+                ],
+            ),
+            NetlistModule(
+                name="branch",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name="sub", ref="leaf", ref_file_id="file://tb"),
+                    NetlistInstance(name="M1", ref="nfet", ref_file_id="file://tb"),
+                ],
+            ),
+            NetlistModule(
+                name="leaf",
+                file_id="file://tb",
+                instances=[NetlistInstance(name="M2", ref="nfet", ref_file_id="file://tb")],
+            ),
+        ],
+        devices=[NetlistDevice(name="nfet", file_id="file://tb")],
+        top="tb",
+    )
+
+    def _paths(**kwargs: object) -> list[str]:
+        return [
+            entry.path
+            for entry in iter_hierarchy(design, include_devices=True, **kwargs)
+        ]
+
+    assert _paths(max_depth=1) == ["tb.a", "tb.b"]
+    assert _paths(path_prefixes=["tb.b.sub"]) == ["tb.b.sub", "tb.b.sub.M2"]
+    assert _paths(predicate=lambda entry: entry.is_device) == [
+        "tb.a.sub.M2",
+        "tb.a.M1",
+        "tb.b.sub.M2",
+        "tb.b.M1",
+    ]
+    assert _paths(skip_subtree=lambda entry: entry.instance == "sub", max_depth=2) == [
+        "tb.a",
+        "tb.a.sub",
+        "tb.a.M1",
+        "tb.b",
+        "tb.b.sub",
+        "tb.b.M1",
+    ]
+    assert _paths(path_prefixes=["tb"]) == [
+        entry.path for entry in traverse_hierarchy(design, include_devices=True)
+    ]
+
+
+def test_rollup_hierarchy_multiplies_counts_through_module_dag() -> None:
+    """Roll-up totals match flattened counts without enumerating occurrences."""
+    levels = 6
+    modules = [
+        NetlistModule(
+            name=f"lvl{level}",
+            file_id="file://tb",
+            instances=[
+                NetlistInstance(
+                    name=f"x{index}", ref=f"lvl{level + 1}", ref_file_id="file://tb"
+                )
+                for index in range(10)
+            ],
+        )
+        for level in range(levels)
+    ]
+    modules.append(
+        NetlistModule(
+            name=f"lvl{levels}",
+            file_id="file://tb",
+            instances=[
+                NetlistInstance(name="r", ref="res", ref_file_id="file://tb"),
+                NetlistInstance(name="c", ref="cap", ref_file_id="file://tb"),
+            ],
+        )
+    )
+    design = NetlistDesign(
+        modules=modules,
+        devices=[
+            NetlistDevice(name="res", file_id="file://tb"),
+            NetlistDevice(name="cap", file_id="file://tb"),
+        ],
+        top="lvl0",
+    )
+
+    stats = rollup_hierarchy(design)
+
+    assert stats.top is not None and stats.top.name == "lvl0"
+    assert stats.total.device_counts == {"res": 10**levels, "cap": 10**levels}
+    assert stats.total.module_counts[f"lvl{levels}"] == 10**levels
+    assert stats.total.max_depth == levels + 1
+    assert stats.occurrences[("file://tb", "lvl3")] == 10**3
+    assert stats.subtrees[("file://tb", "lvl4")].instance_count == 10 + 100 + 200
+
+
+def test_rollup_hierarchy_matches_traversal_on_ancestry_cycles() -> None:
+    """Cycle edges count once as leaves, matching traversal rows."""
+    design = NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="A",
+                file_id="file://a",
+                instances=[
+                    NetlistInstance(name="b", ref="B", ref_file_id="file://a"),
+                    NetlistInstance(name="r", ref="res", ref_file_id="file://a"),
+                ],
+            ),
+            NetlistModule(
+                name="B",
+                file_id="file://a",
+                instances=[
+                    NetlistInstance(name="a", ref="A", ref_file_id="file://a"),
+                    NetlistInstance(name="r", ref="res", ref_file_id="file://a"),
+                ],
+            ),
+        ],
+        devices=[NetlistDevice(name="res", file_id="file://a")],
+        top="A",
+    )
+
+    stats = rollup_hierarchy(design)
+    entries = traverse_hierarchy(design, include_devices=True)
+
+    assert stats.total.instance_count == len(entries)
+    assert stats.total.device_counts == {"res": 2}
+    assert stats.total.module_counts == {"A": 1, "B": 1}
+    assert stats.total.max_depth == max(entry.depth for entry in entries)
+    assert stats.occurrences == {("file://a", "A"): 2, ("file://a", "B"): 1}
@@ -0,0 +1,112 @@
+"""Unit tests for cross-hierarchy net tracing."""
+
+from asdl.core.net_trace import NetConnectivityIndex
+from asdl.emit.netlist_ir import (
+    NetlistConn,
+    NetlistDesign,
+    NetlistDevice,
+    NetlistInstance,
+    NetlistModule,
+    NetlistNet,
+)
+
+
+def _module(name: str, ports: list[str], instances: list[NetlistInstance]) -> NetlistModule:
+    nets = list(ports)
+    for instance in instances:
+        for conn in instance.conns:
+            if conn.net not in nets:
+                nets.append(conn.net)
+    return NetlistModule(
+        name=name,
+        file_id="file://tb",
+        ports=ports,
+        nets=[NetlistNet(name=net) for net in nets],
+        instances=instances,
+    )
+
+
+def _inst(name: str, ref: str, **conns: str) -> NetlistInstance:
+    return NetlistInstance(
+        name=name,
+        ref=ref,
+        ref_file_id="file://tb",
+        conns=[NetlistConn(port=port, net=net) for port, net in conns.items()],
+    )
+
+
+def _design() -> NetlistDesign:
+    # `tb` ties both ports of `x1` to net `a`, so `tb.x1.A` and `tb.x1.B` are
+    # equivalent even though `pair` keeps them apart internally.
+    return NetlistDesign(
+        modules=[
+            _module(
+                "tb",
+                [],
+                [
+                    _inst("x1", "pair", A="a", B="a"),
+                    _inst("x2", "pair", A="a", B="c"),
+                    _inst("r_top", "res", P="a", N="gnd"),
+                ],
+            ),
+            _module(
+                "pair",
+                ["A", "B"],
+                [
+                    _inst("leaf", "cell", P="A", N="mid"),
+                    _inst("r_mid", "res", P="mid", N="B"),
+                ],
+            ),
+            _module("cell", ["P", "N"], [_inst("r", "res", P="P", N="N")]),
+        ],
+        devices=[NetlistDevice(name="res", file_id="file://tb", ports=["P", "N"])],
+        top="tb",
+    )
+
+
+def test_net_trace_joins_child_ports_tied_in_the_parent() -> None:
+    index = NetConnectivityIndex(_design())
+    chain = index.resolve_occurrences("tb")
+    assert chain is not None
+
+    traced = index.trace(chain, "a")
+    assert traced is not None
+    equivalents, pins = traced
+
+    by_path = {item.occurrence.path: (item.nets, item.relation) for item in equivalents}
+    assert by_path == {
+        "tb": (("a",), "self"),
+        "tb.x1": (("A", "B"), "down"),
+        "tb.x1.leaf": (("P",), "down"),
+        "tb.x2": (("A",), "down"),
+        "tb.x2.leaf": (("P",), "down"),
+    }
+    assert sorted((pin.instance_path, pin.terminal) for pin in pins) == [
+        ("tb.r_top", "P"),
+        ("tb.x1.leaf.r", "P"),
+        ("tb.x1.r_mid", "N"),
+        ("tb.x2.leaf.r", "P"),
+    ]
+    assert index.trace(chain, "missing") is None
+
+
+def test_net_trace_directions_filter_the_equivalence_class() -> None:
+    index = NetConnectivityIndex(_design())
+    chain = index.resolve_occurrences("tb.x1.leaf")
+    assert chain is not None
+    assert [occurrence.position for occurrence in chain] == [(), (0,), (0, 0)]
+
+    up = index.trace(chain, "P", direction="up")
+    down = index.trace(chain, "P", direction="down")
+    both = index.trace(chain, "P", direction="both")
+    assert up is not None and down is not None and both is not None
+
+    assert {item.occurrence.path: item.nets for item in up[0]} == {
+        "tb.x1.leaf": ("P",),
+        "tb.x1": ("A", "B"),
+        "tb": ("a",),
+    }
+    assert [item.occurrence.path for item in down[0]] == ["tb.x1.leaf"]
+    assert {pin.instance_path for pin in down[1]} == {"tb.x1.leaf.r"}
+    assert "tb.x2.leaf" in {item.occurrence.path for item in both[0]}
+    assert index.resolve_occurrences("tb.r_top") is None
@@ -101,6 +101,51 @@ sim.ngspice:
 
     config = load_backend_config(BACKEND_NAME, config_file)
     assert config.pattern_rendering == "[{N}]"
+    assert config.multiplicity_param is None
+
+
+def test_load_multiplicity_param(tmp_path: Path) -> None:
+    """Test parsing the multiplicity param name from backend config."""
+    config_file = tmp_path / "backends.yaml"
+    config_file.write_text(
+        """
+sim.ngspice:
+  extension: ".spice"
+  comment_prefix: "*"
+  multiplicity_param: m
+  templates:
+    __subckt_header__: ".subckt {name} {ports}"
+    __subckt_header_params__: ".subckt {name} {ports} {params}"
+    __subckt_footer__: ".ends {name}"
+    __subckt_call__: "X{name} {ports} {ref}"
+    __subckt_call_params__: "X{name} {ports} {ref} {params}"
+    __netlist_header__: ""
+    __netlist_footer__: ""
+"""
+    )
+
+    config = load_backend_config(BACKEND_NAME, config_file)
+    assert config.multiplicity_param == "m"
+
+
+def test_load_array_rendering(tmp_path: Path) -> None:
+    """Test parsing and validating the array rendering template."""
+    template = """
+sim.spectre:
+  extension: ".scs"
+  comment_prefix: "//"
+  array_rendering: "{array_rendering}"
+  templates: {{}}
+"""
+    config_file = tmp_path / "backends.yaml"
+    config_file.write_text(template.format(array_rendering="<{start}:{end}>"))
+
+    config = load_backend_config("sim.spectre", config_file)
+    assert config.array_rendering == "<{start}:{end}>"
+
+    config_file.write_text(template.format(array_rendering="<{start}>"))
+    with pytest.raises(TypeError, match="array_rendering"):
+        load_backend_config("sim.spectre", config_file)
 
 
 def test_validate_missing_required_devices() -> None:
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+import pytest
+
+import asdl
+from asdl.compile_environment import CompileEnvironment, compile_environment_scope
+from asdl.compiler import Compiler
+from asdl.emit.netlist import emit_netlist
+from asdl.lowering import run_netlist_ir_pipeline
+
+BACKEND_LINES = [
+    "sim.ngspice:",
+    '  extension: ".spice"',
+    '  comment_prefix: "*"',
+    "  templates:",
+    '    __subckt_header__: ".subckt {name} {ports}"',
+    '    __subckt_header_params__: ".subckt {name} {ports} {params}"',
+    '    __subckt_footer__: ".ends {name}"',
+    '    __subckt_call__: "X{name} {ports} {ref}"',
+    '    __subckt_call_params__: "X{name} {ports} {ref} {params}"',
+    '    __netlist_header__: ""',
+    '    __netlist_footer__: ".end"',
+]
+
+
+def _write_library(path: Path, value: str = "1k") -> None:
+    lines = [
+        "modules:",
+        "  leaf:",
+        "    instances:",
+        "      R1: res",
+        "    nets:",
+        "      $A: [R1.P]",
+        "      $B: [R1.N]",
+        "devices:",
+        "  res:",
+        "    ports: [P, N]",
+        "    backends:",
+        "      sim.ngspice:",
+        f'        template: "R{{name}} {{ports}} {value}"',
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _write_testbench(path: Path, count: int) -> None:
+    lines = [
+        "imports:",
+        "  lib: ./lib.asdl",
+        "top: tb",
+        "modules:",
+        "  tb:",
+        "    instances:",
+        f"      U<1:{count}>: lib.leaf",
+        "    nets:",
+        f"      $A: [U<1:{count}>.A]",
+        f"      $B: [U<1:{count}>.B]",
+    ]
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def _touch(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+
+@pytest.fixture
+def project(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    monkeypatch.delenv("ASDL_LIB_PATH", raising=False)
+    config_path = tmp_path / "backends.yaml"
+    config_path.write_text("\n".join(BACKEND_LINES), encoding="utf-8")
+    monkeypatch.setenv("ASDL_BACKEND_CONFIG", str(config_path))
+    _write_library(tmp_path / "lib.asdl")
+    _write_testbench(tmp_path / "tb_one.asdl", 1)
+    _write_testbench(tmp_path / "tb_two.asdl", 2)
+    return tmp_path
+
+
+def test_compiler_stages_match_pipeline_and_reuse_cached_results(
+    project: Path,
+) -> None:
+    compiler = asdl.Compiler()
+    entry = project / "tb_two.asdl"
+
+    design, diagnostics = compiler.netlist_ir(entry)
+    expected, expected_diags = run_netlist_ir_pipeline(entry_file=entry)
+
+    assert design == expected
+    assert diagnostics == expected_diags
+    assert compiler.netlist_ir(entry)[0] is design
+    assert compiler.patterned(entry)[0] is compiler.patterned(entry)[0]
+
+    text, emit_diags = compiler.emit(entry)
+    assert emit_diags == []
+    assert text == emit_netlist(expected)[0]
+
+    compiler.netlist_ir(project / "tb_one.asdl")
+    assert len(compiler.documents) == 3
+
+
+def test_compiler_revalidates_edits_and_invalidates_explicitly(project: Path) -> None:
+    compiler = Compiler(max_entries=1)
+    entry = project / "tb_one.asdl"
+    first_text, _ = compiler.emit(entry)
+    first_design, _ = compiler.netlist_ir(entry)
+    assert first_text is not None and "1k" in first_text
+
+    _write_library(project / "lib.asdl", value="2k")
+    _touch(project / "lib.asdl")
+    edited_text, _ = compiler.emit(entry)
+    assert edited_text is not None and "2k" in edited_text
+
+    edited_design, _ = compiler.netlist_ir(entry)
+    compiler.invalidate(project / "lib.asdl")
+    assert compiler.netlist_ir(entry)[0] is not edited_design
+    assert compiler.netlist_ir(entry)[0] == edited_design
+
+    compiler.netlist_ir(project / "tb_two.asdl")
+    assert compiler.netlist_ir(entry)[0] is not first_design
+
+    missing, diagnostics = compiler.netlist_ir(project / "missing.asdl")
+    assert missing is None
+    assert any("not found" in diagnostic.message for diagnostic in diagnostics)
+
+    compiler.invalidate()
+    assert len(compiler.documents) == 0
+
+
+def test_compiler_keys_settings_and_stages_on_the_environment(project: Path) -> None:
+    for name in ("a", "b"):
+        (project / name).mkdir()
+        _write_library(project / name / "lib.asdl", value=f"{name}$RVAL")
+    entry = project / "tb_env.asdl"
+    entry.write_text(
+        (project / "tb_one.asdl")
+        .read_text(encoding="utf-8")
+        .replace("./lib.asdl", "$LIBDIR/lib.asdl"),
+        encoding="utf-8",
+    )
+    rc_path = project / ".asdlrc"
+    rc_path.write_text("schema_version: 1\nenv:\n  RVAL: 1k\n", encoding="utf-8")
+    compiler = Compiler()
+
+    def emit(name: str) -> Optional[str]:
+        environment = CompileEnvironment({**os.environ, "LIBDIR": str(project / name)})
+        with compile_environment_scope(environment):
+            return compiler.emit(entry)[0]
+
+    assert emit("a") is not None and " a1k\n" in emit("a")
+    assert emit("b") is not None and " b1k\n" in emit("b")
+
+    rc_path.write_text("schema_version: 1\nenv:\n  RVAL: 22k\n", encoding="utf-8")
+    _touch(rc_path)
+    assert " a22k\n" in (emit("a") or "")
+
+
+def test_compiler_rebuilds_files_edited_while_they_were_parsed(
+    project: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    import asdl.imports.document_cache as document_cache_module
+
+    library = project / "lib.asdl"
+    parse_file = document_cache_module.parse_file
+
+    def parse_then_edit(path: str):  # type: ignore[no-untyped-def]
+        result = parse_file(path)
+        if Path(path) == library:
+            monkeypatch.setattr(document_cache_module, "parse_file", parse_file)
+            _write_library(library, value="22k")
+        return result
+
+    monkeypatch.setattr(document_cache_module, "parse_file", parse_then_edit)
+    compiler = Compiler()
+    entry = project / "tb_one.asdl"
+
+    first_text, _ = compiler.emit(entry)
+    assert first_text is not None and " 1k\n" in first_text
+    second_text, _ = compiler.emit(entry)
+    assert second_text is not None and " 22k\n" in second_text
+
+
+def test_concurrent_pipeline_runs_each_use_their_own_environment(
+    project: Path,
+) -> None:
+    for name in ("a", "b"):
+        (project / name).mkdir()
+        _write_library(project / name / "lib.asdl", value=f"{name}$RVAL")
+    entry = project / "tb_env.asdl"
+    entry.write_text(
+        (project / "tb_one.asdl")
+        .read_text(encoding="utf-8")
+        .replace("./lib.asdl", "$LIBDIR/lib.asdl"),
+        encoding="utf-8",
+    )
+
+    def compile_variant(index: int) -> tuple[str, str]:
+        name = "ab"[index % 2]
+        environment = CompileEnvironment(
+            {**os.environ, "LIBDIR": str(project / name), "RVAL": f"{index}k"}
+        )
+        with compile_environment_scope(environment):
+            design, diagnostics = run_netlist_ir_pipeline(entry_file=entry)
+            assert design is not None, diagnostics
+            text, emit_diags = emit_netlist(design)
+        assert text is not None, emit_diags
+        return text, f"{name}{index}k"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(compile_variant, range(64)))
+
+    for text, expected_value in results:
+        assert f" {expected_value}\n" in text
+        assert "$" not in text
+    assert "RVAL" not in os.environ and "LIBDIR" not in os.environ
+
+
+def test_compiler_session_is_shared_safely_across_threads(project: Path) -> None:
+    entries = []
+    for index in range(4):
+        directory = project / f"variant{index}"
+        directory.mkdir()
+        _write_library(directory / "lib.asdl", value="$RVAL")
+        _write_testbench(directory / "tb.asdl", index + 1)
+        (directory / ".asdlrc").write_text(
+            f"schema_version: 1\nenv:\n  RVAL: {index}k\n", encoding="utf-8"
+        )
+        entries.append(directory / "tb.asdl")
+    expected = [Compiler().emit(entry)[0] for entry in entries]
+    assert all(text is not None and "$" not in text for text in expected)
+
+    compiler = Compiler(max_entries=2)
+
+    def emit(index: int) -> Optional[str]:
+        if index % 16 == 15:
+            compiler.invalidate(entries[index % 4])
+        return compiler.emit(entries[index % 4])[0]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(emit, range(128)))
+
+    assert results == [expected[index % 4] for index in range(128)]
+    assert "RVAL" not in os.environ
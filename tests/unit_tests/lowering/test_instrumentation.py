@@ -0,0 +1,147 @@
+from __future__ import annotations
+
+import gc
+import weakref
+from pathlib import Path
+
+from asdl import instrumentation
+from asdl.compile_stats import CompileStats, compile_stats_scope
+from asdl.instrumentation import ChromeTraceRecorder, InstrumentationEvent
+from asdl.lowering import run_netlist_ir_pipeline
+
+
+def _write_design(tmp_path: Path) -> Path:
+    (tmp_path / "lib.asdl").write_text(
+        "\n".join(
+            [
+                "modules:",
+                "  leaf:",
+                "    instances:",
+                "      R1: res",
+                "    nets:",
+                "      $A: [R1.P]",
+                "      $B: [R1.N]",
+                "devices:",
+                "  res:",
+                "    ports: [P, N]",
+                "    backends:",
+                "      sim.ngspice:",
+                '        template: "R{name} {ports} 1k"',
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    entry = tmp_path / "tb.asdl"
+    entry.write_text(
+        "\n".join(
+            [
+                "imports:",
+                "  lib: ./lib.asdl",
+                "top: tb",
+                "modules:",
+                "  tb:",
+                "    instances:",
+                "      U<1:2>: lib.leaf",
+                "    nets:",
+                "      $A: [U<1:2>.A]",
+                "      $B: [U<1:2>.B]",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    return entry
+
+
+def test_pipeline_spans_cover_stages_files_and_modules(tmp_path: Path) -> None:
+    entry = _write_design(tmp_path)
+    events: list[InstrumentationEvent] = []
+    recorder = ChromeTraceRecorder()
+
+    with instrumentation.subscribed(events.append), instrumentation.subscribed(
+        recorder
+    ):
+        design, diagnostics = run_netlist_ir_pipeline(entry_file=entry)
+    assert design is not None, diagnostics
+    assert not instrumentation.is_enabled()
+
+    begins = [event for event in events if event.phase == "begin"]
+    assert len(begins) == len([event for event in events if event.phase == "end"])
+    assert [event.name for event in begins if event.category == "stage"] == [
+        "import_resolution",
+        "parse",
+        "parse",
+        "patterned_graph",
+        "atomization",
+        "verification",
+        "netlist_ir",
+    ]
+    assert [event.args["file"] for event in begins if event.name == "parse"] == [
+        str(entry),
+        str(tmp_path / "lib.asdl"),
+    ]
+    assert sorted(
+        event.args["module"] for event in begins if event.name == "atomize_module"
+    ) == ["leaf", "tb"]
+
+    trace = recorder.to_jsonable()["traceEvents"]
+    assert len(trace) == len(events)
+    assert {entry["ph"] for entry in trace} == {"B", "E", "i"}
+    # IR handoff events name the IR type instead of rendering the object.
+    assert [
+        (entry["args"]["ir"], entry["args"]["value"])
+        for entry in trace
+        if entry["name"] == "ir_ready"
+    ] == [
+        ("ast", "<ImportGraph>"),
+        ("patterned_graph", "<ProgramGraph>"),
+        ("atomized_graph", "<AtomizedProgramGraph>"),
+        ("netlist_ir", "<NetlistDesign>"),
+    ]
+    assert all(entry["ts"] >= 0 for entry in trace)
+
+
+def test_disabled_instrumentation_is_a_shared_no_op() -> None:
+    assert not instrumentation.is_enabled()
+    assert instrumentation.span("a") is instrumentation.span("b", module="m")
+    instrumentation.event("ignored")
+
+    stats = CompileStats()
+    with compile_stats_scope(stats):
+        with stats.stage("outer"):
+            with stats.stage("inner"):
+                pass
+    assert stats.stages["outer"].calls == 1
+    assert stats.stages["inner"].calls == 1
+    assert stats.to_jsonable()["total_wall_ms"] >= 0
+
+
+def test_low_memory_pipeline_releases_each_ir_before_the_next_stage(
+    tmp_path: Path,
+) -> None:
+    entry = _write_design(tmp_path)
+    expected, _ = run_netlist_ir_pipeline(entry_file=entry)
+    irs: dict[str, weakref.ref] = {}
+    alive: dict[str, list[str]] = {}
+
+    def hook(record: InstrumentationEvent) -> None:
+        if record.name == "ir_ready":
+            irs[record.args["ir"]] = weakref.ref(record.args["value"])
+        elif record.category == "stage" and record.phase == "begin":
+            alive[record.name] = [name for name, ref in irs.items() if ref()]
+
+    # Released IRs must be freed by refcounting alone, not by a gc pass.
+    gc.disable()
+    try:
+        with instrumentation.subscribed(hook):
+            design, diagnostics = run_netlist_ir_pipeline(
+                entry_file=entry, low_memory=True
+            )
+    finally:
+        gc.enable()
+
+    assert design == expected, diagnostics
+    assert alive["atomization"] == ["patterned_graph"]
+    assert alive["netlist_ir"] == ["atomized_graph"]
+    assert [name for name, ref in irs.items() if ref()] == ["netlist_ir"]
@@ -0,0 +1,139 @@
+from asdl.emit.netlist import ParallelFoldEntry, fold_parallel_devices
+from asdl.emit.netlist_ir import (
+    NetlistBackend,
+    NetlistConn,
+    NetlistDesign,
+    NetlistDevice,
+    NetlistInstance,
+    NetlistModule,
+    NetlistNet,
+    PatternOrigin,
+)
+
+BACKEND_NAME = "sim.ngspice"
+
+
+def _device(template: str = "M{name} {ports} nch {params}") -> NetlistDevice:
+    return NetlistDevice(
+        name="nmos",
+        file_id="devices.asdl",
+        ports=["d", "g"],
+        params={"W": "1u", "m": "1"},
+        backends=[NetlistBackend(name=BACKEND_NAME, template=template)],
+    )
+
+
+def _instance(
+    name: str,
+    *,
+    expression_id: str | None = "expr1",
+    drain: str = "D",
+    params: dict[str, str] | None = None,
+) -> NetlistInstance:
+    origin = None
+    if expression_id is not None:
+        origin = PatternOrigin(
+            expression_id=expression_id,
+            segment_index=0,
+            base_name="MN",
+            pattern_parts=[int(name[-1])],
+        )
+    return NetlistInstance(
+        name=name,
+        ref="nmos",
+        ref_file_id="devices.asdl",
+        params=params,
+        conns=[NetlistConn(port="d", net=drain), NetlistConn(port="g", net="G")],
+        pattern_origin=origin,
+    )
+
+
+def _design(
+    instances: list[NetlistInstance], device: NetlistDevice | None = None
+) -> NetlistDesign:
+    module = NetlistModule(
+        name="top",
+        file_id="top.asdl",
+        ports=["D", "G"],
+        nets=[NetlistNet(name="D"), NetlistNet(name="G"), NetlistNet(name="D2")],
+        instances=instances,
+    )
+    return NetlistDesign(
+        modules=[module],
+        devices=[device or _device()],
+        top="top",
+        entry_file_id="top.asdl",
+    )
+
+
+def test_fold_parallel_devices_collapses_pattern_group() -> None:
+    design = _design(
+        [_instance(f"MN{index}", params={"W": "2u"}) for index in range(1, 5)]
+    )
+
+    folded, entries = fold_parallel_devices(
+        design, backend_name=BACKEND_NAME, multiplicity_param="m"
+    )
+
+    instances = folded.modules[0].instances
+    assert [inst.name for inst in instances] == ["MN1"]
+    assert instances[0].params == {"W": "2u", "m": "4"}
+    assert instances[0].pattern_origin == design.modules[0].instances[0].pattern_origin
+    assert entries == (
+        ParallelFoldEntry(
+            module="top",
+            file_id="top.asdl",
+            instance="MN1",
+            ref="nmos",
+            expression_id="expr1",
+            members=("MN1", "MN2", "MN3", "MN4"),
+            multiplicity=4,
+        ),
+    )
+
+
+def test_fold_parallel_devices_scales_instance_multiplicity() -> None:
+    design = _design(
+        [_instance(f"MN{index}", params={"m": "3"}) for index in range(1, 3)]
+    )
+
+    folded, entries = fold_parallel_devices(
+        design, backend_name=BACKEND_NAME, multiplicity_param="m"
+    )
+
+    assert folded.modules[0].instances[0].params == {"m": "6"}
+    assert entries[0].multiplicity == 6
+
+
+def test_fold_parallel_devices_keeps_distinct_instances() -> None:
+    design = _design(
+        [
+            _instance("MN1"),
+            _instance("MN2", drain="D2"),
+            _instance("MN3", expression_id=None),
+            _instance("MN4", expression_id=None),
+            _instance("MN5", params={"m": "x"}),
+            _instance("MN6", params={"m": "x"}),
+        ]
+    )
+
+    folded, entries = fold_parallel_devices(
+        design, backend_name=BACKEND_NAME, multiplicity_param="m"
+    )
+
+    assert folded is design
+    assert entries == ()
+
+
+def test_fold_parallel_devices_requires_multiplicity_placeholder() -> None:
+    design = _design(
+        [_instance(f"MN{index}") for index in range(1, 3)],
+        device=_device(template="M{name} {ports} nch W={W}"),
+    )
+
+    folded, entries = fold_parallel_devices(
+        design, backend_name=BACKEND_NAME, multiplicity_param="m"
+    )
+
+    assert folded is design
+    assert entries == ()
@@ -1,14 +1,21 @@
 import datetime
+from dataclasses import replace
 from pathlib import Path
 
-from asdl.diagnostics import Severity, format_code
+from asdl.diagnostics import Diagnostic, Severity, format_code
 from asdl.emit.backend_config import (
     BackendConfig,
     SystemDeviceTemplate,
     load_backend_config,
 )
 from asdl.emit.netlist.api import EmitOptions
-from asdl.emit.netlist.render import _emit_design, build_emission_name_map
+from asdl.emit.netlist.render import (
+    _emit_design,
+    _emit_split_netlist_ir_design,
+    _split_file_name,
+    build_emission_name_map,
+    build_emission_plan,
+)
 from asdl.emit.netlist_ir import (
     NetlistBackend,
     NetlistConn,
@@ -305,6 +312,52 @@ def test_build_emission_name_map_reports_logical_base_and_emitted_names() -> Non
     assert [entry.renamed for entry in name_map] == [False, False, True]
 
 
+def test_emission_plan_is_shared_by_render_and_name_map() -> None:
+    top = NetlistModule(
+        name="TOP",
+        file_id="top.asdl",
+        ports=[],
+        nets=[],
+        instances=[
+            NetlistInstance(name="U1", ref="CELL", ref_file_id="a.asdl", conns=[]),
+            NetlistInstance(name="U2", ref="CELL", ref_file_id="b.asdl", conns=[]),
+        ],
+    )
+    cell_a = NetlistModule(
+        name="CELL", file_id="a.asdl", ports=[], nets=[], instances=[]
+    )
+    cell_b = NetlistModule(
+        name="CELL", file_id="b.asdl", ports=[], nets=[], instances=[]
+    )
+    unused = NetlistModule(
+        name="UNUSED", file_id="top.asdl", ports=[], nets=[], instances=[]
+    )
+    design = NetlistDesign(
+        modules=[top, cell_a, cell_b, unused],
+        devices=[],
+        top="TOP",
+        entry_file_id="top.asdl",
+    )
+
+    plan, plan_diagnostics = build_emission_plan(design)
+
+    assert plan is not None
+    assert plan.reachable_modules == [top, cell_a, cell_b]
+    assert plan.emitted_name(cell_b) == "CELL__2"
+    assert [diag.code for diag in plan_diagnostics] == [format_code("EMIT", 14)]
+    assert plan.diagnostics == tuple(plan_diagnostics)
+    assert build_emission_name_map(design, plan) == build_emission_name_map(design)
+
+    options = EmitOptions(
+        backend_name=BACKEND_NAME,
+        backend_config=_backend_config(),
+        emit_timestamp=datetime.datetime(2026, 1, 1, 12, 0, 0),
+    )
+    planned = _emit_design(design, options, plan)
+    assert planned == _emit(design, _backend_config())
+    assert planned[1] == plan_diagnostics
+
+
 def test_build_emission_name_map_ignores_unreachable_module_colliders() -> None:
     top = NetlistModule(
         name="TOP",
@@ -992,3 +1045,331 @@ def test_render_netlist_ir_uses_plain_subckt_header_when_module_parameters_empty
     lines = netlist.splitlines()
     assert ".subckt CHILD IN OUT" in lines
     assert ".subckt CHILD IN OUT PARAMS:" not in lines
+
+
+def test_render_netlist_ir_reuses_device_tables_with_per_instance_diagnostics() -> None:
+    backend_config = _backend_config()
+
+    device = NetlistDevice(
+        name="NMOS",
+        file_id="devices.asdl",
+        ports=["d", "g"],
+        params={"W": "1u", "L": "180n"},
+        variables={"corner": "tt"},
+        backends=[
+            NetlistBackend(
+                name=BACKEND_NAME,
+                template="M{name} {ports} nch {params} {corner}",
+                params={"nf": "1"},
+            )
+        ],
+    )
+    module = NetlistModule(
+        name="TOP",
+        file_id="top.asdl",
+        ports=[],
+        nets=[NetlistNet(name="D"), NetlistNet(name="G")],
+        instances=[
+            NetlistInstance(
+                name=name,
+                ref="NMOS",
+                ref_file_id="devices.asdl",
+                params=params,
+                conns=[
+                    NetlistConn(port="d", net="D"),
+                    NetlistConn(port="g", net="G"),
+                ],
+            )
+            for name, params in (
+                ("1", {"W": "2u", "bogus": "1"}),
+                ("2", None),
+                ("3", {"nf": "4", "bogus": "2"}),
+            )
+        ],
+    )
+    design = NetlistDesign(
+        modules=[module],
+        devices=[device],
+        top="TOP",
+        entry_file_id="top.asdl",
+    )
+
+    netlist, diagnostics = _emit(design, backend_config)
+
+    assert netlist == "\n".join(
+        [
+            "* header TOP",
+            "M1 D G nch W=2u L=180n nf=1 tt",
+            "M2 D G nch W=1u L=180n nf=1 tt",
+            "M3 D G nch W=1u L=180n nf=4 tt",
+            ".end",
+        ]
+    )
+    assert [diag.message for diag in diagnostics] == [
+        "Instance '1' overrides unknown param 'bogus' on device 'NMOS'",
+        "Instance '3' overrides unknown param 'bogus' on device 'NMOS'",
+    ]
+    assert all(diag.code == format_code("EMIT", 2) for diag in diagnostics)
+
+
+def _array_pattern_design(
+    drain_indices: tuple[int, ...],
+) -> NetlistDesign:
+    device = NetlistDevice(
+        name="NMOS",
+        file_id="devices.asdl",
+        ports=["d", "g"],
+        backends=[
+            NetlistBackend(name=BACKEND_NAME, template="{name} ({ports}) nch")
+        ],
+    )
+    nets = [NetlistNet(name="G")]
+    nets.extend(
+        NetlistNet(
+            name=f"D{index}",
+            pattern_origin=PatternOrigin(
+                expression_id="expr_net",
+                segment_index=0,
+                base_name="D",
+                pattern_parts=[index],
+            ),
+        )
+        for index in sorted(drain_indices)
+    )
+    instances = [
+        NetlistInstance(
+            name=f"MN{inst_index}",
+            ref="NMOS",
+            ref_file_id="devices.asdl",
+            conns=[
+                NetlistConn(port="d", net=f"D{net_index}"),
+                NetlistConn(port="g", net="G"),
+            ],
+            pattern_origin=PatternOrigin(
+                expression_id="expr_inst",
+                segment_index=0,
+                base_name="MN",
+                pattern_parts=[inst_index],
+            ),
+        )
+        for inst_index, net_index in zip((3, 2, 1, 0), drain_indices)
+    ]
+    module = NetlistModule(
+        name="TOP",
+        file_id="top.asdl",
+        ports=[],
+        nets=nets,
+        instances=instances,
+        pattern_expression_table={
+            "expr_net": PatternExpressionEntry(expression="D<0:3>", kind="net"),
+            "expr_inst": PatternExpressionEntry(expression="MN<3:0>", kind="inst"),
+        },
+    )
+    return NetlistDesign(
+        modules=[module],
+        devices=[device],
+        top="TOP",
+        entry_file_id="top.asdl",
+    )
+
+
+def test_render_netlist_ir_emits_backend_array_instances() -> None:
+    backend_config = replace(
+        _backend_config(pattern_rendering="<{N}>"),
+        array_rendering="<{start}:{end}>",
+    )
+
+    netlist, diagnostics = _emit(_array_pattern_design((0, 1, 2, 3)), backend_config)
+
+    assert diagnostics == []
+    assert netlist == "\n".join(
+        [
+            "* header TOP",
+            "MN<3:0> (D<0:3> G) nch",
+            ".end",
+        ]
+    )
+
+
+def test_render_netlist_ir_array_instances_fall_back_for_irregular_nets() -> None:
+    backend_config = replace(
+        _backend_config(pattern_rendering="<{N}>"),
+        array_rendering="<{start}:{end}>",
+    )
+
+    netlist, diagnostics = _emit(_array_pattern_design((0, 2, 1, 3)), backend_config)
+
+    assert diagnostics == []
+    assert netlist == "\n".join(
+        [
+            "* header TOP",
+            "MN<3> (D<0> G) nch",
+            "MN<2> (D<2> G) nch",
+            "MN<1> (D<1> G) nch",
+            "MN<0> (D<3> G) nch",
+            ".end",
+        ]
+    )
+
+
+def test_render_netlist_ir_without_array_rendering_emits_atoms() -> None:
+    netlist, _ = _emit(
+        _array_pattern_design((0, 1, 2, 3)),
+        _backend_config(pattern_rendering="<{N}>"),
+    )
+
+    assert netlist is not None
+    assert "MN<3:0>" not in netlist
+    assert "MN<3> (D<0> G) nch" in netlist
+
+
+def test_render_netlist_ir_split_emits_one_file_per_subckt() -> None:
+    base_config = _backend_config()
+    backend_config = replace(
+        base_config,
+        templates={
+            **base_config.templates,
+            "__include__": SystemDeviceTemplate(template='.include "{path}"'),
+        },
+    )
+    top = NetlistModule(
+        name="TOP",
+        file_id="top.asdl",
+        ports=[],
+        nets=[],
+        instances=[
+            NetlistInstance(name="U1", ref="CELL", ref_file_id="cell.asdl", conns=[])
+        ],
+    )
+    cell = NetlistModule(
+        name="CELL",
+        file_id="cell.asdl",
+        ports=[],
+        nets=[],
+        instances=[],
+    )
+    design = NetlistDesign(
+        modules=[top, cell],
+        devices=[],
+        top="TOP",
+        entry_file_id="top.asdl",
+    )
+    options = EmitOptions(
+        backend_name=BACKEND_NAME,
+        backend_config=backend_config,
+        emit_timestamp=datetime.datetime(2026, 1, 1, 12, 0, 0),
+    )
+
+    split, diagnostics = _emit_split_netlist_ir_design(
+        design, options, include_dir="top.subckts"
+    )
+
+    assert diagnostics == []
+    assert split is not None
+    assert split.top == "\n".join(
+        [
+            "* header TOP",
+            '.include "top.subckts/CELL.spice"',
+            "XU1 CELL",
+            ".end",
+        ]
+    )
+    assert [(item.symbol, item.file_name) for item in split.subckts] == [
+        ("CELL", "CELL.spice")
+    ]
+    assert split.subckts[0].text == ".subckt CELL\n.ends CELL"
+    single, _ = _emit(design, backend_config)
+    assert single == "\n".join(
+        ["* header TOP", "XU1 CELL", ".subckt CELL", ".ends CELL", ".end"]
+    )
+
+
+def test_render_netlist_ir_split_file_names_avoid_case_collisions() -> None:
+    backend_config = replace(
+        _backend_config(),
+        templates={
+            **_backend_config().templates,
+            "__include__": SystemDeviceTemplate(template='.include "{path}"'),
+        },
+    )
+    top = NetlistModule(
+        name="TOP",
+        file_id="top.asdl",
+        ports=[],
+        nets=[],
+        instances=[
+            NetlistInstance(name="U1", ref="Cell", ref_file_id="top.asdl", conns=[]),
+            NetlistInstance(name="U2", ref="cell", ref_file_id="top.asdl", conns=[]),
+        ],
+    )
+    cells = [
+        NetlistModule(name=name, file_id="top.asdl", ports=[], nets=[], instances=[])
+        for name in ["Cell", "cell"]
+    ]
+    design = NetlistDesign(
+        modules=[top, *cells],
+        devices=[],
+        top="TOP",
+        entry_file_id="top.asdl",
+    )
+    options = EmitOptions(
+        backend_name=BACKEND_NAME,
+        backend_config=backend_config,
+        emit_timestamp=datetime.datetime(2026, 1, 1, 12, 0, 0),
+    )
+
+    split, diagnostics = _emit_split_netlist_ir_design(
+        design, options, include_dir="top.subckts"
+    )
+
+    assert split is not None
+    assert [(item.emitted_name, item.file_name) for item in split.subckts] == [
+        ("Cell", "Cell.spice"),
+        ("cell", "cell__2.spice"),
+    ]
+    assert '.include "top.subckts/cell__2.spice"' in split.top.splitlines()
+    assert [(diag.code, diag.severity) for diag in diagnostics] == [
+        (format_code("EMIT", 16), Severity.WARNING)
+    ]
+
+    escaped: list[Diagnostic] = []
+    assert _split_file_name("a/b\\c", ".spice", set(), escaped) == "a_b_c.spice"
+    assert _split_file_name("..", "", set(), escaped) == "_.."
+    assert len(escaped) == 2
+
+
+def test_render_netlist_ir_split_requires_include_system_device() -> None:
+    top = NetlistModule(
+        name="TOP",
+        file_id="top.asdl",
+        ports=[],
+        nets=[],
+        instances=[
+            NetlistInstance(name="U1", ref="CELL", ref_file_id="top.asdl", conns=[])
+        ],
+    )
+    cell = NetlistModule(
+        name="CELL",
+        file_id="top.asdl",
+        ports=[],
+        nets=[],
+        instances=[],
+    )
+    design = NetlistDesign(
+        modules=[top, cell],
+        devices=[],
+        top="TOP",
+        entry_file_id="top.asdl",
+    )
+    options = EmitOptions(
+        backend_name=BACKEND_NAME,
+        backend_config=_backend_config(),
+        emit_timestamp=datetime.datetime(2026, 1, 1, 12, 0, 0),
+    )
+
+    split, diagnostics = _emit_split_netlist_ir_design(
+        design, options, include_dir="top.subckts"
+    )
+
+    assert split is None
+    assert any("__include__" in diag.message for diag in diagnostics)
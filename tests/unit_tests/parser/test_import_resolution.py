@@ -5,6 +5,7 @@ import pytest
 
 from asdl.diagnostics import Severity
 from asdl.ast.location import Locatable
+from asdl.imports.document_cache import DocumentCache
 from asdl.imports.resolver import resolve_import_graph, resolve_import_path
 
 
@@ -327,3 +328,35 @@ def test_duplicate_symbol_names_emit_error(
     diag = diagnostics[0]
     assert diag.code == "AST-014"
     assert diag.severity is Severity.ERROR
+
+
+def test_document_cache_shares_documents_and_reparses_changed_files(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.delenv("ASDL_LIB_PATH", raising=False)
+    shared = tmp_path / "shared.asdl"
+    _write_stub(shared)
+    first = tmp_path / "first.asdl"
+    second = tmp_path / "second.asdl"
+    _write_stub(first, {"lib": "./shared.asdl"})
+    _write_stub(second, {"lib": "./shared.asdl"})
+    cache = DocumentCache()
+
+    first_graph, first_diags = resolve_import_graph(first, document_cache=cache)
+    second_graph, second_diags = resolve_import_graph(second, document_cache=cache)
+
+    assert first_diags == []
+    assert second_diags == []
+    assert first_graph is not None and second_graph is not None
+    shared_id = shared.absolute()
+    assert first_graph.documents[shared_id] is second_graph.documents[shared_id]
+    assert len(cache) == 3
+
+    shared.write_text("top: top\nmodules:\n  top: {}\n  extra: {}\n", encoding="utf-8")
+    stat = shared.stat()
+    os.utime(shared, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    third_graph, _ = resolve_import_graph(first, document_cache=cache)
+
+    assert third_graph is not None
+    assert third_graph.documents[shared_id] is not first_graph.documents[shared_id]
+    assert "extra" in (third_graph.documents[shared_id].modules or {})
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from benchmarks.pipeline import STAGES, compare_results, parse_case, run_case
+from benchmarks.synthetic import DesignParams, module_levels, render_design
+
+
+def test_synthetic_design_is_deterministic_and_validated() -> None:
+    params = DesignParams(modules=5, depth=2, fanout=3, bus_width=4, view_rules=2)
+
+    assert render_design(params) == render_design(params)
+    assert module_levels(params) == [["m0", "m1", "m2"], ["m3", "m4"]]
+    assert "M3_<@fan>: m3" in render_design(params)
+    assert "m3@behave:" in render_design(params)
+    assert "m4@behave:" not in render_design(params)
+    with pytest.raises(ValueError, match="view_rules"):
+        render_design(DesignParams(modules=2, depth=2, view_rules=3))
+    with pytest.raises(ValueError, match="depth"):
+        DesignParams(modules=2, depth=3)
+
+
+def test_run_case_measures_every_stage(tmp_path: Path) -> None:
+    params = DesignParams(
+        modules=4, depth=2, fanout=2, bus_width=2, view_rules=1, library_size=2
+    )
+
+    case = run_case(params, tmp_path, repeats=1)
+
+    assert case["label"] == "N4-D2-F2-W2-R1-L2"
+    assert list(case["stages"]) == list(STAGES)
+    assert all(stage["wall_s_min"] > 0 for stage in case["stages"].values())
+    assert all(stage["peak_bytes"] > 0 for stage in case["stages"].values())
+    assert case["sizes"]["atomized_instances"] == 14
+    assert (tmp_path / case["label"] / "top.asdl").exists()
+
+    slower = {
+        "cases": [
+            {
+                **case,
+                "stages": {
+                    name: {**stage, "wall_s_min": stage["wall_s_min"] * 2}
+                    for name, stage in case["stages"].items()
+                },
+            }
+        ]
+    }
+    lines, regressed = compare_results({"cases": [case]}, slower)
+    assert regressed
+    assert len(lines) == len(STAGES) + 1
+    assert not compare_results({"cases": [case]}, {"cases": [case]})[1]
+
+
+def test_parse_case_overrides_scaling_base() -> None:
+    assert parse_case("modules=64,bus_width=2").bus_width == 2
+    with pytest.raises(ValueError, match="Unknown"):
+        parse_case("width=2")
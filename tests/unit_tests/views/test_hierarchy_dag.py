@@ -0,0 +1,83 @@
+"""Unit tests for the occurrence-compressed view-binding hierarchy DAG."""
+
+from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
+from asdl.views.hierarchy_dag import build_hierarchy_dag
+from asdl.views.instance_index import build_instance_index
+
+
+def _arrayed_design() -> NetlistDesign:
+    return NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=f"row{index}", ref="row", ref_file_id="file://tb")
+                    for index in range(3)
+                ],
+            ),
+            NetlistModule(
+                name="row",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=f"sw{index}", ref="switch", ref_file_id="file://tb")
+                    for index in range(4)
+                ],
+            ),
+            NetlistModule(name="switch", file_id="file://tb"),
+        ],
+        top="tb",
+    )
+
+
+def test_build_hierarchy_dag_stores_edges_once_with_multiplicity() -> None:
+    """Each parent/instance edge is stored once; occurrences are counted."""
+    design = _arrayed_design()
+
+    dag = build_hierarchy_dag(design)
+
+    assert dag.root == ("file://tb", "tb")
+    assert dag.root_path == "tb"
+    assert [edge.instance for edge in dag.edges[("file://tb", "row")]] == [
+        "sw0",
+        "sw1",
+        "sw2",
+        "sw3",
+    ]
+    assert sum(len(edges) for edges in dag.edges.values()) == 7
+    assert dag.occurrences == {
+        ("file://tb", "tb"): 1,
+        ("file://tb", "row"): 3,
+        ("file://tb", "switch"): 12,
+    }
+    assert dag.occurrence_count() == 15
+    assert dag.to_instance_index() == build_instance_index(design)
+
+
+def test_hierarchy_dag_has_path_follows_occurrences_and_cycle_leaves() -> None:
+    """Path lookup walks DAG edges and treats cycle edges as leaves."""
+    design = NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[NetlistInstance(name="a", ref="A", ref_file_id="file://tb")],
+            ),
+            NetlistModule(
+                name="A",
+                file_id="file://tb",
+                instances=[NetlistInstance(name="back", ref="tb", ref_file_id="file://tb")],
+            ),
+        ],
+        top="tb",
+    )
+
+    dag = build_hierarchy_dag(design)
+
+    assert dag.has_cycles
+    assert dag.has_path("tb")
+    assert dag.has_path("tb.a.back")
+    assert not dag.has_path("tb.a.back.a")
+    assert not dag.has_path("tb.missing")
+    assert not dag.has_path("other.a")
+    assert dag.to_instance_index() == build_instance_index(design)
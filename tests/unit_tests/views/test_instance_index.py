@@ -177,3 +177,44 @@ def test_build_instance_index_excludes_device_targets() -> None:
 def test_build_instance_index_has_no_local_top_resolution_helper() -> None:
     """Views index must rely on shared hierarchy top-resolution logic."""
     assert not hasattr(instance_index_module, "_resolve_top_module")
+
+
+def test_match_index_entries_scopes_repeated_module_subtrees() -> None:
+    """Matching keeps scope, predicate and preorder semantics for shared modules."""
+    design = NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=f"row{index}", ref="Row", ref_file_id="file://tb")
+                    for index in range(3)
+                ],
+            ),
+            NetlistModule(
+                name="Row",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name="sw0", ref="Switch", ref_file_id="file://tb"),
+                    NetlistInstance(name="sw1", ref="Switch", ref_file_id="file://tb"),
+                ],
+            ),
+            NetlistModule(name="Switch", file_id="file://tb"),
+        ],
+        top="tb",
+    )
+    index = build_instance_index(design)
+
+    scoped = match_index_entries(index, ViewMatch(path="tb.row1", instance="sw1"))
+    by_module = match_index_entries(index, ViewMatch(path="tb", module="Switch"))
+    subtree = match_index_entries(index, ViewMatch(path="tb.row2"))
+
+    assert [entry.full_path for entry in scoped] == ["tb.row1.sw1"]
+    assert [entry.full_path for entry in by_module] == [
+        f"tb.row{row}.sw{switch}" for row in range(3) for switch in range(2)
+    ]
+    assert [entry.full_path for entry in subtree] == [
+        "tb.row2",
+        "tb.row2.sw0",
+        "tb.row2.sw1",
+    ]
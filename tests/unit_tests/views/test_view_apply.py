@@ -1,8 +1,12 @@
 """Unit tests for applying resolved view bindings to NetlistIR designs."""
 
+import pytest
+
 from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
 from asdl.views.api import apply_resolved_view_bindings
-from asdl.views.resolver import ResolvedViewBindingEntry
+from asdl.views.models import ViewProfile
+from asdl.views.resolver import ResolvedViewBindingEntry, resolve_view_binding_graph
+from asdl.views.session import ViewBindingSession
 
 
 def _design_for_apply() -> NetlistDesign:
@@ -214,3 +218,157 @@ def test_apply_resolved_view_bindings_missing_ref_file_id_avoids_chained_special
     ][0]
     assert [instance.ref for instance in a1_module.instances] == ["leaf@alt"]
     assert [instance.ref for instance in a2_module.instances] == ["leaf@dbg"]
+
+
+def test_apply_resolved_view_bindings_shares_identical_specializations() -> None:
+    """Occurrences with identical rewritten content share one specialization."""
+    design = NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=name, ref="branch", ref_file_id="file://tb")
+                    for name in ("A1", "A2", "A3")
+                ],
+            ),
+            NetlistModule(
+                name="branch",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name="core", ref="leaf", ref_file_id="file://tb"),
+                ],
+            ),
+            NetlistModule(name="leaf", file_id="file://tb"),
+            NetlistModule(name="leaf@alt", file_id="file://tb"),
+            NetlistModule(name="leaf@dbg", file_id="file://tb"),
+        ],
+        top="tb",
+    )
+    resolved = (
+        ResolvedViewBindingEntry(path="tb", instance="A1", resolved="branch", rule_id=None),
+        ResolvedViewBindingEntry(path="tb.A1", instance="core", resolved="leaf@alt", rule_id="r1"),
+        ResolvedViewBindingEntry(path="tb", instance="A2", resolved="branch", rule_id=None),
+        ResolvedViewBindingEntry(path="tb.A2", instance="core", resolved="leaf@dbg", rule_id="r2"),
+        ResolvedViewBindingEntry(path="tb", instance="A3", resolved="branch", rule_id=None),
+        ResolvedViewBindingEntry(path="tb.A3", instance="core", resolved="leaf@alt", rule_id="r1"),
+    )
+
+    updated = apply_resolved_view_bindings(design, resolved)
+
+    tb_module = [module for module in updated.modules if module.name == "tb"][0]
+    instance_file_ids = {
+        instance.name: instance.ref_file_id for instance in tb_module.instances
+    }
+    assert instance_file_ids["A1"] == instance_file_ids["A3"]
+    assert instance_file_ids["A1"] != instance_file_ids["A2"]
+    branch_variants = [module for module in updated.modules if module.name == "branch"]
+    assert len(branch_variants) == 3
+
+
+def test_apply_resolved_view_bindings_consumes_graph_without_flattening() -> None:
+    """Graph application matches sidecar application and skips the flat index."""
+    design = NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=f"row{index}", ref="row", ref_file_id="file://tb")
+                    for index in range(8)
+                ],
+            ),
+            NetlistModule(
+                name="row",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=f"sw{index}", ref="leaf", ref_file_id="file://tb")
+                    for index in range(8)
+                ],
+            ),
+            NetlistModule(name="leaf", file_id="file://tb"),
+            NetlistModule(name="leaf@dbg", file_id="file://tb"),
+        ],
+        top="tb",
+    )
+    profile = ViewProfile.model_validate(
+        {
+            "view_order": ["default"],
+            "rules": [
+                {"id": "row3", "match": {"path": "tb.row3", "module": "leaf"}, "bind": "leaf@dbg"},
+                {"id": "row5", "match": {"path": "tb.row5", "module": "leaf"}, "bind": "leaf@dbg"},
+            ],
+        }
+    )
+    session = ViewBindingSession(design)
+    graph = resolve_view_binding_graph(design, profile, session=session)
+
+    from_graph = apply_resolved_view_bindings(design, graph, session=session)
+
+    assert "index" not in vars(session)
+    assert from_graph == apply_resolved_view_bindings(design, graph.entries())
+    tb_module = from_graph.modules[0]
+    specialized = {
+        instance.name
+        for instance in tb_module.instances
+        if instance.ref_file_id != "file://tb"
+    }
+    assert specialized == {"row3", "row5"}
+    assert len(from_graph.modules) == len(design.modules) + 1
+
+
+def test_apply_resolved_view_bindings_rejects_mismatched_sidecar() -> None:
+    """Sidecar entries must cover exactly the design's occurrences."""
+    design = _design_for_apply()
+    resolved = (
+        ResolvedViewBindingEntry(path="tb", instance="dut", resolved="TopCell", rule_id=None),
+        ResolvedViewBindingEntry(
+            path="tb.dut", instance="Tgate3", resolved="swmatrix_Tgate", rule_id=None
+        ),
+    )
+
+    with pytest.raises(ValueError, match="missing paths: tb.dut.Tgate1, tb.dut.Tgate2"):
+        apply_resolved_view_bindings(design, resolved)
+
+
+def test_apply_resolved_view_bindings_handles_hierarchy_deeper_than_recursion_limit() -> None:
+    """Specialization walks deep hierarchies without recursion."""
+    depth = 1500
+    modules = [
+        NetlistModule(
+            name=f"m{level}",
+            file_id="file://tb",
+            instances=[
+                NetlistInstance(name="sub", ref=f"m{level + 1}", ref_file_id="file://tb")
+            ],
+        )
+        for level in range(depth)
+    ]
+    modules.append(NetlistModule(name=f"m{depth}", file_id="file://tb"))
+    modules.append(NetlistModule(name=f"m{depth}@dbg", file_id="file://tb"))
+    design = NetlistDesign(modules=modules, top="m0")
+    leaf_parent = ".".join(["m0", *(["sub"] * (depth - 1))])
+    profile = ViewProfile.model_validate(
+        {
+            "view_order": ["default"],
+            "rules": [
+                {
+                    "id": "leaf_dbg",
+                    "match": {"path": leaf_parent, "module": f"m{depth}"},
+                    "bind": f"m{depth}@dbg",
+                }
+            ],
+        }
+    )
+
+    updated = apply_resolved_view_bindings(
+        design, resolve_view_binding_graph(design, profile)
+    )
+
+    modules_by_key = {(module.file_id, module.name): module for module in updated.modules}
+    module = updated.modules[0]
+    for _ in range(depth):
+        (instance,) = module.instances
+        module = modules_by_key[(instance.ref_file_id, instance.ref)]
+    assert module.name == f"m{depth}@dbg"
+
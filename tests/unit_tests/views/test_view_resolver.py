@@ -5,11 +5,12 @@ from pathlib import Path
 import pytest
 import yaml
 
+from asdl.compile_stats import CompileStats, compile_stats_scope
 from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
 from asdl.lowering import run_netlist_ir_pipeline
 from asdl.views.config import load_view_config
 from asdl.views.models import ViewProfile
-from asdl.views.resolver import resolve_view_bindings
+from asdl.views.resolver import resolve_view_binding_graph, resolve_view_bindings
 
 FIXTURE_DIR = Path(__file__).parent / "fixtures"
 VIEW_FIXTURE_ASDL = FIXTURE_DIR / "view_binding_fixture.asdl"
@@ -319,3 +320,153 @@ def test_resolve_view_bindings_keeps_deterministic_order_for_divergent_paths() -
         ("tb.R", "U", "stage", None),
         ("tb.R.U", "core", "leaf@dbg", "right_dbg"),
     ]
+
+
+def test_resolve_view_binding_graph_shares_nodes_until_path_rule_splits() -> None:
+    """Occurrences share resolved nodes unless a path-scoped rule splits them."""
+    design = NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=f"row{index}", ref="row", ref_file_id="file://tb")
+                    for index in range(3)
+                ],
+            ),
+            NetlistModule(
+                name="row",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name=f"sw{index}", ref="leaf", ref_file_id="file://tb")
+                    for index in range(2)
+                ],
+            ),
+            NetlistModule(name="leaf", file_id="file://tb"),
+            NetlistModule(name="leaf@dbg", file_id="file://tb"),
+        ],
+        top="tb",
+    )
+    profile = ViewProfile.model_validate(
+        {
+            "view_order": ["default"],
+            "rules": [
+                {
+                    "id": "row1_dbg",
+                    "match": {"path": "tb.row1", "module": "leaf"},
+                    "bind": "leaf@dbg",
+                },
+            ],
+        }
+    )
+
+    graph = resolve_view_binding_graph(design, profile)
+
+    assert graph.root is not None
+    row0, row1, row2 = (edge.child for edge in graph.root.edges)
+    assert row0 is row2
+    assert row1 is not row0
+    assert [edge.resolved for edge in row1.edges] == ["leaf@dbg", "leaf@dbg"]
+    assert graph.node_count == 5
+    assert graph.entries() == resolve_view_bindings(design, profile)
+    assert [entry.rule_id for entry in graph.entries()] == [
+        None,
+        None,
+        None,
+        None,
+        "row1_dbg",
+        "row1_dbg",
+        None,
+        None,
+        None,
+    ]
+
+
+def test_resolve_view_bindings_handles_hierarchy_deeper_than_recursion_limit() -> None:
+    """Resolution and sidecar expansion do not recurse per hierarchy level."""
+    depth = 1500
+    modules = [
+        NetlistModule(
+            name=f"m{level}",
+            file_id="file://tb",
+            instances=[
+                NetlistInstance(name="sub", ref=f"m{level + 1}", ref_file_id="file://tb")
+            ],
+        )
+        for level in range(depth)
+    ]
+    modules.append(NetlistModule(name=f"m{depth}", file_id="file://tb"))
+    modules.append(NetlistModule(name=f"m{depth}@dbg", file_id="file://tb"))
+    design = NetlistDesign(modules=modules, top="m0")
+    leaf_parent = ".".join(["m0", *(["sub"] * (depth - 1))])
+    profile = ViewProfile.model_validate(
+        {
+            "view_order": ["default"],
+            "rules": [
+                {
+                    "id": "leaf_dbg",
+                    "match": {"path": leaf_parent, "module": f"m{depth}"},
+                    "bind": f"m{depth}@dbg",
+                }
+            ],
+        }
+    )
+
+    entries = resolve_view_bindings(design, profile)
+
+    assert len(entries) == depth
+    assert entries[-1].path == leaf_parent
+    assert entries[-1].resolved == f"m{depth}@dbg"
+    assert entries[0].rule_id is None
+
+
+def test_resolve_view_binding_graph_examines_only_bucketed_rule_candidates() -> None:
+    """Each edge examines only rules bucketed under its instance or module."""
+    count = 100
+    modules = [
+        NetlistModule(
+            name="tb",
+            file_id="file://tb",
+            instances=[
+                NetlistInstance(name=f"u{index}", ref=f"cell{index}", ref_file_id="file://tb")
+                for index in range(count)
+            ],
+        ),
+        NetlistModule(name="leaf", file_id="file://tb"),
+    ]
+    for index in range(count):
+        modules.append(
+            NetlistModule(
+                name=f"cell{index}",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name="r", ref="leaf", ref_file_id="file://tb")
+                ],
+            )
+        )
+        modules.append(NetlistModule(name=f"cell{index}@dbg", file_id="file://tb"))
+    design = NetlistDesign(modules=modules, top="tb")
+    rules = [
+        {"id": f"mod{index}", "match": {"module": f"cell{index}"}, "bind": f"cell{index}"}
+        for index in range(count)
+    ] + [
+        {
+            "id": f"inst{index}",
+            "match": {"path": "tb", "instance": f"u{index}"},
+            "bind": f"cell{index}@dbg",
+        }
+        for index in range(count)
+    ]
+    profile = ViewProfile.model_validate({"view_order": ["default"], "rules": rules})
+
+    stats = CompileStats()
+    with compile_stats_scope(stats):
+        entries = resolve_view_bindings(design, profile)
+
+    assert stats.counters["view_rule_candidates"] == 2 * count
+    assert [(entry.instance, entry.resolved, entry.rule_id) for entry in entries[:4]] == [
+        ("u0", "cell0@dbg", "inst0"),
+        ("r", "leaf", None),
+        ("u1", "cell1@dbg", "inst1"),
+        ("r", "leaf", None),
+    ]
@@ -0,0 +1,83 @@
+"""Unit tests for shared view-binding session state."""
+
+import pytest
+
+import asdl.views.session as session_module
+from asdl.emit.netlist_ir import NetlistDesign, NetlistInstance, NetlistModule
+from asdl.views.api import apply_resolved_view_bindings
+from asdl.views.instance_index import build_instance_index
+from asdl.views.models import ViewProfile
+from asdl.views.resolver import resolve_view_binding_graph
+from asdl.views.session import ViewBindingSession
+
+
+def _design() -> NetlistDesign:
+    return NetlistDesign(
+        modules=[
+            NetlistModule(
+                name="tb",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name="A1", ref="branch", ref_file_id="file://tb"),
+                    NetlistInstance(name="A2", ref="branch", ref_file_id="file://tb"),
+                ],
+            ),
+            NetlistModule(
+                name="branch",
+                file_id="file://tb",
+                instances=[
+                    NetlistInstance(name="core", ref="leaf", ref_file_id="file://tb"),
+                ],
+            ),
+            NetlistModule(name="leaf", file_id="file://tb"),
+            NetlistModule(name="leaf@alt", file_id="file://tb"),
+        ],
+        top="tb",
+    )
+
+
+def test_view_binding_session_builds_hierarchy_once_for_resolve_and_apply(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Resolution and application reuse one session's DAG, index and tables."""
+    calls: list[NetlistDesign] = []
+    build_hierarchy_dag = session_module.build_hierarchy_dag
+
+    def _counting_build(design: NetlistDesign):
+        calls.append(design)
+        return build_hierarchy_dag(design)
+
+    monkeypatch.setattr(session_module, "build_hierarchy_dag", _counting_build)
+    design = _design()
+    profile = ViewProfile.model_validate(
+        {
+            "view_order": ["default"],
+            "rules": [
+                {"id": "alt", "match": {"path": "tb.A2", "module": "leaf"}, "bind": "leaf@alt"}
+            ],
+        }
+    )
+    session = ViewBindingSession(design)
+
+    entries = resolve_view_binding_graph(design, profile, session=session).entries()
+    updated = apply_resolved_view_bindings(design, entries, session=session)
+
+    assert calls == [design]
+    assert session.index == build_instance_index(design)
+    assert session.entries_by_path["tb.A2.core"].ref == "leaf"
+    assert [entry.instance for entry in session.child_entries_by_parent["tb"]] == [
+        "A1",
+        "A2",
+    ]
+    assert len([module for module in updated.modules if module.name == "branch"]) == 2
+    assert [module.name for module in session.modules_by_name["branch"]] == ["branch"]
+
+
+def test_view_binding_session_for_design_ignores_foreign_session() -> None:
+    """A session built for another design is never reused."""
+    design = _design()
+    session = ViewBindingSession(design)
+
+    assert ViewBindingSession.for_design(design, session) is session
+    assert ViewBindingSession.for_design(_design(), session) is not session
+    assert ViewBindingSession.for_design(design, None).design is design